@@ -0,0 +1,194 @@
+# Copyright (c) 2018-2026 Linh Pham
+# api.wwdt.me is released under the terms of the Apache License 2.0
+# SPDX-License-Identifier: Apache-2.0
+#
+# vim: set noai syntax=python ts=4 sw=4:
+"""Batch Retrieval by IDs, Slug Strings and Show Dates."""
+
+import datetime
+from collections.abc import Callable, Sequence
+from typing import Any
+
+from fastapi import HTTPException
+from fastapi.responses import JSONResponse
+from mysql.connector.errors import DatabaseError, ProgrammingError
+
+from app.config import load_config
+from app.dispatch import run_query_each
+from app.existence import existence_index
+
+_settings_config = load_config().get("settings", {})
+
+MAX_BATCH_SIZE: int = int(_settings_config.get("max_batch_size", 100))
+
+IDS_PATTERN = r"^\d+(,\d+)*$"
+DATES_PATTERN = r"^\d{4}-\d{2}-\d{2}(,\d{4}-\d{2}-\d{2})*$"
+
+
+def parse_ids(ids: str | None) -> list[int]:
+    """Parses a comma-separated list of IDs.
+
+    :param ids: Comma-separated list of IDs
+    :return: List of IDs
+    """
+    if not ids:
+        return []
+
+    return [int(id_) for id_ in ids.split(",")]
+
+
+def parse_keys(keys: str | None) -> list[str]:
+    """Parses a comma-separated list of slug strings or show dates.
+
+    :param keys: Comma-separated list of slug strings or show dates
+    :return: List of slug strings or show dates
+    """
+    if not keys:
+        return []
+
+    return [key.strip() for key in keys.split(",") if key.strip()]
+
+
+def _key_methods(entity: str) -> tuple[str, str, str]:
+    """Returns the response field and retrieval methods for the keys."""
+    if entity == "Show":
+        return "dates", "retrieve_by_date_string", "retrieve_details_by_date_string"
+
+    return "slugs", "retrieve_by_slug", "retrieve_details_by_slug"
+
+
+async def retrieve_batch(
+    field: str,
+    library_class: Callable[..., Any],
+    ids: Sequence[int],
+    keys: Sequence[str | datetime.date],
+    details: bool = False,
+    **kwargs: Any,
+) -> dict[str, Any]:
+    """Retrieves the information for a batch of IDs and slug strings.
+
+    Duplicate values are only retrieved once. Slug strings are resolved
+    to IDs using the existence index, if loaded, so that the whole
+    batch is retrieved with a single pass over the IDs, using a single
+    database connection or the in-memory snapshot. For shows, dates are
+    used in place of slug strings.
+
+    :param field: Name of the list field in the response
+    :param library_class: wwdtm class, such as ``Guest`` or ``Show``
+    :param ids: List of IDs
+    :param keys: List of slug strings, or show dates for shows
+    :param details: Retrieve the details for each ID and slug string
+    :param kwargs: Keyword arguments passed to the retrieval methods
+    :return: Dictionary containing the list of entities found, in the
+        order requested, and the IDs and slug strings not found
+    :raise fastapi.HTTPException: If no values are requested or the
+        batch is larger than the maximum batch size
+    """
+    entity = library_class.__name__
+    keys_field, key_method, key_details_method = _key_methods(entity)
+
+    ids = list(dict.fromkeys(ids))
+    keys = list(
+        dict.fromkeys(
+            key.isoformat() if isinstance(key, datetime.date) else key for key in keys
+        )
+    )
+    if not ids and not keys:
+        raise HTTPException(
+            status_code=400, detail=f"No IDs or {keys_field} were requested"
+        )
+
+    if len(ids) + len(keys) > MAX_BATCH_SIZE:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Batch requests are limited to {MAX_BATCH_SIZE} values",
+        )
+
+    # Slug strings that are in the index are retrieved along with the
+    # IDs, and slug strings that are not in a loaded index do not exist
+    lookup_ids = list(ids)
+    lookup_keys = []
+    slug_ids: dict[str, int] = {}
+    key_results: dict[str, Any] = {}
+    indexed = keys_field == "slugs" and existence_index.current is not None
+    for key in keys:
+        id_ = existence_index.id_for_slug(entity, key) if indexed else None
+        if id_ is not None:
+            slug_ids[key] = id_
+            if id_ not in lookup_ids:
+                lookup_ids.append(id_)
+        elif indexed:
+            key_results[key] = {}
+        else:
+            lookup_keys.append(key)
+
+    results: dict[int, Any] = {}
+    if lookup_ids:
+        method_name = "retrieve_details_by_id" if details else "retrieve_by_id"
+        found = await run_query_each(library_class, method_name, lookup_ids, **kwargs)
+        results = dict(zip(lookup_ids, found, strict=True))
+
+    if lookup_keys:
+        method_name = key_details_method if details else key_method
+        found = await run_query_each(library_class, method_name, lookup_keys, **kwargs)
+        key_results.update(zip(lookup_keys, found, strict=True))
+
+    for key, id_ in slug_ids.items():
+        key_results[key] = results.get(id_)
+
+    items = []
+    seen = set()
+    not_found: dict[str, list[Any]] = {"ids": [], keys_field: []}
+    for id_ in ids:
+        if results.get(id_):
+            items.append(results[id_])
+            seen.add(id_)
+        else:
+            not_found["ids"].append(id_)
+
+    for key in keys:
+        info = key_results.get(key)
+        if not info:
+            not_found[keys_field].append(key)
+        elif info["id"] not in seen:
+            items.append(info)
+            seen.add(info["id"])
+
+    return {field: items, "not_found": not_found}
+
+
+async def batch_response(
+    field: str,
+    library_class: Callable[..., Any],
+    ids: Sequence[int],
+    keys: Sequence[str | datetime.date],
+    details: bool = False,
+    **kwargs: Any,
+) -> dict[str, Any] | JSONResponse:
+    """Creates the response for a batch route.
+
+    :param field: Name of the list field in the response
+    :param library_class: wwdtm class, such as ``Guest`` or ``Show``
+    :param ids: List of IDs
+    :param keys: List of slug strings, or show dates for shows
+    :param details: Retrieve the details for each ID and slug string
+    :param kwargs: Keyword arguments passed to the retrieval methods
+    :return: Dictionary returned by ``retrieve_batch``, or a JSON error
+        response if a database error occurred
+    """
+    try:
+        return await retrieve_batch(
+            field, library_class, ids, keys, details=details, **kwargs
+        )
+    except ProgrammingError:
+        return JSONResponse(
+            status_code=500,
+            content={"detail": f"Unable to retrieve {field} from the database"},
+        )
+    except DatabaseError:
+        return JSONResponse(
+            status_code=500,
+            content={
+                "detail": f"Database error occurred while retrieving {field} from the database"
+            },
+        )
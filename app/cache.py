@@ -0,0 +1,638 @@
+# Copyright (c) 2018-2026 Linh Pham
+# api.wwdt.me is released under the terms of the Apache License 2.0
+# SPDX-License-Identifier: Apache-2.0
+#
+# vim: set noai syntax=python ts=4 sw=4:
+"""In-process Response Cache for API Routes."""
+
+import asyncio
+import hashlib
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from email.utils import formatdate, parsedate_to_datetime
+from functools import partial
+from typing import Any
+from urllib.parse import parse_qsl, urlencode
+
+from fastapi.routing import APIRoute
+from starlette.datastructures import Headers
+from starlette.routing import Match
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.compression import (
+    COMPRESSION_LEVELS,
+    ENCODINGS,
+    compress,
+    compressible,
+    encoded_headers,
+    response_encoding,
+    variant_etag,
+)
+from app.config import API_VERSION, load_config
+from app.dispatch import run_blocking
+from app.generation import data_generation
+
+_settings_config = load_config().get("settings", {})
+_cache_config: dict[str, Any] = _settings_config.get("response_cache", {})
+
+CACHE_ENABLED: bool = bool(_cache_config.get("enabled", True))
+CACHE_MAX_BYTES: int = int(_cache_config.get("max_bytes", 64 * 1024 * 1024))
+CACHE_DEFAULT_TTL: float = float(_cache_config.get("default_ttl", 86400))
+CACHE_COALESCE: bool = bool(_cache_config.get("coalesce", True))
+CACHE_NEGATIVE_TTL: float = float(_cache_config.get("negative_ttl", 60))
+CACHE_ROUTE_TTLS: dict[str, float] = {
+    str(path): float(ttl) for path, ttl in _cache_config.get("ttls", {}).items()
+}
+
+
+Variant = tuple[list[tuple[bytes, bytes]], bytes]
+
+
+@dataclass
+class CacheEntry:
+    """Cached response status, headers and serialized body.
+
+    Compressed copies of the body are stored in ``variants``, keyed by
+    content coding, once they have been requested.
+    """
+
+    status: int
+    headers: list[tuple[bytes, bytes]]
+    body: bytes
+    expires: float
+    key: str | None = None
+    variants: dict[str, Variant] = field(default_factory=dict, repr=False)
+    size: int = field(init=False)
+
+    def __post_init__(self):
+        self.size = len(self.body) + sum(len(k) + len(v) for k, v in self.headers)
+
+
+class ResponseCache:
+    """Size-bounded response cache with per-entry TTL and LRU eviction.
+
+    :param max_bytes: Maximum combined size of all cached responses
+    """
+
+    def __init__(self, max_bytes: int = CACHE_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: OrderedDict[str, CacheEntry] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> CacheEntry | None:
+        """Returns a cached response and marks it as recently used.
+
+        :param key: Cache key
+        :return: Cached response, or None if the key is not cached or
+            the cached response has expired
+        """
+        entry = self._entries.get(key)
+        if entry and entry.expires > time.monotonic():
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+        if entry:
+            self._remove(key)
+
+        self.misses += 1
+        return None
+
+    def set(
+        self,
+        key: str,
+        status: int,
+        headers: list[tuple[bytes, bytes]],
+        body: bytes,
+        ttl: float,
+    ) -> CacheEntry | None:
+        """Stores a response, evicting least recently used responses.
+
+        :param key: Cache key
+        :param status: HTTP status code
+        :param headers: Raw response headers
+        :param body: Serialized response body
+        :param ttl: Number of seconds to keep the response
+        :return: The cached response, or None if the response is too
+            large to be cached
+        """
+        entry = CacheEntry(
+            status=status,
+            headers=headers,
+            body=body,
+            expires=time.monotonic() + ttl,
+            key=key,
+        )
+        if ttl <= 0 or entry.size > self.max_bytes:
+            return None
+
+        if key in self._entries:
+            self._remove(key)
+
+        self._entries[key] = entry
+        self.size += entry.size
+        self._evict()
+        return entry
+
+    def add_variant(self, entry: CacheEntry, encoding: str, body: bytes) -> Variant:
+        """Stores a compressed copy of a cached response.
+
+        The size of the compressed copy counts towards the memory
+        budget of the cache if the response is still cached.
+
+        :param entry: Cached response
+        :param encoding: Content coding of the compressed copy
+        :param body: Compressed response body
+        :return: Raw response headers and body of the compressed copy
+        """
+        if encoding in entry.variants:
+            return entry.variants[encoding]
+
+        headers = encoded_headers(entry.headers, encoding, len(body))
+        entry.variants[encoding] = (headers, body)
+        size = len(body) + sum(len(k) + len(v) for k, v in headers)
+        entry.size += size
+        if entry.key is not None and self._entries.get(entry.key) is entry:
+            self.size += size
+            self._evict()
+
+        return headers, body
+
+    def _evict(self) -> None:
+        while self.size > self.max_bytes:
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+            self.evictions += 1
+
+    def _remove(self, key: str) -> None:
+        entry = self._entries.pop(key)
+        self.size -= entry.size
+
+    def clear(self) -> None:
+        """Removes all cached responses."""
+        self._entries.clear()
+        self.size = 0
+
+    def stats(self) -> dict[str, int]:
+        """Returns cache hit, miss and eviction counters."""
+        return {
+            "entries": len(self._entries),
+            "size": self.size,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+
+def route_ttl(route_path: str, seeded: bool = False) -> float:
+    """Returns the number of seconds responses for a route are cached.
+
+    Routes that return random values are not cached unless a TTL is
+    explicitly configured for them, or the request includes a seed.
+
+    :param route_path: Route path template, such as
+        ``/v2.0/guests/id/{guest_id}``
+    :param seeded: True if the request includes a ``seed`` query
+        parameter, which makes responses for random routes reproducible
+    :return: Number of seconds, or 0 if the route is not cached
+    """
+    if route_path in CACHE_ROUTE_TTLS:
+        return CACHE_ROUTE_TTLS[route_path]
+
+    if "/random" in route_path and not seeded:
+        return 0
+
+    return CACHE_DEFAULT_TTL
+
+
+def match_route(scope: Scope) -> APIRoute | None:
+    """Returns the API route that will handle a request, if any."""
+    app = scope.get("app")
+    if not app:
+        return None
+
+    for route in app.router.routes:
+        if isinstance(route, APIRoute) and "GET" in route.methods:
+            match, _ = route.matches({**scope, "method": "GET"})
+            if match == Match.FULL:
+                return route
+
+    return None
+
+
+def cache_key(scope: Scope, route: APIRoute) -> str:
+    """Builds a cache key from the request path and query parameters.
+
+    Only query parameters declared by the route are included so that
+    unknown query parameters cannot be used to bypass the cache. The
+    current data generation is included so that responses cached
+    before the data was updated are never returned.
+
+    :param scope: ASGI connection scope
+    :param route: Matched API route
+    :return: Cache key string
+    """
+    declared = {param.alias for param in route.dependant.query_params}
+    query = sorted(
+        (name, value)
+        for name, value in parse_qsl(
+            scope.get("query_string", b"").decode("latin-1"), keep_blank_values=True
+        )
+        if name in declared
+    )
+    return (
+        f"{data_generation.generation}|{route.path}|{scope['path']}?{urlencode(query)}"
+    )
+
+
+def _seeded(scope: Scope, route: APIRoute) -> bool:
+    """Returns True if a request includes a seed declared by the route."""
+    if not any(param.alias == "seed" for param in route.dependant.query_params):
+        return False
+
+    return any(
+        name == "seed"
+        for name, _ in parse_qsl(
+            scope.get("query_string", b"").decode("latin-1"), keep_blank_values=True
+        )
+    )
+
+
+def _no_store(headers: list[tuple[bytes, bytes]]) -> bool:
+    """Returns True if the response must not be stored in the cache."""
+    return any(
+        name.lower() == b"cache-control" and b"no-store" in value.lower()
+        for name, value in headers
+    )
+
+
+def _varies_by_encoding(headers: list[tuple[bytes, bytes]]) -> bool:
+    """Returns True if the response body depends on ``Accept-Encoding``.
+
+    Such responses are negotiated by the route handler and are not
+    stored in the cache, which is keyed by path and query parameters.
+    """
+    return any(
+        name.lower() == b"vary" and b"accept-encoding" in value.lower()
+        for name, value in headers
+    )
+
+
+def _header(headers: list[tuple[bytes, bytes]], name: bytes) -> str | None:
+    """Returns the value of a raw response header, if present."""
+    for header_name, value in headers:
+        if header_name.lower() == name:
+            return value.decode("latin-1")
+
+    return None
+
+
+def validator_headers(generation: str, body: bytes) -> list[tuple[bytes, bytes]]:
+    """Builds the ``ETag`` and ``Last-Modified`` headers for a response.
+
+    The strong ETag is a hash of the data generation and the serialized
+    response body. ``Last-Modified`` is the last update time of the
+    tables in the database, and is omitted if the database does not
+    report it.
+
+    :param generation: Data generation used to build the response
+    :param body: Serialized response body
+    :return: List of raw response headers
+    """
+    digest = hashlib.blake2b(
+        generation.encode("utf-8") + b"|" + body, digest_size=16
+    ).hexdigest()
+    headers = [(b"etag", f'"{digest}"'.encode("latin-1"))]
+    if data_generation.last_modified is not None:
+        last_modified = formatdate(data_generation.last_modified, usegmt=True)
+        headers.append((b"last-modified", last_modified.encode("latin-1")))
+
+    return headers
+
+
+def not_modified(scope: Scope, headers: list[tuple[bytes, bytes]]) -> bool:
+    """Returns True if the client already has the current response.
+
+    ``If-None-Match`` takes precedence over ``If-Modified-Since`` when
+    both request headers are present.
+
+    :param scope: ASGI connection scope
+    :param headers: Raw response headers
+    :return: True if a ``304 Not Modified`` response can be sent
+    """
+    request_headers = Headers(scope=scope)
+    if_none_match = request_headers.get("if-none-match")
+    if if_none_match is not None:
+        etag = _header(headers, b"etag")
+        tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+        if "*" in tags:
+            return True
+
+        return etag is not None and any(
+            variant_etag(etag, encoding) in tags
+            for encoding in ("identity", *ENCODINGS)
+        )
+
+    if_modified_since = request_headers.get("if-modified-since")
+    last_modified = _header(headers, b"last-modified")
+    if not if_modified_since or not last_modified:
+        return False
+
+    try:
+        return parsedate_to_datetime(last_modified) <= parsedate_to_datetime(
+            if_modified_since
+        )
+    except (TypeError, ValueError):
+        return False
+
+
+_NOT_MODIFIED_HEADERS = (b"cache-control", b"etag", b"last-modified", b"vary")
+
+response_cache = ResponseCache()
+data_generation.subscribe(lambda _: response_cache.clear())
+
+
+class ResponseCacheMiddleware:
+    """ASGI middleware that serves GET and HEAD API responses from cache.
+
+    Successful responses are stored as the final serialized bytes, so
+    cache hits skip both the database queries and response model
+    validation and serialization. Every successful response includes
+    ``ETag`` and ``Last-Modified`` headers, and conditional requests
+    for a cached response receive a ``304 Not Modified`` response
+    without calling the route handler.
+
+    Cached responses are sent using a compressed copy when the client
+    accepts one. Each compressed copy is created once and stored along
+    with the cached response, rather than being compressed for each
+    request by ``CompressionMiddleware``.
+
+    Identical requests that arrive while a cache miss is being handled
+    wait for and share the response of the first request, rather than
+    each running the same database queries.
+
+    :param app: ASGI application
+    :param cache: Response cache to use
+    :param coalesce: Coalesce identical concurrent cache misses
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        cache: ResponseCache = response_cache,
+        coalesce: bool = CACHE_COALESCE,
+    ):
+        self.app = app
+        self.cache = cache
+        self.coalesce = coalesce
+        self._inflight: dict[str, asyncio.Future[CacheEntry | None]] = {}
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if (
+            scope["type"] != "http"
+            or scope["method"] not in ("GET", "HEAD")
+            or not scope["path"].startswith(f"/v{API_VERSION}/")
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        route = match_route(scope)
+        if not route:
+            await self.app(scope, receive, send)
+            return
+
+        generation = data_generation.generation
+        ttl = route_ttl(route.path, _seeded(scope, route)) if CACHE_ENABLED else 0
+        key = cache_key(scope, route) if ttl > 0 else None
+        if key:
+            entry = self.cache.get(key)
+            if entry:
+                await self.send_entry(scope, send, entry, b"HIT")
+                return
+
+        if not key or not self.coalesce:
+            await self.app(
+                scope, receive, self.capture(scope, send, key, ttl, generation)
+            )
+            return
+
+        inflight = self._inflight.get(key)
+        if inflight:
+            entry = await asyncio.shield(inflight)
+            if entry:
+                await self.send_entry(scope, send, entry, b"COALESCED")
+                return
+
+            await self.app(
+                scope, receive, self.capture(scope, send, key, ttl, generation)
+            )
+            return
+
+        future: asyncio.Future[CacheEntry | None] = (
+            asyncio.get_running_loop().create_future()
+        )
+        self._inflight[key] = future
+        try:
+            await self.app(
+                scope,
+                receive,
+                self.capture(scope, send, key, ttl, generation, future),
+            )
+        finally:
+            del self._inflight[key]
+            if not future.done():
+                future.set_result(None)
+
+    async def send_entry(
+        self, scope: Scope, send: Send, entry: CacheEntry, status: bytes
+    ) -> None:
+        """Sends a cached response, or ``304 Not Modified``, to the client."""
+        if entry.status == 200 and not_modified(scope, entry.headers):
+            encoding = response_encoding(scope, entry.headers, len(entry.body))
+            await self.send_not_modified(send, entry.headers, status, encoding)
+            return
+
+        headers, body = await self.select_variant(scope, entry)
+        await send(
+            {
+                "type": "http.response.start",
+                "status": entry.status,
+                "headers": [*headers, (b"x-cache", status)],
+            }
+        )
+        await send(
+            {
+                "type": "http.response.body",
+                "body": b"" if scope["method"] == "HEAD" else body,
+            }
+        )
+
+    async def select_variant(self, scope: Scope, entry: CacheEntry) -> Variant:
+        """Returns the copy of a cached response accepted by the client.
+
+        A compressed copy is created and stored the first time it is
+        requested. Responses smaller than the minimum size configured
+        for the route are sent uncompressed.
+
+        :param scope: ASGI connection scope
+        :param entry: Cached response
+        :return: Raw response headers and body
+        """
+        encoding = response_encoding(scope, entry.headers, len(entry.body))
+        if encoding == "identity":
+            return entry.headers, entry.body
+
+        if encoding in entry.variants:
+            return entry.variants[encoding]
+
+        body = await run_blocking(
+            partial(compress, entry.body, encoding, COMPRESSION_LEVELS[encoding]),
+            key="compress",
+        )
+        return self.cache.add_variant(entry, encoding, body)
+
+    @staticmethod
+    async def send_not_modified(
+        send: Send,
+        headers: list[tuple[bytes, bytes]],
+        status: bytes | None,
+        encoding: str = "identity",
+    ) -> None:
+        """Sends a ``304 Not Modified`` response without a body.
+
+        The ETag is replaced with the ETag of the copy of the response
+        the client would have received, based on the content coding.
+        """
+        headers = [
+            (
+                name,
+                variant_etag(value.decode("latin-1"), encoding).encode("latin-1")
+                if name.lower() == b"etag"
+                else value,
+            )
+            for name, value in headers
+            if name.lower() in _NOT_MODIFIED_HEADERS
+        ]
+        if status:
+            headers.append((b"x-cache", status))
+
+        await send({"type": "http.response.start", "status": 304, "headers": headers})
+        await send({"type": "http.response.body", "body": b""})
+
+    def capture(
+        self,
+        scope: Scope,
+        send: Send,
+        key: str | None,
+        ttl: float,
+        generation: str,
+        future: asyncio.Future[CacheEntry | None] | None = None,
+    ) -> Send:
+        """Wraps ``send`` to add validators and store successful responses.
+
+        Responses with a single body message are buffered so that the
+        ETag can be computed before the response headers are sent.
+        Streaming responses are passed through as they are sent and are
+        never stored or given validators, so that every copy of a
+        streamed response is sent with the same headers.
+        The response is not stored if the data generation changed while
+        the response was being generated, or if the response varies by
+        ``Accept-Encoding``. ``404 Not Found`` responses are stored for
+        at most ``negative_ttl`` seconds, so that repeated requests for
+        values that do not exist are answered from the cache. Buffered
+        responses that are stored are sent using ``send_entry``, so
+        that a compressed copy is stored along with the response. If a
+        future is provided, stored responses to GET requests are shared
+        with requests waiting on it.
+        """
+        start: Message = {}
+        streaming = False
+        status = b"MISS" if key else None
+
+        def _headers(headers: list[tuple[bytes, bytes]]) -> list[tuple[bytes, bytes]]:
+            return [*headers, (b"x-cache", status)] if status else headers
+
+        def _store(
+            headers: list[tuple[bytes, bytes]],
+            body: bytes,
+            status_code: int = 200,
+            entry_ttl: float = ttl,
+        ) -> CacheEntry | None:
+            if (
+                scope["method"] != "GET"
+                or _no_store(headers)
+                or _varies_by_encoding(headers)
+            ):
+                return None
+
+            entry = None
+            if key and generation == data_generation.generation:
+                entry = self.cache.set(
+                    key, status=status_code, headers=headers, body=body, ttl=entry_ttl
+                )
+
+            if future and not future.done():
+                future.set_result(
+                    entry
+                    or CacheEntry(
+                        status=status_code,
+                        headers=headers,
+                        body=body,
+                        expires=time.monotonic() + entry_ttl,
+                    )
+                )
+
+            return entry
+
+        async def _send(message: Message) -> None:
+            nonlocal start, streaming
+            if message["type"] == "http.response.start":
+                start = message
+                return
+
+            if message["type"] != "http.response.body":
+                await send(message)
+                return
+
+            if streaming or message.get("more_body", False):
+                if not streaming:
+                    streaming = True
+                    await send({**start, "headers": _headers(start.get("headers", []))})
+
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            headers = list(start.get("headers", []))
+            if start["status"] == 200:
+                if _header(headers, b"etag") is None:
+                    headers.extend(validator_headers(generation, body))
+
+                entry = _store(headers, body)
+                if entry:
+                    await self.send_entry(scope, send, entry, status)
+                    return
+
+                if not_modified(scope, headers):
+                    encoding = response_encoding(scope, headers, len(body))
+                    await self.send_not_modified(send, headers, status, encoding)
+                    return
+
+            elif start["status"] == 404 and CACHE_NEGATIVE_TTL > 0:
+                entry = _store(headers, body, 404, min(ttl, CACHE_NEGATIVE_TTL))
+                if entry:
+                    await self.send_entry(scope, send, entry, status)
+                    return
+
+            await send({**start, "headers": _headers(headers)})
+            await send({"type": "http.response.body", "body": body})
+
+        return _send
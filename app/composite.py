@@ -0,0 +1,172 @@
+# Copyright (c) 2018-2026 Linh Pham
+# api.wwdt.me is released under the terms of the Apache License 2.0
+# SPDX-License-Identifier: Apache-2.0
+#
+# vim: set noai syntax=python ts=4 sw=4:
+"""Composite Requests Dispatched to the API Routes In-Process."""
+
+import asyncio
+import json
+import logging
+from collections.abc import Sequence
+from urllib.parse import unquote, urlsplit
+
+from fastapi import HTTPException
+from starlette.responses import Response
+from starlette.types import ASGIApp, Message, Scope
+
+from app.config import API_VERSION, load_config
+
+logger = logging.getLogger(__name__)
+
+_settings_config = load_config().get("settings", {})
+
+MAX_COMPOSITE_REQUESTS: int = int(_settings_config.get("max_composite_requests", 25))
+
+COMPOSITE_PATH = f"/v{API_VERSION}/batch"
+_API_PREFIX = f"/v{API_VERSION}/"
+
+
+def _error_body(detail: str) -> bytes:
+    """Returns a JSON error message body."""
+    return json.dumps({"detail": detail}).encode("utf-8")
+
+
+def valid_path(path: str) -> bool:
+    """Returns whether a path can be requested in a composite request.
+
+    :param path: Relative API path, such as ``/v2.0/shows/recent``,
+        with an optional query string
+    :return: True if the path is for an API route other than the
+        composite request route
+    """
+    url = urlsplit(path)
+    return (
+        not url.scheme
+        and not url.netloc
+        and url.path.startswith(_API_PREFIX)
+        and url.path.rstrip("/") != COMPOSITE_PATH
+    )
+
+
+async def dispatch_request(
+    app: ASGIApp, parent: Scope, path: str
+) -> tuple[int, bytes, bool]:
+    """Sends a ``GET`` request to the application without an HTTP request.
+
+    The request passes through the same middleware as a request
+    received from a client, so responses are served from and stored in
+    the response cache. Responses are not compressed.
+
+    :param app: ASGI application
+    :param parent: Scope of the composite request
+    :param path: Relative API path, with an optional query string
+    :return: A tuple containing the status code, the response body and
+        whether the response body is a JSON document
+    """
+    if not valid_path(path):
+        return 400, _error_body(f"Invalid API path: {path}"), True
+
+    url = urlsplit(path)
+    host = dict(parent.get("headers", [])).get(b"host", b"localhost")
+    scope = {
+        "type": "http",
+        "asgi": parent.get("asgi", {"version": "3.0"}),
+        "http_version": parent.get("http_version", "1.1"),
+        "method": "GET",
+        "scheme": parent.get("scheme", "http"),
+        "server": parent.get("server"),
+        "client": parent.get("client"),
+        "root_path": parent.get("root_path", ""),
+        "path": unquote(url.path),
+        "raw_path": url.path.encode("ascii", errors="ignore"),
+        "query_string": url.query.encode("ascii", errors="ignore"),
+        "headers": [(b"host", host), (b"accept", b"application/json")],
+    }
+
+    status_code = 500
+    media_type = b""
+    chunks: list[bytes] = []
+    complete = asyncio.Event()
+    requested = False
+
+    async def receive() -> Message:
+        nonlocal requested
+        if not requested:
+            requested = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+
+        await complete.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message: Message) -> None:
+        nonlocal status_code, media_type
+        if message["type"] == "http.response.start":
+            status_code = message["status"]
+            headers = dict(message.get("headers", []))
+            media_type = headers.get(b"content-type", b"")
+        elif message["type"] == "http.response.body":
+            chunks.append(message.get("body", b""))
+            if not message.get("more_body", False):
+                complete.set()
+
+    try:
+        await app(scope, receive, send)
+    except Exception:
+        logger.exception("Error occurred while handling composite request %s", path)
+        return 500, _error_body("Internal Server Error"), True
+    finally:
+        complete.set()
+
+    return status_code, b"".join(chunks), media_type.startswith(b"application/json")
+
+
+async def composite_response(
+    app: ASGIApp, parent: Scope, paths: Sequence[str]
+) -> Response:
+    """Creates the response for a composite request.
+
+    Each path is requested concurrently, and the response bodies are
+    copied into the composite response without being parsed and
+    serialized again.
+
+    :param app: ASGI application
+    :param parent: Scope of the composite request
+    :param paths: List of relative API paths
+    :return: JSON response containing the status code and body of the
+        response for each path, keyed by path
+    :raise fastapi.HTTPException: If no paths are requested or more
+        paths than the maximum number of paths are requested
+    """
+    paths = list(dict.fromkeys(paths))
+    if not paths:
+        raise HTTPException(status_code=400, detail="No paths were requested")
+
+    if len(paths) > MAX_COMPOSITE_REQUESTS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Composite requests are limited to {MAX_COMPOSITE_REQUESTS} paths",
+        )
+
+    results = await asyncio.gather(
+        *(dispatch_request(app, parent, path) for path in paths)
+    )
+
+    items: list[bytes] = []
+    for path, (status_code, body, is_json) in zip(paths, results, strict=True):
+        if not body:
+            body = b"null"
+        elif not is_json:
+            body = json.dumps(body.decode("utf-8", errors="replace")).encode("utf-8")
+
+        items.append(
+            json.dumps(path).encode("utf-8")
+            + b':{"status":'
+            + str(status_code).encode("ascii")
+            + b',"body":'
+            + body
+            + b"}"
+        )
+
+    content = b'{"responses":{' + b",".join(items) + b"}}"
+    return Response(content=content, media_type="application/json")
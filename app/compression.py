@@ -0,0 +1,491 @@
+# Copyright (c) 2018-2026 Linh Pham
+# api.wwdt.me is released under the terms of the Apache License 2.0
+# SPDX-License-Identifier: Apache-2.0
+#
+# vim: set noai syntax=python ts=4 sw=4:
+"""Response Body Compression and Content Negotiation."""
+
+import gzip
+import re
+import zlib
+from collections.abc import Collection
+from dataclasses import dataclass, replace
+from functools import partial
+from typing import Any
+
+import brotli
+import zstandard
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.config import API_VERSION, load_config
+from app.dispatch import run_blocking
+
+# Content codings supported by the application, in order of preference
+ENCODINGS: tuple[str, ...] = ("br", "zstd", "gzip")
+
+_settings_config = load_config().get("settings", {})
+_compression_config: dict[str, Any] = _settings_config.get("compression", {})
+
+COMPRESSION_ENABLED: bool = bool(_compression_config.get("enabled", True))
+COMPRESSION_MINIMUM_SIZE: int = int(_compression_config.get("minimum_size", 1024))
+COMPRESSION_OFFLOAD_SIZE: int = int(_compression_config.get("offload_size", 65536))
+COMPRESSION_LEVELS: dict[str, int] = {
+    "br": 4,
+    "zstd": 3,
+    "gzip": 6,
+    **{
+        str(encoding): int(level)
+        for encoding, level in _compression_config.get("levels", {}).items()
+    },
+}
+PRERENDER_LEVELS: dict[str, int] = {
+    "br": 11,
+    "zstd": 19,
+    "gzip": 9,
+    **{
+        str(encoding): int(level)
+        for encoding, level in _compression_config.get("prerender_levels", {}).items()
+    },
+}
+
+# Media types that are worth compressing, matched by prefix
+_COMPRESSIBLE_TYPES = (
+    "application/javascript",
+    "application/json",
+    "application/xml",
+    "image/svg+xml",
+    "text/",
+)
+
+
+@dataclass(frozen=True)
+class CompressionSettings:
+    """Compression settings for a route."""
+
+    enabled: bool = COMPRESSION_ENABLED
+    minimum_size: int = COMPRESSION_MINIMUM_SIZE
+    encodings: tuple[str, ...] = tuple(
+        encoding
+        for encoding in _compression_config.get("encodings", ENCODINGS)
+        if encoding in ENCODINGS
+    )
+
+
+def _route_pattern(route_path: str) -> re.Pattern[str]:
+    """Compiles a route path template into a regular expression."""
+    parts = re.split(r"(\{[^}]+\})", route_path)
+    return re.compile(
+        "".join("[^/]+" if part.startswith("{") else re.escape(part) for part in parts)
+    )
+
+
+_DEFAULT_SETTINGS = CompressionSettings()
+_ROUTE_SETTINGS: list[tuple[re.Pattern[str], CompressionSettings]] = [
+    (
+        _route_pattern(str(path)),
+        replace(
+            _DEFAULT_SETTINGS,
+            **{
+                name: tuple(value) if name == "encodings" else value
+                for name, value in overrides.items()
+                if name in ("enabled", "minimum_size", "encodings")
+            },
+        ),
+    )
+    for path, overrides in _compression_config.get("routes", {}).items()
+]
+
+
+def route_settings(path: str) -> CompressionSettings:
+    """Returns the compression settings for a request path.
+
+    :param path: Request path, which is matched against the route path
+        templates in the ``routes`` section of the compression settings,
+        such as ``/v2.0/shows/date/{year}``
+    :return: Compression settings for the route, or the default
+        compression settings if the route does not override them
+    """
+    for pattern, settings in _ROUTE_SETTINGS:
+        if pattern.fullmatch(path):
+            return settings
+
+    return _DEFAULT_SETTINGS
+
+
+def compress(body: bytes, encoding: str, level: int) -> bytes:
+    """Compresses a response body using a content coding.
+
+    :param body: Response body
+    :param encoding: Content coding, either ``br``, ``zstd`` or ``gzip``
+    :param level: Compression level or quality
+    :return: Compressed response body
+    :raise ValueError: If the content coding is not supported
+    """
+    if encoding == "br":
+        return brotli.compress(body, quality=level)
+
+    if encoding == "zstd":
+        return zstandard.ZstdCompressor(level=level).compress(body)
+
+    if encoding == "gzip":
+        return gzip.compress(body, compresslevel=level, mtime=0)
+
+    raise ValueError(f"Unsupported content coding: {encoding}")
+
+
+class StreamCompressor:
+    """Incrementally compresses a streamed response body.
+
+    Each chunk is flushed once it has been compressed, so that clients
+    receive data as it is streamed rather than once the response is
+    complete.
+
+    :param encoding: Content coding, either ``br``, ``zstd`` or ``gzip``
+    :param level: Compression level or quality
+    :raise ValueError: If the content coding is not supported
+    """
+
+    def __init__(self, encoding: str, level: int):
+        self.encoding = encoding
+        if encoding == "br":
+            self._compressor: Any = brotli.Compressor(quality=level)
+        elif encoding == "zstd":
+            self._compressor = zstandard.ZstdCompressor(level=level).compressobj()
+        elif encoding == "gzip":
+            self._compressor = zlib.compressobj(
+                level, zlib.DEFLATED, 16 + zlib.MAX_WBITS
+            )
+        else:
+            raise ValueError(f"Unsupported content coding: {encoding}")
+
+    def compress(self, chunk: bytes, final: bool = False) -> bytes:
+        """Compresses a chunk of the response body.
+
+        :param chunk: Chunk of the response body
+        :param final: True if this is the last chunk of the response body
+        :return: Compressed data for the chunk
+        """
+        compressor = self._compressor
+        if self.encoding == "br":
+            data = compressor.process(chunk)
+            return data + (compressor.finish() if final else compressor.flush())
+
+        if self.encoding == "zstd":
+            data = compressor.compress(chunk)
+            if final:
+                return data + compressor.flush()
+
+            return data + compressor.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+
+        data = compressor.compress(chunk)
+        return data + compressor.flush(zlib.Z_FINISH if final else zlib.Z_SYNC_FLUSH)
+
+    async def compress_chunk(self, chunk: bytes, final: bool = False) -> bytes:
+        """Compresses a chunk of the response body without blocking the event loop.
+
+        The chunk is compressed and flushed using one of the query
+        thread pools, as with ``compress_body``. Chunks of a response
+        are sent one at a time, so the compressor is never used by more
+        than one thread at once.
+
+        :param chunk: Chunk of the response body
+        :param final: True if this is the last chunk of the response body
+        :return: Compressed data for the chunk
+        """
+        return await run_blocking(
+            partial(self.compress, chunk, final=final), key="compress"
+        )
+
+
+def select_encoding(accept_encoding: str | None, available: Collection[str]) -> str:
+    """Selects a content coding using the ``Accept-Encoding`` header.
+
+    Codings with the highest quality value are preferred, with ties
+    broken using the order of ``ENCODINGS``. Codings with a quality
+    value of 0 are never selected.
+
+    :param accept_encoding: Value of the ``Accept-Encoding`` request
+        header
+    :param available: Content codings available for the response
+    :return: Selected content coding, or ``identity`` if none of the
+        available codings are acceptable
+    """
+    if not accept_encoding:
+        return "identity"
+
+    qualities: dict[str, float] = {}
+    for item in accept_encoding.split(","):
+        coding, _, params = item.strip().partition(";")
+        quality = 1.0
+        for param in params.split(";"):
+            name, _, value = param.strip().partition("=")
+            if name.lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+
+        qualities[coding.strip().lower()] = quality
+
+    best, best_quality = "identity", 0.0
+    for encoding in ENCODINGS:
+        if encoding not in available:
+            continue
+
+        quality = qualities.get(encoding, qualities.get("*", 0.0))
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+
+    return best
+
+
+def compressible(headers: list[tuple[bytes, bytes]]) -> bool:
+    """Returns True if a response can be compressed.
+
+    Responses that already have a content coding, and responses with
+    media types that do not benefit from compression, such as images,
+    are not compressed.
+
+    :param headers: Raw response headers
+    :return: True if the response can be compressed
+    """
+    response_headers = Headers(raw=headers)
+    if "content-encoding" in response_headers:
+        return False
+
+    content_type = response_headers.get("content-type", "").lower()
+    return content_type.startswith(_COMPRESSIBLE_TYPES)
+
+
+def variant_etag(etag: str, encoding: str) -> str:
+    """Returns the ETag of a compressed copy of a response.
+
+    :param etag: ETag of the uncompressed response
+    :param encoding: Content coding of the compressed copy
+    :return: ETag with the content coding appended to the opaque tag,
+        unless it has already been appended
+    """
+    if (
+        encoding == "identity"
+        or not etag.endswith('"')
+        or etag.endswith(f'-{encoding}"')
+    ):
+        return etag
+
+    return f'{etag[:-1]}-{encoding}"'
+
+
+def add_vary(headers: list[tuple[bytes, bytes]]) -> list[tuple[bytes, bytes]]:
+    """Adds ``Accept-Encoding`` to the ``Vary`` response header.
+
+    :param headers: Raw response headers
+    :return: Raw response headers including ``Vary: Accept-Encoding``
+    """
+    updated: list[tuple[bytes, bytes]] = []
+    found = False
+    for name, value in headers:
+        if name.lower() == b"vary":
+            found = True
+            if b"accept-encoding" not in value.lower():
+                value = value + b", Accept-Encoding"
+
+        updated.append((name, value))
+
+    if not found:
+        updated.append((b"vary", b"Accept-Encoding"))
+
+    return updated
+
+
+def encoded_headers(
+    headers: list[tuple[bytes, bytes]], encoding: str, length: int | None
+) -> list[tuple[bytes, bytes]]:
+    """Builds the response headers for a compressed copy of a response.
+
+    :param headers: Raw headers of the uncompressed response
+    :param encoding: Content coding of the compressed copy
+    :param length: Length of the compressed body, or None if the body
+        is streamed
+    :return: Raw response headers with ``Content-Encoding``,
+        ``Content-Length``, ``ETag`` and ``Vary`` updated
+    """
+    updated: list[tuple[bytes, bytes]] = []
+    for name, value in headers:
+        lower = name.lower()
+        if lower == b"content-length":
+            continue
+
+        if lower == b"etag":
+            value = variant_etag(value.decode("latin-1"), encoding).encode("latin-1")
+
+        updated.append((name, value))
+
+    updated.append((b"content-encoding", encoding.encode("latin-1")))
+    if length is not None:
+        updated.append((b"content-length", str(length).encode("latin-1")))
+
+    return add_vary(updated)
+
+
+async def compress_body(body: bytes, encoding: str, level: int) -> bytes:
+    """Compresses a response body without blocking the event loop.
+
+    Bodies at least ``offload_size`` bytes long are compressed using
+    one of the query thread pools, and smaller bodies are compressed on
+    the event loop.
+
+    :param body: Response body
+    :param encoding: Content coding, either ``br``, ``zstd`` or ``gzip``
+    :param level: Compression level or quality
+    :return: Compressed response body
+    :raise ValueError: If the content coding is not supported
+    """
+    if len(body) < COMPRESSION_OFFLOAD_SIZE:
+        return compress(body, encoding, level)
+
+    return await run_blocking(partial(compress, body, encoding, level), key="compress")
+
+
+def negotiate(scope: Scope) -> tuple[str, CompressionSettings]:
+    """Selects the content coding for a response to a request.
+
+    :param scope: ASGI connection scope
+    :return: Selected content coding, or ``identity`` if the response
+        is not compressed, and the compression settings for the route
+    """
+    settings = route_settings(scope["path"])
+    if not settings.enabled or scope["method"] == "HEAD":
+        return "identity", settings
+
+    accept_encoding = Headers(scope=scope).get("accept-encoding")
+    return select_encoding(accept_encoding, settings.encodings), settings
+
+
+def response_encoding(
+    scope: Scope, headers: list[tuple[bytes, bytes]], length: int
+) -> str:
+    """Returns the content coding a response is sent to the client with.
+
+    :param scope: ASGI connection scope
+    :param headers: Raw headers of the uncompressed response
+    :param length: Length of the uncompressed response body
+    :return: Selected content coding, or ``identity`` if the response
+        is sent uncompressed
+    """
+    encoding, settings = negotiate(scope)
+    if length < settings.minimum_size or not compressible(headers):
+        return "identity"
+
+    return encoding
+
+
+class CompressionMiddleware:
+    """ASGI middleware that compresses response bodies.
+
+    Responses smaller than the minimum size configured for the route
+    are sent uncompressed. Streaming responses are compressed as each
+    chunk is sent, and large responses are compressed using one of the
+    query thread pools. Responses that already have a content coding,
+    such as cached or pre-rendered responses sent using a stored
+    compressed copy, are passed through unchanged.
+
+    :param app: ASGI application
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding, settings = negotiate(scope)
+        if not settings.enabled:
+            await self.app(scope, receive, send)
+            return
+
+        api_route = scope["path"].startswith(f"/v{API_VERSION}/")
+        await self.app(scope, receive, self.wrap(send, encoding, settings, api_route))
+
+    @staticmethod
+    def wrap(
+        send: Send, encoding: str, settings: CompressionSettings, api_route: bool
+    ) -> Send:
+        """Wraps ``send`` to compress the response body.
+
+        ``Vary: Accept-Encoding`` is added to every response that can be
+        compressed, including responses sent uncompressed, and to
+        ``304 Not Modified`` responses to API routes. The ETag of a
+        ``304 Not Modified`` response is set by ``ResponseCacheMiddleware``
+        using the copy of the response the client would have received.
+
+        :param send: ASGI send callable
+        :param encoding: Content coding used to compress the response,
+            or ``identity`` to only add the ``Vary`` header
+        :param settings: Compression settings for the route
+        :param api_route: True if the request is for an API route
+        :return: Wrapped ASGI send callable
+        """
+        start: Message = {}
+        compressor: StreamCompressor | None = None
+        passthrough = False
+
+        async def _send(message: Message) -> None:
+            nonlocal start, compressor, passthrough
+            if message["type"] == "http.response.start":
+                headers = list(message.get("headers", []))
+                if message["status"] == 304 and api_route:
+                    await send({**message, "headers": add_vary(headers)})
+                    passthrough = True
+                    return
+
+                if message["status"] < 200 or not compressible(headers):
+                    await send(message)
+                    passthrough = True
+                    return
+
+                if encoding == "identity":
+                    await send({**message, "headers": add_vary(headers)})
+                    passthrough = True
+                    return
+
+                start = message
+                return
+
+            if passthrough or message["type"] != "http.response.body":
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+            headers = list(start.get("headers", []))
+            if compressor is None and not more_body:
+                if len(body) < settings.minimum_size:
+                    await send({**start, "headers": add_vary(headers)})
+                    await send(message)
+                    return
+
+                body = await compress_body(body, encoding, COMPRESSION_LEVELS[encoding])
+                await send(
+                    {**start, "headers": encoded_headers(headers, encoding, len(body))}
+                )
+                await send({"type": "http.response.body", "body": body})
+                return
+
+            if compressor is None:
+                compressor = StreamCompressor(encoding, COMPRESSION_LEVELS[encoding])
+                await send(
+                    {**start, "headers": encoded_headers(headers, encoding, None)}
+                )
+
+            await send(
+                {
+                    "type": "http.response.body",
+                    "body": await compressor.compress_chunk(body, final=not more_body),
+                    "more_body": more_body,
+                }
+            )
+
+        return _send
@@ -11,13 +11,14 @@ from pathlib import Path
 from typing import Any
 
 API_VERSION = "2.0"
-APP_VERSION = "2.22.1"
+APP_VERSION = "2.23.0"
 
 
 def load_config(
     config_file_path: str = "config.json",
     connection_pool_size: int = 10,
     connection_pool_name: str = "wwdtm_api",
+    connection_pool_timeout: float = 10.0,
 ) -> dict[str, Any]:
     """Reads application and database settings from JSON file.
 
@@ -26,7 +27,13 @@ def load_config(
     :param connection_pool_size: Number of connections to use in
         creating a connection pool
     :type connection_pool_size: int, optional
-    :return: Dictionary containing database configuration settings
+    :param connection_pool_name: Name of the connection pool
+    :type connection_pool_name: str, optional
+    :param connection_pool_timeout: Number of seconds to wait for an
+        available pooled connection
+    :type connection_pool_timeout: float, optional
+    :return: Dictionary containing database, connection pool and
+        application configuration settings
     :rtype: Dict[str, Any]
     """
     _config_file_path = Path(config_file_path)
@@ -49,31 +56,76 @@ def load_config(
     if "database" in config_dict:
         database_config = config_dict["database"]
 
-        # Set database connection pooling settings if and only if there
-        # is a ``use_pool`` key and it is set to True. Remove the key
-        # after parsing through the configuration to prevent issues
-        # with mysql.connector.connect()
+        # Parse connection pool settings into a separate pool section
+        # used by the application-wide connection pool. Each thread
+        # used to run queries holds a connection while its queries
+        # run, so the pool has at least one connection for each
+        # ``query_workers`` and ``details_query_workers`` thread. If
+        # ``use_pool`` is set to True, ``pool_size`` can be used to
+        # open more connections, but never fewer than
+        # ``connection_pool_size``. Remove the pool keys from the
+        # database settings to prevent issues with
+        # mysql.connector.connect()
         use_pool = database_config.get("use_pool", False)
 
+        try:
+            query_workers = max(1, int(settings_config.get("query_workers", 8)))
+        except (AttributeError, TypeError, ValueError):
+            query_workers = 8
+
+        try:
+            query_workers += max(
+                1, int(settings_config.get("details_query_workers", 2))
+            )
+        except (AttributeError, TypeError, ValueError):
+            query_workers += 2
+
         if use_pool:
             pool_name = database_config.get("pool_name", connection_pool_name)
             pool_size = database_config.get("pool_size", connection_pool_size)
             if pool_size < connection_pool_size:
                 pool_size = connection_pool_size
-
-            database_config["pool_name"] = pool_name
-            database_config["pool_size"] = pool_size
-            del database_config["use_pool"]
         else:
-            if "pool_name" in database_config:
-                del database_config["pool_name"]
+            pool_name = connection_pool_name
+            pool_size = query_workers
+
+        pool_size = max(pool_size, query_workers)
+
+        try:
+            pool_timeout = float(
+                database_config.get("pool_timeout", connection_pool_timeout)
+            )
+            if pool_timeout < 0:
+                pool_timeout = connection_pool_timeout
+        except (TypeError, ValueError):
+            pool_timeout = connection_pool_timeout
+
+        try:
+            pool_max_overflow = max(0, int(database_config.get("pool_max_overflow", 0)))
+        except (TypeError, ValueError):
+            pool_max_overflow = 0
 
-            if "pool_size" in database_config:
-                del database_config["pool_size"]
+        pool_config = {
+            "name": pool_name,
+            "size": pool_size,
+            "timeout": pool_timeout,
+            "max_overflow": pool_max_overflow,
+        }
 
-            if "use_pool" in database_config:
-                del database_config["use_pool"]
+        for key in (
+            "use_pool",
+            "pool_name",
+            "pool_size",
+            "pool_timeout",
+            "pool_max_overflow",
+        ):
+            if key in database_config:
+                del database_config[key]
 
-        return {"database": database_config, "settings": settings_config}
+        return {
+            "database": database_config,
+            "pool": pool_config,
+            "settings": settings_config,
+        }
     else:
         return {}
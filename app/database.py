@@ -0,0 +1,227 @@
+# Copyright (c) 2018-2026 Linh Pham
+# api.wwdt.me is released under the terms of the Apache License 2.0
+# SPDX-License-Identifier: Apache-2.0
+#
+# vim: set noai syntax=python ts=4 sw=4:
+"""Application-wide MySQL Connection Pool."""
+
+import threading
+from collections import deque
+from collections.abc import Iterator
+from contextlib import contextmanager
+from typing import Any
+
+import mysql.connector
+from mysql.connector.connection import MySQLConnection
+from mysql.connector.errors import PoolError
+
+from app.config import load_config
+
+
+class ConnectionPool:
+    """Thread-safe pool of MySQL connections shared by all routers.
+
+    Connections are opened lazily as they are needed, up to
+    ``pool_size``. When every pooled connection is checked out, callers
+    wait up to ``pool_timeout`` seconds for one to be returned. If the
+    wait times out, up to ``max_overflow`` temporary connections are
+    opened and closed again once returned. A ``PoolError`` is raised
+    when no connection can be provided.
+
+    :param database_config: Dictionary containing database connection
+        settings as required by MySQL Connector/Python
+    :param pool_size: Maximum number of pooled connections
+    :param pool_timeout: Number of seconds to wait for a pooled
+        connection to become available
+    :param max_overflow: Number of temporary connections that can be
+        opened once the pool has been exhausted
+    """
+
+    def __init__(
+        self,
+        database_config: dict[str, Any],
+        pool_size: int = 10,
+        pool_timeout: float = 10.0,
+        max_overflow: int = 0,
+    ):
+        self.database_config = database_config
+        self.pool_size = max(1, pool_size)
+        self.pool_timeout = max(0.0, pool_timeout)
+        self.max_overflow = max(0, max_overflow)
+
+        self._idle: deque[MySQLConnection] = deque()
+        self._slots = threading.BoundedSemaphore(self.pool_size)
+        self._lock = threading.Lock()
+        self._overflow_count = 0
+        self._overflow_connections: set[int] = set()
+        self._closed = False
+
+    def _connect(self) -> MySQLConnection:
+        """Opens a new database connection."""
+        return mysql.connector.connect(**self.database_config)
+
+    def get_connection(self) -> MySQLConnection:
+        """Checks out a connection from the pool.
+
+        :return: An open MySQL database connection
+        :raise PoolError: If the pool has been closed or no connection
+            became available before the pool timeout elapsed and no
+            overflow connections remain
+        """
+        if self._closed:
+            raise PoolError("Database connection pool has been closed")
+
+        if self._slots.acquire(timeout=self.pool_timeout):
+            with self._lock:
+                connection = self._idle.pop() if self._idle else None
+
+            try:
+                if not connection:
+                    connection = self._connect()
+                elif not connection.is_connected():
+                    connection.reconnect()
+            except Exception:
+                self._slots.release()
+                raise
+
+            return connection
+
+        with self._lock:
+            if self._overflow_count >= self.max_overflow:
+                raise PoolError(
+                    "Timed out waiting for an available database connection"
+                )
+            self._overflow_count += 1
+
+        try:
+            connection = self._connect()
+        except Exception:
+            with self._lock:
+                self._overflow_count -= 1
+            raise
+
+        with self._lock:
+            self._overflow_connections.add(id(connection))
+
+        return connection
+
+    def release(self, connection: MySQLConnection) -> None:
+        """Returns a connection to the pool.
+
+        Overflow connections and connections returned after the pool has
+        been closed are closed instead of being kept for reuse.
+
+        :param connection: Connection previously checked out from the
+            pool
+        """
+        with self._lock:
+            overflow = id(connection) in self._overflow_connections
+            if overflow:
+                self._overflow_connections.discard(id(connection))
+                self._overflow_count -= 1
+            elif not self._closed:
+                self._idle.append(connection)
+
+        if overflow or self._closed:
+            connection.close()
+
+        if not overflow:
+            self._slots.release()
+
+    @contextmanager
+    def connection(self) -> Iterator[MySQLConnection]:
+        """Checks out a connection for the duration of a ``with`` block.
+
+        :return: An open MySQL database connection
+        """
+        _connection = self.get_connection()
+        try:
+            yield _connection
+        finally:
+            self.release(_connection)
+
+    def close(self) -> None:
+        """Closes all idle connections and stops handing out new ones."""
+        with self._lock:
+            self._closed = True
+            idle = list(self._idle)
+            self._idle.clear()
+
+        for _connection in idle:
+            _connection.close()
+
+
+_pool: ConnectionPool | None = None
+_pool_lock = threading.Lock()
+
+
+def _create_pool(config: dict[str, Any]) -> ConnectionPool:
+    """Creates a connection pool using the application configuration."""
+    pool_config = config.get("pool", {})
+    return ConnectionPool(
+        database_config=config["database"],
+        pool_size=pool_config.get("size", 10),
+        pool_timeout=pool_config.get("timeout", 10.0),
+        max_overflow=pool_config.get("max_overflow", 0),
+    )
+
+
+def open_pool(config: dict[str, Any]) -> ConnectionPool:
+    """Creates the application-wide connection pool.
+
+    Intended to be called from the application lifespan hook so that
+    the pool is created within each worker process after it has been
+    started.
+
+    :param config: Application configuration as returned by
+        ``load_config``
+    :return: The application-wide connection pool
+    """
+    global _pool
+
+    with _pool_lock:
+        if _pool:
+            _pool.close()
+
+        _pool = _create_pool(config)
+        return _pool
+
+
+def close_pool() -> None:
+    """Closes the application-wide connection pool, if open."""
+    global _pool
+
+    with _pool_lock:
+        if _pool:
+            _pool.close()
+        _pool = None
+
+
+def get_pool() -> ConnectionPool:
+    """Returns the application-wide connection pool.
+
+    If the application lifespan hook has not been run, such as when
+    using a ``TestClient`` outside of a ``with`` block, the pool is
+    created on first use.
+
+    :return: The application-wide connection pool
+    """
+    global _pool
+
+    if _pool:
+        return _pool
+
+    with _pool_lock:
+        if not _pool:
+            _pool = _create_pool(load_config())
+        return _pool
+
+
+@contextmanager
+def database_connection() -> Iterator[MySQLConnection]:
+    """Checks out a connection from the application-wide pool.
+
+    :return: An open MySQL database connection
+    """
+    with get_pool().connection() as _connection:
+        yield _connection
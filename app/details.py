@@ -0,0 +1,207 @@
+# Copyright (c) 2018-2026 Linh Pham
+# api.wwdt.me is released under the terms of the Apache License 2.0
+# SPDX-License-Identifier: Apache-2.0
+#
+# vim: set noai syntax=python ts=4 sw=4:
+"""Partial Panelist and Show Details Retrieval."""
+
+import datetime
+from collections.abc import Collection, Sequence
+from functools import partial
+from typing import Any
+
+from wwdtm.panelist import Panelist
+from wwdtm.show import Show
+
+from app.database import database_connection
+from app.dispatch import UNRESOLVED, resolve, run_blocking
+
+PANELIST_DETAILS_PARTS: tuple[str, ...] = ("statistics", "bluffs", "appearances")
+SHOW_DETAILS_PARTS: tuple[str, ...] = (
+    "location",
+    "host",
+    "scorekeeper",
+    "panelists",
+    "bluffs",
+    "guests",
+)
+
+
+def include_pattern(parts: Sequence[str]) -> str:
+    """Returns a pattern matching a comma-separated list of parts.
+
+    :param parts: Names of the parts that can be included
+    :return: Regular expression pattern string
+    """
+    part = "|".join(parts)
+    return f"^({part})(,({part}))*$"
+
+
+def parse_include(include: str) -> frozenset[str]:
+    """Parses a comma-separated list of parts to include.
+
+    :param include: Comma-separated list of parts
+    :return: Set of part names
+    """
+    return frozenset(part.strip() for part in include.split(",") if part.strip())
+
+
+def _exclude(
+    info: Any, parts: Sequence[str], include: Collection[str]
+) -> dict[str, Any]:
+    """Returns a copy of full details without the parts not requested."""
+    if not info:
+        return {}
+
+    excluded = set(parts).difference(include)
+    return {key: value for key, value in info.items() if key not in excluded}
+
+
+def _panelist_details(
+    include: Collection[str],
+    number_decimal_places: int,
+    panelist_id: int | None = None,
+    panelist_slug: str | None = None,
+) -> dict[str, Any]:
+    """Retrieves panelist information and the requested details."""
+    with database_connection() as connection:
+        panelist = Panelist(database_connection=connection)
+        if panelist_slug is not None:
+            panelist_id = panelist.utility.convert_slug_to_id(panelist_slug.strip())
+
+        if not panelist_id:
+            return {}
+
+        info = panelist.retrieve_by_id(panelist_id)
+        if not info:
+            return {}
+
+        if "statistics" in include:
+            info["statistics"] = panelist.statistics.retrieve_statistics_by_id(
+                panelist_id, number_decimal_places=number_decimal_places
+            )
+
+        if "bluffs" in include:
+            info["bluffs"] = panelist.statistics.retrieve_bluffs_by_id(panelist_id)
+
+        if "appearances" in include:
+            info["appearances"] = panelist.appearances.retrieve_appearances_by_id(
+                panelist_id
+            )
+
+    return info
+
+
+async def retrieve_panelist_details(
+    include: Collection[str],
+    number_decimal_places: int,
+    panelist_id: int | None = None,
+    panelist_slug: str | None = None,
+) -> dict[str, Any]:
+    """Retrieves panelist information and only the requested details.
+
+    Statistics, Bluff the Listener counts and appearances that are not
+    requested are not retrieved from the database or calculated. Lookups
+    that can be answered by a registered resolver, such as the data
+    snapshot, are not sent to the database.
+
+    :param include: Names of the details to include
+    :param number_decimal_places: Number of decimal places to include
+        when rounding statistics
+    :param panelist_id: Panelist ID
+    :param panelist_slug: Panelist slug string, used if the panelist ID
+        is not provided
+    :return: A dictionary containing panelist information and the
+        requested details, or an empty dictionary if the panelist does
+        not exist
+    """
+    if panelist_slug is not None:
+        key, value = "Panelist.retrieve_details_by_slug", panelist_slug.strip()
+    else:
+        key, value = "Panelist.retrieve_details_by_id", panelist_id
+
+    info = resolve(key, (value,), {"number_decimal_places": number_decimal_places})
+    if info is not UNRESOLVED:
+        return _exclude(info, PANELIST_DETAILS_PARTS, include)
+
+    return await run_blocking(
+        partial(
+            _panelist_details,
+            include,
+            number_decimal_places,
+            panelist_id=panelist_id,
+            panelist_slug=panelist_slug,
+        ),
+        key="Panelist.retrieve_details_by_id",
+    )
+
+
+def _show_details(
+    include: Collection[str],
+    show_id: int | None = None,
+    show_date: datetime.date | None = None,
+) -> dict[str, Any]:
+    """Retrieves core show information and the requested details."""
+    with database_connection() as connection:
+        show = Show(database_connection=connection)
+        if show_date is not None:
+            show_id = show.utility.convert_date_to_id(
+                show_date.year, show_date.month, show_date.day
+            )
+
+        if not show_id:
+            return {}
+
+        info = show.info.retrieve_core_info_by_id(show_id)
+        if not info:
+            return {}
+
+        for part in ("location", "host", "scorekeeper"):
+            if part not in include:
+                info.pop(part, None)
+
+        if "panelists" in include:
+            info["panelists"] = show.info.retrieve_panelist_info_by_id(show_id)
+
+        if "bluffs" in include:
+            info["bluffs"] = show.info.retrieve_bluff_info_by_id(show_id)
+
+        if "guests" in include:
+            info["guests"] = show.info.retrieve_guest_info_by_id(show_id)
+
+    return info
+
+
+async def retrieve_show_details(
+    include: Collection[str],
+    show_id: int | None = None,
+    show_date: datetime.date | None = None,
+) -> dict[str, Any]:
+    """Retrieves show information and only the requested details.
+
+    Panelist, Bluff the Listener and Not My Job guest information that
+    is not requested is not retrieved from the database. Lookups that
+    can be answered by a registered resolver, such as the data snapshot,
+    are not sent to the database.
+
+    :param include: Names of the details to include
+    :param show_id: Show ID
+    :param show_date: Show date, used if the show ID is not provided
+    :return: A dictionary containing show information and the
+        requested details, or an empty dictionary if the show does not
+        exist
+    """
+    if show_date is not None:
+        key = "Show.retrieve_details_by_date"
+        args: tuple[Any, ...] = (show_date.year, show_date.month, show_date.day)
+    else:
+        key, args = "Show.retrieve_details_by_id", (show_id,)
+
+    info = resolve(key, args, {})
+    if info is not UNRESOLVED:
+        return _exclude(info, SHOW_DETAILS_PARTS, include)
+
+    return await run_blocking(
+        partial(_show_details, include, show_id=show_id, show_date=show_date),
+        key="Show.retrieve_details_by_id",
+    )
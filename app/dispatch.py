@@ -0,0 +1,219 @@
+# Copyright (c) 2018-2026 Linh Pham
+# api.wwdt.me is released under the terms of the Apache License 2.0
+# SPDX-License-Identifier: Apache-2.0
+#
+# vim: set noai syntax=python ts=4 sw=4:
+"""Dispatch Blocking wwdtm Queries to Bounded Thread Pools."""
+
+import asyncio
+import threading
+import weakref
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Any
+
+from app.config import load_config
+from app.database import database_connection
+
+_settings_config = load_config().get("settings", {})
+
+QUERY_WORKERS: int = int(_settings_config.get("query_workers", 8))
+DETAILS_QUERY_WORKERS: int = int(_settings_config.get("details_query_workers", 2))
+QUERY_CONCURRENCY: int = int(_settings_config.get("query_concurrency", QUERY_WORKERS))
+DETAILS_QUERY_CONCURRENCY: int = int(
+    _settings_config.get("details_query_concurrency", 1)
+)
+QUERY_CONCURRENCY_LIMITS: dict[str, int] = dict(
+    _settings_config.get("query_concurrency_limits", {})
+)
+
+UNRESOLVED: Any = object()
+
+_executors: dict[bool, ThreadPoolExecutor] = {}
+_executors_lock = threading.Lock()
+_semaphores: weakref.WeakKeyDictionary[
+    asyncio.AbstractEventLoop, dict[str, asyncio.Semaphore]
+] = weakref.WeakKeyDictionary()
+_resolvers: list[Callable[[str, tuple[Any, ...], dict[str, Any]], Any]] = []
+
+
+def _get_executor(details: bool) -> ThreadPoolExecutor:
+    """Returns the thread pool used for regular or details queries."""
+    with _executors_lock:
+        if details not in _executors:
+            _executors[details] = ThreadPoolExecutor(
+                max_workers=max(1, DETAILS_QUERY_WORKERS if details else QUERY_WORKERS),
+                thread_name_prefix="wwdtm-details" if details else "wwdtm",
+            )
+
+        return _executors[details]
+
+
+def _get_semaphore(key: str, details: bool) -> asyncio.Semaphore:
+    """Returns the concurrency cap for a query on the running event loop."""
+    loop = asyncio.get_running_loop()
+    semaphores = _semaphores.setdefault(loop, {})
+    if key not in semaphores:
+        default = DETAILS_QUERY_CONCURRENCY if details else QUERY_CONCURRENCY
+        semaphores[key] = asyncio.Semaphore(
+            max(1, QUERY_CONCURRENCY_LIMITS.get(key, default))
+        )
+
+    return semaphores[key]
+
+
+def register_resolver(
+    resolver: Callable[[str, tuple[Any, ...], dict[str, Any]], Any],
+) -> None:
+    """Registers a function that can answer queries without the database.
+
+    Resolvers are called with the query name, such as
+    ``Guest.retrieve_by_id``, and the arguments of the query. A resolver
+    returns ``UNRESOLVED`` if it cannot answer the query, in which case
+    the next resolver or the database is used. Resolvers are called on
+    the event loop and must not block.
+
+    :param resolver: Function used to answer queries
+    """
+    _resolvers.append(resolver)
+
+
+def resolve(key: str, args: tuple[Any, ...], kwargs: dict[str, Any]) -> Any:
+    """Returns the answer from the first resolver that can answer a query.
+
+    :param key: Query name, such as ``Guest.retrieve_by_id``
+    :param args: Positional arguments of the query
+    :param kwargs: Keyword arguments of the query
+    :return: Query result, or ``UNRESOLVED`` if no resolver can answer
+        the query
+    """
+    for resolver in _resolvers:
+        value = resolver(key, args, kwargs)
+        if value is not UNRESOLVED:
+            return value
+
+    return UNRESOLVED
+
+
+def shutdown_executors() -> None:
+    """Shuts down the query thread pools, if started."""
+    with _executors_lock:
+        executors = list(_executors.values())
+        _executors.clear()
+
+    for executor in executors:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+async def run_blocking(
+    func: Callable[..., Any],
+    *args: Any,
+    key: str | None = None,
+    details: bool = False,
+) -> Any:
+    """Runs a blocking function on one of the query thread pools.
+
+    :param func: Function to run
+    :param args: Positional arguments passed to the function
+    :param key: Name used to look up the concurrency cap for the
+        function. Defaults to the function's qualified name
+    :param details: Run the function on the smaller thread pool
+        reserved for full-table details queries
+    :return: Value returned by the function
+    """
+    semaphore = _get_semaphore(key or func.__qualname__, details)
+    async with semaphore:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_get_executor(details), func, *args)
+
+
+def _query(
+    library_class: Callable[..., Any],
+    method_name: str,
+    args: tuple[Any, ...],
+    kwargs: dict[str, Any],
+) -> Any:
+    """Checks out a connection and calls a wwdtm retrieval method."""
+    with database_connection() as connection:
+        instance = library_class(database_connection=connection)
+        return getattr(instance, method_name)(*args, **kwargs)
+
+
+async def run_query(
+    library_class: Callable[..., Any],
+    method_name: str,
+    *args: Any,
+    details: bool = False,
+    **kwargs: Any,
+) -> Any:
+    """Runs a wwdtm retrieval method without blocking the event loop.
+
+    A database connection is checked out from the connection pool
+    within the worker thread and returned once the method completes.
+    Each method has its own concurrency cap so that requests for one
+    route cannot occupy every worker thread. Queries that a registered
+    resolver can answer are not sent to the database.
+
+    :param library_class: wwdtm class, such as ``Guest`` or ``Show``
+    :param method_name: Name of the retrieval method to call
+    :param args: Positional arguments passed to the method
+    :param details: Run the query on the smaller thread pool reserved
+        for full-table details queries
+    :param kwargs: Keyword arguments passed to the method
+    :return: Value returned by the retrieval method
+    """
+    key = f"{library_class.__name__}.{method_name}"
+    value = resolve(key, args, kwargs)
+    if value is not UNRESOLVED:
+        return value
+
+    return await run_blocking(
+        partial(_query, library_class, method_name, args, kwargs),
+        key=key,
+        details=details,
+    )
+
+
+def _query_each(
+    library_class: Callable[..., Any],
+    method_name: str,
+    values: list[Any],
+    kwargs: dict[str, Any],
+) -> list[Any]:
+    """Checks out a connection and calls a wwdtm method for each value."""
+    with database_connection() as connection:
+        method = getattr(library_class(database_connection=connection), method_name)
+        return [method(value, **kwargs) for value in values]
+
+
+async def run_query_each(
+    library_class: Callable[..., Any],
+    method_name: str,
+    values: list[Any],
+    *,
+    details: bool = False,
+    **kwargs: Any,
+) -> list[Any]:
+    """Runs a wwdtm retrieval method once for each value.
+
+    All calls share a single database connection and worker thread.
+
+    :param library_class: wwdtm class, such as ``Guest`` or ``Show``
+    :param method_name: Name of the retrieval method to call
+    :param values: Values passed as the first argument of each call
+    :param details: Run the queries on the smaller thread pool reserved
+        for full-table details queries
+    :param kwargs: Keyword arguments passed to each call
+    :return: List of values returned by the retrieval method
+    """
+    key = f"{library_class.__name__}.{method_name}"
+    resolved = [resolve(key, (value,), kwargs) for value in values]
+    if all(value is not UNRESOLVED for value in resolved):
+        return resolved
+
+    return await run_blocking(
+        partial(_query_each, library_class, method_name, values, kwargs),
+        key=key,
+        details=details,
+    )
@@ -0,0 +1,478 @@
+# Copyright (c) 2018-2026 Linh Pham
+# api.wwdt.me is released under the terms of the Apache License 2.0
+# SPDX-License-Identifier: Apache-2.0
+#
+# vim: set noai syntax=python ts=4 sw=4:
+"""Existence Index of IDs, Slug Strings and Show Dates."""
+
+import bisect
+import datetime
+import hashlib
+import heapq
+import re
+import secrets
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass, field
+from functools import partial
+from typing import Any
+from zoneinfo import ZoneInfo
+
+from fastapi import HTTPException
+from pydantic import BaseModel
+from starlette.responses import Response
+from starlette.types import ASGIApp, Receive, Scope, Send
+from wwdtm.guest import Guest
+from wwdtm.host import Host
+from wwdtm.location import Location
+from wwdtm.panelist import Panelist
+from wwdtm.pronoun import Pronouns
+from wwdtm.scorekeeper import Scorekeeper
+from wwdtm.show import Show
+
+from app.config import API_VERSION, load_config
+from app.database import database_connection
+from app.dispatch import (
+    UNRESOLVED,
+    register_resolver,
+    resolve,
+    run_blocking,
+    run_query_each,
+)
+from app.generation import GenerationStore, data_generation
+from app.serialization import render
+
+_config = load_config()
+_settings_config = _config.get("settings", {})
+
+# Shows air in the time zone used by the database session, which is
+# also used by the wwdtm random methods to exclude unaired shows
+SHOW_TIME_ZONE = ZoneInfo(
+    _config.get("database", {}).get("time_zone", "America/Los_Angeles")
+)
+
+EXISTENCE_INDEX_ENABLED: bool = bool(_settings_config.get("existence_index", True))
+
+_ID_METHODS = ("retrieve_by_id", "retrieve_details_by_id")
+_SLUG_METHODS = ("retrieve_by_slug", "retrieve_details_by_slug")
+_DATE_METHODS = ("retrieve_by_date", "retrieve_details_by_date")
+_DATE_STRING_METHODS = ("retrieve_by_date_string", "retrieve_details_by_date_string")
+
+# Placeholder slug strings that are never returned by the random methods
+_RANDOM_EXCLUDED_SLUGS: dict[str, str] = {
+    "Guest": "none",
+    "Host": "tbd",
+    "Location": "tbd",
+    "Panelist": "multiple",
+    "Scorekeeper": "tbd",
+}
+
+# Random methods that return information for a random ID, and the
+# method used to retrieve the information by ID
+_RANDOM_INFO_METHODS: dict[str, str] = {
+    "retrieve_random": "retrieve_by_id",
+    "retrieve_random_details": "retrieve_details_by_id",
+    "retrieve_random_by_year": "retrieve_by_id",
+    "retrieve_random_details_by_year": "retrieve_details_by_id",
+}
+
+_system_random = secrets.SystemRandom()
+
+# Entities with slug strings, keyed by the collection name used in routes
+SLUG_COLLECTIONS: dict[str, str] = {
+    "guests": "Guest",
+    "hosts": "Host",
+    "locations": "Location",
+    "panelists": "Panelist",
+    "scorekeepers": "Scorekeeper",
+}
+_SLUG_PATH = re.compile(
+    rf"/v{re.escape(API_VERSION)}/(?P<collection>{'|'.join(SLUG_COLLECTIONS)})"
+    r"/(?P<prefix>(?:[^/]+/)*)slug/(?P<slug>[^/]+)"
+)
+
+
+def normalize_slug(slug: str) -> str:
+    """Normalizes a slug string for case-insensitive lookups.
+
+    :param slug: Slug string
+    :return: Slug string with surrounding whitespace removed and case
+        folded
+    """
+    return slug.strip().casefold()
+
+
+@dataclass
+class ExistenceSets:
+    """IDs, slug strings and show dates that exist for a data generation.
+
+    Slug strings are normalized using ``normalize_slug`` and map to the
+    corresponding ID. ``random_ids`` holds the IDs that can be returned
+    by the random methods, and the show IDs and dates are sorted by
+    show date, with ``show_years`` holding the start and end positions
+    of the shows for each year.
+    """
+
+    generation: str
+    ids: dict[str, frozenset[int]] = field(default_factory=dict)
+    slugs: dict[str, dict[str, int]] = field(default_factory=dict)
+    dates: frozenset[str] = frozenset()
+    random_ids: dict[str, tuple[int, ...]] = field(default_factory=dict)
+    slugs_by_id: dict[str, dict[int, str]] = field(default_factory=dict)
+    show_ids: tuple[int, ...] = ()
+    show_dates: tuple[str, ...] = ()
+    show_years: dict[int, tuple[int, int]] = field(default_factory=dict)
+
+
+def load_existence_sets(generation: str) -> ExistenceSets:
+    """Loads the IDs, slug strings and show dates from the database.
+
+    All queries share a single database connection.
+
+    :param generation: Current data generation
+    :return: IDs, slug strings and show dates
+    """
+    sets = ExistenceSets(generation)
+    with database_connection() as connection:
+        for library_class in (Guest, Host, Location, Panelist, Scorekeeper):
+            rows = library_class(database_connection=connection).retrieve_all()
+            name = library_class.__name__
+            sets.ids[name] = frozenset(row["id"] for row in rows)
+            sets.slugs[name] = {
+                normalize_slug(row["slug"]): row["id"] for row in rows if row["slug"]
+            }
+            sets.slugs_by_id[name] = {
+                row["id"]: row["slug"] for row in rows if row["slug"]
+            }
+            sets.random_ids[name] = tuple(
+                row["id"]
+                for row in rows
+                if row["slug"] and row["slug"] != _RANDOM_EXCLUDED_SLUGS[name]
+            )
+
+        pronouns = Pronouns(database_connection=connection)
+        sets.ids["Pronouns"] = frozenset(pronouns.retrieve_all_ids() or [])
+
+        shows = sorted(
+            Show(database_connection=connection).retrieve_all(),
+            key=lambda row: row["date"],
+        )
+
+    sets.ids["Show"] = frozenset(row["id"] for row in shows)
+    sets.show_ids = tuple(row["id"] for row in shows)
+    sets.show_dates = tuple(row["date"] for row in shows)
+    sets.dates = frozenset(sets.show_dates)
+    for position, show_date in enumerate(sets.show_dates):
+        year = int(show_date[:4])
+        start, _ = sets.show_years.get(year, (position, position))
+        sets.show_years[year] = (start, position + 1)
+
+    return sets
+
+
+def _seeded_key(seed: str, id_: int) -> bytes:
+    """Returns the sort key of an ID for a seeded random sample."""
+    return hashlib.blake2b(f"{seed}|{id_}".encode(), digest_size=8).digest()
+
+
+def sample(pool: Sequence[int], count: int, seed: str | None = None) -> list[int]:
+    """Returns distinct IDs drawn at random from a pool of IDs.
+
+    Seeded samples are drawn by ordering the pool using a hash of the
+    seed and each ID, so that the same seed always returns the same IDs
+    for the same pool.
+
+    :param pool: IDs to draw from
+    :param count: Number of IDs to draw. All IDs in the pool are
+        returned, in random order, if the pool has fewer IDs
+    :param seed: Optional seed string
+    :return: List of IDs
+    """
+    count = min(count, len(pool))
+    if seed is None:
+        return _system_random.sample(pool, count)
+
+    return heapq.nsmallest(count, pool, key=partial(_seeded_key, seed))
+
+
+def _date_string(year: Any, month: Any, day: Any) -> str | None:
+    """Returns a date as an ISO 8601 string, or None if it is invalid."""
+    try:
+        return datetime.date(year, month, day).isoformat()
+    except (TypeError, ValueError):
+        return None
+
+
+class ExistenceIndex(GenerationStore):
+    """Rejects lookups for IDs, slug strings and dates that do not exist.
+
+    The index holds every guest, host, location, panelist, pronouns,
+    scorekeeper and show ID, every slug string and the ID it maps to,
+    and every show date, and is reloaded each time the data changes.
+    Lookups for values that are not in the index are answered with an
+    empty result, which the routes return as a 404 response, without
+    querying the database. Lookups for values that are in the index are
+    left to the next resolver or the database.
+
+    If the index is disabled, it is only loaded by ``ensure_loaded``
+    the next time it is needed to draw random IDs.
+
+    :param preload: Reload the index as soon as the data changes
+    """
+
+    current: ExistenceSets | None
+
+    def __init__(self, preload: bool = True):
+        super().__init__("existence index", preload=preload)
+
+    def exists(self, key: str, args: tuple[Any, ...]) -> bool | None:
+        """Returns whether the value looked up by a query exists.
+
+        :param key: Query name, such as ``Guest.retrieve_by_slug``
+        :param args: Positional arguments of the query
+        :return: True or False, or None if the index is not loaded or
+            does not cover the query
+        """
+        sets = self.current
+        if sets is None or not args:
+            return None
+
+        entity, _, method = key.partition(".")
+        if method in _ID_METHODS and entity in sets.ids and len(args) == 1:
+            return args[0] in sets.ids[entity]
+
+        if method in _SLUG_METHODS and entity in sets.slugs and len(args) == 1:
+            return self.id_for_slug(entity, args[0]) is not None
+
+        if entity != "Show":
+            return None
+
+        if method in _DATE_METHODS and len(args) == 3:
+            return _date_string(*args) in sets.dates
+
+        if method in _DATE_STRING_METHODS and len(args) == 1:
+            try:
+                parsed = datetime.datetime.strptime(args[0], "%Y-%m-%d")
+            except (TypeError, ValueError):
+                return False
+
+            return parsed.date().isoformat() in sets.dates
+
+        return None
+
+    def id_for_slug(self, entity: str, slug: Any) -> int | None:
+        """Returns the ID for a slug string, ignoring case.
+
+        :param entity: Entity name, such as ``Guest``
+        :param slug: Slug string
+        :return: ID, or None if the index is not loaded or the slug
+            string does not exist
+        """
+        sets = self.current
+        if sets is None or entity not in sets.slugs or not isinstance(slug, str):
+            return None
+
+        return sets.slugs[entity].get(normalize_slug(slug))
+
+    def id_path(self, path: str) -> str | None:
+        """Returns the ID route path for a slug string route path.
+
+        :param path: Request path, such as ``/v2.0/guests/slug/luke-burbank``
+        :return: Path of the corresponding ID route, such as
+            ``/v2.0/guests/id/54``, or None if the path is not for a slug
+            string route or the slug string does not exist
+        """
+        match = _SLUG_PATH.fullmatch(path)
+        if not match:
+            return None
+
+        id_ = self.id_for_slug(SLUG_COLLECTIONS[match["collection"]], match["slug"])
+        if id_ is None:
+            return None
+
+        return f"/v{API_VERSION}/{match['collection']}/{match['prefix']}id/{id_}"
+
+    def random_pool(self, entity: str, year: int | None = None) -> Sequence[int] | None:
+        """Returns the IDs that a random ID is drawn from.
+
+        Shows with a date after the current date are not included.
+
+        :param entity: Entity name, such as ``Guest`` or ``Show``
+        :param year: Only include shows from a year
+        :return: Sequence of IDs, or None if the index is not loaded or
+            does not include the entity
+        """
+        sets = self.current
+        if sets is None:
+            return None
+
+        if entity != "Show":
+            return None if year is not None else sets.random_ids.get(entity)
+
+        today = datetime.datetime.now(SHOW_TIME_ZONE).date().isoformat()
+        end = bisect.bisect_right(sets.show_dates, today)
+        if year is None:
+            return sets.show_ids[:end]
+
+        start, stop = sets.show_years.get(year, (0, 0))
+        return sets.show_ids[start : min(stop, end)]
+
+    def _resolve_random(
+        self, entity: str, method: str, args: tuple[Any, ...], kwargs: dict[str, Any]
+    ) -> Any:
+        """Answers a random query by drawing an ID from the index."""
+        sets = self.current
+        by_year = method.endswith("_by_year")
+        year = kwargs.pop("year", args[0] if args else None) if by_year else None
+        if sets is None or (by_year and not isinstance(year, int)):
+            return UNRESOLVED
+
+        pool = self.random_pool(entity, year)
+        if pool is None:
+            return UNRESOLVED
+
+        if not pool:
+            return None
+
+        (id_,) = sample(pool, 1)
+        base = method.removesuffix("_by_year")
+        if base == "retrieve_random_id":
+            return id_
+
+        if base == "retrieve_random_slug" and entity in sets.slugs_by_id:
+            return sets.slugs_by_id[entity][id_]
+
+        if base in ("retrieve_random_date", "retrieve_random_date_object"):
+            show_date = sets.show_dates[sets.show_ids.index(id_)]
+            if base == "retrieve_random_date":
+                return show_date
+
+            return datetime.date.fromisoformat(show_date)
+
+        if method in _RANDOM_INFO_METHODS:
+            return resolve(f"{entity}.{_RANDOM_INFO_METHODS[method]}", (id_,), kwargs)
+
+        return UNRESOLVED
+
+    def resolve(self, key: str, args: tuple[Any, ...], kwargs: dict[str, Any]) -> Any:
+        """Answers lookups for values that do not exist and random queries.
+
+        Random queries draw an ID from the index, and queries for the
+        information of a random entity are answered using the next
+        resolver that can retrieve the information by ID, such as the
+        data snapshot.
+
+        :param key: Query name, such as ``Guest.retrieve_by_id``
+        :param args: Positional arguments of the query
+        :param kwargs: Keyword arguments of the query
+        :return: An empty dictionary if the value does not exist, the
+            result of a random query, otherwise ``UNRESOLVED``
+        """
+        entity, _, method = key.partition(".")
+        if method.startswith("retrieve_random"):
+            return self._resolve_random(entity, method, args, dict(kwargs))
+
+        if self.exists(key, args) is False:
+            return {}
+
+        return UNRESOLVED
+
+    async def load(self, generation: str) -> ExistenceSets:
+        """Loads the index for a data generation.
+
+        :param generation: Data generation to load the index for
+        :return: Index for the data generation
+        """
+        return await run_blocking(
+            load_existence_sets, generation, key="load_existence_index"
+        )
+
+
+existence_index = ExistenceIndex(preload=EXISTENCE_INDEX_ENABLED)
+data_generation.subscribe(existence_index.invalidate)
+
+if EXISTENCE_INDEX_ENABLED:
+    register_resolver(existence_index.resolve)
+
+
+async def random_sample_response(
+    model: type[BaseModel],
+    field: str,
+    library_class: Callable[..., Any],
+    method_name: str,
+    count: int | None,
+    seed: str | None,
+    year: int | None = None,
+    **kwargs: Any,
+) -> Response | dict[str, Any] | None:
+    """Creates a JSON response for a list of distinct random entities.
+
+    IDs are drawn without replacement from the existence index, which
+    is loaded first if needed. If ``count`` is not set, the random
+    entity is returned on its own, so that a seeded request returns the
+    same response format as a request without a seed.
+
+    :param model: Response model with a single list field
+    :param field: Name of the list field
+    :param library_class: wwdtm class, such as ``Guest`` or ``Show``
+    :param method_name: Name of the method used to retrieve the
+        information for each ID, such as ``retrieve_by_id``
+    :param count: Number of entities to return as a list, or None to
+        return a single entity
+    :param seed: Optional seed used to return the same entities for
+        the same seed
+    :param year: Only include shows from a year
+    :param kwargs: Keyword arguments passed to the retrieval method
+    :return: JSON response, the information for a single entity if
+        ``count`` is not set, or None if no entities are available
+    :raise fastapi.HTTPException: If the existence index is not
+        available
+    """
+    entity = library_class.__name__
+    pool = existence_index.random_pool(entity, year)
+    if pool is None:
+        await existence_index.ensure_loaded()
+        pool = existence_index.random_pool(entity, year)
+        if pool is None:
+            raise HTTPException(
+                status_code=503, detail="Random sampling is currently unavailable"
+            )
+
+    ids = sample(pool, count or 1, seed)
+    if not ids:
+        return None
+
+    items = await run_query_each(library_class, method_name, ids, **kwargs)
+    if count is None:
+        return items[0] or None
+
+    return Response(
+        content=render(model, {field: items}), media_type="application/json"
+    )
+
+
+class SlugRouteMiddleware:
+    """ASGI middleware that sends slug string requests to the ID routes.
+
+    Requests for a slug string route, such as
+    ``/v2.0/guests/slug/{guest_slug}``, are handled by the corresponding
+    ID route once the slug string has been resolved using the existence
+    index. Both routes return the same response, so each response is
+    only cached once, using the ID route, and slug strings are resolved
+    without querying the database. Requests are passed through
+    unchanged if the index is not loaded.
+
+    :param app: ASGI application
+    :param index: Existence index used to resolve slug strings
+    """
+
+    def __init__(self, app: ASGIApp, index: ExistenceIndex = existence_index):
+        self.app = app
+        self.index = index
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "http" and scope["method"] in ("GET", "HEAD"):
+            path = self.index.id_path(scope["path"])
+            if path:
+                scope = {**scope, "path": path, "raw_path": path.encode("ascii")}
+
+        await self.app(scope, receive, send)
@@ -0,0 +1,76 @@
+# Copyright (c) 2018-2026 Linh Pham
+# api.wwdt.me is released under the terms of the Apache License 2.0
+# SPDX-License-Identifier: Apache-2.0
+#
+# vim: set noai syntax=python ts=4 sw=4:
+"""Export the Data Set to a Memory-Mapped Snapshot File.
+
+Run using ``python -m app.export_snapshot [PATH]``. If a path is not
+provided, ``path`` from the ``settings.snapshot`` section of
+``config.json`` is used.
+"""
+
+import argparse
+import sys
+
+from app.config import load_config
+from app.database import close_pool, open_pool
+from app.generation import data_generation, retrieve_change_token
+from app.snapshot import SNAPSHOT_PATH, load_snapshot, write_snapshot
+
+MAX_ATTEMPTS = 3
+
+
+def export_snapshot(path: str) -> str:
+    """Loads the data set from the database and writes a snapshot file.
+
+    The snapshot is only written if the data did not change while it
+    was being loaded.
+
+    :param path: Path to the snapshot file
+    :return: Data generation of the snapshot
+    :raise RuntimeError: If the data kept changing while being loaded
+    """
+    for _ in range(MAX_ATTEMPTS):
+        token, _database_version, update_time = retrieve_change_token()
+        data_generation.update(token, last_modified=update_time)
+        snapshot = load_snapshot(data_generation.generation)
+        if retrieve_change_token()[0] == token:
+            write_snapshot(snapshot, path)
+            return snapshot.generation
+
+    raise RuntimeError("Data changed while the snapshot was being loaded")
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Exports the data set to a snapshot file.
+
+    :param argv: Command line arguments
+    :return: Exit status
+    """
+    parser = argparse.ArgumentParser(
+        prog="python -m app.export_snapshot",
+        description="Export the data set to a memory-mapped snapshot file.",
+    )
+    parser.add_argument(
+        "path", nargs="?", default=SNAPSHOT_PATH, help="path to the snapshot file"
+    )
+    args = parser.parse_args(argv)
+    if not args.path:
+        parser.error("a path is required if settings.snapshot.path is not set")
+
+    open_pool(load_config())
+    try:
+        generation = export_snapshot(args.path)
+    except RuntimeError as error:
+        print(error, file=sys.stderr)
+        return 1
+    finally:
+        close_pool()
+
+    print(f"Wrote snapshot for data generation {generation} to {args.path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,236 @@
+# Copyright (c) 2018-2026 Linh Pham
+# api.wwdt.me is released under the terms of the Apache License 2.0
+# SPDX-License-Identifier: Apache-2.0
+#
+# vim: set noai syntax=python ts=4 sw=4:
+"""Data Generation Tracking and Cache Invalidation."""
+
+import asyncio
+import hashlib
+import logging
+from collections.abc import Callable
+from contextlib import suppress
+from typing import Any
+
+from mysql.connector.errors import Error
+from wwdtm import database_version
+
+from app.config import load_config
+from app.database import database_connection
+from app.dispatch import run_blocking
+
+_settings_config = load_config().get("settings", {})
+
+POLL_INTERVAL: float = float(_settings_config.get("data_generation_poll_interval", 60))
+
+logger = logging.getLogger(__name__)
+
+
+class DataGeneration:
+    """Tracks the generation of the data served by the application.
+
+    The generation is derived from a change token retrieved from the
+    database, so every worker process polling the same database arrives
+    at the same generation without needing to communicate with each
+    other. Callbacks registered using ``subscribe`` are called whenever
+    the generation changes so that all caches are invalidated together.
+
+    ``last_modified`` is the last update time of the tables in the
+    database, which is the same for every worker process, or None if
+    the database does not report it.
+    """
+
+    def __init__(self):
+        self.token: str | None = None
+        self.generation: str = "0"
+        self.last_modified: float | None = None
+        self.database_version: tuple[int, int, int] | None = None
+        self._callbacks: list[Callable[[str], None]] = []
+
+    def subscribe(self, callback: Callable[[str], None]) -> None:
+        """Registers a callback to be called with each new generation.
+
+        :param callback: Function that accepts the new generation
+        """
+        self._callbacks.append(callback)
+
+    def update(self, token: str, last_modified: float | None = None) -> bool:
+        """Updates the generation from a change token.
+
+        A callback that raises an exception is logged and does not stop
+        the remaining callbacks from being called.
+
+        :param token: Change token retrieved from the database
+        :param last_modified: Last update time of the data, as a Unix
+            timestamp
+        :return: True if the generation has changed
+        """
+        if token == self.token:
+            return False
+
+        self.token = token
+        self.generation = hashlib.sha256(token.encode("utf-8")).hexdigest()[:16]
+        self.last_modified = last_modified
+        for callback in self._callbacks:
+            try:
+                callback(self.generation)
+            except Exception:
+                logger.exception("Data generation callback %r failed", callback)
+
+        return True
+
+
+data_generation = DataGeneration()
+
+
+class GenerationStore:
+    """Holds a value loaded for the current data generation.
+
+    The value is dropped as soon as the data generation changes, and
+    the value for the new data generation is loaded in the background
+    if ``preload`` is True. Until it has been loaded, ``current`` is
+    None. Subclasses implement ``load``.
+
+    :param description: Description of the value used in log messages
+    :param preload: Load the value as soon as the data generation
+        changes, rather than the next time ``ensure_loaded`` is called
+    """
+
+    errors: tuple[type[BaseException], ...] = (Error,)
+
+    def __init__(self, description: str, preload: bool = True):
+        self.description = description
+        self.preload = preload
+        self.current: Any = None
+        self._task: asyncio.Task | None = None
+
+    async def load(self, generation: str) -> Any:
+        """Loads the value for a data generation.
+
+        :param generation: Data generation to load the value for
+        :return: Loaded value, or None if there is no value to store
+        """
+        raise NotImplementedError
+
+    async def reload(self, generation: str) -> None:
+        """Loads and stores the value for a data generation.
+
+        The value is discarded if the data generation changed while it
+        was being loaded.
+
+        :param generation: Data generation to load the value for
+        """
+        try:
+            value = await self.load(generation)
+        except self.errors as error:
+            logger.warning("Unable to load %s: %s", self.description, error)
+            return
+
+        if value is not None and generation == data_generation.generation:
+            self.current = value
+
+    def invalidate(self, generation: str) -> None:
+        """Drops the current value and schedules a reload.
+
+        :param generation: New data generation
+        """
+        self.current = None
+        if self._task:
+            self._task.cancel()
+            self._task = None
+
+        if not self.preload:
+            return
+
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+
+        self._task = loop.create_task(self.reload(generation))
+
+    async def wait(self) -> None:
+        """Waits for a pending reload to complete, if any."""
+        if self._task and not self._task.done():
+            await asyncio.wait({self._task})
+
+    async def ensure_loaded(self) -> None:
+        """Waits for a pending reload, or loads the value if not loaded."""
+        await self.wait()
+        if self.current is None:
+            await self.reload(data_generation.generation)
+
+    async def close(self) -> None:
+        """Cancels a pending reload, if any."""
+        if self._task:
+            self._task.cancel()
+            with suppress(asyncio.CancelledError):
+                await self._task
+
+            self._task = None
+
+
+def retrieve_change_token() -> tuple[str, tuple[int, int, int] | None, float | None]:
+    """Retrieves a token that changes whenever the data is updated.
+
+    The token is built using the database version, the last update time
+    of the tables in the database, as well as the row counts and maximum
+    IDs of the show and appearance tables.
+
+    MySQL caches the last update time of tables for up to
+    ``information_schema_stats_expiry`` seconds, so the cache is
+    disabled for the session when supported by the database server.
+    Updates to existing rows are detected using the last update time,
+    which MySQL 8.0 and later maintain for InnoDB tables.
+
+    :return: A tuple containing the change token, database version and
+        the last update time of the tables in the database as a Unix
+        timestamp
+    """
+    query = """
+        SELECT (
+        SELECT UNIX_TIMESTAMP(MAX(UPDATE_TIME)) FROM information_schema.tables
+        WHERE table_schema = DATABASE()) AS update_time, (
+        SELECT COUNT(showid) FROM ww_shows) AS shows, (
+        SELECT MAX(showid) FROM ww_shows) AS max_show_id, (
+        SELECT COUNT(showpnlmapid) FROM ww_showpnlmap) AS panelist_appearances, (
+        SELECT COUNT(showguestmapid) FROM ww_showguestmap) AS guest_appearances, (
+        SELECT MAX(showpnlmapid) FROM ww_showpnlmap) AS max_panelist_appearance_id;
+        """
+    with database_connection() as connection:
+        _database_version = database_version(database_connection=connection)
+        cursor = connection.cursor(dictionary=False)
+        with suppress(Error):
+            cursor.execute("SET SESSION information_schema_stats_expiry = 0;")
+
+        cursor.execute(query)
+        result = cursor.fetchone() or ()
+        cursor.close()
+
+    token = "|".join(str(value) for value in (_database_version, *result))
+    update_time = float(result[0]) if result and result[0] is not None else None
+    return token, _database_version, update_time
+
+
+async def refresh_data_generation() -> bool:
+    """Retrieves the change token and updates the data generation.
+
+    :return: True if the data generation has changed
+    """
+    token, _database_version, update_time = await run_blocking(retrieve_change_token)
+    data_generation.database_version = _database_version
+    return data_generation.update(token, last_modified=update_time)
+
+
+async def poll_data_generation(interval: float = POLL_INTERVAL) -> None:
+    """Periodically refreshes the data generation until cancelled.
+
+    :param interval: Number of seconds between each refresh
+    """
+    while True:
+        try:
+            await refresh_data_generation()
+        except Error as error:
+            logger.warning("Unable to refresh data generation: %s", error)
+
+        await asyncio.sleep(interval)
@@ -5,17 +5,34 @@
 # vim: set noai syntax=python ts=4 sw=4:
 """FastAPI main application for api.wwdt.me."""
 
+import asyncio
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager, suppress
 from pathlib import Path
 
 from fastapi import FastAPI, HTTPException
-from fastapi.responses import FileResponse, HTMLResponse, RedirectResponse
+from fastapi.responses import (
+    FileResponse,
+    HTMLResponse,
+    JSONResponse,
+    RedirectResponse,
+)
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
+from mysql.connector.errors import PoolError
 from starlette.requests import Request
 
+from app.cache import ResponseCacheMiddleware
+from app.compression import CompressionMiddleware
 from app.config import API_VERSION, APP_VERSION, load_config
+from app.database import close_pool, open_pool
+from app.dispatch import shutdown_executors
+from app.existence import SlugRouteMiddleware, existence_index
+from app.generation import poll_data_generation
 from app.metadata import app_metadata, tags_metadata
+from app.prerender import close_prerendered_responses
 from app.routers import (
+    batch,
     guests,
     hosts,
     locations,
@@ -25,10 +42,45 @@ from app.routers import (
     shows,
     version,
 )
+from app.scores import score_column_store
+from app.snapshot import snapshot_store
 
 from .utility import format_umami_analytics
 
+config = load_config()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    """Creates the database connection pool after the worker starts.
+
+    Also starts polling the database for data changes, which
+    invalidates cached responses and reloads the data snapshot once new
+    data has been loaded.
+    """
+    open_pool(config)
+    poller: asyncio.Task | None = None
+    try:
+        poller = asyncio.create_task(poll_data_generation())
+        yield
+    finally:
+        if poller:
+            poller.cancel()
+            with suppress(asyncio.CancelledError):
+                await poller
+
+        try:
+            await close_prerendered_responses()
+            await snapshot_store.close()
+            await score_column_store.close()
+            await existence_index.close()
+            shutdown_executors()
+        finally:
+            close_pool()
+
+
 app = FastAPI(
+    lifespan=lifespan,
     title=app_metadata["title"],
     description=app_metadata["description"].strip(),
     openapi_tags=tags_metadata,
@@ -45,9 +97,20 @@ app = FastAPI(
     },
 )
 
+app.add_middleware(ResponseCacheMiddleware)
+app.add_middleware(SlugRouteMiddleware)
+app.add_middleware(CompressionMiddleware)
 app.mount("/static", StaticFiles(directory="static"), name="static")
 templates = Jinja2Templates(directory="templates")
-config = load_config()
+
+
+@app.exception_handler(PoolError)
+async def pool_error_handler(request: Request, exc: PoolError):
+    """Return a 503 response if no database connection is available."""
+    return JSONResponse(
+        status_code=503,
+        content={"detail": "No database connections are currently available"},
+    )
 
 
 @app.get("/", include_in_schema=False, response_class=HTMLResponse)
@@ -146,7 +209,7 @@ async def api_v1_docs_redirect():
 
 
 # Add the router modules for Guests, Hosts, Locations, Panelists,
-# Scorekeepers, Shows and Version
+# Scorekeepers, Shows, Version and Composite Requests
 app.include_router(guests.router)
 app.include_router(hosts.router)
 app.include_router(locations.router)
@@ -155,3 +218,4 @@ app.include_router(pronouns.router)
 app.include_router(scorekeepers.router)
 app.include_router(shows.router)
 app.include_router(version.router)
+app.include_router(batch.router)
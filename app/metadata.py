@@ -87,4 +87,8 @@ tags_metadata = [
         "name": "Version",
         "description": "Retrieve Wait Wait Stats API and Application Version Information",
     },
+    {
+        "name": "Batch",
+        "description": "Retrieve responses for multiple API paths in a single request",
+    },
 ]
@@ -0,0 +1,67 @@
+# Copyright (c) 2018-2026 Linh Pham
+# api.wwdt.me is released under the terms of the Apache License 2.0
+# SPDX-License-Identifier: Apache-2.0
+#
+# vim: set noai syntax=python ts=4 sw=4:
+"""Batch Request and Response Models."""
+
+import datetime
+from typing import Annotated, Any
+
+from pydantic import BaseModel, Field
+
+
+class BatchRequest(BaseModel):
+    """Batch Request of IDs and Slug Strings."""
+
+    ids: list[Annotated[int, Field(ge=0, lt=2**31)]] = Field(
+        default=[], title="List of IDs"
+    )
+    slugs: list[str] = Field(default=[], title="List of Slug Strings")
+
+
+class BatchNotFound(BaseModel):
+    """IDs and Slug Strings Not Found."""
+
+    ids: list[int] = Field(default=[], title="List of IDs Not Found")
+    slugs: list[str] = Field(default=[], title="List of Slug Strings Not Found")
+
+
+class ShowsBatchRequest(BaseModel):
+    """Batch Request of Show IDs and Dates."""
+
+    ids: list[Annotated[int, Field(ge=0, lt=2**31)]] = Field(
+        default=[], title="List of Show IDs"
+    )
+    dates: list[datetime.date] = Field(default=[], title="List of Show Dates")
+
+
+class ShowsBatchNotFound(BaseModel):
+    """Show IDs and Dates Not Found."""
+
+    ids: list[int] = Field(default=[], title="List of Show IDs Not Found")
+    dates: list[str] = Field(default=[], title="List of Show Dates Not Found")
+
+
+class CompositeRequest(BaseModel):
+    """Composite Request of API Paths."""
+
+    paths: list[str] = Field(
+        title="List of Relative API Paths",
+        examples=[["/v2.0/shows/recent", "/v2.0/version"]],
+    )
+
+
+class CompositeResponseItem(BaseModel):
+    """Response for an API Path."""
+
+    status: int = Field(title="HTTP Status Code")
+    body: Any = Field(title="Response Body")
+
+
+class CompositeResponse(BaseModel):
+    """Responses for a Composite Request, Keyed by API Path."""
+
+    responses: dict[str, CompositeResponseItem] = Field(
+        title="Responses Keyed by API Path"
+    )
@@ -9,6 +9,8 @@ from typing import Annotated
 
 from pydantic import BaseModel, Field
 
+from app.models.batch import BatchNotFound
+
 
 class Guest(BaseModel):
     """Not My Job Guest Information."""
@@ -68,6 +70,20 @@ class GuestsDetails(BaseModel):
     guests: list[GuestDetails] = Field(title="List of Guest Details")
 
 
+class GuestsBatch(BaseModel):
+    """Batch of Not My Job Guests."""
+
+    guests: list[Guest] = Field(title="List of Guests")
+    not_found: BatchNotFound = Field(title="IDs and Slug Strings Not Found")
+
+
+class GuestsDetailsBatch(BaseModel):
+    """Batch of Not My Job Guest Details."""
+
+    guests: list[GuestDetails] = Field(title="List of Guest Details")
+    not_found: BatchNotFound = Field(title="IDs and Slug Strings Not Found")
+
+
 class GuestID(BaseModel):
     """Not My Job Guest ID."""
 
@@ -9,6 +9,8 @@ from typing import Annotated
 
 from pydantic import BaseModel, Field
 
+from app.models.batch import BatchNotFound
+
 
 class Host(BaseModel):
     """Host Information."""
@@ -69,6 +71,20 @@ class HostsDetails(BaseModel):
     hosts: list[HostDetails] = Field(title="List of Host Details")
 
 
+class HostsBatch(BaseModel):
+    """Batch of Hosts."""
+
+    hosts: list[Host] = Field(title="List of Hosts")
+    not_found: BatchNotFound = Field(title="IDs and Slug Strings Not Found")
+
+
+class HostsDetailsBatch(BaseModel):
+    """Batch of Host Details."""
+
+    hosts: list[HostDetails] = Field(title="List of Host Details")
+    not_found: BatchNotFound = Field(title="IDs and Slug Strings Not Found")
+
+
 class HostID(BaseModel):
     """Host ID."""
 
@@ -10,6 +10,8 @@ from typing import Annotated
 
 from pydantic import BaseModel, Field, RootModel
 
+from app.models.batch import BatchNotFound
+
 
 class LocationCoordinates(BaseModel):
     """Coordinates for a Location."""
@@ -80,6 +82,20 @@ class LocationsDetails(BaseModel):
     locations: list[LocationDetails] = Field(title="List of Location Details")
 
 
+class LocationsBatch(BaseModel):
+    """Batch of Locations."""
+
+    locations: list[Location] = Field(title="List of Locations")
+    not_found: BatchNotFound = Field(title="IDs and Slug Strings Not Found")
+
+
+class LocationsDetailsBatch(BaseModel):
+    """Batch of Location Details."""
+
+    locations: list[LocationDetails] = Field(title="List of Location Details")
+    not_found: BatchNotFound = Field(title="IDs and Slug Strings Not Found")
+
+
 class LocationID(BaseModel):
     """Location ID."""
 
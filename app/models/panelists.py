@@ -11,6 +11,8 @@ from typing import Annotated
 
 from pydantic import BaseModel, Field, RootModel
 
+from app.models.batch import BatchNotFound
+
 
 class Panelist(BaseModel):
     """Panelist Information."""
@@ -199,6 +201,20 @@ class PanelistsDetails(BaseModel):
     )
 
 
+class PanelistsBatch(BaseModel):
+    """Batch of Panelists."""
+
+    panelists: list[Panelist] = Field(title="List of Panelists")
+    not_found: BatchNotFound = Field(title="IDs and Slug Strings Not Found")
+
+
+class PanelistsDetailsBatch(BaseModel):
+    """Batch of Panelist Details."""
+
+    panelists: list[PanelistDetails] = Field(title="List of Panelist Details")
+    not_found: BatchNotFound = Field(title="IDs and Slug Strings Not Found")
+
+
 class PanelistID(BaseModel):
     """Panelist ID."""
 
@@ -252,3 +268,90 @@ class PanelistScoresGroupedOrderedPair(BaseModel):
         "number of times that score "
         "has been earned",
     )
+
+
+class PanelistScoresMatrixShows(BaseModel):
+    """Shows in a Panelist Scores Matrix, Sorted by Show Date."""
+
+    ids: list[int] = Field(title="List of Show IDs")
+    dates: list[str] = Field(title="List of Show Dates")
+
+
+class PanelistScoresMatrixColumn(BaseModel):
+    """Panelist Scores for Each Show in a Panelist Scores Matrix."""
+
+    id: int = Field(title="Panelist ID")
+    slug: str | None = Field(default=None, title="Panelist Slug String")
+    scores: list[Decimal | None] = Field(title="List of Panelist Scores")
+
+
+class PanelistScoresMatrixCompactColumn(BaseModel):
+    """Panelist Scores for Each Appearance in a Compact Scores Matrix."""
+
+    id: int = Field(title="Panelist ID")
+    slug: str | None = Field(default=None, title="Panelist Slug String")
+    rows: list[int] = Field(
+        title="Positions of the Panelist Appearances in the List of Shows"
+    )
+    scores: list[Decimal] = Field(title="List of Panelist Scores")
+
+
+class PanelistScoresMatrix(BaseModel):
+    """Matrix of Panelist Scores with a Column for Each Panelist."""
+
+    encoding: str = Field(title="Encoding of the Panelist Score Columns")
+    shows: PanelistScoresMatrixShows = Field(title="Shows")
+    panelists: list[PanelistScoresMatrixCompactColumn | PanelistScoresMatrixColumn] = (
+        Field(title="List of Panelist Score Columns")
+    )
+
+
+class PanelistComparisonScores(BaseModel):
+    """Panelist Scores for Each Show Shared by the Compared Panelists."""
+
+    id: int = Field(title="Panelist ID")
+    slug: str | None = Field(default=None, title="Panelist Slug String")
+    scores: list[Decimal] = Field(title="List of Panelist Scores")
+
+
+class PanelistScoreDifferential(BaseModel):
+    """Differences Between a Panelist's Scores and an Opponent's Scores."""
+
+    total: Decimal = Field(title="Total Score Differential")
+    mean: Decimal | None = Field(default=None, title="Mean Score Differential")
+    minimum: Decimal | None = Field(default=None, title="Minimum Score Differential")
+    maximum: Decimal | None = Field(default=None, title="Maximum Score Differential")
+
+
+class PanelistMatchupRanks(BaseModel):
+    """Ranking Counts for Shows Shared by a Panelist and an Opponent."""
+
+    panelist: RankingCounts = Field(title="Panelist Ranking Counts")
+    opponent: RankingCounts = Field(title="Opponent Ranking Counts")
+
+
+class PanelistMatchup(BaseModel):
+    """Head-to-Head Record of a Panelist and an Opponent."""
+
+    panelist_id: int = Field(title="Panelist ID")
+    opponent_id: int = Field(title="Opponent Panelist ID")
+    shared_appearances: int = Field(title="Count of Shared Appearances")
+    wins: int = Field(title="Count of Shows with a Higher Score")
+    losses: int = Field(title="Count of Shows with a Lower Score")
+    ties: int = Field(title="Count of Shows with the Same Score")
+    score_differential: PanelistScoreDifferential = Field(title="Score Differential")
+    ranks: PanelistMatchupRanks = Field(title="Ranking Counts")
+
+
+class PanelistsComparison(BaseModel):
+    """Head-to-Head Comparison of Panelists."""
+
+    shows: PanelistScoresMatrixShows = Field(
+        title="Shows Shared by All of the Panelists"
+    )
+    panelists: list[PanelistComparisonScores] = Field(
+        title="List of Panelist Scores for the Shared Shows"
+    )
+    matchups: list[PanelistMatchup] = Field(
+        title="List of Head-to-Head Records for Each Pair of Panelists"
+    )
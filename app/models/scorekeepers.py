@@ -9,6 +9,8 @@ from typing import Annotated
 
 from pydantic import BaseModel, Field
 
+from app.models.batch import BatchNotFound
+
 
 class Scorekeeper(BaseModel):
     """Scorekeeper Information."""
@@ -72,6 +74,20 @@ class ScorekeepersDetails(BaseModel):
     scorekeepers: list[ScorekeeperDetails] = Field(title="List of Scorekeeper Details")
 
 
+class ScorekeepersBatch(BaseModel):
+    """Batch of Scorekeepers."""
+
+    scorekeepers: list[Scorekeeper] = Field(title="List of Scorekeepers")
+    not_found: BatchNotFound = Field(title="IDs and Slug Strings Not Found")
+
+
+class ScorekeepersDetailsBatch(BaseModel):
+    """Batch of Scorekeeper Details."""
+
+    scorekeepers: list[ScorekeeperDetails] = Field(title="List of Scorekeeper Details")
+    not_found: BatchNotFound = Field(title="IDs and Slug Strings Not Found")
+
+
 class ScorekeeperID(BaseModel):
     """Scorekeeper ID."""
 
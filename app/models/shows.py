@@ -10,6 +10,8 @@ from typing import Annotated
 
 from pydantic import BaseModel, Field
 
+from app.models.batch import ShowsBatchNotFound
+
 
 class Show(BaseModel):
     """Show Information."""
@@ -161,6 +163,20 @@ class ShowsDetails(BaseModel):
     )
 
 
+class ShowsBatch(BaseModel):
+    """Batch of Shows."""
+
+    shows: list[Show] = Field(title="List of Shows")
+    not_found: ShowsBatchNotFound = Field(title="Show IDs and Dates Not Found")
+
+
+class ShowsDetailsBatch(BaseModel):
+    """Batch of Show Details."""
+
+    shows: list[ShowDetails] = Field(title="List of Show Details")
+    not_found: ShowsBatchNotFound = Field(title="Show IDs and Dates Not Found")
+
+
 class ShowDates(BaseModel):
     """List of Show Dates in ISO format (YYYY-MM-DD)."""
 
@@ -0,0 +1,217 @@
+# Copyright (c) 2018-2026 Linh Pham
+# api.wwdt.me is released under the terms of the Apache License 2.0
+# SPDX-License-Identifier: Apache-2.0
+#
+# vim: set noai syntax=python ts=4 sw=4:
+"""Keyset Pagination for Collection Routes."""
+
+import base64
+import bisect
+import json
+from collections.abc import AsyncIterator, Callable, Sequence
+from dataclasses import dataclass
+from typing import Any
+
+from fastapi import HTTPException
+from pydantic import BaseModel
+from starlette.requests import Request
+from starlette.responses import Response
+
+from app.config import load_config
+from app.dispatch import run_query, run_query_each
+from app.generation import data_generation
+from app.serialization import render
+
+_settings_config = load_config().get("settings", {})
+
+MAX_PAGE_SIZE: int = int(_settings_config.get("max_page_size", 100))
+
+
+def encode_cursor(row_id: int, key: Sequence[Any]) -> str:
+    """Encodes the ID and sort key of the last row of a page.
+
+    :param row_id: ID of the last row
+    :param key: Sort key of the last row
+    :return: Opaque cursor string
+    """
+    data = json.dumps({"id": row_id, "key": list(key)}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(data.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[int, tuple[Any, ...]]:
+    """Decodes a cursor created by ``encode_cursor``.
+
+    :param cursor: Opaque cursor string
+    :return: A tuple containing the ID and sort key of the last row
+    :raise fastapi.HTTPException: If the cursor is not valid
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        data = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        return int(data["id"]), tuple(data["key"])
+    except (ValueError, TypeError, KeyError) as error:
+        raise HTTPException(status_code=400, detail="Invalid cursor") from error
+
+
+@dataclass
+class Page:
+    """A page of rows from a collection index."""
+
+    rows: list[dict[str, Any]]
+    next_cursor: str | None
+
+    @property
+    def ids(self) -> list[int]:
+        """IDs of the rows in the page."""
+        return [row["id"] for row in self.rows]
+
+
+class CollectionIndex:
+    """Ordered index of the rows in a collection.
+
+    The index is loaded using a wwdtm ``retrieve_all`` method, which
+    returns rows in the same order as the corresponding
+    ``retrieve_all_details`` method, and is kept until the data
+    generation changes. Pages are located using the ID of the last row
+    of the previous page, falling back to the sort key if that row no
+    longer exists.
+
+    :param library_class: wwdtm class, such as ``Guest`` or ``Show``
+    :param sort_fields: Row fields used to build the sort key
+    :param method_name: Name of the retrieval method
+    :param kwargs: Keyword arguments passed to the retrieval method
+    """
+
+    def __init__(
+        self,
+        library_class: Callable[..., Any],
+        sort_fields: Sequence[str],
+        method_name: str = "retrieve_all",
+        **kwargs: Any,
+    ):
+        self.library_class = library_class
+        self.sort_fields = tuple(sort_fields)
+        self.method_name = method_name
+        self.kwargs = kwargs
+        self._rows: list[dict[str, Any]] | None = None
+        self._positions: dict[int, int] = {}
+        self._keys: list[tuple[Any, ...]] = []
+        data_generation.subscribe(lambda _: self.clear())
+
+    def clear(self) -> None:
+        """Removes the loaded rows so they are reloaded when next used."""
+        self._rows = None
+        self._positions = {}
+        self._keys = []
+
+    def sort_key(self, row: dict[str, Any]) -> tuple[Any, ...]:
+        """Returns the sort key for a row.
+
+        String values are case folded to approximate the case
+        insensitive collation used by the database.
+        """
+        return tuple(
+            value.casefold() if isinstance(value, str) else value
+            for value in (row.get(field) or "" for field in self.sort_fields)
+        )
+
+    async def rows(self) -> list[dict[str, Any]]:
+        """Returns all rows in the collection, loading them if needed."""
+        if self._rows is None:
+            rows = await run_query(self.library_class, self.method_name, **self.kwargs)
+            self._positions = {row["id"]: index for index, row in enumerate(rows)}
+            self._keys = [self.sort_key(row) for row in rows]
+            self._rows = rows
+
+        return self._rows
+
+    async def iter_details(
+        self, method_name: str = "retrieve_details_by_id", **kwargs: Any
+    ) -> AsyncIterator[list[dict[str, Any]]]:
+        """Retrieves details for every row in the collection.
+
+        Details are retrieved for ``MAX_PAGE_SIZE`` rows at a time, so
+        that only one batch of details is held in memory at once.
+        Rows that no longer exist when their batch is retrieved are
+        skipped.
+
+        :param method_name: Name of the retrieval method called with
+            the ID of each row
+        :param kwargs: Keyword arguments passed to the retrieval method
+        :return: Async iterator of lists of details, in collection order
+        """
+        rows = await self.rows()
+        for start in range(0, len(rows), MAX_PAGE_SIZE):
+            ids = [row["id"] for row in rows[start : start + MAX_PAGE_SIZE]]
+            details = await run_query_each(
+                self.library_class, method_name, ids, details=True, **kwargs
+            )
+            yield [item for item in details if item]
+
+    async def page(self, cursor: str | None, limit: int | None) -> Page:
+        """Returns a page of rows following a cursor.
+
+        :param cursor: Cursor returned with the previous page, or None
+            to return the first page
+        :param limit: Maximum number of rows to return
+        :return: Page of rows and the cursor for the next page, if any
+        """
+        anchor = decode_cursor(cursor) if cursor else None
+        rows = await self.rows()
+        limit = limit or MAX_PAGE_SIZE
+        start = 0
+        if anchor:
+            row_id, key = anchor
+            if row_id in self._positions:
+                start = self._positions[row_id] + 1
+            else:
+                try:
+                    start = bisect.bisect_right(self._keys, key)
+                except TypeError as error:
+                    raise HTTPException(
+                        status_code=400, detail="Invalid cursor"
+                    ) from error
+
+        page_rows = rows[start : start + limit]
+        next_cursor = None
+        if page_rows and start + limit < len(rows):
+            last = page_rows[-1]
+            next_cursor = encode_cursor(last["id"], self.sort_key(last))
+
+        return Page(rows=page_rows, next_cursor=next_cursor)
+
+
+def page_response(
+    request: Request,
+    model: type[BaseModel],
+    field: str,
+    items: list[Any],
+    next_cursor: str | None,
+) -> Response:
+    """Creates a JSON response for a page of a collection.
+
+    The response body uses the same response model as the unpaginated
+    response. The cursor for the next page is returned using the
+    ``X-Next-Cursor`` and ``Link`` response headers. The ``Link`` URL
+    is relative to the request host, as responses are cached and served
+    for every host name the application is reachable at.
+
+    :param request: Current request
+    :param model: Response model with a single list field
+    :param field: Name of the list field
+    :param items: Items in the page
+    :param next_cursor: Cursor for the next page, or None if this is
+        the last page
+    :return: JSON response
+    """
+    headers = {}
+    if next_cursor:
+        next_url = request.url.include_query_params(cursor=next_cursor)
+        headers["x-next-cursor"] = next_cursor
+        headers["link"] = f'<{next_url.path}?{next_url.query}>; rel="next"'
+
+    return Response(
+        content=render(model, {field: items}),
+        media_type="application/json",
+        headers=headers,
+    )
@@ -0,0 +1,346 @@
+# Copyright (c) 2018-2026 Linh Pham
+# api.wwdt.me is released under the terms of the Apache License 2.0
+# SPDX-License-Identifier: Apache-2.0
+#
+# vim: set noai syntax=python ts=4 sw=4:
+"""Panelist Statistics Calculated for All Panelists Using Columnar Arrays."""
+
+from dataclasses import dataclass
+from decimal import Decimal
+from typing import Any
+
+import numpy
+from slugify import slugify
+from wwdtm import panelist
+from wwdtm.guest.utility import GuestUtility
+from wwdtm.host.utility import HostUtility
+from wwdtm.scorekeeper.utility import ScorekeeperUtility
+from wwdtm.validation import valid_rounding_decimal_places
+
+# Scores and ranks of every panelist appearance in regular shows, using
+# the same filters as the wwdtm panelist scores and statistics methods
+_SCORES_QUERY = """
+    SELECT pm.panelistid AS id, pm.panelistscore AS score,
+    pm.panelistscore_decimal AS score_decimal, pm.showpnlrank AS pnl_rank
+    FROM ww_showpnlmap pm
+    JOIN ww_shows s ON s.showid = pm.showid
+    WHERE s.bestof = 0 AND s.repeatshowid IS NULL
+    ORDER BY pm.panelistid ASC, s.showdate ASC;
+    """
+
+_PANELISTS_QUERY = """
+    SELECT p.panelistid AS id, p.panelist AS name, p.panelistslug AS slug,
+    p.panelistgender AS gender
+    FROM ww_panelists p
+    WHERE panelistslug != 'multiple'
+    ORDER BY panelist ASC;
+    """
+
+_PRONOUNS_QUERY = """
+    SELECT pn.pronouns
+    FROM ww_panelistpronounsmap ppm
+    JOIN ww_pronouns pn on pn.pronounsid = ppm.pronounsid
+    WHERE ppm.panelistid = %s
+    ORDER BY ppm.panelistpronounsmapid ASC;
+    """
+
+# Panelist ranks counted in the ranking statistics, keyed by the rank
+# stored in the database
+RANKS: dict[str, str] = {
+    "1": "first",
+    "1t": "first_tied",
+    "2": "second",
+    "2t": "second_tied",
+    "3": "third",
+}
+_RANK_POSITIONS: dict[str, int] = {rank: index for index, rank in enumerate(RANKS)}
+
+
+@dataclass(frozen=True)
+class ScoreColumns:
+    """Panelist appearance scores and ranks stored as columnar arrays.
+
+    Each position holds one appearance, ordered by panelist ID and show
+    date. Missing scores are stored as zero, which the wwdtm panelist
+    scores methods also leave out, and ``ranks`` holds the position of
+    the rank in ``RANKS`` or -1 for any other rank.
+    """
+
+    ids: numpy.ndarray
+    scores: numpy.ndarray
+    scores_decimal: numpy.ndarray
+    ranks: numpy.ndarray
+
+    @classmethod
+    def from_rows(cls, rows: list[dict[str, Any]]) -> "ScoreColumns":
+        """Creates columnar arrays from panelist appearance rows.
+
+        :param rows: Rows containing panelist ID, score, decimal score
+            and rank, ordered by panelist ID and show date
+        :return: Columnar arrays of the appearances
+        """
+        return cls(
+            ids=numpy.array([row["id"] for row in rows], dtype=numpy.int64),
+            scores=numpy.array([row["score"] or 0 for row in rows], dtype=numpy.int64),
+            scores_decimal=numpy.array(
+                [row["score_decimal"] or Decimal(0) for row in rows], dtype=object
+            ),
+            ranks=numpy.array(
+                [_RANK_POSITIONS.get(row["pnl_rank"], -1) for row in rows],
+                dtype=numpy.int64,
+            ),
+        )
+
+
+def _segment_statistics(
+    ids: numpy.ndarray, values: numpy.ndarray, keys: numpy.ndarray
+) -> dict[int, dict[str, Any]]:
+    """Calculates statistics for each panelist's segment of scores.
+
+    Minimum, maximum, total, median and modes are calculated for all
+    panelists at once. The population standard deviation and variance
+    are calculated by NumPy for each segment, in show date order, so
+    that the summation order matches the wwdtm panelist statistics.
+
+    :param ids: Panelist IDs, sorted in ascending order
+    :param values: Scores for each panelist ID
+    :param keys: Numeric sort keys for the scores
+    :return: Dictionary of unrounded statistics, keyed by panelist ID
+    """
+    group_ids, starts, counts = numpy.unique(ids, return_index=True, return_counts=True)
+    totals = numpy.add.reduceat(values, starts)
+    means = totals / counts
+    minimums = numpy.minimum.reduceat(values, starts)
+    maximums = numpy.maximum.reduceat(values, starts)
+
+    order = numpy.lexsort((keys, ids))
+    sorted_values = values[order]
+    sorted_keys = keys[order]
+    lower = sorted_values[starts + (counts - 1) // 2]
+    upper = sorted_values[starts + counts // 2]
+    odd = counts % 2 == 1
+    medians = numpy.where(odd, lower, lower + upper) / numpy.where(odd, 1, 2)
+
+    # Runs of equal scores within a segment, with the most common
+    # scores being the runs as long as the longest run in the segment
+    run_starts = numpy.flatnonzero(
+        numpy.concatenate(
+            (
+                [True],
+                (ids[order][1:] != ids[order][:-1])
+                | (sorted_keys[1:] != sorted_keys[:-1]),
+            )
+        )
+    )
+    run_counts = numpy.diff(numpy.append(run_starts, len(sorted_values)))
+    run_groups = numpy.searchsorted(starts, run_starts, side="right") - 1
+    longest = numpy.maximum.reduceat(run_counts, numpy.searchsorted(run_starts, starts))
+    modes: dict[int, list[Any]] = {}
+    for run in numpy.flatnonzero(run_counts == longest[run_groups]):
+        modes.setdefault(int(run_groups[run]), []).append(
+            sorted_values[run_starts[run]]
+        )
+
+    statistics = {}
+    for index, id_ in enumerate(group_ids.tolist()):
+        segment = values[starts[index] : starts[index] + counts[index]]
+        statistics[id_] = {
+            "count": int(counts[index]),
+            "minimum": minimums[index],
+            "maximum": maximums[index],
+            "mean": means[index],
+            "median": medians[index],
+            "modes": modes[index],
+            "standard_deviation": numpy.std(segment),
+            "variance": numpy.var(segment),
+            "total": totals[index],
+        }
+
+    return statistics
+
+
+def scoring_statistics(
+    columns: ScoreColumns, number_decimal_places: int = 5
+) -> dict[int, dict[str, Any]]:
+    """Calculates scoring and ranking statistics for all panelists.
+
+    Returns the same statistics as the wwdtm panelist
+    ``retrieve_statistics_by_id`` method for each panelist with at
+    least one score and one decimal score.
+
+    :param columns: Columnar arrays of panelist appearances
+    :param number_decimal_places: Number of decimal places to include
+        when rounding
+    :return: Dictionary of panelist scoring and ranking statistics,
+        keyed by panelist ID
+    """
+    if not len(columns.ids):
+        return {}
+
+    scored = columns.scores != 0
+    scored_decimal = columns.scores_decimal != 0
+    if not scored.any() or not scored_decimal.any():
+        return {}
+
+    scoring = _segment_statistics(
+        columns.ids[scored], columns.scores[scored], columns.scores[scored]
+    )
+    scoring_decimal = _segment_statistics(
+        columns.ids[scored_decimal],
+        columns.scores_decimal[scored_decimal],
+        columns.scores_decimal[scored_decimal].astype(numpy.float64),
+    )
+
+    ranked = columns.ranks >= 0
+    panelist_ids, positions = numpy.unique(columns.ids, return_inverse=True)
+    rank_counts = numpy.bincount(
+        positions[ranked] * len(RANKS) + columns.ranks[ranked],
+        minlength=len(panelist_ids) * len(RANKS),
+    ).reshape(len(panelist_ids), len(RANKS))
+
+    statistics = {}
+    for index, id_ in enumerate(panelist_ids.tolist()):
+        if id_ not in scoring or id_ not in scoring_decimal:
+            continue
+
+        scores = scoring[id_]
+        scores_decimal = scoring_decimal[id_]
+        counts = rank_counts[index]
+        percentages = 100 * (counts / scores["count"])
+        statistics[id_] = {
+            "scoring": {
+                "minimum": int(scores["minimum"]),
+                "maximum": int(scores["maximum"]),
+                "mean": round(scores["mean"], number_decimal_places),
+                "median": int(scores["median"]),
+                "mode": int(scores["modes"][0]),
+                "mode_multiple": [int(mode) for mode in scores["modes"]],
+                "standard_deviation": round(
+                    scores["standard_deviation"], number_decimal_places
+                ),
+                "variance": round(scores["variance"], number_decimal_places),
+                "total": int(scores["total"]),
+            },
+            "scoring_decimal": {
+                "minimum": Decimal(scores_decimal["minimum"]),
+                "maximum": Decimal(scores_decimal["maximum"]),
+                "mean": round(Decimal(scores_decimal["mean"]), number_decimal_places),
+                "median": Decimal(scores_decimal["median"]),
+                "mode": scores_decimal["modes"][0],
+                "mode_multiple": scores_decimal["modes"],
+                "standard_deviation": round(
+                    Decimal(scores_decimal["standard_deviation"]),
+                    number_decimal_places,
+                ),
+                "variance": round(
+                    Decimal(scores_decimal["variance"]), number_decimal_places
+                ),
+                "total": Decimal(scores_decimal["total"]),
+            },
+            "ranking": {
+                "rank": {
+                    rank: int(count)
+                    for rank, count in zip(RANKS.values(), counts, strict=True)
+                },
+                "percentage": {
+                    rank: round(float(percentage), number_decimal_places)
+                    for rank, percentage in zip(
+                        RANKS.values(), percentages, strict=True
+                    )
+                },
+            },
+        }
+
+    return statistics
+
+
+class Panelist(panelist.Panelist):
+    """Panelist retrieval class with statistics for all panelists.
+
+    The wwdtm ``retrieve_all_details`` method queries the scores,
+    decimal scores and each rank separately for each panelist and
+    calculates the scoring statistics one panelist at a time. This
+    method instead loads the scores and ranks of every appearance into
+    columnar arrays with one query and calculates the statistics for
+    all panelists together, returning the same information.
+
+    :param connect_dict: A dictionary containing database connection
+        settings as required by MySQL Connector/Python
+    :param database_connection: MySQL database connection object
+    """
+
+    def retrieve_score_columns(self) -> ScoreColumns:
+        """Retrieves the scores and ranks of every panelist appearance.
+
+        :return: Columnar arrays of panelist appearances in regular
+            shows, ordered by panelist ID and show date
+        """
+        cursor = self.database_connection.cursor(dictionary=True)
+        cursor.execute(_SCORES_QUERY)
+        results = cursor.fetchall()
+        cursor.close()
+
+        return ScoreColumns.from_rows(results)
+
+    def retrieve_all_details(
+        self, number_decimal_places: int = 5
+    ) -> list[dict[str, Any]]:
+        """Retrieves panelist information, appearances and scores for all panelists.
+
+        :param number_decimal_places: Number of decimal places to
+            include when rounding (valid range: 0 through 20)
+        :return: A list of dictionaries containing panelist ID, name,
+            slug string, gender, pronouns, whether the panelist is
+            also a guest, host or scorekeeper, scoring statistics and
+            appearances for each panelist
+        """
+        if not valid_rounding_decimal_places(
+            number_decimal_places=number_decimal_places
+        ):
+            return {}
+
+        cursor = self.database_connection.cursor(dictionary=True)
+        cursor.execute(_PANELISTS_QUERY)
+        results = cursor.fetchall()
+        cursor.close()
+
+        if not results:
+            return []
+
+        statistics = scoring_statistics(
+            self.retrieve_score_columns(), number_decimal_places=number_decimal_places
+        )
+        _guest_utility = GuestUtility(database_connection=self.database_connection)
+        _host_utility = HostUtility(database_connection=self.database_connection)
+        _scorekeeper_utility = ScorekeeperUtility(
+            database_connection=self.database_connection
+        )
+
+        panelists = []
+        cursor = self.database_connection.cursor(dictionary=True)
+        for row in results:
+            _slug = row["slug"] if row["slug"] else slugify(row["name"])
+            cursor.execute(_PRONOUNS_QUERY, (row["id"],))
+            pn_results = cursor.fetchall()
+            panelists.append(
+                {
+                    "id": row["id"],
+                    "name": row["name"],
+                    "slug": _slug,
+                    "gender": row["gender"],
+                    "pronouns": [result["pronouns"] for result in pn_results],
+                    "is_guest": bool(_guest_utility.slug_exists(guest_slug=_slug)),
+                    "is_host": bool(_host_utility.slug_exists(host_slug=_slug)),
+                    "is_scorekeeper": bool(
+                        _scorekeeper_utility.slug_exists(scorekeeper_slug=_slug)
+                    ),
+                    "statistics": statistics.get(row["id"], {}),
+                    "bluffs": self.statistics.retrieve_bluffs_by_id(row["id"]),
+                    "appearances": self.appearances.retrieve_appearances_by_id(
+                        row["id"]
+                    ),
+                }
+            )
+        cursor.close()
+
+        return panelists
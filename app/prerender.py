@@ -0,0 +1,159 @@
+# Copyright (c) 2018-2026 Linh Pham
+# api.wwdt.me is released under the terms of the Apache License 2.0
+# SPDX-License-Identifier: Apache-2.0
+#
+# vim: set noai syntax=python ts=4 sw=4:
+"""Pre-rendered and Pre-compressed Responses for Full-Table Routes."""
+
+from collections.abc import Callable
+from dataclasses import dataclass
+from functools import partial
+from typing import Any
+
+from pydantic import BaseModel
+from starlette.requests import Request
+from starlette.responses import Response
+
+from app.cache import validator_headers
+from app.compression import (
+    ENCODINGS,
+    PRERENDER_LEVELS,
+    compress,
+    encoded_headers,
+    select_encoding,
+)
+from app.config import load_config
+from app.dispatch import run_blocking, run_query
+from app.generation import GenerationStore, data_generation
+from app.serialization import render
+from app.snapshot import snapshot_store
+
+_settings_config = load_config().get("settings", {})
+
+PRERENDER_ENABLED: bool = bool(_settings_config.get("prerender_responses", True))
+
+Variants = dict[str, tuple[bytes, list[tuple[bytes, bytes]]]]
+
+_prerendered_responses: list["PrerenderedResponse"] = []
+
+
+@dataclass
+class RenderedBody:
+    """Serialized response body and its compressed variants."""
+
+    generation: str
+    variants: Variants
+
+    def response(self, request: Request) -> Response:
+        """Returns the variant accepted by the client as a response.
+
+        :param request: Current request
+        :return: JSON response with the ``Content-Encoding``, ``Vary``,
+            ``ETag`` and ``Last-Modified`` headers set
+        """
+        encoding = select_encoding(
+            request.headers.get("accept-encoding"), self.variants
+        )
+        body, raw_headers = self.variants[encoding]
+        headers = {name.decode(): value.decode() for name, value in raw_headers}
+        headers["vary"] = "Accept-Encoding"
+        return Response(content=body, media_type="application/json", headers=headers)
+
+
+def render_body(
+    model: type[BaseModel], field: str, items: list[Any], generation: str
+) -> Variants:
+    """Serializes and compresses a response body.
+
+    :param model: Response model with a single list field
+    :param field: Name of the list field
+    :param items: Items in the list field
+    :param generation: Data generation of the items
+    :return: Dictionary of response bodies and headers, keyed by content
+        coding
+    """
+    body = render(model, {field: items})
+    validators = validator_headers(generation, body)
+    variants = {"identity": (body, validators)}
+    for encoding in ENCODINGS:
+        compressed = compress(body, encoding, PRERENDER_LEVELS[encoding])
+        headers = encoded_headers(validators, encoding, None)
+        variants[encoding] = (compressed, headers)
+
+    return variants
+
+
+class PrerenderedResponse(GenerationStore):
+    """Full-table details response that is rendered once per data change.
+
+    Once the data changes, the response body is rendered and compressed
+    using each supported content coding in the background. Requests
+    received while the response is being rendered are served by the
+    route, as rendering and compressing the response at the highest
+    compression levels takes longer than serving it directly.
+
+    :param model: Response model with a single list field
+    :param field: Name of the list field
+    :param library_class: wwdtm class, such as ``Panelist`` or ``Show``
+    :param method_name: Name of the retrieval method
+    :param kwargs: Keyword arguments passed to the retrieval method
+    """
+
+    current: RenderedBody | None
+
+    def __init__(
+        self,
+        model: type[BaseModel],
+        field: str,
+        library_class: Callable[..., Any],
+        method_name: str = "retrieve_all_details",
+        **kwargs: Any,
+    ):
+        super().__init__(f"{field} response")
+        self.model = model
+        self.field = field
+        self.library_class = library_class
+        self.method_name = method_name
+        self.kwargs = kwargs
+        if PRERENDER_ENABLED:
+            data_generation.subscribe(self.invalidate)
+            _prerendered_responses.append(self)
+
+    async def load(self, generation: str) -> RenderedBody | None:
+        """Renders the response for a data generation.
+
+        :param generation: Data generation to render the response for
+        :return: Rendered response, or None if there are no items
+        """
+        await snapshot_store.wait()
+        items = await run_query(
+            self.library_class, self.method_name, details=True, **self.kwargs
+        )
+        if not items:
+            return None
+
+        variants = await run_blocking(
+            partial(render_body, self.model, self.field, items, generation),
+            key=f"prerender.{self.field}",
+            details=True,
+        )
+        return RenderedBody(generation=generation, variants=variants)
+
+    async def response(self, request: Request) -> Response | None:
+        """Returns the rendered response for the current data generation.
+
+        :param request: Current request
+        :return: Response, or None if the response has not been
+            rendered or is still being rendered
+        """
+        body = self.current
+        if body is None or body.generation != data_generation.generation:
+            return None
+
+        return body.response(request)
+
+
+async def close_prerendered_responses() -> None:
+    """Cancels the pending renders of every pre-rendered response."""
+    for prerendered in _prerendered_responses:
+        await prerendered.close()
@@ -0,0 +1,37 @@
+# Copyright (c) 2018-2026 Linh Pham
+# api.wwdt.me is released under the terms of the Apache License 2.0
+# SPDX-License-Identifier: Apache-2.0
+#
+# vim: set noai syntax=python ts=4 sw=4:
+"""API routes for Composite Request endpoints."""
+
+from fastapi import APIRouter, Request
+
+from app.composite import COMPOSITE_PATH, composite_response
+from app.models.batch import CompositeRequest, CompositeResponse
+from app.models.messages import MessageDetails
+from app.serialization import FastJSONRoute
+
+router = APIRouter(prefix=COMPOSITE_PATH, route_class=FastJSONRoute)
+
+
+@router.post(
+    "",
+    summary="Retrieve Responses for Multiple API Paths",
+    response_model=CompositeResponse,
+    responses={400: {"model": MessageDetails}},
+    tags=["Batch"],
+)
+async def post_batch(request: Request, batch: CompositeRequest):
+    """Retrieve Responses for a List of API Paths in a Single Request.
+
+    Returned data: HTTP status code and response body for each path,
+    keyed by path.
+
+    Each path is a relative API path, such as `/v2.0/shows/recent` or
+    `/v2.0/panelists/scores/id/30`, and can include a query string.
+    Paths are requested concurrently within the application, and a
+    path that cannot be retrieved only affects its own status code
+    and response body.
+    """
+    return await composite_response(request.app, request.scope, batch.paths)
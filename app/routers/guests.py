@@ -7,25 +7,30 @@
 
 from typing import Annotated
 
-import mysql.connector
-from fastapi import APIRouter, Path
+from fastapi import APIRouter, Path, Query, Request
 from fastapi.responses import JSONResponse
 from mysql.connector.errors import DatabaseError, ProgrammingError
 from wwdtm.guest import Guest
 
-from app.config import API_VERSION, load_config
+from app.batch import IDS_PATTERN, batch_response, parse_ids, parse_keys
+from app.config import API_VERSION
+from app.dispatch import run_query, run_query_each
+from app.existence import random_sample_response
+from app.models.batch import BatchRequest
 from app.models.guests import Guest as ModelsGuest
 from app.models.guests import GuestDetails as ModelsGuestDetails
 from app.models.guests import GuestID as ModelsGuestID
 from app.models.guests import Guests as ModelsGuests
+from app.models.guests import GuestsBatch as ModelsGuestsBatch
 from app.models.guests import GuestsDetails as ModelsGuestsDetails
+from app.models.guests import GuestsDetailsBatch as ModelsGuestsDetailsBatch
 from app.models.guests import GuestSlug as ModelsGuestSlug
 from app.models.messages import MessageDetails
+from app.pagination import MAX_PAGE_SIZE, CollectionIndex, page_response
+from app.serialization import FastJSONRoute, streaming_model_response
 
-router = APIRouter(prefix=f"/v{API_VERSION}/guests")
-_config = load_config()
-_database_config = _config["database"]
-_database_connection = mysql.connector.connect(**_database_config)
+router = APIRouter(prefix=f"/v{API_VERSION}/guests", route_class=FastJSONRoute)
+_collection_index = CollectionIndex(Guest, sort_fields=("name",))
 
 
 @router.get(
@@ -36,16 +41,34 @@ _database_connection = mysql.connector.connect(**_database_config)
     tags=["Guests"],
 )
 @router.head("", include_in_schema=False)
-async def get_guests():
+async def get_guests(
+    request: Request,
+    limit: Annotated[
+        int | None,
+        Query(title="Maximum number of guests to return", ge=1, le=MAX_PAGE_SIZE),
+    ] = None,
+    cursor: Annotated[
+        str | None, Query(title="Cursor returned with the previous page")
+    ] = None,
+):
     """Retrieve All Not My Job Guests.
 
     Returned data: Guest ID, name and slug string.
 
     Guests are sorted by guest name.
+
+    Use `limit` to retrieve one page of guests at a time. The cursor
+    for the next page is returned in the `X-Next-Cursor` response
+    header and is passed back using `cursor`.
     """
     try:
-        guest = Guest(database_connection=_database_connection)
-        guests = guest.retrieve_all()
+        if limit or cursor:
+            page = await _collection_index.page(cursor, limit)
+            return page_response(
+                request, ModelsGuests, "guests", page.rows, page.next_cursor
+            )
+
+        guests = await run_query(Guest, "retrieve_all")
 
         if guests:
             return {"guests": guests}
@@ -81,8 +104,7 @@ async def get_guest_by_id(
     Returned data: Guest ID, name and slug string.
     """
     try:
-        guest = Guest(database_connection=_database_connection)
-        guest_info = guest.retrieve_by_id(guest_id)
+        guest_info = await run_query(Guest, "retrieve_by_id", guest_id)
 
         if guest_info:
             return guest_info
@@ -123,8 +145,7 @@ async def get_guest_by_slug(
     Returned data: Guest ID, name and slug string.
     """
     try:
-        guest = Guest(database_connection=_database_connection)
-        guest_info = guest.retrieve_by_slug(guest_slug.strip())
+        guest_info = await run_query(Guest, "retrieve_by_slug", guest_slug.strip())
 
         if guest_info:
             return guest_info
@@ -159,19 +180,38 @@ async def get_guest_by_slug(
     tags=["Guests"],
 )
 @router.head("/details", include_in_schema=False)
-async def get_guests_details():
+async def get_guests_details(
+    request: Request,
+    limit: Annotated[
+        int | None,
+        Query(title="Maximum number of guests to return", ge=1, le=MAX_PAGE_SIZE),
+    ] = None,
+    cursor: Annotated[
+        str | None, Query(title="Cursor returned with the previous page")
+    ] = None,
+):
     """Retrieve Details for All Not My Job Guests.
 
     Returned data: Guest ID, name, slug string, appearances and scores.
 
     Guests are sorted by guest name. Appearances are sorted by date.
+
+    Use `limit` to retrieve one page of guests at a time. The cursor
+    for the next page is returned in the `X-Next-Cursor` response
+    header and is passed back using `cursor`.
     """
     try:
-        guest = Guest(database_connection=_database_connection)
-        guests = guest.retrieve_all_details()
-
-        if guests:
-            return {"guests": guests}
+        if limit or cursor:
+            page = await _collection_index.page(cursor, limit)
+            guests = await run_query_each(Guest, "retrieve_details_by_id", page.ids)
+            return page_response(
+                request, ModelsGuestsDetails, "guests", guests, page.next_cursor
+            )
+
+        if await _collection_index.rows():
+            return streaming_model_response(
+                ModelsGuestsDetails, "guests", _collection_index.iter_details()
+            )
 
         return JSONResponse(status_code=404, content={"detail": "No guests found"})
     except ProgrammingError:
@@ -206,8 +246,7 @@ async def get_guest_details_by_id(
     Appearances are sorted by date.
     """
     try:
-        guest = Guest(database_connection=_database_connection)
-        guest_details = guest.retrieve_details_by_id(guest_id)
+        guest_details = await run_query(Guest, "retrieve_details_by_id", guest_id)
 
         if guest_details:
             return guest_details
@@ -235,21 +274,49 @@ async def get_guest_details_by_id(
 @router.get(
     "/details/random",
     summary="Retrieve Information and Appearances for a Random Not My Job Guest",
-    response_model=ModelsGuestDetails,
+    response_model=ModelsGuestDetails | ModelsGuestsDetails,
     responses={404: {"model": MessageDetails}, 500: {"model": MessageDetails}},
     tags=["Guests"],
 )
 @router.head("/details/random", include_in_schema=False)
-async def get_random_guest_details():
+async def get_random_guest_details(
+    count: Annotated[
+        int | None,
+        Query(title="Number of random guests to return", ge=1, le=MAX_PAGE_SIZE),
+    ] = None,
+    seed: Annotated[
+        str | None,
+        Query(title="Seed used to return the same random guests", max_length=64),
+    ] = None,
+):
     """Retrieve a Random Not My Job Guest.
 
     Returned data: Guest ID, name, slug string, appearances and scores.
 
     Appearances are sorted by date.
+
+    Use `count` to retrieve a list of distinct random guests in a single
+    response, and `seed` to retrieve the same random guests each time
+    the same seed is used.
     """
     try:
-        guest = Guest(database_connection=_database_connection)
-        guest_details = guest.retrieve_random_details()
+        if count or seed is not None:
+            response = await random_sample_response(
+                ModelsGuestsDetails,
+                "guests",
+                Guest,
+                "retrieve_details_by_id",
+                count,
+                seed,
+            )
+            if response:
+                return response
+
+            return JSONResponse(
+                status_code=404, content={"detail": "Random guests not found"}
+            )
+
+        guest_details = await run_query(Guest, "retrieve_random_details")
 
         if guest_details:
             return guest_details
@@ -292,8 +359,9 @@ async def get_guest_details_by_slug(
     Appearances are sorted by date.
     """
     try:
-        guest = Guest(database_connection=_database_connection)
-        guest_details = guest.retrieve_details_by_slug(guest_slug.strip())
+        guest_details = await run_query(
+            Guest, "retrieve_details_by_slug", guest_slug.strip()
+        )
 
         if guest_details:
             return guest_details
@@ -323,19 +391,42 @@ async def get_guest_details_by_slug(
 @router.get(
     "/random",
     summary="Retrieve Information for a Random Not My Job Guest",
-    response_model=ModelsGuest,
+    response_model=ModelsGuest | ModelsGuests,
     responses={404: {"model": MessageDetails}, 500: {"model": MessageDetails}},
     tags=["Guests"],
 )
 @router.head("/random", include_in_schema=False)
-async def get_random_guest():
+async def get_random_guest(
+    count: Annotated[
+        int | None,
+        Query(title="Number of random guests to return", ge=1, le=MAX_PAGE_SIZE),
+    ] = None,
+    seed: Annotated[
+        str | None,
+        Query(title="Seed used to return the same random guests", max_length=64),
+    ] = None,
+):
     """Retrieve a Random Not My Job Guest.
 
     Returned data: Guest ID, name and slug string.
+
+    Use `count` to retrieve a list of distinct random guests in a single
+    response, and `seed` to retrieve the same random guests each time
+    the same seed is used.
     """
     try:
-        guest = Guest(database_connection=_database_connection)
-        guest_info = guest.retrieve_random()
+        if count or seed is not None:
+            response = await random_sample_response(
+                ModelsGuests, "guests", Guest, "retrieve_by_id", count, seed
+            )
+            if response:
+                return response
+
+            return JSONResponse(
+                status_code=404, content={"detail": "Random guests not found"}
+            )
+
+        guest_info = await run_query(Guest, "retrieve_random")
 
         if guest_info:
             return guest_info
@@ -374,8 +465,7 @@ async def get_random_guest_id():
     Returned data: Guest ID.
     """
     try:
-        guest = Guest(database_connection=_database_connection)
-        guest_id = guest.retrieve_random_id()
+        guest_id = await run_query(Guest, "retrieve_random_id")
 
         if guest_id:
             return {"id": guest_id}
@@ -414,8 +504,7 @@ async def get_random_guest_slug():
     Returned data: Guest slug string.
     """
     try:
-        guest = Guest(database_connection=_database_connection)
-        guest_slug = guest.retrieve_random_slug()
+        guest_slug = await run_query(Guest, "retrieve_random_slug")
 
         if guest_slug:
             return {"slug": guest_slug}
@@ -439,3 +528,99 @@ async def get_random_guest_slug():
                 "detail": "Database error occurred while trying to retrieve a random guest slug string"
             },
         )
+
+
+@router.get(
+    "/batch",
+    summary="Retrieve Information for a Batch of Not My Job Guests",
+    response_model=ModelsGuestsBatch,
+    responses={400: {"model": MessageDetails}, 500: {"model": MessageDetails}},
+    tags=["Guests"],
+)
+@router.head("/batch", include_in_schema=False)
+async def get_guests_batch(
+    ids: Annotated[
+        str | None,
+        Query(title="Comma-separated list of guest IDs", pattern=IDS_PATTERN),
+    ] = None,
+    slugs: Annotated[
+        str | None, Query(title="Comma-separated list of guest slug strings")
+    ] = None,
+):
+    """Retrieve a Batch of Not My Job Guests by IDs and Slug Strings.
+
+    Returned data: Guest ID, name and slug string, and the IDs and slug
+    strings that were not found.
+
+    Guests are returned in the order requested. IDs and slug strings are
+    passed as comma-separated lists using `ids` and `slugs`.
+    """
+    return await batch_response("guests", Guest, parse_ids(ids), parse_keys(slugs))
+
+
+@router.post(
+    "/batch",
+    summary="Retrieve Information for a Batch of Not My Job Guests",
+    response_model=ModelsGuestsBatch,
+    responses={400: {"model": MessageDetails}, 500: {"model": MessageDetails}},
+    tags=["Guests"],
+)
+async def post_guests_batch(batch: BatchRequest):
+    """Retrieve a Batch of Not My Job Guests by IDs and Slug Strings.
+
+    Returned data: Guest ID, name and slug string, and the IDs and slug
+    strings that were not found.
+
+    Guests are returned in the order requested. IDs and slug strings are
+    passed as lists using `ids` and `slugs` in the request body.
+    """
+    return await batch_response("guests", Guest, batch.ids, batch.slugs)
+
+
+@router.get(
+    "/details/batch",
+    summary="Retrieve Details for a Batch of Not My Job Guests",
+    response_model=ModelsGuestsDetailsBatch,
+    responses={400: {"model": MessageDetails}, 500: {"model": MessageDetails}},
+    tags=["Guests"],
+)
+@router.head("/details/batch", include_in_schema=False)
+async def get_guests_details_batch(
+    ids: Annotated[
+        str | None,
+        Query(title="Comma-separated list of guest IDs", pattern=IDS_PATTERN),
+    ] = None,
+    slugs: Annotated[
+        str | None, Query(title="Comma-separated list of guest slug strings")
+    ] = None,
+):
+    """Retrieve Details for a Batch of Not My Job Guests by IDs and Slug Strings.
+
+    Returned data: Guest ID, name, slug string, appearances and scores,
+    and the IDs and slug strings that were not found.
+
+    Guests are returned in the order requested. IDs and slug strings are
+    passed as comma-separated lists using `ids` and `slugs`.
+    """
+    return await batch_response(
+        "guests", Guest, parse_ids(ids), parse_keys(slugs), details=True
+    )
+
+
+@router.post(
+    "/details/batch",
+    summary="Retrieve Details for a Batch of Not My Job Guests",
+    response_model=ModelsGuestsDetailsBatch,
+    responses={400: {"model": MessageDetails}, 500: {"model": MessageDetails}},
+    tags=["Guests"],
+)
+async def post_guests_details_batch(batch: BatchRequest):
+    """Retrieve Details for a Batch of Not My Job Guests by IDs and Slug Strings.
+
+    Returned data: Guest ID, name, slug string, appearances and scores,
+    and the IDs and slug strings that were not found.
+
+    Guests are returned in the order requested. IDs and slug strings are
+    passed as lists using `ids` and `slugs` in the request body.
+    """
+    return await batch_response("guests", Guest, batch.ids, batch.slugs, details=True)
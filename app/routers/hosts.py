@@ -7,25 +7,30 @@
 
 from typing import Annotated
 
-import mysql.connector
-from fastapi import APIRouter, Path
+from fastapi import APIRouter, Path, Query, Request
 from fastapi.responses import JSONResponse
 from mysql.connector.errors import DatabaseError, ProgrammingError
 from wwdtm.host import Host
 
-from app.config import API_VERSION, load_config
+from app.batch import IDS_PATTERN, batch_response, parse_ids, parse_keys
+from app.config import API_VERSION
+from app.dispatch import run_query, run_query_each
+from app.existence import random_sample_response
+from app.models.batch import BatchRequest
 from app.models.hosts import Host as ModelsHost
 from app.models.hosts import HostDetails as ModelsHostDetails
 from app.models.hosts import HostID as ModelsHostID
 from app.models.hosts import Hosts as ModelsHosts
+from app.models.hosts import HostsBatch as ModelsHostsBatch
 from app.models.hosts import HostsDetails as ModelsHostsDetails
+from app.models.hosts import HostsDetailsBatch as ModelsHostsDetailsBatch
 from app.models.hosts import HostSlug as ModelsHostSlug
 from app.models.messages import MessageDetails
+from app.pagination import MAX_PAGE_SIZE, CollectionIndex, page_response
+from app.serialization import FastJSONRoute, streaming_model_response
 
-router = APIRouter(prefix=f"/v{API_VERSION}/hosts")
-_config = load_config()
-_database_config = _config["database"]
-_database_connection = mysql.connector.connect(**_database_config)
+router = APIRouter(prefix=f"/v{API_VERSION}/hosts", route_class=FastJSONRoute)
+_collection_index = CollectionIndex(Host, sort_fields=("name",))
 
 
 @router.get(
@@ -36,16 +41,34 @@ _database_connection = mysql.connector.connect(**_database_config)
     tags=["Hosts"],
 )
 @router.head("", include_in_schema=False)
-async def get_hosts():
+async def get_hosts(
+    request: Request,
+    limit: Annotated[
+        int | None,
+        Query(title="Maximum number of hosts to return", ge=1, le=MAX_PAGE_SIZE),
+    ] = None,
+    cursor: Annotated[
+        str | None, Query(title="Cursor returned with the previous page")
+    ] = None,
+):
     """Retrieve All Hosts.
 
     Returned data: Host ID, name, slug string and gender.
 
     Hosts are sorted by host name.
+
+    Use `limit` to retrieve one page of hosts at a time. The cursor
+    for the next page is returned in the `X-Next-Cursor` response
+    header and is passed back using `cursor`.
     """
     try:
-        host = Host(database_connection=_database_connection)
-        hosts = host.retrieve_all()
+        if limit or cursor:
+            page = await _collection_index.page(cursor, limit)
+            return page_response(
+                request, ModelsHosts, "hosts", page.rows, page.next_cursor
+            )
+
+        hosts = await run_query(Host, "retrieve_all")
 
         if hosts:
             return {"hosts": hosts}
@@ -81,8 +104,7 @@ async def get_host_by_id(
     Returned data: Host ID, name, slug string and gender.
     """
     try:
-        host = Host(database_connection=_database_connection)
-        host_info = host.retrieve_by_id(host_id)
+        host_info = await run_query(Host, "retrieve_by_id", host_id)
 
         if host_info:
             return host_info
@@ -123,8 +145,7 @@ async def get_host_by_slug(
     Returned data: Host ID, name, slug string and gender.
     """
     try:
-        host = Host(database_connection=_database_connection)
-        host_info = host.retrieve_by_slug(host_slug)
+        host_info = await run_query(Host, "retrieve_by_slug", host_slug)
 
         if host_info:
             return host_info
@@ -159,19 +180,38 @@ async def get_host_by_slug(
     tags=["Hosts"],
 )
 @router.head("/details", include_in_schema=False)
-async def get_hosts_details():
+async def get_hosts_details(
+    request: Request,
+    limit: Annotated[
+        int | None,
+        Query(title="Maximum number of hosts to return", ge=1, le=MAX_PAGE_SIZE),
+    ] = None,
+    cursor: Annotated[
+        str | None, Query(title="Cursor returned with the previous page")
+    ] = None,
+):
     """Retrieve Details for All Hosts.
 
     Returned data: Host ID, name, slug string, gender, and appearances.
 
     Hosts are sorted by host name. Appearances are sorted by date.
+
+    Use `limit` to retrieve one page of hosts at a time. The cursor
+    for the next page is returned in the `X-Next-Cursor` response
+    header and is passed back using `cursor`.
     """
     try:
-        host = Host(database_connection=_database_connection)
-        hosts = host.retrieve_all_details()
-
-        if hosts:
-            return {"hosts": hosts}
+        if limit or cursor:
+            page = await _collection_index.page(cursor, limit)
+            hosts = await run_query_each(Host, "retrieve_details_by_id", page.ids)
+            return page_response(
+                request, ModelsHostsDetails, "hosts", hosts, page.next_cursor
+            )
+
+        if await _collection_index.rows():
+            return streaming_model_response(
+                ModelsHostsDetails, "hosts", _collection_index.iter_details()
+            )
 
         return JSONResponse(status_code=404, content={"detail": "No hosts found"})
     except ProgrammingError:
@@ -206,8 +246,7 @@ async def get_host_details_by_id(
     Appearances are sorted by date.
     """
     try:
-        host = Host(database_connection=_database_connection)
-        host_details = host.retrieve_details_by_id(host_id)
+        host_details = await run_query(Host, "retrieve_details_by_id", host_id)
 
         if host_details:
             return host_details
@@ -235,21 +274,44 @@ async def get_host_details_by_id(
 @router.get(
     "/details/random",
     summary="Retrieve Information and Appearances for a Random Host",
-    response_model=ModelsHostDetails,
+    response_model=ModelsHostDetails | ModelsHostsDetails,
     responses={404: {"model": MessageDetails}, 500: {"model": MessageDetails}},
     tags=["Hosts"],
 )
 @router.head("/details/random", include_in_schema=False)
-async def get_random_host_details():
+async def get_random_host_details(
+    count: Annotated[
+        int | None,
+        Query(title="Number of random hosts to return", ge=1, le=MAX_PAGE_SIZE),
+    ] = None,
+    seed: Annotated[
+        str | None,
+        Query(title="Seed used to return the same random hosts", max_length=64),
+    ] = None,
+):
     """Retrieve a Random Host.
 
     Returned data: Host ID, name, slug string, gender, and appearances.
 
     Appearances are sorted by date.
+
+    Use `count` to retrieve a list of distinct random hosts in a single
+    response, and `seed` to retrieve the same random hosts each time the
+    same seed is used.
     """
     try:
-        host = Host(database_connection=_database_connection)
-        host_details = host.retrieve_random_details()
+        if count or seed is not None:
+            response = await random_sample_response(
+                ModelsHostsDetails, "hosts", Host, "retrieve_details_by_id", count, seed
+            )
+            if response:
+                return response
+
+            return JSONResponse(
+                status_code=404, content={"detail": "Random hosts not found"}
+            )
+
+        host_details = await run_query(Host, "retrieve_random_details")
 
         if host_details:
             return host_details
@@ -292,8 +354,7 @@ async def get_host_details_by_slug(
     Appearances are sorted by date.
     """
     try:
-        host = Host(database_connection=_database_connection)
-        host_details = host.retrieve_details_by_slug(host_slug)
+        host_details = await run_query(Host, "retrieve_details_by_slug", host_slug)
 
         if host_details:
             return host_details
@@ -323,19 +384,42 @@ async def get_host_details_by_slug(
 @router.get(
     "/random",
     summary="Retrieve Information for a Random Host",
-    response_model=ModelsHost,
+    response_model=ModelsHost | ModelsHosts,
     responses={404: {"model": MessageDetails}, 500: {"model": MessageDetails}},
     tags=["Hosts"],
 )
 @router.head("/random", include_in_schema=False)
-async def get_random_host():
+async def get_random_host(
+    count: Annotated[
+        int | None,
+        Query(title="Number of random hosts to return", ge=1, le=MAX_PAGE_SIZE),
+    ] = None,
+    seed: Annotated[
+        str | None,
+        Query(title="Seed used to return the same random hosts", max_length=64),
+    ] = None,
+):
     """Retrieve a Random Host.
 
     Returned data: Host ID, name, slug string and gender.
+
+    Use `count` to retrieve a list of distinct random hosts in a single
+    response, and `seed` to retrieve the same random hosts each time the
+    same seed is used.
     """
     try:
-        host = Host(database_connection=_database_connection)
-        host_info = host.retrieve_random()
+        if count or seed is not None:
+            response = await random_sample_response(
+                ModelsHosts, "hosts", Host, "retrieve_by_id", count, seed
+            )
+            if response:
+                return response
+
+            return JSONResponse(
+                status_code=404, content={"detail": "Random hosts not found"}
+            )
+
+        host_info = await run_query(Host, "retrieve_random")
 
         if host_info:
             return host_info
@@ -374,8 +458,7 @@ async def get_random_host_id():
     Returned data: Host ID.
     """
     try:
-        host = Host(database_connection=_database_connection)
-        host_id = host.retrieve_random_id()
+        host_id = await run_query(Host, "retrieve_random_id")
 
         if host_id:
             return {"id": host_id}
@@ -414,8 +497,7 @@ async def get_random_host_slug():
     Returned data: Host slug string.
     """
     try:
-        host = Host(database_connection=_database_connection)
-        host_slug = host.retrieve_random_slug()
+        host_slug = await run_query(Host, "retrieve_random_slug")
 
         if host_slug:
             return {"slug": host_slug}
@@ -439,3 +521,99 @@ async def get_random_host_slug():
                 "detail": "Database error occurred while trying to retrieve a random host slug string"
             },
         )
+
+
+@router.get(
+    "/batch",
+    summary="Retrieve Information for a Batch of Hosts",
+    response_model=ModelsHostsBatch,
+    responses={400: {"model": MessageDetails}, 500: {"model": MessageDetails}},
+    tags=["Hosts"],
+)
+@router.head("/batch", include_in_schema=False)
+async def get_hosts_batch(
+    ids: Annotated[
+        str | None,
+        Query(title="Comma-separated list of host IDs", pattern=IDS_PATTERN),
+    ] = None,
+    slugs: Annotated[
+        str | None, Query(title="Comma-separated list of host slug strings")
+    ] = None,
+):
+    """Retrieve a Batch of Hosts by IDs and Slug Strings.
+
+    Returned data: Host ID, name, slug string and gender, and the IDs
+    and slug strings that were not found.
+
+    Hosts are returned in the order requested. IDs and slug strings are
+    passed as comma-separated lists using `ids` and `slugs`.
+    """
+    return await batch_response("hosts", Host, parse_ids(ids), parse_keys(slugs))
+
+
+@router.post(
+    "/batch",
+    summary="Retrieve Information for a Batch of Hosts",
+    response_model=ModelsHostsBatch,
+    responses={400: {"model": MessageDetails}, 500: {"model": MessageDetails}},
+    tags=["Hosts"],
+)
+async def post_hosts_batch(batch: BatchRequest):
+    """Retrieve a Batch of Hosts by IDs and Slug Strings.
+
+    Returned data: Host ID, name, slug string and gender, and the IDs
+    and slug strings that were not found.
+
+    Hosts are returned in the order requested. IDs and slug strings are
+    passed as lists using `ids` and `slugs` in the request body.
+    """
+    return await batch_response("hosts", Host, batch.ids, batch.slugs)
+
+
+@router.get(
+    "/details/batch",
+    summary="Retrieve Details for a Batch of Hosts",
+    response_model=ModelsHostsDetailsBatch,
+    responses={400: {"model": MessageDetails}, 500: {"model": MessageDetails}},
+    tags=["Hosts"],
+)
+@router.head("/details/batch", include_in_schema=False)
+async def get_hosts_details_batch(
+    ids: Annotated[
+        str | None,
+        Query(title="Comma-separated list of host IDs", pattern=IDS_PATTERN),
+    ] = None,
+    slugs: Annotated[
+        str | None, Query(title="Comma-separated list of host slug strings")
+    ] = None,
+):
+    """Retrieve Details for a Batch of Hosts by IDs and Slug Strings.
+
+    Returned data: Host ID, name, slug string, gender, and appearances,
+    and the IDs and slug strings that were not found.
+
+    Hosts are returned in the order requested. IDs and slug strings are
+    passed as comma-separated lists using `ids` and `slugs`.
+    """
+    return await batch_response(
+        "hosts", Host, parse_ids(ids), parse_keys(slugs), details=True
+    )
+
+
+@router.post(
+    "/details/batch",
+    summary="Retrieve Details for a Batch of Hosts",
+    response_model=ModelsHostsDetailsBatch,
+    responses={400: {"model": MessageDetails}, 500: {"model": MessageDetails}},
+    tags=["Hosts"],
+)
+async def post_hosts_details_batch(batch: BatchRequest):
+    """Retrieve Details for a Batch of Hosts by IDs and Slug Strings.
+
+    Returned data: Host ID, name, slug string, gender, and appearances,
+    and the IDs and slug strings that were not found.
+
+    Hosts are returned in the order requested. IDs and slug strings are
+    passed as lists using `ids` and `slugs` in the request body.
+    """
+    return await batch_response("hosts", Host, batch.ids, batch.slugs, details=True)
@@ -7,18 +7,23 @@
 
 from typing import Annotated
 
-import mysql.connector
-from fastapi import APIRouter, Path
+from fastapi import APIRouter, Path, Query, Request
 from fastapi.responses import JSONResponse
 from mysql.connector.errors import DatabaseError, ProgrammingError
 from wwdtm.location import Location
 
-from app.config import API_VERSION, load_config
+from app.batch import IDS_PATTERN, batch_response, parse_ids, parse_keys
+from app.config import API_VERSION
+from app.dispatch import run_query, run_query_each
+from app.existence import random_sample_response
+from app.models.batch import BatchRequest
 from app.models.locations import Location as ModelsLocation
 from app.models.locations import LocationDetails as ModelsLocationDetails
 from app.models.locations import LocationID as ModelsLocationID
 from app.models.locations import Locations as ModelsLocations
+from app.models.locations import LocationsBatch as ModelsLocationsBatch
 from app.models.locations import LocationsDetails as ModelsLocationsDetails
+from app.models.locations import LocationsDetailsBatch as ModelsLocationsDetailsBatch
 from app.models.locations import LocationSlug as ModelsLocationSlug
 from app.models.locations import (
     PostalAbbreviationDetails as ModelsPostalAbbreviationDetails,
@@ -28,11 +33,13 @@ from app.models.locations import (
     PostalAbbreviationsDetails as ModelsPostalAbbreviationsDetails,
 )
 from app.models.messages import MessageDetails
+from app.pagination import MAX_PAGE_SIZE, CollectionIndex, page_response
+from app.serialization import FastJSONRoute, streaming_model_response
 
-router = APIRouter(prefix=f"/v{API_VERSION}/locations")
-_config = load_config()
-_database_config = _config["database"]
-_database_connection = mysql.connector.connect(**_database_config)
+router = APIRouter(prefix=f"/v{API_VERSION}/locations", route_class=FastJSONRoute)
+_collection_index = CollectionIndex(
+    Location, sort_fields=("venue", "city", "state"), sort_by_venue=True
+)
 
 
 @router.get(
@@ -43,16 +50,34 @@ _database_connection = mysql.connector.connect(**_database_config)
     tags=["Locations"],
 )
 @router.head("", include_in_schema=False)
-async def get_locations():
+async def get_locations(
+    request: Request,
+    limit: Annotated[
+        int | None,
+        Query(title="Maximum number of locations to return", ge=1, le=MAX_PAGE_SIZE),
+    ] = None,
+    cursor: Annotated[
+        str | None, Query(title="Cursor returned with the previous page")
+    ] = None,
+):
     """Retrieve All Show Locations.
 
     Returned data: Location ID, city, state, venue and slug string.
 
     Locations are sorted by venue name, city, and state.
+
+    Use `limit` to retrieve one page of locations at a time. The cursor
+    for the next page is returned in the `X-Next-Cursor` response
+    header and is passed back using `cursor`.
     """
     try:
-        location = Location(database_connection=_database_connection)
-        locations = location.retrieve_all(sort_by_venue=True)
+        if limit or cursor:
+            page = await _collection_index.page(cursor, limit)
+            return page_response(
+                request, ModelsLocations, "locations", page.rows, page.next_cursor
+            )
+
+        locations = await run_query(Location, "retrieve_all", sort_by_venue=True)
 
         if locations:
             return {"locations": locations}
@@ -90,8 +115,7 @@ async def get_location_by_id(
     Returned data: Location ID, city, state, venue and slug string.
     """
     try:
-        location = Location(database_connection=_database_connection)
-        location_info = location.retrieve_by_id(location_id)
+        location_info = await run_query(Location, "retrieve_by_id", location_id)
 
         if location_info:
             return location_info
@@ -133,8 +157,9 @@ async def get_location_by_slug(
     Returned data: Location ID, city, state, venue and slug string.
     """
     try:
-        location = Location(database_connection=_database_connection)
-        location_info = location.retrieve_by_slug(location_slug.strip())
+        location_info = await run_query(
+            Location, "retrieve_by_slug", location_slug.strip()
+        )
 
         if location_info:
             return location_info
@@ -170,7 +195,16 @@ async def get_location_by_slug(
     tags=["Locations"],
 )
 @router.head("/recordings", include_in_schema=False)
-async def get_locations_details():
+async def get_locations_details(
+    request: Request,
+    limit: Annotated[
+        int | None,
+        Query(title="Maximum number of locations to return", ge=1, le=MAX_PAGE_SIZE),
+    ] = None,
+    cursor: Annotated[
+        str | None, Query(title="Cursor returned with the previous page")
+    ] = None,
+):
     """Retrieve Details for All Show Locations.
 
     Returned data: Location ID, city, state, venue, slug string and
@@ -178,13 +212,29 @@ async def get_locations_details():
 
     Locations are sorted by venue name, city, and state. Recordings are
     sorted by show date.
+
+    Use `limit` to retrieve one page of locations at a time. The cursor
+    for the next page is returned in the `X-Next-Cursor` response
+    header and is passed back using `cursor`.
     """
     try:
-        location = Location(database_connection=_database_connection)
-        locations = location.retrieve_all_details(sort_by_venue=True)
-
-        if locations:
-            return {"locations": locations}
+        if limit or cursor:
+            page = await _collection_index.page(cursor, limit)
+            locations = await run_query_each(
+                Location, "retrieve_details_by_id", page.ids
+            )
+            return page_response(
+                request,
+                ModelsLocationsDetails,
+                "locations",
+                locations,
+                page.next_cursor,
+            )
+
+        if await _collection_index.rows():
+            return streaming_model_response(
+                ModelsLocationsDetails, "locations", _collection_index.iter_details()
+            )
 
         return JSONResponse(status_code=404, content={"detail": "No locations found"})
     except ProgrammingError:
@@ -222,8 +272,9 @@ async def get_location_details_by_id(
     Recordings are sorted by show date.
     """
     try:
-        location = Location(database_connection=_database_connection)
-        location_recordings = location.retrieve_details_by_id(location_id)
+        location_recordings = await run_query(
+            Location, "retrieve_details_by_id", location_id
+        )
 
         if location_recordings:
             return location_recordings
@@ -252,21 +303,49 @@ async def get_location_details_by_id(
 @router.get(
     "/recordings/random",
     summary="Retrieve Information and Recordings for a Random Location",
-    response_model=ModelsLocationDetails,
+    response_model=ModelsLocationDetails | ModelsLocationsDetails,
     responses={404: {"model": MessageDetails}, 500: {"model": MessageDetails}},
     tags=["Locations"],
 )
 @router.head("/recordings/random", include_in_schema=False)
-async def get_random_location_details():
+async def get_random_location_details(
+    count: Annotated[
+        int | None,
+        Query(title="Number of random locations to return", ge=1, le=MAX_PAGE_SIZE),
+    ] = None,
+    seed: Annotated[
+        str | None,
+        Query(title="Seed used to return the same random locations", max_length=64),
+    ] = None,
+):
     """Retrieve a Random Location.
 
     Returned data: Location ID, venue, city, state, slug string, and recordings.
 
     Appearances are sorted by date.
+
+    Use `count` to retrieve a list of distinct random locations in a
+    single response, and `seed` to retrieve the same random locations
+    each time the same seed is used.
     """
     try:
-        location = Location(database_connection=_database_connection)
-        location_details = location.retrieve_random_details()
+        if count or seed is not None:
+            response = await random_sample_response(
+                ModelsLocationsDetails,
+                "locations",
+                Location,
+                "retrieve_details_by_id",
+                count,
+                seed,
+            )
+            if response:
+                return response
+
+            return JSONResponse(
+                status_code=404, content={"detail": "Random locations not found"}
+            )
+
+        location_details = await run_query(Location, "retrieve_random_details")
 
         if location_details:
             return location_details
@@ -311,8 +390,9 @@ async def get_location_details_by_slug(
     Recordings are sorted by show date.
     """
     try:
-        location = Location(database_connection=_database_connection)
-        location_details = location.retrieve_details_by_slug(location_slug.strip())
+        location_details = await run_query(
+            Location, "retrieve_details_by_slug", location_slug.strip()
+        )
 
         if location_details:
             return location_details
@@ -357,8 +437,7 @@ async def get_postal_abbreviations() -> list[str]:
     Postal abbreviations are sorted alphabetically.
     """
     try:
-        location = Location(database_connection=_database_connection)
-        abbreviations = location.retrieve_postal_abbreviations()
+        abbreviations = await run_query(Location, "retrieve_postal_abbreviations")
 
         if abbreviations:
             return list(abbreviations.keys())
@@ -397,8 +476,7 @@ async def get_postal_abbreviations_details() -> list[dict[str, str]]:
     Postal abbreviations are sorted alphabetically.
     """
     try:
-        location = Location(database_connection=_database_connection)
-        abbreviations = location.retrieve_postal_abbreviations_list()
+        abbreviations = await run_query(Location, "retrieve_postal_abbreviations_list")
 
         if abbreviations:
             return {"postal_abbreviations": abbreviations}
@@ -439,9 +517,10 @@ async def get_postal_abbreviation_details(
     territory, and country.
     """
     try:
-        location = Location(database_connection=_database_connection)
-        info = location.retrieve_postal_details_by_abbreviation(
-            abbreviation=abbreviation
+        info = await run_query(
+            Location,
+            "retrieve_postal_details_by_abbreviation",
+            abbreviation=abbreviation,
         )
 
         if info:
@@ -473,19 +552,42 @@ async def get_postal_abbreviation_details(
 @router.get(
     "/random",
     summary="Retrieve Information for a Random Location",
-    response_model=ModelsLocation,
+    response_model=ModelsLocation | ModelsLocations,
     responses={404: {"model": MessageDetails}, 500: {"model": MessageDetails}},
     tags=["Locations"],
 )
 @router.head("/random", include_in_schema=False)
-async def get_random_location():
+async def get_random_location(
+    count: Annotated[
+        int | None,
+        Query(title="Number of random locations to return", ge=1, le=MAX_PAGE_SIZE),
+    ] = None,
+    seed: Annotated[
+        str | None,
+        Query(title="Seed used to return the same random locations", max_length=64),
+    ] = None,
+):
     """Retrieve a Random Location.
 
     Returned data: Location ID, venue, city, state and slug string.
+
+    Use `count` to retrieve a list of distinct random locations in a
+    single response, and `seed` to retrieve the same random locations
+    each time the same seed is used.
     """
     try:
-        location = Location(database_connection=_database_connection)
-        location_info = location.retrieve_random()
+        if count or seed is not None:
+            response = await random_sample_response(
+                ModelsLocations, "locations", Location, "retrieve_by_id", count, seed
+            )
+            if response:
+                return response
+
+            return JSONResponse(
+                status_code=404, content={"detail": "Random locations not found"}
+            )
+
+        location_info = await run_query(Location, "retrieve_random")
 
         if location_info:
             return location_info
@@ -525,8 +627,7 @@ async def get_random_location_id():
     Returned data: Location ID.
     """
     try:
-        location = Location(database_connection=_database_connection)
-        location_id = location.retrieve_random_id()
+        location_id = await run_query(Location, "retrieve_random_id")
 
         if location_id:
             return {"id": location_id}
@@ -566,8 +667,7 @@ async def get_random_location_slug():
     Returned data: Location slug string.
     """
     try:
-        location = Location(database_connection=_database_connection)
-        location_slug = location.retrieve_random_slug()
+        location_slug = await run_query(Location, "retrieve_random_slug")
 
         if location_slug:
             return {"slug": location_slug}
@@ -593,3 +693,103 @@ async def get_random_location_slug():
                 "detail": "Database error occurred while trying to retrieve a location host slug string"
             },
         )
+
+
+@router.get(
+    "/batch",
+    summary="Retrieve Information for a Batch of Show Locations",
+    response_model=ModelsLocationsBatch,
+    responses={400: {"model": MessageDetails}, 500: {"model": MessageDetails}},
+    tags=["Locations"],
+)
+@router.head("/batch", include_in_schema=False)
+async def get_locations_batch(
+    ids: Annotated[
+        str | None,
+        Query(title="Comma-separated list of location IDs", pattern=IDS_PATTERN),
+    ] = None,
+    slugs: Annotated[
+        str | None, Query(title="Comma-separated list of location slug strings")
+    ] = None,
+):
+    """Retrieve a Batch of Show Locations by IDs and Slug Strings.
+
+    Returned data: Location ID, city, state, venue and slug string, and
+    the IDs and slug strings that were not found.
+
+    Locations are returned in the order requested. IDs and slug strings
+    are passed as comma-separated lists using `ids` and `slugs`.
+    """
+    return await batch_response(
+        "locations", Location, parse_ids(ids), parse_keys(slugs)
+    )
+
+
+@router.post(
+    "/batch",
+    summary="Retrieve Information for a Batch of Show Locations",
+    response_model=ModelsLocationsBatch,
+    responses={400: {"model": MessageDetails}, 500: {"model": MessageDetails}},
+    tags=["Locations"],
+)
+async def post_locations_batch(batch: BatchRequest):
+    """Retrieve a Batch of Show Locations by IDs and Slug Strings.
+
+    Returned data: Location ID, city, state, venue and slug string, and
+    the IDs and slug strings that were not found.
+
+    Locations are returned in the order requested. IDs and slug strings
+    are passed as lists using `ids` and `slugs` in the request body.
+    """
+    return await batch_response("locations", Location, batch.ids, batch.slugs)
+
+
+@router.get(
+    "/recordings/batch",
+    summary="Retrieve Information and Recordings for a Batch of Show Locations",
+    response_model=ModelsLocationsDetailsBatch,
+    responses={400: {"model": MessageDetails}, 500: {"model": MessageDetails}},
+    tags=["Locations"],
+)
+@router.head("/recordings/batch", include_in_schema=False)
+async def get_locations_details_batch(
+    ids: Annotated[
+        str | None,
+        Query(title="Comma-separated list of location IDs", pattern=IDS_PATTERN),
+    ] = None,
+    slugs: Annotated[
+        str | None, Query(title="Comma-separated list of location slug strings")
+    ] = None,
+):
+    """Retrieve Details for a Batch of Show Locations by IDs and Slug Strings.
+
+    Returned data: Location ID, city, state, venue, slug string and
+    recordings, and the IDs and slug strings that were not found.
+
+    Locations are returned in the order requested. IDs and slug strings
+    are passed as comma-separated lists using `ids` and `slugs`.
+    """
+    return await batch_response(
+        "locations", Location, parse_ids(ids), parse_keys(slugs), details=True
+    )
+
+
+@router.post(
+    "/recordings/batch",
+    summary="Retrieve Information and Recordings for a Batch of Show Locations",
+    response_model=ModelsLocationsDetailsBatch,
+    responses={400: {"model": MessageDetails}, 500: {"model": MessageDetails}},
+    tags=["Locations"],
+)
+async def post_locations_details_batch(batch: BatchRequest):
+    """Retrieve Details for a Batch of Show Locations by IDs and Slug Strings.
+
+    Returned data: Location ID, city, state, venue, slug string and
+    recordings, and the IDs and slug strings that were not found.
+
+    Locations are returned in the order requested. IDs and slug strings
+    are passed as lists using `ids` and `slugs` in the request body.
+    """
+    return await batch_response(
+        "locations", Location, batch.ids, batch.slugs, details=True
+    )
@@ -7,33 +7,58 @@
 
 from typing import Annotated
 
-import mysql.connector
-from fastapi import APIRouter, Path
+from fastapi import APIRouter, Path, Query, Request
 from fastapi.responses import JSONResponse
 from mysql.connector.errors import DatabaseError, ProgrammingError
-from wwdtm.panelist import Panelist, PanelistDecimalScores, PanelistScores
+from wwdtm.panelist import PanelistDecimalScores, PanelistScores
 
+from app.batch import IDS_PATTERN, batch_response, parse_ids, parse_keys
 from app.config import API_VERSION, load_config
+from app.details import (
+    PANELIST_DETAILS_PARTS,
+    include_pattern,
+    parse_include,
+    retrieve_panelist_details,
+)
+from app.dispatch import run_query, run_query_each
+from app.existence import random_sample_response
+from app.models.batch import BatchRequest
 from app.models.messages import MessageDetails
 from app.models.panelists import Panelist as ModelsPanelist
 from app.models.panelists import PanelistDetails as ModelsPanelistDetails
 from app.models.panelists import PanelistID as ModelsPanelistID
 from app.models.panelists import Panelists as ModelsPanelists
+from app.models.panelists import PanelistsBatch as ModelsPanelistsBatch
+from app.models.panelists import PanelistsComparison as ModelsPanelistsComparison
 from app.models.panelists import (
     PanelistScoresGroupedOrderedPair as ModelsPanelistScoresGroupedOrderedPair,
 )
 from app.models.panelists import PanelistScoresList as ModelsPanelistScoresList
+from app.models.panelists import (
+    PanelistScoresMatrix as ModelsPanelistScoresMatrix,
+)
 from app.models.panelists import (
     PanelistScoresOrderedPair as ModelsPanelistScoresOrderedPair,
 )
 from app.models.panelists import PanelistsDetails as ModelsPanelistsDetails
+from app.models.panelists import PanelistsDetailsBatch as ModelsPanelistsDetailsBatch
 from app.models.panelists import PanelistSlug as ModelsPanelistSlug
+from app.pagination import MAX_PAGE_SIZE, CollectionIndex, page_response
+from app.panelist import Panelist
+from app.prerender import PrerenderedResponse
+from app.scores import MAX_COMPARE_PANELISTS, current_score_columns
+from app.serialization import FastJSONRoute, streaming_model_response
 
-router = APIRouter(prefix=f"/v{API_VERSION}/panelists")
+router = APIRouter(prefix=f"/v{API_VERSION}/panelists", route_class=FastJSONRoute)
 _config = load_config()
-_database_config = _config["database"]
 _settings_config = _config["settings"]
-_database_connection = mysql.connector.connect(**_database_config)
+_collection_index = CollectionIndex(Panelist, sort_fields=("name",))
+_prerendered_details = PrerenderedResponse(
+    ModelsPanelistsDetails,
+    "panelists",
+    Panelist,
+    number_decimal_places=_settings_config["number_decimal_places"],
+)
 
 
 @router.get(
@@ -44,16 +69,34 @@ _database_connection = mysql.connector.connect(**_database_config)
     tags=["Panelists"],
 )
 @router.head("", include_in_schema=False)
-async def get_panelists():
+async def get_panelists(
+    request: Request,
+    limit: Annotated[
+        int | None,
+        Query(title="Maximum number of panelists to return", ge=1, le=MAX_PAGE_SIZE),
+    ] = None,
+    cursor: Annotated[
+        str | None, Query(title="Cursor returned with the previous page")
+    ] = None,
+):
     """Retrieve All Panelists.
 
     Returned data: Panelist ID, name, slug string and gender.
 
     Panelists are sorted by panelist name.
+
+    Use `limit` to retrieve one page of panelists at a time. The cursor
+    for the next page is returned in the `X-Next-Cursor` response
+    header and is passed back using `cursor`.
     """
     try:
-        panelist = Panelist(database_connection=_database_connection)
-        panelists = panelist.retrieve_all()
+        if limit or cursor:
+            page = await _collection_index.page(cursor, limit)
+            return page_response(
+                request, ModelsPanelists, "panelists", page.rows, page.next_cursor
+            )
+
+        panelists = await run_query(Panelist, "retrieve_all")
 
         if panelists:
             return {"panelists": panelists}
@@ -91,8 +134,7 @@ async def get_panelist_by_id(
     Returned data: Panelist ID, name, slug string and gender.
     """
     try:
-        panelist = Panelist(database_connection=_database_connection)
-        panelist_info = panelist.retrieve_by_id(panelist_id)
+        panelist_info = await run_query(Panelist, "retrieve_by_id", panelist_id)
 
         if panelist_info:
             return panelist_info
@@ -134,8 +176,9 @@ async def get_panelist_by_slug(
     Returned data: Panelist ID, name, slug string and gender.
     """
     try:
-        panelist = Panelist(database_connection=_database_connection)
-        panelist_info = panelist.retrieve_by_slug(panelist_slug.strip())
+        panelist_info = await run_query(
+            Panelist, "retrieve_by_slug", panelist_slug.strip()
+        )
 
         if panelist_info:
             return panelist_info
@@ -171,7 +214,16 @@ async def get_panelist_by_slug(
     tags=["Panelists"],
 )
 @router.head("/details", include_in_schema=False)
-async def get_panelists_details():
+async def get_panelists_details(
+    request: Request,
+    limit: Annotated[
+        int | None,
+        Query(title="Maximum number of panelists to return", ge=1, le=MAX_PAGE_SIZE),
+    ] = None,
+    cursor: Annotated[
+        str | None, Query(title="Cursor returned with the previous page")
+    ] = None,
+):
     """Retrieve Details for All Panelists.
 
     Returned data: Panelists ID, name, slug string, gender, statistics
@@ -179,15 +231,40 @@ async def get_panelists_details():
 
     Panelists are sorted by panelist name. Appearances are sorted by
     date.
+
+    Use `limit` to retrieve one page of panelists at a time. The cursor
+    for the next page is returned in the `X-Next-Cursor` response
+    header and is passed back using `cursor`.
     """
     try:
-        panelist = Panelist(database_connection=_database_connection)
-        panelists = panelist.retrieve_all_details(
-            number_decimal_places=_settings_config["number_decimal_places"]
-        )
-
-        if panelists:
-            return {"panelists": panelists}
+        if limit or cursor:
+            page = await _collection_index.page(cursor, limit)
+            panelists = await run_query_each(
+                Panelist,
+                "retrieve_details_by_id",
+                page.ids,
+                number_decimal_places=_settings_config["number_decimal_places"],
+            )
+            return page_response(
+                request,
+                ModelsPanelistsDetails,
+                "panelists",
+                panelists,
+                page.next_cursor,
+            )
+
+        response = await _prerendered_details.response(request)
+        if response:
+            return response
+
+        if await _collection_index.rows():
+            return streaming_model_response(
+                ModelsPanelistsDetails,
+                "panelists",
+                _collection_index.iter_details(
+                    number_decimal_places=_settings_config["number_decimal_places"]
+                ),
+            )
 
         return JSONResponse(status_code=404, content={"detail": "No panelists found"})
     except ProgrammingError:
@@ -216,6 +293,13 @@ async def get_panelist_details_by_id(
     panelist_id: Annotated[
         int, Path(title="The ID of the panelist to get", ge=0, lt=2**31)
     ],
+    include: Annotated[
+        str | None,
+        Query(
+            title="Comma-separated list of details to include",
+            pattern=include_pattern(PANELIST_DETAILS_PARTS),
+        ),
+    ] = None,
 ):
     """Retrieve Details for a Panelist by Panelist ID.
 
@@ -223,12 +307,25 @@ async def get_panelist_details_by_id(
     and appearances.
 
     Appearances are sorted by date.
+
+    Use `include` with a comma-separated list of `statistics`, `bluffs`
+    and `appearances` to only retrieve those details. Details that are
+    not included are returned as null.
     """
     try:
-        panelist = Panelist(database_connection=_database_connection)
-        panelist_details = panelist.retrieve_details_by_id(
-            panelist_id, number_decimal_places=_settings_config["number_decimal_places"]
-        )
+        if include:
+            panelist_details = await retrieve_panelist_details(
+                parse_include(include),
+                _settings_config["number_decimal_places"],
+                panelist_id=panelist_id,
+            )
+        else:
+            panelist_details = await run_query(
+                Panelist,
+                "retrieve_details_by_id",
+                panelist_id,
+                number_decimal_places=_settings_config["number_decimal_places"],
+            )
 
         if panelist_details:
             return panelist_details
@@ -257,23 +354,54 @@ async def get_panelist_details_by_id(
 @router.get(
     "/details/random",
     summary="Retrieve Information and Appearances for a Random Panelist",
-    response_model=ModelsPanelistDetails,
+    response_model=ModelsPanelistDetails | ModelsPanelistsDetails,
     responses={404: {"model": MessageDetails}, 500: {"model": MessageDetails}},
     tags=["Panelists"],
 )
 @router.head("/details/random", include_in_schema=False)
-async def get_random_panelist_details():
+async def get_random_panelist_details(
+    count: Annotated[
+        int | None,
+        Query(title="Number of random panelists to return", ge=1, le=MAX_PAGE_SIZE),
+    ] = None,
+    seed: Annotated[
+        str | None,
+        Query(title="Seed used to return the same random panelists", max_length=64),
+    ] = None,
+):
     """Retrieve a Random Panelist.
 
     Returned data: Panelist ID, name, slug string, gender, statistics
     and appearances.
 
     Appearances are sorted by date.
+
+    Use `count` to retrieve a list of distinct random panelists in a
+    single response, and `seed` to retrieve the same random panelists
+    each time the same seed is used.
     """
     try:
-        panelist = Panelist(database_connection=_database_connection)
-        panelist_details = panelist.retrieve_random_details(
-            number_decimal_places=_settings_config["number_decimal_places"]
+        if count or seed is not None:
+            response = await random_sample_response(
+                ModelsPanelistsDetails,
+                "panelists",
+                Panelist,
+                "retrieve_details_by_id",
+                count,
+                seed,
+                number_decimal_places=_settings_config["number_decimal_places"],
+            )
+            if response:
+                return response
+
+            return JSONResponse(
+                status_code=404, content={"detail": "Random panelists not found"}
+            )
+
+        panelist_details = await run_query(
+            Panelist,
+            "retrieve_random_details",
+            number_decimal_places=_settings_config["number_decimal_places"],
         )
 
         if panelist_details:
@@ -310,6 +438,13 @@ async def get_random_panelist_details():
 @router.head("/details/slug/{panelist_slug}", include_in_schema=False)
 async def get_panelist_details_by_slug(
     panelist_slug: Annotated[str, Path(title="The slug string of the panelist to get")],
+    include: Annotated[
+        str | None,
+        Query(
+            title="Comma-separated list of details to include",
+            pattern=include_pattern(PANELIST_DETAILS_PARTS),
+        ),
+    ] = None,
 ):
     """Retrieve Details for a Panelist by Panelist Slug String.
 
@@ -317,13 +452,25 @@ async def get_panelist_details_by_slug(
     and appearances.
 
     Appearances are sorted by date.
+
+    Use `include` with a comma-separated list of `statistics`, `bluffs`
+    and `appearances` to only retrieve those details. Details that are
+    not included are returned as null.
     """
     try:
-        panelist = Panelist(database_connection=_database_connection)
-        panelist_details = panelist.retrieve_details_by_slug(
-            panelist_slug.strip(),
-            number_decimal_places=_settings_config["number_decimal_places"],
-        )
+        if include:
+            panelist_details = await retrieve_panelist_details(
+                parse_include(include),
+                _settings_config["number_decimal_places"],
+                panelist_slug=panelist_slug,
+            )
+        else:
+            panelist_details = await run_query(
+                Panelist,
+                "retrieve_details_by_slug",
+                panelist_slug.strip(),
+                number_decimal_places=_settings_config["number_decimal_places"],
+            )
 
         if panelist_details:
             return panelist_details
@@ -369,11 +516,8 @@ async def get_panelist_scores_by_id(
     Returned data: One array with show dates and one array with scores.
     """
     try:
-        panelist_scores = PanelistDecimalScores(
-            database_connection=_database_connection
-        )
-        scores = panelist_scores.retrieve_scores_list_by_id(
-            panelist_id,
+        scores = await run_query(
+            PanelistDecimalScores, "retrieve_scores_list_by_id", panelist_id
         )
 
         if scores:
@@ -416,10 +560,9 @@ async def get_panelist_scores_by_slug(
     Returned data: One array with show dates and one array with scores.
     """
     try:
-        panelist_scores = PanelistDecimalScores(
-            database_connection=_database_connection
+        scores = await run_query(
+            PanelistDecimalScores, "retrieve_scores_list_by_slug", panelist_slug.strip()
         )
-        scores = panelist_scores.retrieve_scores_list_by_slug(panelist_slug.strip())
 
         if scores:
             return scores
@@ -470,10 +613,11 @@ async def get_panelist_scores_grouped_ordered_pair_by_id(
     and one element with corresponding score count.
     """
     try:
-        panelist_scores = PanelistDecimalScores(
-            database_connection=_database_connection
+        scores = await run_query(
+            PanelistDecimalScores,
+            "retrieve_scores_grouped_ordered_pair_by_id",
+            panelist_id,
         )
-        scores = panelist_scores.retrieve_scores_grouped_ordered_pair_by_id(panelist_id)
 
         if scores:
             return {"scores": scores}
@@ -521,12 +665,10 @@ async def get_panelist_scores_grouped_ordered_pair_by_slug(
     and one element with corresponding score count.
     """
     try:
-        panelist_scores = PanelistDecimalScores(
-            database_connection=_database_connection
-        )
-
-        scores = panelist_scores.retrieve_scores_grouped_ordered_pair_by_slug(
-            panelist_slug.strip()
+        scores = await run_query(
+            PanelistDecimalScores,
+            "retrieve_scores_grouped_ordered_pair_by_slug",
+            panelist_slug.strip(),
         )
 
         if scores:
@@ -575,10 +717,9 @@ async def get_panelist_scores_ordered_pair_by_id(
     date and one element with corresponding score.
     """
     try:
-        panelist_scores = PanelistDecimalScores(
-            database_connection=_database_connection
+        scores = await run_query(
+            PanelistDecimalScores, "retrieve_scores_ordered_pair_by_id", panelist_id
         )
-        scores = panelist_scores.retrieve_scores_ordered_pair_by_id(panelist_id)
 
         if scores:
             return {"scores": scores}
@@ -621,11 +762,10 @@ async def get_panelist_scores_ordered_pair_by_slug(
     date and one element with corresponding score.
     """
     try:
-        panelist_scores = PanelistDecimalScores(
-            database_connection=_database_connection
-        )
-        scores = panelist_scores.retrieve_scores_ordered_pair_by_slug(
-            panelist_slug.strip()
+        scores = await run_query(
+            PanelistDecimalScores,
+            "retrieve_scores_ordered_pair_by_slug",
+            panelist_slug.strip(),
         )
 
         if scores:
@@ -655,22 +795,199 @@ async def get_panelist_scores_ordered_pair_by_slug(
         )
 
 
+@router.get(
+    "/scores/matrix",
+    summary="Retrieve a Matrix of Panelist Scores for Each Show",
+    response_model=ModelsPanelistScoresMatrix,
+    responses={
+        404: {"model": MessageDetails},
+        500: {"model": MessageDetails},
+        503: {"model": MessageDetails},
+    },
+    tags=["Panelists"],
+)
+@router.head("/scores/matrix", include_in_schema=False)
+async def get_panelists_scores_matrix(
+    ids: Annotated[
+        str | None,
+        Query(title="Comma-separated list of panelist IDs", pattern=IDS_PATTERN),
+    ] = None,
+    start_year: Annotated[
+        int | None, Query(title="Only include shows from this year onward", ge=1)
+    ] = None,
+    end_year: Annotated[
+        int | None,
+        Query(title="Only include shows up to and including this year", le=9999),
+    ] = None,
+    encoding: Annotated[
+        str,
+        Query(
+            title="Encoding of the panelist score columns",
+            pattern="^(dense|compact)$",
+        ),
+    ] = "dense",
+):
+    """Retrieve a Matrix of Panelist Scores for Each Show.
+
+    Returned data: One array with show IDs and one array with show
+    dates, sorted by show date, and a column of scores for each
+    panelist.
+
+    Dense columns contain one score for each show, with `null` for each
+    show the panelist did not appear on. Use `encoding=compact` to only
+    include the panelist's appearances in each column, along with the
+    positions of the shows in `rows`. Use `ids` to only include the
+    panelists in a comma-separated list of panelist IDs, and
+    `start_year` and `end_year` to only include shows from a range of
+    years.
+    """
+    try:
+        columns = await current_score_columns()
+        panelist_ids = list(dict.fromkeys(parse_ids(ids))) if ids else None
+        if panelist_ids:
+            not_found = [id_ for id_ in panelist_ids if id_ not in columns.segments]
+            if not_found:
+                return JSONResponse(
+                    status_code=404,
+                    content={
+                        "detail": "Scoring data for Panelist IDs "
+                        f"{', '.join(map(str, not_found))} not found"
+                    },
+                )
+
+        return columns.scores_matrix(
+            panelist_ids,
+            start_year=start_year,
+            end_year=end_year,
+            compact=encoding == "compact",
+        )
+    except ProgrammingError:
+        return JSONResponse(
+            status_code=500, content={"detail": "Unable to retrieve panelist scores"}
+        )
+    except DatabaseError:
+        return JSONResponse(
+            status_code=500,
+            content={
+                "detail": "Database error occurred while trying to retrieve panelist scores"
+            },
+        )
+
+
+@router.get(
+    "/compare",
+    summary="Retrieve a Head-to-Head Comparison of Panelists",
+    response_model=ModelsPanelistsComparison,
+    responses={
+        400: {"model": MessageDetails},
+        404: {"model": MessageDetails},
+        500: {"model": MessageDetails},
+        503: {"model": MessageDetails},
+    },
+    tags=["Panelists"],
+)
+@router.head("/compare", include_in_schema=False)
+async def get_panelists_comparison(
+    ids: Annotated[
+        str,
+        Query(title="Comma-separated list of panelist IDs", pattern=IDS_PATTERN),
+    ],
+):
+    """Retrieve a Head-to-Head Comparison of Panelists.
+
+    Returned data: One array with show IDs and one array with show
+    dates for the shows shared by all of the panelists, an array of
+    scores for those shows for each panelist, and the number of shared
+    appearances, wins, losses, ties, score differentials and ranking
+    counts for each pair of panelists.
+
+    Panelists are passed as a comma-separated list of two or more
+    panelist IDs using `ids`. Wins, losses and ties are based on the
+    panelist and opponent scores for each shared show.
+    """
+    panelist_ids = list(dict.fromkeys(parse_ids(ids)))
+    if len(panelist_ids) < 2:
+        return JSONResponse(
+            status_code=400,
+            content={"detail": "At least two distinct panelist IDs are required"},
+        )
+
+    if len(panelist_ids) > MAX_COMPARE_PANELISTS:
+        return JSONResponse(
+            status_code=400,
+            content={
+                "detail": f"Comparisons are limited to {MAX_COMPARE_PANELISTS} panelists"
+            },
+        )
+
+    try:
+        columns = await current_score_columns()
+        not_found = [id_ for id_ in panelist_ids if id_ not in columns.segments]
+        if not_found:
+            return JSONResponse(
+                status_code=404,
+                content={
+                    "detail": "Scoring data for Panelist IDs "
+                    f"{', '.join(map(str, not_found))} not found"
+                },
+            )
+
+        return columns.compare(
+            panelist_ids,
+            number_decimal_places=_settings_config["number_decimal_places"],
+        )
+    except ProgrammingError:
+        return JSONResponse(
+            status_code=500, content={"detail": "Unable to retrieve panelist scores"}
+        )
+    except DatabaseError:
+        return JSONResponse(
+            status_code=500,
+            content={
+                "detail": "Database error occurred while trying to retrieve panelist scores"
+            },
+        )
+
+
 @router.get(
     "/random",
     summary="Retrieve Information for a Random Panelist",
-    response_model=ModelsPanelist,
+    response_model=ModelsPanelist | ModelsPanelists,
     responses={404: {"model": MessageDetails}, 500: {"model": MessageDetails}},
     tags=["Panelists"],
 )
 @router.head("/random", include_in_schema=False)
-async def get_random_panelist():
+async def get_random_panelist(
+    count: Annotated[
+        int | None,
+        Query(title="Number of random panelists to return", ge=1, le=MAX_PAGE_SIZE),
+    ] = None,
+    seed: Annotated[
+        str | None,
+        Query(title="Seed used to return the same random panelists", max_length=64),
+    ] = None,
+):
     """Retrieve a Random Panelist.
 
     Returned data: Panelist ID, name, slug string and gender.
+
+    Use `count` to retrieve a list of distinct random panelists in a
+    single response, and `seed` to retrieve the same random panelists
+    each time the same seed is used.
     """
     try:
-        panelist = Panelist(database_connection=_database_connection)
-        panelist_info = panelist.retrieve_random()
+        if count or seed is not None:
+            response = await random_sample_response(
+                ModelsPanelists, "panelists", Panelist, "retrieve_by_id", count, seed
+            )
+            if response:
+                return response
+
+            return JSONResponse(
+                status_code=404, content={"detail": "Random panelists not found"}
+            )
+
+        panelist_info = await run_query(Panelist, "retrieve_random")
 
         if panelist_info:
             return panelist_info
@@ -710,8 +1027,7 @@ async def get_random_panelist_id():
     Returned data: Panelist ID.
     """
     try:
-        panelist = Panelist(database_connection=_database_connection)
-        panelist_id = panelist.retrieve_random_id()
+        panelist_id = await run_query(Panelist, "retrieve_random_id")
 
         if panelist_id:
             return {"id": panelist_id}
@@ -751,8 +1067,7 @@ async def get_random_panelist_slug():
     Returned data: Panelist slug string.
     """
     try:
-        panelist = Panelist(database_connection=_database_connection)
-        panelist_slug = panelist.retrieve_random_slug()
+        panelist_slug = await run_query(Panelist, "retrieve_random_slug")
 
         if panelist_slug:
             return {"slug": panelist_slug}
@@ -778,3 +1093,113 @@ async def get_random_panelist_slug():
                 "detail": "Database error occurred while trying to retrieve a random panelist slug string"
             },
         )
+
+
+@router.get(
+    "/batch",
+    summary="Retrieve Information for a Batch of Panelists",
+    response_model=ModelsPanelistsBatch,
+    responses={400: {"model": MessageDetails}, 500: {"model": MessageDetails}},
+    tags=["Panelists"],
+)
+@router.head("/batch", include_in_schema=False)
+async def get_panelists_batch(
+    ids: Annotated[
+        str | None,
+        Query(title="Comma-separated list of panelist IDs", pattern=IDS_PATTERN),
+    ] = None,
+    slugs: Annotated[
+        str | None, Query(title="Comma-separated list of panelist slug strings")
+    ] = None,
+):
+    """Retrieve a Batch of Panelists by IDs and Slug Strings.
+
+    Returned data: Panelist ID, name, slug string and gender, and the
+    IDs and slug strings that were not found.
+
+    Panelists are returned in the order requested. IDs and slug strings
+    are passed as comma-separated lists using `ids` and `slugs`.
+    """
+    return await batch_response(
+        "panelists", Panelist, parse_ids(ids), parse_keys(slugs)
+    )
+
+
+@router.post(
+    "/batch",
+    summary="Retrieve Information for a Batch of Panelists",
+    response_model=ModelsPanelistsBatch,
+    responses={400: {"model": MessageDetails}, 500: {"model": MessageDetails}},
+    tags=["Panelists"],
+)
+async def post_panelists_batch(batch: BatchRequest):
+    """Retrieve a Batch of Panelists by IDs and Slug Strings.
+
+    Returned data: Panelist ID, name, slug string and gender, and the
+    IDs and slug strings that were not found.
+
+    Panelists are returned in the order requested. IDs and slug strings
+    are passed as lists using `ids` and `slugs` in the request body.
+    """
+    return await batch_response("panelists", Panelist, batch.ids, batch.slugs)
+
+
+@router.get(
+    "/details/batch",
+    summary="Retrieve Details for a Batch of Panelists",
+    response_model=ModelsPanelistsDetailsBatch,
+    responses={400: {"model": MessageDetails}, 500: {"model": MessageDetails}},
+    tags=["Panelists"],
+)
+@router.head("/details/batch", include_in_schema=False)
+async def get_panelists_details_batch(
+    ids: Annotated[
+        str | None,
+        Query(title="Comma-separated list of panelist IDs", pattern=IDS_PATTERN),
+    ] = None,
+    slugs: Annotated[
+        str | None, Query(title="Comma-separated list of panelist slug strings")
+    ] = None,
+):
+    """Retrieve Details for a Batch of Panelists by IDs and Slug Strings.
+
+    Returned data: Panelist ID, name, slug string, gender, statistics
+    and appearances, and the IDs and slug strings that were not found.
+
+    Panelists are returned in the order requested. IDs and slug strings
+    are passed as comma-separated lists using `ids` and `slugs`.
+    """
+    return await batch_response(
+        "panelists",
+        Panelist,
+        parse_ids(ids),
+        parse_keys(slugs),
+        details=True,
+        number_decimal_places=_settings_config["number_decimal_places"],
+    )
+
+
+@router.post(
+    "/details/batch",
+    summary="Retrieve Details for a Batch of Panelists",
+    response_model=ModelsPanelistsDetailsBatch,
+    responses={400: {"model": MessageDetails}, 500: {"model": MessageDetails}},
+    tags=["Panelists"],
+)
+async def post_panelists_details_batch(batch: BatchRequest):
+    """Retrieve Details for a Batch of Panelists by IDs and Slug Strings.
+
+    Returned data: Panelist ID, name, slug string, gender, statistics
+    and appearances, and the IDs and slug strings that were not found.
+
+    Panelists are returned in the order requested. IDs and slug strings
+    are passed as lists using `ids` and `slugs` in the request body.
+    """
+    return await batch_response(
+        "panelists",
+        Panelist,
+        batch.ids,
+        batch.slugs,
+        details=True,
+        number_decimal_places=_settings_config["number_decimal_places"],
+    )
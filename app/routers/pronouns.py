@@ -7,21 +7,19 @@
 
 from typing import Annotated
 
-import mysql.connector
 from fastapi import APIRouter, Path
 from fastapi.responses import JSONResponse
 from mysql.connector.errors import DatabaseError, ProgrammingError
 from wwdtm.pronoun import Pronouns
 
-from app.config import API_VERSION, load_config
+from app.config import API_VERSION
+from app.dispatch import run_query
 from app.models.messages import MessageDetails
 from app.models.pronouns import Pronouns as ModelsPronouns
 from app.models.pronouns import PronounsInfoList as ModelsPronounsInfoList
+from app.serialization import FastJSONRoute
 
-router = APIRouter(prefix=f"/v{API_VERSION}/pronouns")
-_config = load_config()
-_database_config = _config["database"]
-_database_connection = mysql.connector.connect(**_database_config)
+router = APIRouter(prefix=f"/v{API_VERSION}/pronouns", route_class=FastJSONRoute)
 
 
 @router.get(
@@ -40,8 +38,7 @@ async def get_pronouns():
     Values are sorted by Pronouns ID.
     """
     try:
-        _pronouns = Pronouns(database_connection=_database_connection)
-        all_pronouns = _pronouns.retrieve_all()
+        all_pronouns = await run_query(Pronouns, "retrieve_all")
 
         if all_pronouns:
             return {"pronouns": all_pronouns}
@@ -79,8 +76,7 @@ async def get_pronouns_by_id(
     Returned data: Pronouns ID and pronouns string
     """
     try:
-        _pronouns = Pronouns(database_connection=_database_connection)
-        pronouns_info = _pronouns.retrieve_by_id(pronouns_id)
+        pronouns_info = await run_query(Pronouns, "retrieve_by_id", pronouns_id)
 
         if pronouns_info:
             return pronouns_info
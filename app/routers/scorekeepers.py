@@ -7,25 +7,32 @@
 
 from typing import Annotated
 
-import mysql.connector
-from fastapi import APIRouter, Path
+from fastapi import APIRouter, Path, Query, Request
 from fastapi.responses import JSONResponse
 from mysql.connector.errors import DatabaseError, ProgrammingError
 from wwdtm.scorekeeper import Scorekeeper
 
-from app.config import API_VERSION, load_config
+from app.batch import IDS_PATTERN, batch_response, parse_ids, parse_keys
+from app.config import API_VERSION
+from app.dispatch import run_query, run_query_each
+from app.existence import random_sample_response
+from app.models.batch import BatchRequest
 from app.models.messages import MessageDetails
 from app.models.scorekeepers import Scorekeeper as ModelsScorekeeper
 from app.models.scorekeepers import ScorekeeperDetails as ModelsScorekeeperDetails
 from app.models.scorekeepers import ScorekeeperID as ModelsScorekeeperID
 from app.models.scorekeepers import Scorekeepers as ModelsScorekeepers
+from app.models.scorekeepers import ScorekeepersBatch as ModelsScorekeepersBatch
 from app.models.scorekeepers import ScorekeepersDetails as ModelsScorekeepersDetails
+from app.models.scorekeepers import (
+    ScorekeepersDetailsBatch as ModelsScorekeepersDetailsBatch,
+)
 from app.models.scorekeepers import ScorekeeperSlug as ModelsScorekeeperSlug
+from app.pagination import MAX_PAGE_SIZE, CollectionIndex, page_response
+from app.serialization import FastJSONRoute, streaming_model_response
 
-router = APIRouter(prefix=f"/v{API_VERSION}/scorekeepers")
-_config = load_config()
-_database_config = _config["database"]
-_database_connection = mysql.connector.connect(**_database_config)
+router = APIRouter(prefix=f"/v{API_VERSION}/scorekeepers", route_class=FastJSONRoute)
+_collection_index = CollectionIndex(Scorekeeper, sort_fields=("name",))
 
 
 @router.get(
@@ -36,16 +43,34 @@ _database_connection = mysql.connector.connect(**_database_config)
     tags=["Scorekeepers"],
 )
 @router.head("", include_in_schema=False)
-async def get_scorekeepers():
+async def get_scorekeepers(
+    request: Request,
+    limit: Annotated[
+        int | None,
+        Query(title="Maximum number of scorekeepers to return", ge=1, le=MAX_PAGE_SIZE),
+    ] = None,
+    cursor: Annotated[
+        str | None, Query(title="Cursor returned with the previous page")
+    ] = None,
+):
     """Retrieve All Scorekeepers.
 
     Returned data: Scorekeeper ID, name, slug string and gender.
 
     Scorekeepers are sorted by scorekeeper name.
+
+    Use `limit` to retrieve one page of scorekeepers at a time. The cursor
+    for the next page is returned in the `X-Next-Cursor` response
+    header and is passed back using `cursor`.
     """
     try:
-        scorekeeper = Scorekeeper(database_connection=_database_connection)
-        scorekeepers = scorekeeper.retrieve_all()
+        if limit or cursor:
+            page = await _collection_index.page(cursor, limit)
+            return page_response(
+                request, ModelsScorekeepers, "scorekeepers", page.rows, page.next_cursor
+            )
+
+        scorekeepers = await run_query(Scorekeeper, "retrieve_all")
 
         if scorekeepers:
             return {"scorekeepers": scorekeepers}
@@ -85,8 +110,9 @@ async def get_scorekeeper_by_id(
     Returned data: Scorekeeper ID, name, slug string and gender.
     """
     try:
-        scorekeeper = Scorekeeper(database_connection=_database_connection)
-        scorekeeper_info = scorekeeper.retrieve_by_id(scorekeeper_id)
+        scorekeeper_info = await run_query(
+            Scorekeeper, "retrieve_by_id", scorekeeper_id
+        )
 
         if scorekeeper_info:
             return scorekeeper_info
@@ -132,8 +158,9 @@ async def get_scorekeeper_by_slug(
     Returned data: Scorekeeper ID, name, slug string and gender.
     """
     try:
-        scorekeeper = Scorekeeper(database_connection=_database_connection)
-        scorekeeper_info = scorekeeper.retrieve_by_slug(scorekeeper_slug.strip())
+        scorekeeper_info = await run_query(
+            Scorekeeper, "retrieve_by_slug", scorekeeper_slug.strip()
+        )
 
         if scorekeeper_info:
             return scorekeeper_info
@@ -169,7 +196,16 @@ async def get_scorekeeper_by_slug(
     tags=["Scorekeepers"],
 )
 @router.head("/details", include_in_schema=False)
-async def get_scorekeepers_details():
+async def get_scorekeepers_details(
+    request: Request,
+    limit: Annotated[
+        int | None,
+        Query(title="Maximum number of scorekeepers to return", ge=1, le=MAX_PAGE_SIZE),
+    ] = None,
+    cursor: Annotated[
+        str | None, Query(title="Cursor returned with the previous page")
+    ] = None,
+):
     """Retrieve Details for All Scorekeepers.
 
     Returned data: Scorekeepers ID, name, slug string, gender and
@@ -177,13 +213,31 @@ async def get_scorekeepers_details():
 
     Scorekeepers are sorted by scorekeeper name. Appearances are sorted
     by show date.
+
+    Use `limit` to retrieve one page of scorekeepers at a time. The cursor
+    for the next page is returned in the `X-Next-Cursor` response
+    header and is passed back using `cursor`.
     """
     try:
-        scorekeeper = Scorekeeper(database_connection=_database_connection)
-        scorekeepers = scorekeeper.retrieve_all_details()
-
-        if scorekeepers:
-            return {"scorekeepers": scorekeepers}
+        if limit or cursor:
+            page = await _collection_index.page(cursor, limit)
+            scorekeepers = await run_query_each(
+                Scorekeeper, "retrieve_details_by_id", page.ids
+            )
+            return page_response(
+                request,
+                ModelsScorekeepersDetails,
+                "scorekeepers",
+                scorekeepers,
+                page.next_cursor,
+            )
+
+        if await _collection_index.rows():
+            return streaming_model_response(
+                ModelsScorekeepersDetails,
+                "scorekeepers",
+                _collection_index.iter_details(),
+            )
 
         return JSONResponse(
             status_code=404, content={"detail": "No scorekeepers found"}
@@ -223,8 +277,9 @@ async def get_scorekeeper_details_by_id(
     Appearances are sorted by show date.
     """
     try:
-        scorekeeper = Scorekeeper(database_connection=_database_connection)
-        scorekeeper_details = scorekeeper.retrieve_details_by_id(scorekeeper_id)
+        scorekeeper_details = await run_query(
+            Scorekeeper, "retrieve_details_by_id", scorekeeper_id
+        )
 
         if scorekeeper_details:
             return scorekeeper_details
@@ -255,22 +310,50 @@ async def get_scorekeeper_details_by_id(
 @router.get(
     "/details/random",
     summary="Retrieve Information and Appearances for a Random Scorekeeper",
-    response_model=ModelsScorekeeperDetails,
+    response_model=ModelsScorekeeperDetails | ModelsScorekeepersDetails,
     responses={404: {"model": MessageDetails}, 500: {"model": MessageDetails}},
     tags=["Scorekeepers"],
 )
 @router.head("/details/random", include_in_schema=False)
-async def get_random_scorekeeper_details():
+async def get_random_scorekeeper_details(
+    count: Annotated[
+        int | None,
+        Query(title="Number of random scorekeepers to return", ge=1, le=MAX_PAGE_SIZE),
+    ] = None,
+    seed: Annotated[
+        str | None,
+        Query(title="Seed used to return the same random scorekeepers", max_length=64),
+    ] = None,
+):
     """Retrieve a Random Scorekeeper.
 
     Returned data: Scorekeeper ID, name, slug string, gender, and
     appearances.
 
     Appearances are sorted by date.
+
+    Use `count` to retrieve a list of distinct random scorekeepers in a
+    single response, and `seed` to retrieve the same random scorekeepers
+    each time the same seed is used.
     """
     try:
-        scorekeeper = Scorekeeper(database_connection=_database_connection)
-        scorekeeper_details = scorekeeper.retrieve_random_details()
+        if count or seed is not None:
+            response = await random_sample_response(
+                ModelsScorekeepersDetails,
+                "scorekeepers",
+                Scorekeeper,
+                "retrieve_details_by_id",
+                count,
+                seed,
+            )
+            if response:
+                return response
+
+            return JSONResponse(
+                status_code=404, content={"detail": "Random scorekeepers not found"}
+            )
+
+        scorekeeper_details = await run_query(Scorekeeper, "retrieve_random_details")
 
         if scorekeeper_details:
             return scorekeeper_details
@@ -317,9 +400,8 @@ async def get_scorekeeper_details_by_slug(
     Appearances are sorted by show date.
     """
     try:
-        scorekeeper = Scorekeeper(database_connection=_database_connection)
-        scorekeeper_details = scorekeeper.retrieve_details_by_slug(
-            scorekeeper_slug.strip()
+        scorekeeper_details = await run_query(
+            Scorekeeper, "retrieve_details_by_slug", scorekeeper_slug.strip()
         )
 
         if scorekeeper_details:
@@ -351,19 +433,47 @@ async def get_scorekeeper_details_by_slug(
 @router.get(
     "/random",
     summary="Retrieve Information for a Random Scorekeeper",
-    response_model=ModelsScorekeeper,
+    response_model=ModelsScorekeeper | ModelsScorekeepers,
     responses={404: {"model": MessageDetails}, 500: {"model": MessageDetails}},
     tags=["Scorekeepers"],
 )
 @router.head("/random", include_in_schema=False)
-async def get_random_scorekeeper():
+async def get_random_scorekeeper(
+    count: Annotated[
+        int | None,
+        Query(title="Number of random scorekeepers to return", ge=1, le=MAX_PAGE_SIZE),
+    ] = None,
+    seed: Annotated[
+        str | None,
+        Query(title="Seed used to return the same random scorekeepers", max_length=64),
+    ] = None,
+):
     """Retrieve a Random Scorekeeper.
 
     Returned data: Scorekeeper ID, name, slug string and gender.
+
+    Use `count` to retrieve a list of distinct random scorekeepers in a
+    single response, and `seed` to retrieve the same random scorekeepers
+    each time the same seed is used.
     """
     try:
-        scorekeeper = Scorekeeper(database_connection=_database_connection)
-        scorekeeper_info = scorekeeper.retrieve_random()
+        if count or seed is not None:
+            response = await random_sample_response(
+                ModelsScorekeepers,
+                "scorekeepers",
+                Scorekeeper,
+                "retrieve_by_id",
+                count,
+                seed,
+            )
+            if response:
+                return response
+
+            return JSONResponse(
+                status_code=404, content={"detail": "Random scorekeepers not found"}
+            )
+
+        scorekeeper_info = await run_query(Scorekeeper, "retrieve_random")
 
         if scorekeeper_info:
             return scorekeeper_info
@@ -403,8 +513,7 @@ async def get_random_scorekeeper_id():
     Returned data: Scorekeeper ID.
     """
     try:
-        scorekeeper = Scorekeeper(database_connection=_database_connection)
-        scorekeeper_id = scorekeeper.retrieve_random_id()
+        scorekeeper_id = await run_query(Scorekeeper, "retrieve_random_id")
 
         if scorekeeper_id:
             return {"id": scorekeeper_id}
@@ -444,8 +553,7 @@ async def get_random_scorekeeper_slug():
     Returned data: Scorekeeper slug string.
     """
     try:
-        scorekeeper = Scorekeeper(database_connection=_database_connection)
-        scorekeeper_slug = scorekeeper.retrieve_random_slug()
+        scorekeeper_slug = await run_query(Scorekeeper, "retrieve_random_slug")
 
         if scorekeeper_slug:
             return {"slug": scorekeeper_slug}
@@ -471,3 +579,105 @@ async def get_random_scorekeeper_slug():
                 "detail": "Database error occurred while trying to retrieve a random scorekeeper slug string"
             },
         )
+
+
+@router.get(
+    "/batch",
+    summary="Retrieve Information for a Batch of Scorekeepers",
+    response_model=ModelsScorekeepersBatch,
+    responses={400: {"model": MessageDetails}, 500: {"model": MessageDetails}},
+    tags=["Scorekeepers"],
+)
+@router.head("/batch", include_in_schema=False)
+async def get_scorekeepers_batch(
+    ids: Annotated[
+        str | None,
+        Query(title="Comma-separated list of scorekeeper IDs", pattern=IDS_PATTERN),
+    ] = None,
+    slugs: Annotated[
+        str | None, Query(title="Comma-separated list of scorekeeper slug strings")
+    ] = None,
+):
+    """Retrieve a Batch of Scorekeepers by IDs and Slug Strings.
+
+    Returned data: Scorekeeper ID, name, slug string and gender, and the
+    IDs and slug strings that were not found.
+
+    Scorekeepers are returned in the order requested. IDs and slug
+    strings are passed as comma-separated lists using `ids` and `slugs`.
+    """
+    return await batch_response(
+        "scorekeepers", Scorekeeper, parse_ids(ids), parse_keys(slugs)
+    )
+
+
+@router.post(
+    "/batch",
+    summary="Retrieve Information for a Batch of Scorekeepers",
+    response_model=ModelsScorekeepersBatch,
+    responses={400: {"model": MessageDetails}, 500: {"model": MessageDetails}},
+    tags=["Scorekeepers"],
+)
+async def post_scorekeepers_batch(batch: BatchRequest):
+    """Retrieve a Batch of Scorekeepers by IDs and Slug Strings.
+
+    Returned data: Scorekeeper ID, name, slug string and gender, and the
+    IDs and slug strings that were not found.
+
+    Scorekeepers are returned in the order requested. IDs and slug
+    strings are passed as lists using `ids` and `slugs` in the request
+    body.
+    """
+    return await batch_response("scorekeepers", Scorekeeper, batch.ids, batch.slugs)
+
+
+@router.get(
+    "/details/batch",
+    summary="Retrieve Details for a Batch of Scorekeepers",
+    response_model=ModelsScorekeepersDetailsBatch,
+    responses={400: {"model": MessageDetails}, 500: {"model": MessageDetails}},
+    tags=["Scorekeepers"],
+)
+@router.head("/details/batch", include_in_schema=False)
+async def get_scorekeepers_details_batch(
+    ids: Annotated[
+        str | None,
+        Query(title="Comma-separated list of scorekeeper IDs", pattern=IDS_PATTERN),
+    ] = None,
+    slugs: Annotated[
+        str | None, Query(title="Comma-separated list of scorekeeper slug strings")
+    ] = None,
+):
+    """Retrieve Details for a Batch of Scorekeepers by IDs and Slug Strings.
+
+    Returned data: Scorekeeper ID, name, slug string, gender and
+    appearances, and the IDs and slug strings that were not found.
+
+    Scorekeepers are returned in the order requested. IDs and slug
+    strings are passed as comma-separated lists using `ids` and `slugs`.
+    """
+    return await batch_response(
+        "scorekeepers", Scorekeeper, parse_ids(ids), parse_keys(slugs), details=True
+    )
+
+
+@router.post(
+    "/details/batch",
+    summary="Retrieve Details for a Batch of Scorekeepers",
+    response_model=ModelsScorekeepersDetailsBatch,
+    responses={400: {"model": MessageDetails}, 500: {"model": MessageDetails}},
+    tags=["Scorekeepers"],
+)
+async def post_scorekeepers_details_batch(batch: BatchRequest):
+    """Retrieve Details for a Batch of Scorekeepers by IDs and Slug Strings.
+
+    Returned data: Scorekeeper ID, name, slug string, gender and
+    appearances, and the IDs and slug strings that were not found.
+
+    Scorekeepers are returned in the order requested. IDs and slug
+    strings are passed as lists using `ids` and `slugs` in the request
+    body.
+    """
+    return await batch_response(
+        "scorekeepers", Scorekeeper, batch.ids, batch.slugs, details=True
+    )
@@ -8,13 +8,21 @@
 from datetime import date
 from typing import Annotated
 
-import mysql.connector
-from fastapi import APIRouter, Path, Query
+from fastapi import APIRouter, Path, Query, Request
 from fastapi.responses import JSONResponse
 from mysql.connector.errors import DatabaseError, ProgrammingError
-from wwdtm.show import Show
 
-from app.config import API_VERSION, load_config
+from app.batch import DATES_PATTERN, IDS_PATTERN, batch_response, parse_ids, parse_keys
+from app.config import API_VERSION
+from app.details import (
+    SHOW_DETAILS_PARTS,
+    include_pattern,
+    parse_include,
+    retrieve_show_details,
+)
+from app.dispatch import run_query, run_query_each
+from app.existence import random_sample_response
+from app.models.batch import ShowsBatchRequest
 from app.models.messages import MessageDetails
 from app.models.shows import Show as ModelsShow
 from app.models.shows import ShowDate as ModelsShowDate
@@ -22,12 +30,17 @@ from app.models.shows import ShowDates as ModelsShowDates
 from app.models.shows import ShowDetails as ModelsShowDetails
 from app.models.shows import ShowID as ModelsShowID
 from app.models.shows import Shows as ModelsShows
+from app.models.shows import ShowsBatch as ModelsShowsBatch
 from app.models.shows import ShowsDetails as ModelsShowsDetails
+from app.models.shows import ShowsDetailsBatch as ModelsShowsDetailsBatch
+from app.pagination import MAX_PAGE_SIZE, CollectionIndex, page_response
+from app.prerender import PrerenderedResponse
+from app.serialization import FastJSONRoute, streaming_model_response
+from app.show import Show
 
-router = APIRouter(prefix=f"/v{API_VERSION}/shows")
-_config = load_config()
-_database_config = _config["database"]
-_database_connection = mysql.connector.connect(**_database_config)
+router = APIRouter(prefix=f"/v{API_VERSION}/shows", route_class=FastJSONRoute)
+_collection_index = CollectionIndex(Show, sort_fields=("date",))
+_prerendered_details = PrerenderedResponse(ModelsShowsDetails, "shows", Show)
 
 
 @router.get(
@@ -38,17 +51,35 @@ _database_connection = mysql.connector.connect(**_database_config)
     tags=["Shows"],
 )
 @router.head("", include_in_schema=False)
-async def get_shows():
+async def get_shows(
+    request: Request,
+    limit: Annotated[
+        int | None,
+        Query(title="Maximum number of shows to return", ge=1, le=MAX_PAGE_SIZE),
+    ] = None,
+    cursor: Annotated[
+        str | None, Query(title="Cursor returned with the previous page")
+    ] = None,
+):
     """Retrieve All Shows.
 
     Returned data: Show ID, date, Best Of flag, Repeat flag and NPR.org
     show URL
 
     Shows are sorted by date.
+
+    Use `limit` to retrieve one page of shows at a time. The cursor
+    for the next page is returned in the `X-Next-Cursor` response
+    header and is passed back using `cursor`.
     """
     try:
-        show = Show(database_connection=_database_connection)
-        shows = show.retrieve_all()
+        if limit or cursor:
+            page = await _collection_index.page(cursor, limit)
+            return page_response(
+                request, ModelsShows, "shows", page.rows, page.next_cursor
+            )
+
+        shows = await run_query(Show, "retrieve_all")
 
         if shows:
             return {"shows": shows}
@@ -87,8 +118,7 @@ async def get_shows_best_ofs(
     show url
     """
     try:
-        show = Show(database_connection=_database_connection)
-        show_info = show.retrieve_all_best_ofs(inclusive=inclusive)
+        show_info = await run_query(Show, "retrieve_all_best_ofs", inclusive=inclusive)
 
         if show_info:
             return {"shows": show_info}
@@ -127,8 +157,7 @@ async def get_show_by_id(
     show URL
     """
     try:
-        show = Show(database_connection=_database_connection)
-        show_info = show.retrieve_by_id(show_id)
+        show_info = await run_query(Show, "retrieve_by_id", show_id)
 
         if show_info:
             return show_info
@@ -171,8 +200,9 @@ async def get_show_by_date_string(
     show URL
     """
     try:
-        show = Show(database_connection=_database_connection)
-        show_info = show.retrieve_by_date_string(show_date.isoformat())
+        show_info = await run_query(
+            Show, "retrieve_by_date_string", show_date.isoformat()
+        )
 
         if show_info:
             return show_info
@@ -217,8 +247,7 @@ async def get_shows_by_year(
     Shows are sorted by date.
     """
     try:
-        show = Show(database_connection=_database_connection)
-        shows = show.retrieve_by_year(year)
+        shows = await run_query(Show, "retrieve_by_year", year)
 
         if shows:
             return {"shows": shows}
@@ -266,8 +295,9 @@ async def get_shows_by_year_best_ofs(
     Shows are sorted by date.
     """
     try:
-        show = Show(database_connection=_database_connection)
-        shows = show.retrieve_best_ofs_by_year(year=year, inclusive=inclusive)
+        shows = await run_query(
+            Show, "retrieve_best_ofs_by_year", year=year, inclusive=inclusive
+        )
 
         if shows:
             return {"shows": shows}
@@ -314,8 +344,7 @@ async def get_shows_by_year_repeat_best_ofs(
     Shows are sorted by date.
     """
     try:
-        show = Show(database_connection=_database_connection)
-        shows = show.retrieve_repeat_best_ofs_by_year(year=year)
+        shows = await run_query(Show, "retrieve_repeat_best_ofs_by_year", year=year)
 
         if shows:
             return {"shows": shows}
@@ -365,8 +394,9 @@ async def get_shows_by_year_repeats(
     Shows are sorted by date.
     """
     try:
-        show = Show(database_connection=_database_connection)
-        shows = show.retrieve_repeats_by_year(year=year, inclusive=inclusive)
+        shows = await run_query(
+            Show, "retrieve_repeats_by_year", year=year, inclusive=inclusive
+        )
 
         if shows:
             return {"shows": shows}
@@ -414,8 +444,7 @@ async def get_shows_by_year_month(
     Shows are sorted by date.
     """
     try:
-        show = Show(database_connection=_database_connection)
-        shows = show.retrieve_by_year_month(year, month)
+        shows = await run_query(Show, "retrieve_by_year_month", year, month)
 
         if shows:
             return {"shows": shows}
@@ -463,8 +492,7 @@ async def get_shows_by_month_day(
     Shows are sorted by date.
     """
     try:
-        show = Show(database_connection=_database_connection)
-        shows = show.retrieve_by_month_day(month, day)
+        shows = await run_query(Show, "retrieve_by_month_day", month, day)
 
         if shows:
             return {"shows": shows}
@@ -511,8 +539,7 @@ async def get_show_by_date(
     show URL
     """
     try:
-        show = Show(database_connection=_database_connection)
-        show_info = show.retrieve_by_date(year, month, day)
+        show_info = await run_query(Show, "retrieve_by_date", year, month, day)
 
         if show_info:
             return show_info
@@ -554,8 +581,7 @@ async def get_all_show_dates():
     Returned data: Show dates in YYYY-MM-DD format
     """
     try:
-        show = Show(database_connection=_database_connection)
-        shows = show.retrieve_all_dates()
+        shows = await run_query(Show, "retrieve_all_dates")
 
         if shows:
             return {"shows": shows}
@@ -583,7 +609,16 @@ async def get_all_show_dates():
     tags=["Shows"],
 )
 @router.head("/details", include_in_schema=False)
-async def get_shows_details():
+async def get_shows_details(
+    request: Request,
+    limit: Annotated[
+        int | None,
+        Query(title="Maximum number of shows to return", ge=1, le=MAX_PAGE_SIZE),
+    ] = None,
+    cursor: Annotated[
+        str | None, Query(title="Cursor returned with the previous page")
+    ] = None,
+):
     """Retrieve Details For All Shows.
 
     Return data: Show ID, date, Best Of flag, Repeat flag or date,
@@ -591,13 +626,27 @@ async def get_shows_details():
     panelists, Bluff information and Not My Job guests
 
     Shows are sorted by date.
+
+    Use `limit` to retrieve one page of shows at a time. The cursor
+    for the next page is returned in the `X-Next-Cursor` response
+    header and is passed back using `cursor`.
     """
     try:
-        show = Show(database_connection=_database_connection)
-        shows = show.retrieve_all_details()
-
-        if shows:
-            return {"shows": shows}
+        if limit or cursor:
+            page = await _collection_index.page(cursor, limit)
+            shows = await run_query_each(Show, "retrieve_details_by_id", page.ids)
+            return page_response(
+                request, ModelsShowsDetails, "shows", shows, page.next_cursor
+            )
+
+        response = await _prerendered_details.response(request)
+        if response:
+            return response
+
+        if await _collection_index.rows():
+            return streaming_model_response(
+                ModelsShowsDetails, "shows", _collection_index.iter_details()
+            )
 
         return JSONResponse(status_code=404, content={"detail": "No shows found"})
     except ProgrammingError:
@@ -633,8 +682,9 @@ async def get_shows_details_best_ofs(
     show url
     """
     try:
-        show = Show(database_connection=_database_connection)
-        shows = show.retrieve_all_best_ofs_details(inclusive=inclusive)
+        shows = await run_query(
+            Show, "retrieve_all_best_ofs_details", inclusive=inclusive, details=True
+        )
 
         if shows:
             return {"shows": shows}
@@ -666,16 +716,31 @@ async def get_shows_details_best_ofs(
 @router.head("/details/id/{show_id}", include_in_schema=False)
 async def get_show_details_by_id(
     show_id: Annotated[int, Path(title="The ID of the show to get", ge=0, lt=2**31)],
+    include: Annotated[
+        str | None,
+        Query(
+            title="Comma-separated list of details to include",
+            pattern=include_pattern(SHOW_DETAILS_PARTS),
+        ),
+    ] = None,
 ):
     """Retrieve Details for a Shows by Show ID.
 
     Return data: Show ID, date, Best Of flag, Repeat flag or date,
     NPR.org show URL, location, description, notes, host, scorekeeper,
     panelists, Bluff information and Not My Job guests
+
+    Use `include` with a comma-separated list of `location`, `host`,
+    `scorekeeper`, `panelists`, `bluffs` and `guests` to only retrieve
+    those details. Details that are not included are returned as null.
     """
     try:
-        show = Show(database_connection=_database_connection)
-        show_details = show.retrieve_details_by_id(show_id)
+        if include:
+            show_details = await retrieve_show_details(
+                parse_include(include), show_id=show_id
+            )
+        else:
+            show_details = await run_query(Show, "retrieve_details_by_id", show_id)
 
         if show_details:
             return show_details
@@ -711,16 +776,33 @@ async def get_show_details_by_id(
 @router.head("/details/date/iso/{show_date}", include_in_schema=False)
 async def get_show_details_by_date_string(
     show_date: Annotated[date, Path(title="ISO date for the show to get")],
+    include: Annotated[
+        str | None,
+        Query(
+            title="Comma-separated list of details to include",
+            pattern=include_pattern(SHOW_DETAILS_PARTS),
+        ),
+    ] = None,
 ):
     """Retrieve Details for a Show by Show Date in YYYY-MM-DD format.
 
     Return data: Show ID, date, Best Of flag, Repeat flag or date,
     NPR.org show URL, location, description, notes, host, scorekeeper,
     panelists, Bluff information and Not My Job guests
+
+    Use `include` with a comma-separated list of `location`, `host`,
+    `scorekeeper`, `panelists`, `bluffs` and `guests` to only retrieve
+    those details. Details that are not included are returned as null.
     """
     try:
-        show = Show(database_connection=_database_connection)
-        show_details = show.retrieve_details_by_date_string(show_date.isoformat())
+        if include:
+            show_details = await retrieve_show_details(
+                parse_include(include), show_date=show_date
+            )
+        else:
+            show_details = await run_query(
+                Show, "retrieve_details_by_date_string", show_date.isoformat()
+            )
 
         if show_details:
             return show_details
@@ -766,8 +848,7 @@ async def get_shows_details_by_year(
     Shows are sorted by date.
     """
     try:
-        show = Show(database_connection=_database_connection)
-        shows = show.retrieve_details_by_year(year)
+        shows = await run_query(Show, "retrieve_details_by_year", year, details=True)
 
         if shows:
             return {"shows": shows}
@@ -815,8 +896,13 @@ async def get_shows_details_by_year_best_ofs(
     Shows are sorted by date.
     """
     try:
-        show = Show(database_connection=_database_connection)
-        shows = show.retrieve_best_ofs_details_by_year(year=year, inclusive=inclusive)
+        shows = await run_query(
+            Show,
+            "retrieve_best_ofs_details_by_year",
+            year=year,
+            inclusive=inclusive,
+            details=True,
+        )
 
         if shows:
             return {"shows": shows}
@@ -863,8 +949,9 @@ async def get_shows_details_by_year_repeat_best_ofs(
     Shows are sorted by date.
     """
     try:
-        show = Show(database_connection=_database_connection)
-        shows = show.retrieve_repeat_best_ofs_details_by_year(year=year)
+        shows = await run_query(
+            Show, "retrieve_repeat_best_ofs_details_by_year", year=year, details=True
+        )
 
         if shows:
             return {"shows": shows}
@@ -914,8 +1001,13 @@ async def get_shows_details_by_year_repeats(
     Shows are sorted by date.
     """
     try:
-        show = Show(database_connection=_database_connection)
-        shows = show.retrieve_repeats_details_by_year(year=year, inclusive=inclusive)
+        shows = await run_query(
+            Show,
+            "retrieve_repeats_details_by_year",
+            year=year,
+            inclusive=inclusive,
+            details=True,
+        )
 
         if shows:
             return {"shows": shows}
@@ -964,8 +1056,7 @@ async def get_shows_details_by_year_month(
     Shows are sorted by date.
     """
     try:
-        show = Show(database_connection=_database_connection)
-        shows = show.retrieve_details_by_year_month(year, month)
+        shows = await run_query(Show, "retrieve_details_by_year_month", year, month)
 
         if shows:
             return {"shows": shows}
@@ -1014,8 +1105,7 @@ async def get_shows_details_by_month_day(
     Shows are sorted by date.
     """
     try:
-        show = Show(database_connection=_database_connection)
-        shows = show.retrieve_details_by_month_day(month, day)
+        shows = await run_query(Show, "retrieve_details_by_month_day", month, day)
 
         if shows:
             return {"shows": shows}
@@ -1059,16 +1149,33 @@ async def get_show_details_by_date(
     year: Annotated[int, Path(title="The year to get a show for", ge=1998, le=9999)],
     month: Annotated[int, Path(title="The month to get a show for", ge=1, le=12)],
     day: Annotated[int, Path(title="The day to get a show for", ge=1, le=31)],
+    include: Annotated[
+        str | None,
+        Query(
+            title="Comma-separated list of details to include",
+            pattern=include_pattern(SHOW_DETAILS_PARTS),
+        ),
+    ] = None,
 ):
     """Retrieve Details for a Shows by Year, Month and Day.
 
     Return data: Show ID, date, Best Of flag, Repeat flag or date,
     NPR.org show URL, location, description, notes, host, scorekeeper,
     panelists, Bluff information and Not My Job guests
+
+    Use `include` with a comma-separated list of `location`, `host`,
+    `scorekeeper`, `panelists`, `bluffs` and `guests` to only retrieve
+    those details. Details that are not included are returned as null.
     """
     try:
-        show = Show(database_connection=_database_connection)
-        show_details = show.retrieve_details_by_date(year, month, day)
+        if include:
+            show_details = await retrieve_show_details(
+                parse_include(include), show_date=date(year, month, day)
+            )
+        else:
+            show_details = await run_query(
+                Show, "retrieve_details_by_date", year, month, day
+            )
 
         if show_details:
             return show_details
@@ -1099,21 +1206,44 @@ async def get_show_details_by_date(
 @router.get(
     "/details/random",
     summary="Retrieve Detailed Information for a Random Show",
-    response_model=ModelsShowDetails,
+    response_model=ModelsShowDetails | ModelsShowsDetails,
     responses={404: {"model": MessageDetails}, 500: {"model": MessageDetails}},
     tags=["Shows"],
 )
 @router.head("/details/random", include_in_schema=False)
-async def get_random_show_details():
+async def get_random_show_details(
+    count: Annotated[
+        int | None,
+        Query(title="Number of random shows to return", ge=1, le=MAX_PAGE_SIZE),
+    ] = None,
+    seed: Annotated[
+        str | None,
+        Query(title="Seed used to return the same random shows", max_length=64),
+    ] = None,
+):
     """Retrieve Details for a Random Show.
 
     Return data: Show ID, date, Best Of flag, Repeat flag or date,
     NPR.org show URL, location, description, notes, host, scorekeeper,
     panelists, Bluff information and Not My Job guests
+
+    Use `count` to retrieve a list of distinct random shows in a single
+    response, and `seed` to retrieve the same random shows each time the
+    same seed is used.
     """
     try:
-        show = Show(database_connection=_database_connection)
-        show_details = show.retrieve_random_details()
+        if count or seed is not None:
+            response = await random_sample_response(
+                ModelsShowsDetails, "shows", Show, "retrieve_details_by_id", count, seed
+            )
+            if response:
+                return response
+
+            return JSONResponse(
+                status_code=404, content={"detail": "Random shows not found"}
+            )
+
+        show_details = await run_query(Show, "retrieve_random_details")
 
         if show_details:
             return show_details
@@ -1142,7 +1272,7 @@ async def get_random_show_details():
 @router.get(
     "/details/random/year/{year}",
     summary="Retrieve Detailed Information for a Random Show for a Given Year",
-    response_model=ModelsShowDetails,
+    response_model=ModelsShowDetails | ModelsShowsDetails,
     responses={404: {"model": MessageDetails}, 500: {"model": MessageDetails}},
     tags=["Shows"],
 )
@@ -1151,15 +1281,45 @@ async def get_random_show_by_year_details(
     year: Annotated[
         int, Path(title="The year to get a random show for", ge=1998, le=9999)
     ],
+    count: Annotated[
+        int | None,
+        Query(title="Number of random shows to return", ge=1, le=MAX_PAGE_SIZE),
+    ] = None,
+    seed: Annotated[
+        str | None,
+        Query(title="Seed used to return the same random shows", max_length=64),
+    ] = None,
 ):
     """Retrieve Details for a Random Show of a given year.
 
     Returned data: Show ID, date, Best Of flag, Repeat flag and NPR.org
     show URL
+
+    Use `count` to retrieve a list of distinct random shows for the year
+    in a single response, and `seed` to retrieve the same random shows
+    each time the same seed is used.
     """
     try:
-        show = Show(database_connection=_database_connection)
-        show_details = show.retrieve_random_details_by_year(year=year)
+        if count or seed is not None:
+            response = await random_sample_response(
+                ModelsShowsDetails,
+                "shows",
+                Show,
+                "retrieve_details_by_id",
+                count,
+                seed,
+                year=year,
+            )
+            if response:
+                return response
+
+            return JSONResponse(
+                status_code=404, content={"detail": "Random shows not found"}
+            )
+
+        show_details = await run_query(
+            Show, "retrieve_random_details_by_year", year=year
+        )
 
         if show_details:
             return show_details
@@ -1203,8 +1363,7 @@ async def get_shows_recent_details():
     Shows are sorted by date.
     """
     try:
-        show = Show(database_connection=_database_connection)
-        shows = show.retrieve_recent_details()
+        shows = await run_query(Show, "retrieve_recent_details")
 
         if shows:
             return {"shows": shows}
@@ -1241,8 +1400,9 @@ async def get_shows_details_repeat_best_ofs():
     show url
     """
     try:
-        show = Show(database_connection=_database_connection)
-        shows = show.retrieve_all_repeat_best_ofs_details()
+        shows = await run_query(
+            Show, "retrieve_all_repeat_best_ofs_details", details=True
+        )
 
         if shows:
             return {"shows": shows}
@@ -1285,8 +1445,9 @@ async def get_shows_details_repeats(
     show url
     """
     try:
-        show = Show(database_connection=_database_connection)
-        shows = show.retrieve_all_repeats_details(inclusive=inclusive)
+        shows = await run_query(
+            Show, "retrieve_all_repeats_details", inclusive=inclusive, details=True
+        )
 
         if shows:
             return {"shows": shows}
@@ -1311,20 +1472,43 @@ async def get_shows_details_repeats(
 @router.get(
     "/random",
     summary="Retrieve Information for a Random Show",
-    response_model=ModelsShow,
+    response_model=ModelsShow | ModelsShows,
     responses={404: {"model": MessageDetails}, 500: {"model": MessageDetails}},
     tags=["Shows"],
 )
 @router.head("/random", include_in_schema=False)
-async def get_random_show():
+async def get_random_show(
+    count: Annotated[
+        int | None,
+        Query(title="Number of random shows to return", ge=1, le=MAX_PAGE_SIZE),
+    ] = None,
+    seed: Annotated[
+        str | None,
+        Query(title="Seed used to return the same random shows", max_length=64),
+    ] = None,
+):
     """Retrieve Information for a Random Show.
 
     Returned data: Show ID, date, Best Of flag, Repeat flag and NPR.org
     show URL
+
+    Use `count` to retrieve a list of distinct random shows in a single
+    response, and `seed` to retrieve the same random shows each time the
+    same seed is used.
     """
     try:
-        show = Show(database_connection=_database_connection)
-        show_info = show.retrieve_random()
+        if count or seed is not None:
+            response = await random_sample_response(
+                ModelsShows, "shows", Show, "retrieve_by_id", count, seed
+            )
+            if response:
+                return response
+
+            return JSONResponse(
+                status_code=404, content={"detail": "Random shows not found"}
+            )
+
+        show_info = await run_query(Show, "retrieve_random")
 
         if show_info:
             return show_info
@@ -1364,8 +1548,7 @@ async def get_random_show_date():
     Returned data: Show Date.
     """
     try:
-        show = Show(database_connection=_database_connection)
-        _date = show.retrieve_random_date()
+        _date = await run_query(Show, "retrieve_random_date")
 
         if _date:
             return {"date": _date}
@@ -1405,8 +1588,7 @@ async def get_random_show_id():
     Returned data: Show ID.
     """
     try:
-        show = Show(database_connection=_database_connection)
-        _id = show.retrieve_random_id()
+        _id = await run_query(Show, "retrieve_random_id")
 
         if _id:
             return {"id": _id}
@@ -1435,7 +1617,7 @@ async def get_random_show_id():
 @router.get(
     "/random/year/{year}",
     summary="Retrieve Information for a Random Show for a Given Year",
-    response_model=ModelsShow,
+    response_model=ModelsShow | ModelsShows,
     responses={404: {"model": MessageDetails}, 500: {"model": MessageDetails}},
     tags=["Shows"],
 )
@@ -1444,15 +1626,37 @@ async def get_random_show_by_year(
     year: Annotated[
         int, Path(title="The year to get a random show for", ge=1998, le=9999)
     ],
+    count: Annotated[
+        int | None,
+        Query(title="Number of random shows to return", ge=1, le=MAX_PAGE_SIZE),
+    ] = None,
+    seed: Annotated[
+        str | None,
+        Query(title="Seed used to return the same random shows", max_length=64),
+    ] = None,
 ):
     """Retrieve Information for a Random Show of a given year.
 
     Returned data: Show ID, date, Best Of flag, Repeat flag and NPR.org
     show URL
+
+    Use `count` to retrieve a list of distinct random shows for the year
+    in a single response, and `seed` to retrieve the same random shows
+    each time the same seed is used.
     """
     try:
-        show = Show(database_connection=_database_connection)
-        show_info = show.retrieve_random_by_year(year=year)
+        if count or seed is not None:
+            response = await random_sample_response(
+                ModelsShows, "shows", Show, "retrieve_by_id", count, seed, year=year
+            )
+            if response:
+                return response
+
+            return JSONResponse(
+                status_code=404, content={"detail": "Random shows not found"}
+            )
+
+        show_info = await run_query(Show, "retrieve_random_by_year", year=year)
 
         if show_info:
             return show_info
@@ -1495,8 +1699,7 @@ async def get_shows_recent():
     Shows are sorted by date.
     """
     try:
-        show = Show(database_connection=_database_connection)
-        shows = show.retrieve_recent()
+        shows = await run_query(Show, "retrieve_recent")
 
         if shows:
             return {"shows": shows}
@@ -1533,8 +1736,7 @@ async def get_repeat_best_ofs():
     show url
     """
     try:
-        show = Show(database_connection=_database_connection)
-        show_info = show.retrieve_all_repeat_best_ofs()
+        show_info = await run_query(Show, "retrieve_all_repeat_best_ofs")
 
         if show_info:
             return {"shows": show_info}
@@ -1577,8 +1779,7 @@ async def get_shows_repeats(
     show url
     """
     try:
-        show = Show(database_connection=_database_connection)
-        show_info = show.retrieve_all_repeats(inclusive=inclusive)
+        show_info = await run_query(Show, "retrieve_all_repeats", inclusive=inclusive)
 
         if show_info:
             return {"shows": show_info}
@@ -1598,3 +1799,111 @@ async def get_shows_repeats(
                 "detail": "Database error occurred while retrieving Repeat shows from the database"
             },
         )
+
+
+@router.get(
+    "/batch",
+    summary="Retrieve Information for a Batch of Shows",
+    response_model=ModelsShowsBatch,
+    responses={400: {"model": MessageDetails}, 500: {"model": MessageDetails}},
+    tags=["Shows"],
+)
+@router.head("/batch", include_in_schema=False)
+async def get_shows_batch(
+    ids: Annotated[
+        str | None,
+        Query(title="Comma-separated list of show IDs", pattern=IDS_PATTERN),
+    ] = None,
+    dates: Annotated[
+        str | None,
+        Query(
+            title="Comma-separated list of show dates in ISO format (YYYY-MM-DD)",
+            pattern=DATES_PATTERN,
+        ),
+    ] = None,
+):
+    """Retrieve a Batch of Shows by IDs and Dates.
+
+    Returned data: Show ID, date, Best Of flag, Repeat flag and NPR.org
+    show URL, and the IDs and dates that were not found.
+
+    Shows are returned in the order requested. IDs and dates are passed
+    as comma-separated lists using `ids` and `dates`.
+    """
+    return await batch_response("shows", Show, parse_ids(ids), parse_keys(dates))
+
+
+@router.post(
+    "/batch",
+    summary="Retrieve Information for a Batch of Shows",
+    response_model=ModelsShowsBatch,
+    responses={400: {"model": MessageDetails}, 500: {"model": MessageDetails}},
+    tags=["Shows"],
+)
+async def post_shows_batch(batch: ShowsBatchRequest):
+    """Retrieve a Batch of Shows by IDs and Dates.
+
+    Returned data: Show ID, date, Best Of flag, Repeat flag and NPR.org
+    show URL, and the IDs and dates that were not found.
+
+    Shows are returned in the order requested. IDs and dates are passed
+    as lists using `ids` and `dates` in the request body.
+    """
+    return await batch_response("shows", Show, batch.ids, batch.dates)
+
+
+@router.get(
+    "/details/batch",
+    summary="Retrieve Details for a Batch of Shows",
+    response_model=ModelsShowsDetailsBatch,
+    responses={400: {"model": MessageDetails}, 500: {"model": MessageDetails}},
+    tags=["Shows"],
+)
+@router.head("/details/batch", include_in_schema=False)
+async def get_shows_details_batch(
+    ids: Annotated[
+        str | None,
+        Query(title="Comma-separated list of show IDs", pattern=IDS_PATTERN),
+    ] = None,
+    dates: Annotated[
+        str | None,
+        Query(
+            title="Comma-separated list of show dates in ISO format (YYYY-MM-DD)",
+            pattern=DATES_PATTERN,
+        ),
+    ] = None,
+):
+    """Retrieve Details for a Batch of Shows by IDs and Dates.
+
+    Returned data: Show ID, date, Best Of flag, Repeat flag or date,
+    NPR.org show URL, location, description, notes, host, scorekeeper,
+    panelists, Bluff information and Not My Job guests, and the IDs and
+    dates that were not found.
+
+    Shows are returned in the order requested. IDs and dates are passed
+    as comma-separated lists using `ids` and `dates`.
+    """
+    return await batch_response(
+        "shows", Show, parse_ids(ids), parse_keys(dates), details=True
+    )
+
+
+@router.post(
+    "/details/batch",
+    summary="Retrieve Details for a Batch of Shows",
+    response_model=ModelsShowsDetailsBatch,
+    responses={400: {"model": MessageDetails}, 500: {"model": MessageDetails}},
+    tags=["Shows"],
+)
+async def post_shows_details_batch(batch: ShowsBatchRequest):
+    """Retrieve Details for a Batch of Shows by IDs and Dates.
+
+    Returned data: Show ID, date, Best Of flag, Repeat flag or date,
+    NPR.org show URL, location, description, notes, host, scorekeeper,
+    panelists, Bluff information and Not My Job guests, and the IDs and
+    dates that were not found.
+
+    Shows are returned in the order requested. IDs and dates are passed
+    as lists using `ids` and `dates` in the request body.
+    """
+    return await batch_response("shows", Show, batch.ids, batch.dates, details=True)
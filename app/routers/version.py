@@ -5,18 +5,24 @@
 # vim: set noai syntax=python ts=4 sw=4:
 """API routes for Application Version endpoints."""
 
-import mysql.connector
 from fastapi import APIRouter
 from wwdtm import VERSION as WWDTM_VERSION
 from wwdtm import database_version
 
-from app.config import API_VERSION, APP_VERSION, load_config
+from app.config import API_VERSION, APP_VERSION
+from app.database import database_connection
+from app.dispatch import run_blocking
+from app.generation import data_generation
 from app.models.version import Version
+from app.serialization import FastJSONRoute
 
-router = APIRouter(prefix=f"/v{API_VERSION}/version")
-_config = load_config()
-_database_config = _config["database"]
-_database_connection = mysql.connector.connect(**_database_config)
+router = APIRouter(prefix=f"/v{API_VERSION}/version", route_class=FastJSONRoute)
+
+
+def _retrieve_database_version() -> tuple[int] | None:
+    """Retrieves the Wait Wait Stats Database version."""
+    with database_connection() as connection:
+        return database_version(database_connection=connection)
 
 
 @router.get(
@@ -28,7 +34,9 @@ _database_connection = mysql.connector.connect(**_database_config)
 @router.head("", include_in_schema=False)
 async def get_version():
     """Retrieves API, Application and Wait Wait Stats Library Versions."""
-    _database_version = database_version(database_connection=_database_connection)
+    _database_version = data_generation.database_version
+    if not _database_version:
+        _database_version = await run_blocking(_retrieve_database_version)
 
     return {
         "api": API_VERSION,
@@ -0,0 +1,603 @@
+# Copyright (c) 2018-2026 Linh Pham
+# api.wwdt.me is released under the terms of the Apache License 2.0
+# SPDX-License-Identifier: Apache-2.0
+#
+# vim: set noai syntax=python ts=4 sw=4:
+"""Columnar Store of Panelist Show Dates and Decimal Scores."""
+
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from decimal import Decimal
+from math import floor
+from typing import Any
+
+import numpy
+from fastapi import HTTPException
+
+from app.config import load_config
+from app.database import database_connection
+from app.dispatch import UNRESOLVED, register_resolver, run_blocking
+from app.existence import normalize_slug
+from app.generation import GenerationStore, data_generation
+from app.panelist import RANKS
+
+_settings_config = load_config().get("settings", {})
+
+SCORE_COLUMNS_ENABLED: bool = bool(_settings_config.get("score_columns", True))
+MAX_COMPARE_PANELISTS: int = int(_settings_config.get("max_compare_panelists", 10))
+
+# Decimal scores of every panelist appearance in regular shows, using
+# the same filters as the wwdtm panelist decimal scores methods
+_SCORES_QUERY = """
+    SELECT pm.panelistid AS id, pm.showid AS show_id, s.showdate AS date,
+    pm.panelistscore_decimal AS score, pm.showpnlrank AS pnl_rank
+    FROM ww_showpnlmap pm
+    JOIN ww_shows s ON s.showid = pm.showid
+    WHERE s.bestof = 0 AND s.repeatshowid IS NULL
+    AND pm.panelistscore_decimal IS NOT NULL
+    ORDER BY pm.panelistid ASC, s.showdate ASC;
+    """
+
+# Range of the grouped scores, which includes every show
+_SCORE_RANGE_QUERY = """
+    SELECT MIN(pm.panelistscore_decimal) AS min,
+    MAX(pm.panelistscore_decimal) AS max
+    FROM ww_showpnlmap pm;
+    """
+
+_RANK_POSITIONS: dict[str, int] = {rank: index for index, rank in enumerate(RANKS)}
+
+_SLUGS_QUERY = """
+    SELECT p.panelistid AS id, p.panelistslug AS slug
+    FROM ww_panelists p
+    WHERE p.panelistslug IS NOT NULL;
+    """
+
+
+def score_label(score: Decimal) -> str:
+    """Returns the label used for a score in grouped scores.
+
+    :param score: Decimal score
+    :return: Score without trailing zeros, such as ``10`` or ``10.5``
+    """
+    return f"{Decimal(score).normalize():f}"
+
+
+def score_bins(minimum: Decimal | None, maximum: Decimal | None) -> list[str]:
+    """Returns the labels of the half-point scores in a score range.
+
+    :param minimum: Minimum decimal score
+    :param maximum: Maximum decimal score
+    :return: List of score labels, starting with the whole score at or
+        below the minimum score and ending with the half-point score
+        above the whole score at or below the maximum score
+    """
+    if minimum is None or maximum is None:
+        return []
+
+    labels = []
+    for score in range(floor(minimum), floor(maximum) + 1):
+        labels.append(score_label(Decimal(score)))
+        labels.append(score_label(Decimal(score) + Decimal("0.5")))
+
+    return labels
+
+
+@dataclass
+class DecimalScoreColumns:
+    """Show dates and decimal scores of every panelist appearance.
+
+    Appearances are stored as columnar arrays, ordered by panelist ID
+    and show date, with ``segments`` holding the start and end
+    positions of the appearances for each panelist. Scores grouped by
+    score are calculated once, when the columns are created.
+
+    ``show_axis_ids`` and ``show_axis_dates`` hold every show with at
+    least one appearance, sorted by show date, and ``show_positions``
+    holds the position of each appearance's show in the show axis.
+    ``ranks`` holds the position of each appearance's rank in
+    ``RANKS``, or -1 for any other rank.
+
+    ``co_appearances`` holds the positions of the appearances of each
+    pair of panelists on the same show, sorted by show date and keyed
+    by the pair of panelist IDs in ascending order.
+    """
+
+    generation: str
+    ids: numpy.ndarray
+    show_ids: numpy.ndarray
+    dates: numpy.ndarray
+    scores: numpy.ndarray
+    show_positions: numpy.ndarray
+    show_axis_ids: numpy.ndarray
+    show_axis_dates: numpy.ndarray
+    ranks: numpy.ndarray
+    segments: dict[int, tuple[int, int]] = field(default_factory=dict)
+    grouped: dict[int, list[tuple[str, int]]] = field(default_factory=dict)
+    slugs: dict[str, int] = field(default_factory=dict)
+    slugs_by_id: dict[int, str] = field(default_factory=dict)
+    co_appearances: dict[tuple[int, int], numpy.ndarray] = field(default_factory=dict)
+
+    @classmethod
+    def from_rows(
+        cls,
+        generation: str,
+        rows: list[dict[str, Any]],
+        minimum: Decimal | None = None,
+        maximum: Decimal | None = None,
+        slugs: dict[str, int] | None = None,
+    ) -> "DecimalScoreColumns":
+        """Creates columnar arrays from panelist appearance rows.
+
+        :param generation: Data generation of the rows
+        :param rows: Rows containing panelist ID, show ID, show date,
+            decimal score and rank, ordered by panelist ID and show date
+        :param minimum: Minimum decimal score of all appearances
+        :param maximum: Maximum decimal score of all appearances
+        :param slugs: Panelist IDs keyed by slug string
+        :return: Columnar arrays of the appearances
+        """
+        show_ids = numpy.array([row["show_id"] for row in rows], dtype=numpy.int64)
+        dates = numpy.array([row["date"] for row in rows], dtype="datetime64[D]")
+        axis_ids, first, positions = numpy.unique(
+            show_ids, return_index=True, return_inverse=True
+        )
+        axis_order = numpy.lexsort((axis_ids, dates[first]))
+        axis_positions = numpy.empty_like(axis_order)
+        axis_positions[axis_order] = numpy.arange(len(axis_order))
+
+        columns = cls(
+            generation=generation,
+            ids=numpy.array([row["id"] for row in rows], dtype=numpy.int64),
+            show_ids=show_ids,
+            dates=dates,
+            scores=numpy.array([row["score"] for row in rows], dtype=object),
+            show_positions=axis_positions[positions],
+            show_axis_ids=axis_ids[axis_order],
+            show_axis_dates=dates[first][axis_order],
+            ranks=numpy.array(
+                [_RANK_POSITIONS.get(row["pnl_rank"], -1) for row in rows],
+                dtype=numpy.int64,
+            ),
+            slugs={normalize_slug(slug): id_ for slug, id_ in (slugs or {}).items()},
+            slugs_by_id={id_: slug for slug, id_ in (slugs or {}).items()},
+        )
+        if not rows:
+            return columns
+
+        panelist_ids, starts, counts = numpy.unique(
+            columns.ids, return_index=True, return_counts=True
+        )
+        columns.segments = {
+            id_: (start, start + count)
+            for id_, start, count in zip(
+                panelist_ids.tolist(), starts.tolist(), counts.tolist(), strict=True
+            )
+        }
+
+        # Scores that fall on a half-point bin are counted for all
+        # panelists at once, and any other scores are added after the
+        # bins in ascending order, as the wwdtm methods do
+        labels = score_bins(minimum, maximum)
+        segment_index = numpy.repeat(numpy.arange(len(panelist_ids)), counts)
+        bins = columns.scores.astype(numpy.float64) * 2
+        if labels:
+            bins -= 2 * floor(minimum)
+
+        on_bin = (bins == numpy.floor(bins)) & (bins >= 0) & (bins < len(labels))
+        bin_counts = numpy.bincount(
+            segment_index[on_bin] * len(labels) + bins[on_bin].astype(numpy.int64),
+            minlength=len(panelist_ids) * len(labels),
+        ).reshape(len(panelist_ids), len(labels))
+
+        extras: dict[int, dict[str, int]] = {}
+        for position in numpy.flatnonzero(~on_bin).tolist():
+            id_ = int(columns.ids[position])
+            score = columns.scores[position]
+            extras.setdefault(id_, {})
+            label = score_label(score)
+            extras[id_][label] = extras[id_].get(label, 0) + 1
+
+        for index, id_ in enumerate(panelist_ids.tolist()):
+            grouped = list(zip(labels, bin_counts[index].tolist(), strict=True))
+            extra = extras.get(id_, {})
+            grouped.extend(
+                (label, extra[label]) for label in sorted(extra, key=Decimal)
+            )
+            columns.grouped[id_] = grouped
+
+        # Appearances sorted by show and panelist ID, so that each pair
+        # of panelists on a show is keyed in ascending order
+        by_show = numpy.lexsort((columns.ids, columns.show_positions))
+        show_starts = numpy.flatnonzero(
+            numpy.diff(columns.show_positions[by_show], prepend=-1)
+        ).tolist()
+        co_appearances: dict[tuple[int, int], list[tuple[int, int]]] = {}
+        for start, end in zip(
+            show_starts, [*show_starts[1:], len(by_show)], strict=True
+        ):
+            appearances = by_show[start:end].tolist()
+            for position, left in enumerate(appearances):
+                for right in appearances[position + 1 :]:
+                    pair = (int(columns.ids[left]), int(columns.ids[right]))
+                    co_appearances.setdefault(pair, []).append((left, right))
+
+        columns.co_appearances = {
+            pair: numpy.array(appearances, dtype=numpy.int64)
+            for pair, appearances in co_appearances.items()
+        }
+        return columns
+
+    def id_for_slug(self, slug: Any) -> int | None:
+        """Returns the panelist ID for a slug string, ignoring case.
+
+        :param slug: Panelist slug string
+        :return: Panelist ID, or None if the slug string does not exist
+        """
+        if not isinstance(slug, str):
+            return None
+
+        return self.slugs.get(normalize_slug(slug))
+
+    def _segment(self, panelist_id: int) -> slice | None:
+        """Returns the positions of a panelist's appearances."""
+        segment = self.segments.get(panelist_id)
+        return slice(*segment) if segment else None
+
+    def scores_list(self, panelist_id: int) -> dict[str, list[str | Decimal]]:
+        """Returns show dates and decimal scores as paired lists.
+
+        :param panelist_id: Panelist ID
+        :return: A dictionary containing a list of show dates and a
+            list of decimal scores
+        """
+        segment = self._segment(panelist_id)
+        if segment is None:
+            return {}
+
+        return {
+            "shows": numpy.datetime_as_string(self.dates[segment]).tolist(),
+            "scores": self.scores[segment].tolist(),
+        }
+
+    def scores_ordered_pair(self, panelist_id: int) -> list[tuple[str, Decimal]]:
+        """Returns show dates and decimal scores as a list of tuples.
+
+        :param panelist_id: Panelist ID
+        :return: A list of tuples containing show dates and decimal
+            scores
+        """
+        segment = self._segment(panelist_id)
+        if segment is None:
+            return []
+
+        return list(
+            zip(
+                numpy.datetime_as_string(self.dates[segment]).tolist(),
+                self.scores[segment].tolist(),
+                strict=True,
+            )
+        )
+
+    def scores_grouped_ordered_pair(self, panelist_id: int) -> list[tuple[str, int]]:
+        """Returns decimal scores and counts as a list of tuples.
+
+        :param panelist_id: Panelist ID
+        :return: A list of tuples containing decimal scores and score
+            counts
+        """
+        return list(self.grouped.get(panelist_id, []))
+
+    def scores_grouped_list(self, panelist_id: int) -> dict[str, list[str | int]]:
+        """Returns decimal scores and counts as paired lists.
+
+        :param panelist_id: Panelist ID
+        :return: A dictionary containing a list of decimal scores and a
+            list of score counts
+        """
+        grouped = self.grouped.get(panelist_id)
+        if not grouped:
+            return {}
+
+        return {
+            "score": [label for label, _ in grouped],
+            "count": [count for _, count in grouped],
+        }
+
+    def scores_matrix(
+        self,
+        panelist_ids: list[int] | None = None,
+        start_year: int | None = None,
+        end_year: int | None = None,
+        compact: bool = False,
+    ) -> dict[str, Any]:
+        """Returns decimal scores as a matrix of shows and panelists.
+
+        Shows are included if at least one of the included panelists
+        appeared on the show, and are sorted by show date. Each panelist
+        is a column of scores that lines up with the list of shows, with
+        None for each show the panelist did not appear on. Compact
+        columns only include the panelist's appearances, along with the
+        position of each appearance in the list of shows.
+
+        :param panelist_ids: IDs of the panelists to include, in the
+            order of the columns. Defaults to every panelist, sorted by
+            panelist ID
+        :param start_year: Only include shows from this year onward
+        :param end_year: Only include shows up to and including this
+            year
+        :param compact: Return compact columns instead of dense columns
+        :return: A dictionary containing the encoding, the IDs and
+            dates of the shows and the columns of panelist scores
+        """
+        selected = numpy.ones(len(self.ids), dtype=bool)
+        if start_year is not None:
+            selected &= self.dates >= numpy.datetime64(f"{start_year:04d}-01-01")
+
+        if end_year is not None:
+            selected &= self.dates <= numpy.datetime64(f"{end_year:04d}-12-31")
+
+        if panelist_ids is None:
+            columns = numpy.unique(self.ids[selected])
+        else:
+            columns = numpy.array(panelist_ids, dtype=numpy.int64)
+            selected &= numpy.isin(self.ids, columns)
+
+        positions = self.show_positions[selected]
+        rows = numpy.unique(positions)
+        row_index = numpy.searchsorted(rows, positions)
+        sorter = numpy.argsort(columns)
+        column_index = sorter[
+            numpy.searchsorted(columns, self.ids[selected], sorter=sorter)
+        ]
+        scores = self.scores[selected]
+
+        panelists = []
+        if compact:
+            order = numpy.lexsort((row_index, column_index))
+            bounds = numpy.searchsorted(
+                column_index[order], numpy.arange(len(columns) + 1)
+            ).tolist()
+            for index, id_ in enumerate(columns.tolist()):
+                appearances = order[bounds[index] : bounds[index + 1]]
+                panelists.append(
+                    {
+                        "id": id_,
+                        "slug": self.slugs_by_id.get(id_),
+                        "rows": row_index[appearances].tolist(),
+                        "scores": scores[appearances].tolist(),
+                    }
+                )
+        else:
+            matrix = numpy.full((len(columns), len(rows)), None, dtype=object)
+            matrix[column_index, row_index] = scores
+            for id_, column in zip(columns.tolist(), matrix.tolist(), strict=True):
+                panelists.append(
+                    {"id": id_, "slug": self.slugs_by_id.get(id_), "scores": column}
+                )
+
+        return {
+            "encoding": "compact" if compact else "dense",
+            "shows": {
+                "ids": self.show_axis_ids[rows].tolist(),
+                "dates": numpy.datetime_as_string(self.show_axis_dates[rows]).tolist(),
+            },
+            "panelists": panelists,
+        }
+
+    def _rank_counts(self, appearances: numpy.ndarray) -> dict[str, int]:
+        """Returns the number of times each rank appears in appearances."""
+        ranks = self.ranks[appearances]
+        counts = numpy.bincount(ranks[ranks >= 0], minlength=len(RANKS))
+        return dict(zip(RANKS.values(), counts.tolist(), strict=True))
+
+    def _matchup(
+        self, panelist_id: int, opponent_id: int, number_decimal_places: int
+    ) -> dict[str, Any]:
+        """Returns the head-to-head record of a panelist and an opponent."""
+        pair = (min(panelist_id, opponent_id), max(panelist_id, opponent_id))
+        appearances = self.co_appearances.get(
+            pair, numpy.empty((0, 2), dtype=numpy.int64)
+        )
+        if panelist_id > opponent_id:
+            appearances = appearances[:, ::-1]
+
+        own = appearances[:, 0]
+        other = appearances[:, 1]
+        differentials = self.scores[own] - self.scores[other]
+        signs = numpy.sign(differentials.astype(numpy.float64))
+        count = len(differentials)
+        total = differentials.sum() if count else Decimal(0)
+        return {
+            "panelist_id": panelist_id,
+            "opponent_id": opponent_id,
+            "shared_appearances": count,
+            "wins": int((signs > 0).sum()),
+            "losses": int((signs < 0).sum()),
+            "ties": int((signs == 0).sum()),
+            "score_differential": {
+                "total": total,
+                "mean": round(total / count, number_decimal_places) if count else None,
+                "minimum": differentials.min() if count else None,
+                "maximum": differentials.max() if count else None,
+            },
+            "ranks": {
+                "panelist": self._rank_counts(own),
+                "opponent": self._rank_counts(other),
+            },
+        }
+
+    def compare(
+        self, panelist_ids: list[int], number_decimal_places: int = 5
+    ) -> dict[str, Any]:
+        """Returns head-to-head comparisons of panelists.
+
+        Each pair of panelists is compared using the co-appearance
+        index, with wins, losses and ties based on decimal scores and
+        score differentials calculated as the panelist's score minus the
+        opponent's score. Shows are included if all of the panelists
+        appeared on the show, and are sorted by show date.
+
+        :param panelist_ids: IDs of the panelists to compare
+        :param number_decimal_places: Number of decimal places to
+            include when rounding the mean score differential
+        :return: A dictionary containing the IDs and dates of the shows
+            shared by all of the panelists, each panelist's scores on
+            those shows and the head-to-head record of each pair of
+            panelists
+        """
+        segments = [slice(*self.segments.get(id_, (0, 0))) for id_ in panelist_ids]
+        shared = numpy.unique(self.show_positions[segments[0]])
+        for segment in segments[1:]:
+            shared = numpy.intersect1d(shared, self.show_positions[segment])
+
+        panelists = []
+        for id_, segment in zip(panelist_ids, segments, strict=True):
+            appearances = numpy.arange(len(self.ids))[segment]
+            appearances = appearances[numpy.isin(self.show_positions[segment], shared)]
+            appearances = appearances[numpy.argsort(self.show_positions[appearances])]
+            panelists.append(
+                {
+                    "id": id_,
+                    "slug": self.slugs_by_id.get(id_),
+                    "scores": self.scores[appearances].tolist(),
+                }
+            )
+
+        return {
+            "shows": {
+                "ids": self.show_axis_ids[shared].tolist(),
+                "dates": numpy.datetime_as_string(
+                    self.show_axis_dates[shared]
+                ).tolist(),
+            },
+            "panelists": panelists,
+            "matchups": [
+                self._matchup(id_, opponent_id, number_decimal_places)
+                for index, id_ in enumerate(panelist_ids)
+                for opponent_id in panelist_ids[index + 1 :]
+            ],
+        }
+
+
+# Projections of the score columns, keyed by the wwdtm
+# PanelistDecimalScores method without the ``_by_id`` or ``_by_slug``
+# suffix
+_PROJECTIONS: dict[str, Callable[[DecimalScoreColumns, int], Any]] = {
+    "retrieve_scores_list": DecimalScoreColumns.scores_list,
+    "retrieve_scores_ordered_pair": DecimalScoreColumns.scores_ordered_pair,
+    "retrieve_scores_grouped_ordered_pair": (
+        DecimalScoreColumns.scores_grouped_ordered_pair
+    ),
+    "retrieve_scores_grouped_list": DecimalScoreColumns.scores_grouped_list,
+}
+
+
+def load_score_columns(generation: str) -> DecimalScoreColumns:
+    """Loads the show dates and decimal scores from the database.
+
+    All queries share a single database connection.
+
+    :param generation: Current data generation
+    :return: Columnar arrays of panelist appearances
+    """
+    with database_connection() as connection:
+        cursor = connection.cursor(dictionary=True)
+        cursor.execute(_SCORES_QUERY)
+        rows = cursor.fetchall()
+        cursor.execute(_SCORE_RANGE_QUERY)
+        score_range = cursor.fetchone() or {}
+        cursor.execute(_SLUGS_QUERY)
+        slugs = {row["slug"]: row["id"] for row in cursor.fetchall()}
+        cursor.close()
+
+    return DecimalScoreColumns.from_rows(
+        generation,
+        rows,
+        minimum=score_range.get("min"),
+        maximum=score_range.get("max"),
+        slugs=slugs,
+    )
+
+
+class ScoreColumnStore(GenerationStore):
+    """Answers panelist decimal scores queries from the score columns.
+
+    The columns are reloaded each time the data changes, and queries
+    are left to the database while the columns are being loaded.
+    """
+
+    current: DecimalScoreColumns | None
+
+    def __init__(self):
+        super().__init__("panelist score columns")
+
+    def resolve(self, key: str, args: tuple[Any, ...], kwargs: dict[str, Any]) -> Any:
+        """Answers a panelist decimal scores query.
+
+        :param key: Query name, such as
+            ``PanelistDecimalScores.retrieve_scores_list_by_id``
+        :param args: Positional arguments of the query
+        :param kwargs: Keyword arguments of the query
+        :return: Result of the query, or ``UNRESOLVED`` if the columns
+            are not loaded or do not cover the query
+        """
+        columns = self.current
+        entity, _, method = key.partition(".")
+        if (
+            columns is None
+            or entity != "PanelistDecimalScores"
+            or kwargs
+            or len(args) != 1
+        ):
+            return UNRESOLVED
+
+        base, _, lookup = method.rpartition("_by_")
+        projection = _PROJECTIONS.get(base)
+        if projection is None or lookup not in ("id", "slug"):
+            return UNRESOLVED
+
+        panelist_id = args[0] if lookup == "id" else columns.id_for_slug(args[0])
+        return projection(columns, panelist_id)
+
+    async def load(self, generation: str) -> DecimalScoreColumns:
+        """Loads the score columns for a data generation.
+
+        :param generation: Data generation to load the columns for
+        :return: Score columns for the data generation
+        """
+        return await run_blocking(
+            load_score_columns, generation, key="load_score_columns"
+        )
+
+
+score_column_store = ScoreColumnStore()
+
+if SCORE_COLUMNS_ENABLED:
+    data_generation.subscribe(score_column_store.invalidate)
+    register_resolver(score_column_store.resolve)
+
+
+async def current_score_columns() -> DecimalScoreColumns:
+    """Returns the score columns for the current data generation.
+
+    The columns are loaded first if needed. If the store has been
+    disabled, the columns are loaded from the database for each call.
+
+    :return: Columnar arrays of panelist appearances
+    :raise fastapi.HTTPException: If the score columns are not
+        available
+    """
+    if not SCORE_COLUMNS_ENABLED:
+        return await run_blocking(
+            load_score_columns, data_generation.generation, key="load_score_columns"
+        )
+
+    await score_column_store.ensure_loaded()
+    columns = score_column_store.current
+    if columns is None:
+        raise HTTPException(
+            status_code=503, detail="Panelist scores are currently unavailable"
+        )
+
+    return columns
@@ -0,0 +1,350 @@
+# Copyright (c) 2018-2026 Linh Pham
+# api.wwdt.me is released under the terms of the Apache License 2.0
+# SPDX-License-Identifier: Apache-2.0
+#
+# vim: set noai syntax=python ts=4 sw=4:
+"""Fast JSON Serialization for Trusted wwdtm Library Output."""
+
+import dataclasses
+import types
+import typing
+from collections.abc import (
+    AsyncIterable,
+    AsyncIterator,
+    Callable,
+    Coroutine,
+    Iterable,
+)
+from decimal import Decimal
+from functools import cache
+from typing import Any
+
+from fastapi.routing import APIRoute
+from pydantic import BaseModel, RootModel, TypeAdapter
+from pydantic_core import to_json
+from starlette.requests import Request
+from starlette.responses import Response, StreamingResponse
+
+from app.config import load_config
+
+_settings_config = load_config().get("settings", {})
+
+FAST_SERIALIZER: bool = bool(_settings_config.get("fast_serializer", False))
+FAST_SERIALIZER_VALIDATE: bool = bool(
+    _settings_config.get("fast_serializer_validate", False)
+)
+STREAM_CHUNK_SIZE: int = int(_settings_config.get("stream_chunk_size", 64 * 1024))
+
+Converter = Callable[[Any], Any]
+
+
+def _identity(value: Any) -> Any:
+    return value
+
+
+def _to_decimal(value: Any) -> Decimal:
+    if isinstance(value, Decimal):
+        return value
+
+    return Decimal(str(value))
+
+
+def _compile_union(members: tuple[Any, ...]) -> Converter:
+    """Builds a converter for a union of types.
+
+    Model members are used for dictionaries, preferring the first model
+    with all of its required fields present. Other values use the first
+    member with a matching type, falling back to the first member that
+    can convert the value.
+    """
+    optional = type(None) in members
+    members = tuple(member for member in members if member is not type(None))
+    converters = [(member, _compile(member)) for member in members]
+    models = [
+        (
+            frozenset(
+                name
+                for name, field in member.model_fields.items()
+                if field.is_required()
+            ),
+            converter,
+        )
+        for member, converter in converters
+        if isinstance(member, type) and issubclass(member, BaseModel)
+    ]
+
+    def _convert(value: Any) -> Any:
+        if value is None and optional:
+            return None
+
+        if isinstance(value, dict) and models:
+            for required, converter in models:
+                if required <= value.keys():
+                    return converter(value)
+
+            return models[0][1](value)
+
+        for member, converter in converters:
+            if isinstance(member, type) and type(value) is member:
+                return converter(value)
+
+        for _, converter in converters:
+            try:
+                return converter(value)
+            except (TypeError, ValueError, ArithmeticError, AttributeError):
+                continue
+
+        return value
+
+    if len(converters) == 1:
+        converter = converters[0][1]
+        return lambda value: None if value is None else converter(value)
+
+    return _convert
+
+
+def _compile_model(model: type[BaseModel]) -> Converter:
+    """Builds a converter that projects a dictionary onto a model."""
+    if issubclass(model, RootModel):
+        return _compile(model.model_fields["root"].annotation)
+
+    fields = []
+    for name, field in model.model_fields.items():
+        key = field.serialization_alias or field.alias or name
+        default = None if field.is_required() else field.get_default()
+        fields.append((name, key, _compile(field.annotation), default))
+
+    def _convert(value: Any) -> dict[str, Any]:
+        if isinstance(value, BaseModel):
+            value = value.model_dump()
+
+        return {
+            key: converter(value[name]) if name in value else default
+            for name, key, converter, default in fields
+        }
+
+    return _convert
+
+
+@cache
+def _compile(annotation: Any) -> Converter:
+    """Builds a converter that coerces a value to match an annotation.
+
+    The converted value serializes to the same JSON as the value after
+    it has been validated against the annotation.
+
+    :param annotation: Type annotation from a Pydantic model field
+    :return: Function that converts a single value
+    """
+    origin = typing.get_origin(annotation)
+    if origin is typing.Annotated:
+        return _compile(typing.get_args(annotation)[0])
+
+    if origin in (typing.Union, types.UnionType):
+        return _compile_union(typing.get_args(annotation))
+
+    if origin is list:
+        (item,) = typing.get_args(annotation) or (Any,)
+        converter = _compile(item)
+        return lambda value: [converter(element) for element in value]
+
+    if origin is dict:
+        _, item = typing.get_args(annotation) or (Any, Any)
+        converter = _compile(item)
+        return lambda value: {
+            str(key): converter(element) for key, element in value.items()
+        }
+
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return _compile_model(annotation)
+
+    if annotation is bool:
+        return bool
+
+    if annotation is int:
+        return int
+
+    if annotation is float:
+        return float
+
+    if annotation is Decimal:
+        return _to_decimal
+
+    return _identity
+
+
+def serialize(model: Any, content: Any) -> bytes:
+    """Serializes wwdtm output to JSON without validating it.
+
+    :param model: Response model for the content
+    :param content: Data returned by the route handler
+    :return: JSON document as bytes, matching the output of the
+        response model
+    """
+    return to_json(_compile(model)(content))
+
+
+@cache
+def _type_adapter(model: Any) -> TypeAdapter:
+    return TypeAdapter(model)
+
+
+def validate(model: Any, content: Any, body: bytes) -> None:
+    """Checks that a fast serialized body matches the response model.
+
+    :param model: Response model for the content
+    :param content: Data returned by the route handler
+    :param body: JSON document created by ``serialize``
+    :raise pydantic.ValidationError: If the content is not valid for
+        the response model
+    :raise RuntimeError: If the JSON documents do not match
+    """
+    adapter = _type_adapter(model)
+    expected = adapter.dump_json(adapter.validate_python(content), by_alias=True)
+    if body != expected:
+        raise RuntimeError(
+            f"Fast serializer output does not match {getattr(model, '__name__', model)}"
+        )
+
+
+def render(model: Any, content: Any) -> bytes:
+    """Serializes content using the response model.
+
+    The fast serializer is used if enabled, otherwise the content is
+    validated and serialized by the response model.
+
+    :param model: Response model for the content
+    :param content: Data returned by the route handler
+    :return: JSON document as bytes
+    """
+    if FAST_SERIALIZER:
+        body = serialize(model, content)
+        if FAST_SERIALIZER_VALIDATE:
+            validate(model, content, body)
+
+        return body
+
+    adapter = _type_adapter(model)
+    return adapter.dump_json(adapter.validate_python(content), by_alias=True)
+
+
+def model_response(model: Any, content: Any) -> Response:
+    """Creates a JSON response using the response model.
+
+    :param model: Response model for the content
+    :param content: Data returned by the route handler
+    :return: JSON response
+    """
+    return Response(content=render(model, content), media_type="application/json")
+
+
+def _item_encoder(model: type[BaseModel], field: str) -> Callable[[Any], bytes]:
+    """Returns a function that serializes a single item of a list field."""
+    annotation = model.model_fields[field].annotation
+    if typing.get_origin(annotation) in (typing.Union, types.UnionType):
+        (annotation,) = (
+            member for member in typing.get_args(annotation) if member is not type(None)
+        )
+
+    (item,) = typing.get_args(annotation)
+    if FAST_SERIALIZER:
+        converter = _compile(item)
+
+        def _encode(value: Any) -> bytes:
+            body = to_json(converter(value))
+            if FAST_SERIALIZER_VALIDATE:
+                validate(item, value, body)
+
+            return body
+
+        return _encode
+
+    adapter = _type_adapter(item)
+    return lambda value: adapter.dump_json(
+        adapter.validate_python(value), by_alias=True
+    )
+
+
+async def iter_model_json(
+    model: type[BaseModel], field: str, batches: AsyncIterable[Iterable[Any]]
+) -> AsyncIterator[bytes]:
+    """Serializes batches of items as a JSON document as they arrive.
+
+    Serialized items are yielded in chunks of at least
+    ``STREAM_CHUNK_SIZE`` bytes rather than one item at a time. Only
+    the current batch and chunk are held in memory.
+
+    :param model: Response model with a single list field
+    :param field: Name of the list field
+    :param batches: Async iterable of lists of items to serialize
+    :return: Async iterator of JSON document chunks
+    """
+    encode = _item_encoder(model, field)
+    buffer = bytearray(b"{" + to_json(field) + b":[")
+    first = True
+    async for batch in batches:
+        for item in batch:
+            if not first:
+                buffer += b","
+
+            first = False
+            buffer += encode(item)
+            if len(buffer) >= STREAM_CHUNK_SIZE:
+                yield bytes(buffer)
+                buffer.clear()
+
+    buffer += b"]}"
+    yield bytes(buffer)
+
+
+def streaming_model_response(
+    model: type[BaseModel], field: str, batches: AsyncIterable[Iterable[Any]]
+) -> StreamingResponse:
+    """Creates a JSON response that is serialized while it is sent.
+
+    The JSON document matches the output of the response model, but
+    items are retrieved and serialized in batches while the response
+    is sent, so neither the items nor the serialized document are ever
+    held in memory in their entirety.
+
+    :param model: Response model with a single list field
+    :param field: Name of the list field
+    :param batches: Async iterable of lists of items to serialize
+    :return: Streaming JSON response
+    """
+    return StreamingResponse(
+        iter_model_json(model, field, batches), media_type="application/json"
+    )
+
+
+class FastJSONRoute(APIRoute):
+    """API route that can skip response model validation.
+
+    If ``fast_serializer`` is enabled, content returned by the route
+    handler is converted directly to JSON bytes using the route's
+    response model as a template instead of being validated by
+    FastAPI. The response model is still used to generate the OpenAPI
+    schema. If ``fast_serializer_validate`` is also enabled, every
+    response is checked against the output of the response model.
+    """
+
+    def get_route_handler(self) -> Callable[[Request], Coroutine[Any, Any, Response]]:
+        if not FAST_SERIALIZER or not self.response_model:
+            return super().get_route_handler()
+
+        endpoint = self.dependant.call
+        model = self.response_model
+
+        async def _call(**kwargs: Any) -> Any:
+            content = await endpoint(**kwargs)
+            if isinstance(content, Response):
+                return content
+
+            return model_response(model, content)
+
+        dependant = self.dependant
+        self.dependant = dataclasses.replace(dependant, call=_call)
+        try:
+            return super().get_route_handler()
+        finally:
+            self.dependant = dependant
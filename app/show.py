@@ -0,0 +1,384 @@
+# Copyright (c) 2018-2026 Linh Pham
+# api.wwdt.me is released under the terms of the Apache License 2.0
+# SPDX-License-Identifier: Apache-2.0
+#
+# vim: set noai syntax=python ts=4 sw=4:
+"""Show Details Retrieval Using Set-Based Queries."""
+
+import datetime
+from collections.abc import Callable
+from typing import Any
+
+from slugify import slugify
+from wwdtm import show
+
+# Each query selects the rows for all shows matching the year, month
+# and day parameters, any of which can be NULL to match every show,
+# so that each table is only queried once per request
+_CORE_QUERY = """
+    SELECT s.showid AS show_id, s.showdate AS date,
+    s.bestof AS best_of, s.repeatshowid AS repeat_show_id,
+    os.showdate AS original_show_date, s.showurl AS show_url,
+    l.locationid AS location_id, l.city, l.state,
+    pa.name AS state_name, l.latitude, l.longitude, l.venue,
+    l.locationslug AS location_slug,
+    h.hostid AS host_id, h.host, h.hostslug AS host_slug,
+    hm.guest as host_guest, sk.scorekeeperid AS scorekeeper_id,
+    sk.scorekeeper, sk.scorekeeperslug AS scorekeeper_slug,
+    skm.guest AS scorekeeper_guest,
+    skm.description AS scorekeeper_description,
+    sd.showdescription AS show_description,
+    sn.shownotes AS show_notes
+    FROM ww_shows s
+    LEFT JOIN ww_shows os ON os.showid = s.repeatshowid
+    JOIN ww_showlocationmap lm ON lm.showid = s.showid
+    JOIN ww_locations l ON l.locationid = lm.locationid
+    LEFT JOIN ww_postal_abbreviations pa ON pa.postal_abbreviation = l.state
+    JOIN ww_showhostmap hm ON hm.showid = s.showid
+    JOIN ww_hosts h ON h.hostid = hm.hostid
+    JOIN ww_showskmap skm ON skm.showid = s.showid
+    JOIN ww_scorekeepers sk ON sk.scorekeeperid = skm.scorekeeperid
+    JOIN ww_showdescriptions sd ON sd.showid = s.showid
+    JOIN ww_shownotes sn ON sn.showid = s.showid
+    WHERE (%(year)s IS NULL OR YEAR(s.showdate) = %(year)s)
+    AND (%(month)s IS NULL OR MONTH(s.showdate) = %(month)s)
+    AND (%(day)s IS NULL OR DAY(s.showdate) = %(day)s)
+    ORDER BY s.showdate ASC;
+    """
+
+_PANELISTS_QUERY = """
+    SELECT pm.showid AS show_id, pm.panelistid AS id, p.panelist AS name,
+    p.panelistslug AS slug,
+    pm.panelistlrndstart AS start,
+    pm.panelistlrndstart_decimal AS start_decimal,
+    pm.panelistlrndcorrect AS correct,
+    pm.panelistlrndcorrect_decimal AS correct_decimal,
+    pm.panelistscore AS score,
+    pm.panelistscore_decimal AS score_decimal,
+    pm.showpnlrank AS pnl_rank
+    FROM ww_showpnlmap pm
+    JOIN ww_panelists p ON p.panelistid = pm.panelistid
+    JOIN ww_shows s ON s.showid = pm.showid
+    WHERE (%(year)s IS NULL OR YEAR(s.showdate) = %(year)s)
+    AND (%(month)s IS NULL OR MONTH(s.showdate) = %(month)s)
+    AND (%(day)s IS NULL OR DAY(s.showdate) = %(day)s)
+    ORDER BY pm.showid ASC, pm.panelistscore_decimal DESC,
+    pm.showpnlmapid ASC;
+    """
+
+_BLUFFS_QUERY = """
+    SELECT bm.showid AS show_id, bm.segment,
+    bm.chosenbluffpnlid AS chosen_id, cp.panelist AS chosen_name,
+    cp.panelistslug AS chosen_slug,
+    bm.correctbluffpnlid AS correct_id, rp.panelist AS correct_name,
+    rp.panelistslug AS correct_slug
+    FROM ww_showbluffmap bm
+    JOIN ww_shows s ON s.showid = bm.showid
+    LEFT JOIN ww_panelists cp ON cp.panelistid = bm.chosenbluffpnlid
+    LEFT JOIN ww_panelists rp ON rp.panelistid = bm.correctbluffpnlid
+    WHERE (%(year)s IS NULL OR YEAR(s.showdate) = %(year)s)
+    AND (%(month)s IS NULL OR MONTH(s.showdate) = %(month)s)
+    AND (%(day)s IS NULL OR DAY(s.showdate) = %(day)s)
+    ORDER BY bm.showid ASC, bm.segment ASC;
+    """
+
+_GUESTS_QUERY = """
+    SELECT gm.showid AS show_id, gm.guestid AS id, g.guest AS name,
+    g.guestslug AS slug, gm.guestscore AS score,
+    gm.exception AS score_exception
+    FROM ww_showguestmap gm
+    JOIN ww_guests g ON g.guestid = gm.guestid
+    JOIN ww_shows s ON s.showid = gm.showid
+    WHERE (%(year)s IS NULL OR YEAR(s.showdate) = %(year)s)
+    AND (%(month)s IS NULL OR MONTH(s.showdate) = %(month)s)
+    AND (%(day)s IS NULL OR DAY(s.showdate) = %(day)s)
+    ORDER BY gm.showid ASC, gm.showguestmapid ASC;
+    """
+
+
+def core_info(
+    row: dict[str, Any], slugify_location: Callable[..., str]
+) -> dict[str, Any]:
+    """Returns the core show information for a show row.
+
+    :param row: Row returned by the core information query
+    :param slugify_location: Function used to create a location slug
+        string for locations without one
+    :return: A dictionary containing show information, location, host,
+        scorekeeper, description and notes
+    """
+    if not row["latitude"] and not row["longitude"]:
+        coordinates = None
+    else:
+        coordinates = {
+            "latitude": row["latitude"] if row["latitude"] else None,
+            "longitude": row["longitude"] if row["longitude"] else None,
+        }
+
+    location_info = {
+        "id": row["location_id"],
+        "slug": row["location_slug"],
+        "city": row["city"],
+        "state": row["state"],
+        "state_name": row["state_name"],
+        "venue": row["venue"],
+        "coordinates": coordinates,
+    }
+    if not row["location_slug"]:
+        location_info["slug"] = slugify_location(
+            location_id=row["location_id"],
+            venue=row["venue"],
+            city=row["city"],
+            state=row["state"],
+        )
+
+    show_info = {
+        "id": row["show_id"],
+        "date": row["date"].isoformat(),
+        "best_of": bool(row["best_of"]),
+        "repeat_show": bool(row["repeat_show_id"]),
+    }
+    if row["repeat_show_id"]:
+        original_date = row["original_show_date"]
+        show_info["original_show_id"] = row["repeat_show_id"]
+        show_info["original_show_date"] = (
+            original_date.isoformat() if original_date else None
+        )
+
+    show_info.update(
+        {
+            "show_url": row["show_url"],
+            "description": (
+                str(row["show_description"]).strip()
+                if row["show_description"]
+                else None
+            ),
+            "notes": str(row["show_notes"]).strip() if row["show_notes"] else None,
+            "location": location_info,
+            "host": {
+                "id": row["host_id"],
+                "name": row["host"],
+                "slug": row["host_slug"] if row["host_slug"] else slugify(row["host"]),
+                "guest": bool(row["host_guest"]),
+            },
+            "scorekeeper": {
+                "id": row["scorekeeper_id"],
+                "name": row["scorekeeper"],
+                "slug": (
+                    row["scorekeeper_slug"]
+                    if row["scorekeeper_slug"]
+                    else slugify(row["scorekeeper"])
+                ),
+                "guest": bool(row["scorekeeper_guest"]),
+                "description": (
+                    row["scorekeeper_description"]
+                    if row["scorekeeper_description"]
+                    else None
+                ),
+            },
+        }
+    )
+    return show_info
+
+
+def panelist_info(row: dict[str, Any]) -> dict[str, Any]:
+    """Returns the panelist information for a show panelist row.
+
+    :param row: Row returned by the panelists query
+    :return: A dictionary containing panelist information, scores and
+        ranking
+    """
+    start = row.get("start_decimal")
+    correct = row.get("correct_decimal")
+    score = row.get("score_decimal")
+    score_exception = bool(
+        start and correct and score and score != (start + (correct * 2))
+    )
+
+    return {
+        "id": row["id"],
+        "name": row["name"],
+        "slug": row["slug"] if row["slug"] else slugify(row["name"]),
+        "lightning_round_start": row["start"],
+        "lightning_round_start_decimal": start,
+        "lightning_round_correct": row["correct"],
+        "lightning_round_correct_decimal": correct,
+        "score": row["score"],
+        "score_decimal": score,
+        "score_exception": score_exception,
+        "rank": row["pnl_rank"] if row["pnl_rank"] else None,
+    }
+
+
+def _bluff_panelist(id_: int | None, name: str, slug: str | None) -> Any:
+    """Returns the information for a chosen or correct Bluff panelist."""
+    if not id_:
+        return None
+
+    return {"id": id_, "name": name, "slug": slug if slug else slugify(name)}
+
+
+def bluff_info(row: dict[str, Any]) -> dict[str, Any]:
+    """Returns the Bluff the Listener information for a show Bluff row.
+
+    :param row: Row returned by the Bluff the Listener query
+    :return: A dictionary containing the segment number and information
+        about the chosen Bluff panelist and correct Bluff panelist
+    """
+    return {
+        "segment": row["segment"],
+        "chosen_panelist": _bluff_panelist(
+            row["chosen_id"], row["chosen_name"], row["chosen_slug"]
+        ),
+        "correct_panelist": _bluff_panelist(
+            row["correct_id"], row["correct_name"], row["correct_slug"]
+        ),
+    }
+
+
+def guest_info(row: dict[str, Any]) -> dict[str, Any]:
+    """Returns the Not My Job guest information for a show guest row.
+
+    :param row: Row returned by the Not My Job guests query
+    :return: A dictionary containing guest information, score and
+        scoring exception
+    """
+    return {
+        "id": row["id"],
+        "name": row["name"],
+        "slug": row["slug"] if row["slug"] else slugify(row["name"]),
+        "score": row["score"],
+        "score_exception": bool(row["score_exception"]),
+    }
+
+
+def group_rows(
+    rows: list[dict[str, Any]], convert: Callable[[dict[str, Any]], Any]
+) -> dict[int, list[Any]]:
+    """Groups converted rows by show ID, keeping the order of the rows.
+
+    :param rows: Rows with a ``show_id`` column
+    :param convert: Function used to convert each row
+    :return: Dictionary of lists of converted rows, keyed by show ID
+    """
+    grouped: dict[int, list[Any]] = {}
+    for row in rows:
+        grouped.setdefault(row["show_id"], []).append(convert(row))
+
+    return grouped
+
+
+class Show(show.Show):
+    """Show retrieval class with set-based details queries.
+
+    The wwdtm details methods for a year, a year and month or a month
+    and day query the panelists, Bluff the Listener segments and Not My
+    Job guests separately for each show, and the original show date
+    separately for each repeat show. These methods instead query each
+    table once for all matching shows and join the rows by show ID,
+    returning the same information as ``retrieve_details_by_id`` for
+    each show.
+
+    :param connect_dict: A dictionary containing database connection
+        settings as required by MySQL Connector/Python
+    :param database_connection: MySQL database connection object
+    """
+
+    def _retrieve_details(
+        self, year: int | None = None, month: int | None = None, day: int | None = None
+    ) -> list[dict[str, Any]]:
+        """Retrieves detailed show information for the matching shows."""
+        params = {"year": year, "month": month, "day": day}
+        slugify_location = self.info_multiple.loc_util.slugify_location
+        cursor = self.database_connection.cursor(dictionary=True)
+        try:
+            cursor.execute(_CORE_QUERY, params)
+            info: dict[int, dict[str, Any]] = {}
+            for row in cursor.fetchall():
+                if row["show_id"] not in info:
+                    info[row["show_id"]] = core_info(row, slugify_location)
+
+            if not info:
+                return []
+
+            cursor.execute(_PANELISTS_QUERY, params)
+            panelists = group_rows(cursor.fetchall(), panelist_info)
+            cursor.execute(_BLUFFS_QUERY, params)
+            bluffs = group_rows(cursor.fetchall(), bluff_info)
+            cursor.execute(_GUESTS_QUERY, params)
+            guests = group_rows(cursor.fetchall(), guest_info)
+        finally:
+            cursor.close()
+
+        for show_id, show_info in info.items():
+            show_info["panelists"] = panelists.get(show_id, [])
+            show_info["bluffs"] = bluffs.get(show_id, [])
+            show_info["guests"] = guests.get(show_id, [])
+
+        return list(info.values())
+
+    def retrieve_all_details(self) -> list[dict[str, Any]]:
+        """Retrieves detailed show information for all shows.
+
+        :return: A list of dictionaries containing show ID, show date,
+            Best Of show flag, repeat show ID (if applicable), show URL
+            at NPR.org, host, scorekeeper, location, panelists and
+            guests
+        """
+        return self._retrieve_details()
+
+    def retrieve_details_by_month_day(
+        self, month: int, day: int
+    ) -> list[dict[str, Any]]:
+        """Retrieves detailed show information by month and day.
+
+        :param month: One or two-digit month
+        :param day: One or two-digit day
+        :return: A list of dictionaries containing show ID, show date,
+            Best Of show flag, repeat show ID (if applicable), show URL
+            at NPR.org, host, scorekeeper, location, panelists and
+            guests
+        """
+        if not 1 <= month <= 12 or not 1 <= day <= 31:
+            return []
+
+        return self._retrieve_details(month=month, day=day)
+
+    def retrieve_details_by_year(self, year: int) -> list[dict[str, Any]]:
+        """Retrieves detailed show information by year.
+
+        :param year: Four-digit year
+        :return: A list of dictionaries containing show ID, show date,
+            Best Of show flag, repeat show ID (if applicable), show URL
+            at NPR.org, host, scorekeeper, location, panelists and
+            guests
+        """
+        try:
+            parsed_year = datetime.datetime.strptime(f"{year:04d}", "%Y")
+        except ValueError:
+            return []
+
+        return self._retrieve_details(year=parsed_year.year)
+
+    def retrieve_details_by_year_month(
+        self, year: int, month: int
+    ) -> list[dict[str, Any]]:
+        """Retrieves detailed show information by year and month.
+
+        :param year: Four-digit year
+        :param month: One or two-digit month
+        :return: A list of dictionaries containing show ID, show date,
+            Best Of show flag, repeat show ID (if applicable), show URL
+            at NPR.org, host, scorekeeper, location, panelists and
+            guests
+        """
+        try:
+            parsed_year_month = datetime.datetime.strptime(
+                f"{year:04d}-{month:02d}-01", "%Y-%m-%d"
+            )
+        except ValueError:
+            return []
+
+        return self._retrieve_details(
+            year=parsed_year_month.year, month=parsed_year_month.month
+        )
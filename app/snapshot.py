@@ -0,0 +1,698 @@
+# Copyright (c) 2018-2026 Linh Pham
+# api.wwdt.me is released under the terms of the Apache License 2.0
+# SPDX-License-Identifier: Apache-2.0
+#
+# vim: set noai syntax=python ts=4 sw=4:
+"""In-Memory Snapshot of the Wait Wait Don't Tell Me! Data Set."""
+
+import asyncio
+import datetime
+import inspect
+import logging
+from collections import defaultdict
+from collections.abc import Callable, Mapping, Sequence
+from contextlib import suppress
+from functools import partial
+from pathlib import Path
+from typing import Any
+
+from mysql.connector.errors import Error
+from wwdtm.guest import Guest
+from wwdtm.host import Host
+from wwdtm.location import Location
+from wwdtm.pronoun import Pronouns
+from wwdtm.scorekeeper import Scorekeeper
+
+from app.config import load_config
+from app.database import database_connection
+from app.dispatch import UNRESOLVED, register_resolver, run_blocking
+from app.generation import GenerationStore, data_generation
+from app.panelist import Panelist
+from app.show import Show
+from app.snapshot_file import SnapshotFile, write_snapshot_file
+
+logger = logging.getLogger(__name__)
+
+_settings_config = load_config().get("settings", {})
+_snapshot_config = _settings_config.get("snapshot", {})
+
+SNAPSHOT_ENABLED: bool = bool(_snapshot_config.get("enabled", False))
+SNAPSHOT_PATH: str = str(_snapshot_config.get("path") or "")
+NUMBER_DECIMAL_PLACES: int = int(_settings_config.get("number_decimal_places", 6))
+
+
+class EntityIndex:
+    """Rows and lookup indexes for a type of entity.
+
+    :param rows: Rows returned by the ``retrieve_all`` method
+    :param details: Rows returned by the ``retrieve_all_details``
+        method
+    :param all_kwargs: Keyword arguments used to retrieve ``rows``
+    :param details_kwargs: Keyword arguments used to retrieve
+        ``details``
+    :param by_id: Rows keyed by ID, built from ``rows`` if not provided
+    :param details_by_id: Details keyed by ID, built from ``details``
+        if not provided
+    :param slugs: IDs keyed by case folded slug string, built from
+        ``rows`` if not provided
+    """
+
+    def __init__(
+        self,
+        rows: Sequence[dict[str, Any]],
+        details: Sequence[dict[str, Any]] | None = None,
+        all_kwargs: dict[str, Any] | None = None,
+        details_kwargs: dict[str, Any] | None = None,
+        *,
+        by_id: Mapping[int, dict[str, Any]] | None = None,
+        details_by_id: Mapping[int, dict[str, Any]] | None = None,
+        slugs: Mapping[str, int] | None = None,
+    ):
+        self.rows = rows
+        self.details = details if details is not None else []
+        self.all_kwargs = all_kwargs or {}
+        self.details_kwargs = details_kwargs or {}
+        if by_id is None:
+            by_id = {row["id"]: row for row in rows}
+
+        if details_by_id is None:
+            details_by_id = {row["id"]: row for row in self.details}
+
+        if slugs is None:
+            slugs = {
+                row["slug"].casefold(): row["id"] for row in rows if row.get("slug")
+            }
+
+        self.by_id = by_id
+        self.details_by_id = details_by_id
+        self.slugs = slugs
+
+    def id_for_slug(self, slug: str) -> int | None:
+        """Returns the ID for a slug string, ignoring case.
+
+        :param slug: Slug string
+        :return: ID, or None if the slug does not exist
+        """
+        if not isinstance(slug, str):
+            return None
+
+        return self.slugs.get(slug.strip().casefold())
+
+
+class ShowIndex(EntityIndex):
+    """Rows and lookup indexes for shows, including date indexes."""
+
+    def __init__(
+        self,
+        rows: Sequence[dict[str, Any]],
+        details: Sequence[dict[str, Any]] | None = None,
+        all_kwargs: dict[str, Any] | None = None,
+        details_kwargs: dict[str, Any] | None = None,
+        **kwargs: Any,
+    ):
+        super().__init__(rows, details, all_kwargs, details_kwargs, **kwargs)
+        self.ids: list[int] = []
+        self.by_date: dict[str, int] = {}
+        self.by_year: defaultdict[int, list[int]] = defaultdict(list)
+        self.by_year_month: defaultdict[tuple[int, int], list[int]] = defaultdict(list)
+        self.by_month_day: defaultdict[tuple[int, int], list[int]] = defaultdict(list)
+        for row in rows:
+            show_date = datetime.date.fromisoformat(row["date"])
+            self.ids.append(row["id"])
+            self.by_date[row["date"]] = row["id"]
+            self.by_year[show_date.year].append(row["id"])
+            self.by_year_month[show_date.year, show_date.month].append(row["id"])
+            self.by_month_day[show_date.month, show_date.day].append(row["id"])
+
+    def id_for_date(self, year: int, month: int, day: int) -> int | None:
+        """Returns the ID of the show for a date.
+
+        :param year: Four-digit year
+        :param month: One or two-digit month
+        :param day: One or two-digit day
+        :return: Show ID, or None if a show does not exist for the date
+        """
+        try:
+            return self.by_date.get(datetime.date(year, month, day).isoformat())
+        except (TypeError, ValueError):
+            return None
+
+
+class Snapshot:
+    """Read-only copy of every entity, keyed by data generation.
+
+    Rows are shared between requests and must not be modified.
+
+    :param generation: Data generation the snapshot was loaded for
+    :param entities: Entity indexes, keyed by wwdtm class name
+    :param extras: Values returned by other parameterless methods,
+        keyed by query name
+    """
+
+    def __init__(
+        self,
+        generation: str,
+        entities: dict[str, EntityIndex],
+        extras: dict[str, Any] | None = None,
+    ):
+        self.generation = generation
+        self.entities = entities
+        self.extras = extras or {}
+        self.decoded: dict[tuple[str, str], list[dict[str, Any]]] = {}
+        self.requested: set[tuple[str, str]] = set()
+        self.scheduled: set[tuple[str, str]] = set()
+
+    def records(self, entity: str, field: str) -> list[dict[str, Any]] | None:
+        """Returns every row or details record of an entity as a list.
+
+        Records stored in a snapshot file are decoded in the background
+        the first time they are requested, as decoding every record
+        would block the event loop. Until then, the request is recorded
+        in ``requested`` and None is returned.
+
+        :param entity: wwdtm class name, such as ``Show``
+        :param field: Either ``rows`` or ``details``
+        :return: List of records, or None if the records have not been
+            decoded
+        """
+        records = getattr(self.entities[entity], field)
+        if isinstance(records, list):
+            return records
+
+        decoded = self.decoded.get((entity, field))
+        if decoded is None:
+            self.requested.add((entity, field))
+
+        return decoded
+
+    def decode(self, entity: str, field: str) -> None:
+        """Decodes every row or details record of an entity.
+
+        :param entity: wwdtm class name, such as ``Show``
+        :param field: Either ``rows`` or ``details``
+        """
+        self.decoded[entity, field] = list(getattr(self.entities[entity], field))
+
+    @property
+    def shows(self) -> ShowIndex:
+        """Show index."""
+        return self.entities["Show"]
+
+
+def load_snapshot(generation: str) -> Snapshot:
+    """Loads every entity from the database into a new snapshot.
+
+    All queries share a single database connection.
+
+    :param generation: Current data generation
+    :return: Snapshot of the data set
+    """
+    entities: dict[str, EntityIndex] = {}
+    with database_connection() as connection:
+        for library_class in (Guest, Host, Scorekeeper):
+            instance = library_class(database_connection=connection)
+            entities[library_class.__name__] = EntityIndex(
+                instance.retrieve_all(), instance.retrieve_all_details()
+            )
+
+        location = Location(database_connection=connection)
+        entities["Location"] = EntityIndex(
+            location.retrieve_all(sort_by_venue=True),
+            location.retrieve_all_details(sort_by_venue=True),
+            all_kwargs={"sort_by_venue": True},
+            details_kwargs={"sort_by_venue": True},
+        )
+
+        panelist = Panelist(database_connection=connection)
+        entities["Panelist"] = EntityIndex(
+            panelist.retrieve_all(),
+            panelist.retrieve_all_details(number_decimal_places=NUMBER_DECIMAL_PLACES),
+            details_kwargs={"number_decimal_places": NUMBER_DECIMAL_PLACES},
+        )
+
+        entities["Pronouns"] = EntityIndex(
+            Pronouns(database_connection=connection).retrieve_all() or []
+        )
+
+        show = Show(database_connection=connection)
+        entities["Show"] = ShowIndex(show.retrieve_all(), show.retrieve_all_details())
+
+        extras = {
+            "Location.retrieve_postal_abbreviations": (
+                location.retrieve_postal_abbreviations()
+            ),
+            "Location.retrieve_postal_abbreviations_list": (
+                location.retrieve_postal_abbreviations_list()
+            ),
+        }
+
+    return Snapshot(generation, entities, extras)
+
+
+def write_snapshot(snapshot: Snapshot, path: str | Path) -> None:
+    """Writes a snapshot to a memory-mapped snapshot file.
+
+    :param snapshot: Snapshot to write
+    :param path: Path to the snapshot file
+    """
+    meta = {
+        "generation": snapshot.generation,
+        "entities": {
+            name: {
+                "all_kwargs": index.all_kwargs,
+                "details_kwargs": index.details_kwargs,
+                "show": isinstance(index, ShowIndex),
+            }
+            for name, index in snapshot.entities.items()
+        },
+        "extras": snapshot.extras,
+    }
+    collections = {}
+    slugs = {}
+    for name, index in snapshot.entities.items():
+        collections[f"{name}.rows"] = index.rows
+        collections[f"{name}.details"] = index.details
+        slugs[name] = dict(index.slugs)
+
+    write_snapshot_file(path, meta, collections, slugs)
+
+
+def read_snapshot(path: str | Path) -> Snapshot:
+    """Opens a memory-mapped snapshot file.
+
+    Rows are read from the file as they are accessed, so the file is
+    shared by every worker process through the page cache. Queries for
+    every row of an entity are answered once the rows have been decoded
+    using ``Snapshot.decode``.
+
+    :param path: Path to the snapshot file
+    :return: Snapshot stored in the file
+    :raise ValueError: If the file is not a supported snapshot file
+    """
+    snapshot_file = SnapshotFile(path)
+    entities: dict[str, EntityIndex] = {}
+    for name, info in snapshot_file.meta["entities"].items():
+        index_class = ShowIndex if info["show"] else EntityIndex
+        entities[name] = index_class(
+            snapshot_file.records(f"{name}.rows"),
+            snapshot_file.records(f"{name}.details"),
+            info["all_kwargs"],
+            info["details_kwargs"],
+            by_id=snapshot_file.records_by_id(f"{name}.rows"),
+            details_by_id=snapshot_file.records_by_id(f"{name}.details"),
+            slugs=snapshot_file.slugs(name),
+        )
+
+    return Snapshot(
+        snapshot_file.meta["generation"], entities, snapshot_file.meta["extras"]
+    )
+
+
+def _load_or_open_snapshot(generation: str) -> Snapshot:
+    """Opens the snapshot file if it matches a data generation.
+
+    Falls back to loading the snapshot from the database if a snapshot
+    file has not been configured, or if it is missing or out of date.
+    """
+    if SNAPSHOT_PATH:
+        try:
+            snapshot = read_snapshot(SNAPSHOT_PATH)
+        except (OSError, ValueError) as error:
+            logger.info("Unable to open data snapshot file: %s", error)
+        else:
+            if snapshot.generation == generation:
+                return snapshot
+
+    return load_snapshot(generation)
+
+
+def _retrieve_all(entity: str, snapshot: Snapshot, **kwargs: Any) -> Any:
+    if kwargs != snapshot.entities[entity].all_kwargs:
+        return UNRESOLVED
+
+    rows = snapshot.records(entity, "rows")
+    return UNRESOLVED if rows is None else list(rows)
+
+
+def _retrieve_all_details(entity: str, snapshot: Snapshot, **kwargs: Any) -> Any:
+    if kwargs != snapshot.entities[entity].details_kwargs:
+        return UNRESOLVED
+
+    details = snapshot.records(entity, "details")
+    return UNRESOLVED if details is None else list(details)
+
+
+def _retrieve_by_id(entity: str, snapshot: Snapshot, id_: int) -> Any:
+    return snapshot.entities[entity].by_id.get(id_, {})
+
+
+def _retrieve_by_slug(entity: str, snapshot: Snapshot, slug: str) -> Any:
+    index = snapshot.entities[entity]
+    return index.by_id.get(index.id_for_slug(slug), {})
+
+
+def _retrieve_details_by_id(
+    entity: str, snapshot: Snapshot, id_: int, **kwargs: Any
+) -> Any:
+    index = snapshot.entities[entity]
+    if kwargs != index.details_kwargs:
+        return UNRESOLVED
+
+    return index.details_by_id.get(id_, {})
+
+
+def _retrieve_details_by_slug(
+    entity: str, snapshot: Snapshot, slug: str, **kwargs: Any
+) -> Any:
+    index = snapshot.entities[entity]
+    return _retrieve_details_by_id(entity, snapshot, index.id_for_slug(slug), **kwargs)
+
+
+def _valid_year(year: int) -> bool:
+    return isinstance(year, int) and 1 <= year <= 9999
+
+
+def _shows(
+    snapshot: Snapshot,
+    ids: list[int],
+    details: bool = False,
+    best_of: bool | None = None,
+    repeat: bool | None = None,
+) -> list[dict[str, Any]]:
+    """Returns show rows for a list of IDs, optionally filtered."""
+    index = snapshot.shows
+    rows = []
+    for show_id in ids:
+        row = index.by_id[show_id]
+        if best_of is not None and row["best_of"] != best_of:
+            continue
+
+        if repeat is not None and row["repeat_show"] != repeat:
+            continue
+
+        rows.append(index.details_by_id[show_id] if details else row)
+
+    return rows
+
+
+def _all_shows(
+    snapshot: Snapshot,
+    details: bool,
+    best_of: bool | None = None,
+    repeat: bool | None = None,
+) -> Any:
+    """Returns every show row, filtered, once the rows are decoded."""
+    rows = snapshot.records("Show", "details" if details else "rows")
+    if rows is None:
+        return UNRESOLVED
+
+    return [
+        row
+        for row in rows
+        if (best_of is None or row["best_of"] == best_of)
+        and (repeat is None or row["repeat_show"] == repeat)
+    ]
+
+
+def _best_ofs(snapshot: Snapshot, inclusive: bool = True, *, details: bool) -> Any:
+    repeat = None if inclusive else False
+    return _all_shows(snapshot, details, best_of=True, repeat=repeat)
+
+
+def _repeat_best_ofs(snapshot: Snapshot, *, details: bool) -> Any:
+    return _all_shows(snapshot, details, best_of=True, repeat=True)
+
+
+def _repeats(snapshot: Snapshot, inclusive: bool = True, *, details: bool) -> Any:
+    best_of = None if inclusive else False
+    return _all_shows(snapshot, details, best_of=best_of, repeat=True)
+
+
+def _all_dates(snapshot: Snapshot) -> Any:
+    rows = snapshot.records("Show", "rows")
+    return UNRESOLVED if rows is None else [row["date"] for row in rows]
+
+
+def _best_ofs_by_year(
+    snapshot: Snapshot, year: int, inclusive: bool = True, *, details: bool
+) -> Any:
+    if not _valid_year(year):
+        return []
+
+    repeat = None if inclusive else False
+    ids = snapshot.shows.by_year.get(year, [])
+    shows = _shows(snapshot, ids, details, best_of=True, repeat=repeat)
+    return shows if shows or details else None
+
+
+def _repeat_best_ofs_by_year(snapshot: Snapshot, year: int, *, details: bool) -> Any:
+    if not _valid_year(year):
+        return []
+
+    ids = snapshot.shows.by_year.get(year, [])
+    shows = _shows(snapshot, ids, details, best_of=True, repeat=True)
+    return shows if shows or details else None
+
+
+def _repeats_by_year(
+    snapshot: Snapshot, year: int, inclusive: bool = True, *, details: bool
+) -> Any:
+    if not _valid_year(year):
+        return []
+
+    best_of = None if inclusive else False
+    ids = snapshot.shows.by_year.get(year, [])
+    shows = _shows(snapshot, ids, details, best_of=best_of, repeat=True)
+    return shows if shows or details else None
+
+
+def _show_by_date(
+    snapshot: Snapshot, year: int, month: int, day: int, *, details: bool
+) -> Any:
+    show_id = snapshot.shows.id_for_date(year, month, day)
+    by_id = snapshot.shows.details_by_id if details else snapshot.shows.by_id
+    return by_id.get(show_id, {})
+
+
+def _show_by_date_string(snapshot: Snapshot, date_string: str, *, details: bool) -> Any:
+    try:
+        parsed_date = datetime.datetime.strptime(date_string, "%Y-%m-%d")
+    except (TypeError, ValueError):
+        return {}
+
+    return _show_by_date(
+        snapshot,
+        parsed_date.year,
+        parsed_date.month,
+        parsed_date.day,
+        details=details,
+    )
+
+
+def _shows_by_month_day(
+    snapshot: Snapshot, month: int, day: int, *, details: bool
+) -> Any:
+    if not 1 <= month <= 12 or not 1 <= day <= 31:
+        return []
+
+    return _shows(snapshot, snapshot.shows.by_month_day.get((month, day), []), details)
+
+
+def _shows_by_year(snapshot: Snapshot, year: int, *, details: bool) -> Any:
+    if not _valid_year(year):
+        return []
+
+    return _shows(snapshot, snapshot.shows.by_year.get(year, []), details)
+
+
+def _shows_by_year_month(
+    snapshot: Snapshot, year: int, month: int, *, details: bool
+) -> Any:
+    if not _valid_year(year) or not 1 <= month <= 12:
+        return []
+
+    ids = snapshot.shows.by_year_month.get((year, month), [])
+    return _shows(snapshot, ids, details)
+
+
+def _entity_methods(entity: str, slugs: bool = True) -> dict[str, Callable]:
+    """Returns the snapshot methods common to every entity."""
+    methods = {
+        f"{entity}.retrieve_all": partial(_retrieve_all, entity),
+        f"{entity}.retrieve_by_id": partial(_retrieve_by_id, entity),
+    }
+    if entity != "Pronouns":
+        methods.update(
+            {
+                f"{entity}.retrieve_all_details": partial(
+                    _retrieve_all_details, entity
+                ),
+                f"{entity}.retrieve_details_by_id": partial(
+                    _retrieve_details_by_id, entity
+                ),
+            }
+        )
+
+    if slugs:
+        methods.update(
+            {
+                f"{entity}.retrieve_by_slug": partial(_retrieve_by_slug, entity),
+                f"{entity}.retrieve_details_by_slug": partial(
+                    _retrieve_details_by_slug, entity
+                ),
+            }
+        )
+
+    return methods
+
+
+_METHODS: dict[str, Callable[..., Any]] = {
+    **_entity_methods("Guest"),
+    **_entity_methods("Host"),
+    **_entity_methods("Location"),
+    **_entity_methods("Panelist"),
+    **_entity_methods("Pronouns", slugs=False),
+    **_entity_methods("Scorekeeper"),
+    **_entity_methods("Show", slugs=False),
+    "Show.retrieve_all_best_ofs": partial(_best_ofs, details=False),
+    "Show.retrieve_all_best_ofs_details": partial(_best_ofs, details=True),
+    "Show.retrieve_all_repeat_best_ofs": partial(_repeat_best_ofs, details=False),
+    "Show.retrieve_all_repeat_best_ofs_details": partial(
+        _repeat_best_ofs, details=True
+    ),
+    "Show.retrieve_all_repeats": partial(_repeats, details=False),
+    "Show.retrieve_all_repeats_details": partial(_repeats, details=True),
+    "Show.retrieve_all_dates": _all_dates,
+    "Show.retrieve_best_ofs_by_year": partial(_best_ofs_by_year, details=False),
+    "Show.retrieve_best_ofs_details_by_year": partial(_best_ofs_by_year, details=True),
+    "Show.retrieve_repeat_best_ofs_by_year": partial(
+        _repeat_best_ofs_by_year, details=False
+    ),
+    "Show.retrieve_repeat_best_ofs_details_by_year": partial(
+        _repeat_best_ofs_by_year, details=True
+    ),
+    "Show.retrieve_repeats_by_year": partial(_repeats_by_year, details=False),
+    "Show.retrieve_repeats_details_by_year": partial(_repeats_by_year, details=True),
+    "Show.retrieve_by_date": partial(_show_by_date, details=False),
+    "Show.retrieve_details_by_date": partial(_show_by_date, details=True),
+    "Show.retrieve_by_date_string": partial(_show_by_date_string, details=False),
+    "Show.retrieve_details_by_date_string": partial(_show_by_date_string, details=True),
+    "Show.retrieve_by_month_day": partial(_shows_by_month_day, details=False),
+    "Show.retrieve_details_by_month_day": partial(_shows_by_month_day, details=True),
+    "Show.retrieve_by_year": partial(_shows_by_year, details=False),
+    "Show.retrieve_details_by_year": partial(_shows_by_year, details=True),
+    "Show.retrieve_by_year_month": partial(_shows_by_year_month, details=False),
+    "Show.retrieve_details_by_year_month": partial(_shows_by_year_month, details=True),
+}
+
+
+_SIGNATURES: dict[str, inspect.Signature] = {
+    key: inspect.signature(method) for key, method in _METHODS.items()
+}
+
+
+def _supports(key: str, args: tuple[Any, ...], kwargs: dict[str, Any]) -> bool:
+    """Returns whether the snapshot method for a query accepts its arguments.
+
+    Queries with arguments that the snapshot methods do not implement
+    are left to the database.
+    """
+    try:
+        _SIGNATURES[key].bind(None, *args, **kwargs)
+    except TypeError:
+        return False
+
+    return True
+
+
+class SnapshotStore(GenerationStore):
+    """Holds the current snapshot and reloads it when the data changes.
+
+    The snapshot is dropped as soon as the data generation changes, so
+    that queries are answered by the database until the snapshot for
+    the new data generation has been loaded. Records of a snapshot file
+    requested by full-table queries are decoded in the background.
+    """
+
+    errors = (Error, OSError)
+    current: Snapshot | None
+
+    def __init__(self):
+        super().__init__("data snapshot")
+        self._decoding: set[asyncio.Task] = set()
+
+    def resolve(self, key: str, args: tuple[Any, ...], kwargs: dict[str, Any]) -> Any:
+        """Answers a wwdtm query using the current snapshot.
+
+        :param key: Query name, such as ``Guest.retrieve_by_id``
+        :param args: Positional arguments of the query
+        :param kwargs: Keyword arguments of the query
+        :return: Query result, or ``UNRESOLVED`` if there is no
+            snapshot or the query is not supported
+        """
+        snapshot = self.current
+        if snapshot is None:
+            return UNRESOLVED
+
+        if key in snapshot.extras and not args and not kwargs:
+            return snapshot.extras[key]
+
+        if key not in _METHODS or not _supports(key, args, kwargs):
+            return UNRESOLVED
+
+        value = _METHODS[key](snapshot, *args, **kwargs)
+        if snapshot.requested - snapshot.scheduled:
+            self.decode(snapshot)
+
+        return value
+
+    def decode(self, snapshot: Snapshot) -> None:
+        """Schedules decoding the records requested from a snapshot.
+
+        :param snapshot: Snapshot with records to decode
+        """
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+
+        for entity, field in snapshot.requested - snapshot.scheduled:
+            snapshot.scheduled.add((entity, field))
+            task = loop.create_task(
+                run_blocking(
+                    partial(snapshot.decode, entity, field),
+                    key="decode_snapshot",
+                    details=True,
+                )
+            )
+            self._decoding.add(task)
+            task.add_done_callback(self._decoding.discard)
+
+    async def load(self, generation: str) -> Snapshot:
+        """Loads the snapshot for a data generation.
+
+        :param generation: Data generation to load the snapshot for
+        :return: Snapshot for the data generation
+        """
+        return await run_blocking(
+            _load_or_open_snapshot, generation, key="load_snapshot", details=True
+        )
+
+    async def close(self) -> None:
+        """Cancels a pending reload and pending decodes, if any."""
+        tasks = list(self._decoding)
+        for task in tasks:
+            task.cancel()
+
+        for task in tasks:
+            with suppress(asyncio.CancelledError):
+                await task
+
+        await super().close()
+
+
+snapshot_store = SnapshotStore()
+
+if SNAPSHOT_ENABLED:
+    data_generation.subscribe(snapshot_store.invalidate)
+    register_resolver(snapshot_store.resolve)
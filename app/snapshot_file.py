@@ -0,0 +1,310 @@
+# Copyright (c) 2018-2026 Linh Pham
+# api.wwdt.me is released under the terms of the Apache License 2.0
+# SPDX-License-Identifier: Apache-2.0
+#
+# vim: set noai syntax=python ts=4 sw=4:
+"""Memory-Mapped Data Snapshot File Format.
+
+A snapshot file starts with a header and a directory of sections,
+followed by the sections themselves. Records are stored as JSON in the
+``records`` section and slug strings in the ``strings``
+section. Each collection of records has a fixed-width record array, in
+collection order, and an offset index sorted by ID. Each slug index is
+a fixed-width array sorted by slug string.
+
+The file is opened using ``mmap`` in read-only mode, so that every
+worker process shares the same copy of the file through the page cache.
+Records are only decoded when accessed.
+"""
+
+import json
+import mmap
+import os
+import struct
+import tempfile
+from collections.abc import Iterator, Mapping, Sequence
+from decimal import Decimal
+from pathlib import Path
+from typing import Any
+
+MAGIC = b"WWDTMSNP"
+FORMAT_VERSION = 1
+
+_HEADER = struct.Struct("<8sHHI")
+_SECTION = struct.Struct("<32sQQ")
+_RECORD = struct.Struct("<IQI")
+_ID_ENTRY = struct.Struct("<II")
+_SLUG_ENTRY = struct.Struct("<QII")
+_ALIGNMENT = 8
+_DECIMAL_KEY = "__decimal__"
+
+
+def _encode(value: Any) -> bytes:
+    """Encodes a record as JSON, keeping ``Decimal`` values intact."""
+
+    def _default(item: Any) -> Any:
+        if isinstance(item, Decimal):
+            return {_DECIMAL_KEY: str(item)}
+
+        raise TypeError(f"{type(item).__name__} values cannot be stored")
+
+    return json.dumps(value, default=_default, separators=(",", ":")).encode("utf-8")
+
+
+def _object_hook(item: dict[str, Any]) -> Any:
+    if len(item) == 1 and _DECIMAL_KEY in item:
+        return Decimal(item[_DECIMAL_KEY])
+
+    return item
+
+
+def _decode(data: memoryview) -> Any:
+    """Decodes a record encoded by ``_encode``."""
+    return json.loads(bytes(data), object_hook=_object_hook)
+
+
+class RecordArray(Sequence):
+    """Records of a collection, in collection order."""
+
+    def __init__(self, array: memoryview, records: memoryview):
+        self._array = array
+        self._records = records
+
+    def __len__(self) -> int:
+        return len(self._array) // _RECORD.size
+
+    def __getitem__(self, index: int | slice) -> Any:
+        if isinstance(index, slice):
+            return [self[position] for position in range(*index.indices(len(self)))]
+
+        if index < 0:
+            index += len(self)
+
+        if not 0 <= index < len(self):
+            raise IndexError(index)
+
+        _, offset, length = _RECORD.unpack_from(self._array, index * _RECORD.size)
+        return _decode(self._records[offset : offset + length])
+
+    def __iter__(self) -> Iterator[Any]:
+        for position in range(len(self)):
+            yield self[position]
+
+
+class RecordMap(Mapping):
+    """Records of a collection, keyed by ID."""
+
+    def __init__(self, index: memoryview, records: RecordArray):
+        self._index = index
+        self._records = records
+
+    def _position(self, key: Any) -> int | None:
+        """Returns the position of a record using a binary search."""
+        if not isinstance(key, int) or isinstance(key, bool):
+            return None
+
+        low, high = 0, len(self)
+        while low < high:
+            middle = (low + high) // 2
+            row_id, position = _ID_ENTRY.unpack_from(
+                self._index, middle * _ID_ENTRY.size
+            )
+            if row_id == key:
+                return position
+
+            if row_id < key:
+                low = middle + 1
+            else:
+                high = middle
+
+        return None
+
+    def __getitem__(self, key: int) -> Any:
+        position = self._position(key)
+        if position is None:
+            raise KeyError(key)
+
+        return self._records[position]
+
+    def __contains__(self, key: object) -> bool:
+        return self._position(key) is not None
+
+    def __iter__(self) -> Iterator[int]:
+        for entry in range(len(self)):
+            yield _ID_ENTRY.unpack_from(self._index, entry * _ID_ENTRY.size)[0]
+
+    def __len__(self) -> int:
+        return len(self._index) // _ID_ENTRY.size
+
+
+class SlugMap(Mapping):
+    """IDs keyed by case folded slug string."""
+
+    def __init__(self, index: memoryview, strings: memoryview):
+        self._index = index
+        self._strings = strings
+
+    def _entry(self, entry: int) -> tuple[bytes, int]:
+        offset, length, row_id = _SLUG_ENTRY.unpack_from(
+            self._index, entry * _SLUG_ENTRY.size
+        )
+        return bytes(self._strings[offset : offset + length]), row_id
+
+    def __getitem__(self, key: str) -> int:
+        if not isinstance(key, str):
+            raise KeyError(key)
+
+        slug = key.encode("utf-8")
+        low, high = 0, len(self)
+        while low < high:
+            middle = (low + high) // 2
+            value, row_id = self._entry(middle)
+            if value == slug:
+                return row_id
+
+            if value < slug:
+                low = middle + 1
+            else:
+                high = middle
+
+        raise KeyError(key)
+
+    def __iter__(self) -> Iterator[str]:
+        for entry in range(len(self)):
+            yield self._entry(entry)[0].decode("utf-8")
+
+    def __len__(self) -> int:
+        return len(self._index) // _SLUG_ENTRY.size
+
+
+class SnapshotFile:
+    """Read-only, memory-mapped snapshot file.
+
+    :param path: Path to the snapshot file
+    :raise ValueError: If the file is not a supported snapshot file
+    """
+
+    def __init__(self, path: str | os.PathLike):
+        with Path(path).open("rb") as file:
+            self._mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        self._buffer = memoryview(self._mmap)
+        if len(self._buffer) < _HEADER.size:
+            raise ValueError(f"{path} is not a snapshot file")
+
+        magic, version, _, count = _HEADER.unpack_from(self._buffer)
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a snapshot file")
+
+        if version != FORMAT_VERSION:
+            raise ValueError(f"Unsupported snapshot file version {version}")
+
+        self._sections: dict[str, memoryview] = {}
+        for section in range(count):
+            name, offset, length = _SECTION.unpack_from(
+                self._buffer, _HEADER.size + section * _SECTION.size
+            )
+            self._sections[name.rstrip(b"\0").decode("ascii")] = self._buffer[
+                offset : offset + length
+            ]
+
+        self.meta: dict[str, Any] = _decode(self._sections["meta"])
+
+    def records(self, name: str) -> RecordArray:
+        """Returns the records of a collection, in collection order.
+
+        :param name: Name of the collection
+        :return: Sequence of records
+        """
+        return RecordArray(self._sections[f"{name}.records"], self._sections["records"])
+
+    def records_by_id(self, name: str) -> RecordMap:
+        """Returns the records of a collection, keyed by ID.
+
+        :param name: Name of the collection
+        :return: Mapping of IDs to records
+        """
+        return RecordMap(self._sections[f"{name}.ids"], self.records(name))
+
+    def slugs(self, name: str) -> SlugMap:
+        """Returns the slug index of a collection.
+
+        :param name: Name of the collection
+        :return: Mapping of case folded slug strings to IDs
+        """
+        return SlugMap(self._sections[f"{name}.slugs"], self._sections["strings"])
+
+
+def write_snapshot_file(
+    path: str | os.PathLike,
+    meta: dict[str, Any],
+    collections: dict[str, Sequence[dict[str, Any]]],
+    slugs: dict[str, dict[str, int]],
+) -> None:
+    """Writes a snapshot file.
+
+    The file is written to a temporary file in the same directory, then
+    renamed, so that processes opening the file always see either the
+    previous or the new snapshot in full.
+
+    :param path: Path to the snapshot file
+    :param meta: Metadata stored with the snapshot
+    :param collections: Records of each collection, keyed by name. Each
+        record must have an integer ``id``
+    :param slugs: Mapping of case folded slug strings to IDs, keyed by
+        collection name
+    """
+    records = bytearray()
+    strings = bytearray()
+    sections: dict[str, bytes] = {"meta": _encode(meta)}
+
+    for name, rows in collections.items():
+        array = bytearray()
+        for row in rows:
+            data = _encode(row)
+            array += _RECORD.pack(row["id"], len(records), len(data))
+            records += data
+
+        ids = sorted((row["id"], position) for position, row in enumerate(rows))
+        sections[f"{name}.records"] = bytes(array)
+        sections[f"{name}.ids"] = b"".join(_ID_ENTRY.pack(*entry) for entry in ids)
+
+    for name, slug_ids in slugs.items():
+        index = bytearray()
+        for slug, row_id in sorted(
+            (slug.encode("utf-8"), row_id) for slug, row_id in slug_ids.items()
+        ):
+            index += _SLUG_ENTRY.pack(len(strings), len(slug), row_id)
+            strings += slug
+
+        sections[f"{name}.slugs"] = bytes(index)
+
+    sections["records"] = bytes(records)
+    sections["strings"] = bytes(strings)
+
+    offset = _HEADER.size + len(sections) * _SECTION.size
+    directory = bytearray(_HEADER.pack(MAGIC, FORMAT_VERSION, 0, len(sections)))
+    for name, data in sections.items():
+        offset += -offset % _ALIGNMENT
+        directory += _SECTION.pack(name.encode("ascii"), offset, len(data))
+        offset += len(data)
+
+    path = Path(path)
+    with tempfile.NamedTemporaryFile(
+        dir=path.parent, prefix=f".{path.name}.", delete=False
+    ) as file:
+        temporary_path = Path(file.name)
+        try:
+            file.write(directory)
+            for data in sections.values():
+                file.write(b"\0" * (-file.tell() % _ALIGNMENT))
+                file.write(data)
+
+            file.flush()
+            os.fsync(file.fileno())
+        except BaseException:
+            temporary_path.unlink()
+            raise
+
+    temporary_path.chmod(0o644)
+    temporary_path.replace(path)
@@ -0,0 +1,110 @@
+# Copyright (c) 2018-2026 Linh Pham
+# api.wwdt.me is released under the terms of the Apache License 2.0
+# SPDX-License-Identifier: Apache-2.0
+#
+# vim: set noai syntax=python ts=4 sw=4:
+"""Testing Batch Retrieval."""
+
+import asyncio
+import datetime
+
+import pytest
+from fastapi import HTTPException
+from wwdtm.guest import Guest
+from wwdtm.show import Show
+
+from app import batch, dispatch
+from app.batch import parse_ids, parse_keys, retrieve_batch
+from app.existence import ExistenceIndex, ExistenceSets
+from app.models.guests import GuestsBatch
+from app.serialization import render
+
+_guests = {
+    1: {"id": 1, "name": "Alpha Guest", "slug": "alpha-guest"},
+    2: {"id": 2, "name": "Beta Guest", "slug": "beta-guest"},
+}
+_shows = {"2018-10-27": {"id": 12, "date": "2018-10-27"}}
+queries = []
+
+
+def _resolver(key, args, kwargs):
+    """Answers guest and show queries from the test data."""
+    queries.append((key, args))
+    if key == "Guest.retrieve_by_id":
+        return _guests.get(args[0], {})
+
+    if key == "Guest.retrieve_by_slug":
+        guests = {guest["slug"]: guest for guest in _guests.values()}
+        return guests.get(args[0].strip().casefold(), {})
+
+    if key == "Show.retrieve_by_date_string":
+        return _shows.get(args[0], {})
+
+    return {}
+
+
+@pytest.fixture(autouse=True)
+def resolvers(monkeypatch):
+    """Answers queries from the test data instead of the database."""
+    queries.clear()
+    monkeypatch.setattr(dispatch, "_resolvers", [_resolver])
+    monkeypatch.setattr(batch, "existence_index", ExistenceIndex())
+
+
+def test_parse_ids_and_keys():
+    """Test parsing comma-separated lists of IDs and slug strings."""
+    assert parse_ids("3,1,2") == [3, 1, 2]
+    assert parse_ids(None) == []
+    assert parse_keys(" alpha-guest, ,beta-guest") == ["alpha-guest", "beta-guest"]
+
+
+def test_retrieve_batch():
+    """Test found entities are returned in order with missing values."""
+    result = asyncio.run(
+        retrieve_batch(
+            "guests", Guest, [2, 99, 2], ["Alpha-Guest", "gamma", "beta-guest"]
+        )
+    )
+
+    assert result == {
+        "guests": [_guests[2], _guests[1]],
+        "not_found": {"ids": [99], "slugs": ["gamma"]},
+    }
+    assert GuestsBatch.model_validate(result)
+    assert render(GuestsBatch, result)
+
+
+def test_retrieve_batch_index(monkeypatch):
+    """Test slug strings are resolved with the existence index."""
+    index = ExistenceIndex()
+    index.current = ExistenceSets(
+        "test", slugs={"Guest": {"alpha-guest": 1, "beta-guest": 2}}
+    )
+    monkeypatch.setattr(batch, "existence_index", index)
+
+    result = asyncio.run(retrieve_batch("guests", Guest, [1], ["beta-guest", "gamma"]))
+
+    assert result["guests"] == [_guests[1], _guests[2]]
+    assert result["not_found"] == {"ids": [], "slugs": ["gamma"]}
+    assert {key for key, _ in queries} == {"Guest.retrieve_by_id"}
+
+
+def test_retrieve_batch_show_dates():
+    """Test shows are retrieved by dates in place of slug strings."""
+    result = asyncio.run(
+        retrieve_batch("shows", Show, [], [datetime.date(2018, 10, 27), "2018-02-30"])
+    )
+
+    assert result == {
+        "shows": [_shows["2018-10-27"]],
+        "not_found": {"ids": [], "dates": ["2018-02-30"]},
+    }
+
+
+@pytest.mark.parametrize("ids", [[], list(range(batch.MAX_BATCH_SIZE + 1))])
+def test_retrieve_batch_size(ids: list[int]):
+    """Test empty batches and batches over the maximum size are rejected."""
+    with pytest.raises(HTTPException) as error:
+        asyncio.run(retrieve_batch("guests", Guest, ids, []))
+
+    assert error.value.status_code == 400
@@ -0,0 +1,298 @@
+# Copyright (c) 2018-2026 Linh Pham
+# api.wwdt.me is released under the terms of the Apache License 2.0
+# SPDX-License-Identifier: Apache-2.0
+#
+# vim: set noai syntax=python ts=4 sw=4:
+"""Testing In-process Response Cache."""
+
+import asyncio
+
+import httpx
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import JSONResponse, StreamingResponse
+from fastapi.testclient import TestClient
+from mysql.connector.errors import Error
+
+from app import generation as generation_module
+from app.cache import ResponseCache, ResponseCacheMiddleware, route_ttl
+from app.config import API_VERSION
+from app.generation import DataGeneration, GenerationStore, data_generation
+
+
+def _create_app(cache: ResponseCache) -> tuple[FastAPI, dict[str, int]]:
+    """Create an application with a counter for each handler call."""
+    calls = {"count": 0}
+    _app = FastAPI()
+    _app.add_middleware(ResponseCacheMiddleware, cache=cache)
+
+    @_app.get(f"/v{API_VERSION}/items/random")
+    async def get_random_item():
+        calls["count"] += 1
+        return {"id": calls["count"]}
+
+    @_app.get(f"/v{API_VERSION}/items/{{item_id}}")
+    async def get_item(item_id: int, inclusive: bool = True):
+        calls["count"] += 1
+        return {"id": item_id, "inclusive": inclusive}
+
+    return _app, calls
+
+
+def test_response_cache_lru_eviction():
+    """Test ResponseCache evicts least recently used responses."""
+    cache = ResponseCache(max_bytes=25)
+    cache.set("a", status=200, headers=[], body=b"a" * 10, ttl=60)
+    cache.set("b", status=200, headers=[], body=b"b" * 10, ttl=60)
+    assert cache.get("a")
+
+    cache.set("c", status=200, headers=[], body=b"c" * 10, ttl=60)
+    assert cache.get("a")
+    assert not cache.get("b")
+    assert cache.get("c")
+    assert cache.evictions == 1
+    assert cache.size <= cache.max_bytes
+
+
+def test_response_cache_ttl():
+    """Test ResponseCache does not return expired responses."""
+    cache = ResponseCache(max_bytes=1024)
+    cache.set("a", status=200, headers=[], body=b"a", ttl=-1)
+    assert not cache.get("a")
+    assert cache.stats()["misses"] == 1
+
+
+def test_response_cache_middleware():
+    """Test ResponseCacheMiddleware serves repeated requests from cache."""
+    cache = ResponseCache(max_bytes=1024 * 1024)
+    _app, calls = _create_app(cache)
+    client = TestClient(_app)
+
+    first = client.get(f"/v{API_VERSION}/items/1", params={"unknown": "1"})
+    second = client.get(f"/v{API_VERSION}/items/1")
+
+    assert first.headers["x-cache"] == "MISS"
+    assert second.headers["x-cache"] == "HIT"
+    assert first.content == second.content
+    assert calls["count"] == 1
+
+    response = client.get(f"/v{API_VERSION}/items/1", params={"inclusive": False})
+    assert response.json() == {"id": 1, "inclusive": False}
+    assert calls["count"] == 2
+
+
+def test_response_cache_middleware_random():
+    """Test ResponseCacheMiddleware does not cache random routes."""
+    cache = ResponseCache(max_bytes=1024 * 1024)
+    _app, calls = _create_app(cache)
+    client = TestClient(_app)
+
+    client.get(f"/v{API_VERSION}/items/random")
+    client.get(f"/v{API_VERSION}/items/random")
+    assert calls["count"] == 2
+    assert len(cache) == 0
+
+
+def test_response_cache_data_generation():
+    """Test ResponseCacheMiddleware invalidates responses on data changes."""
+    cache = ResponseCache(max_bytes=1024 * 1024)
+    _app, calls = _create_app(cache)
+    client = TestClient(_app)
+    generation = DataGeneration()
+    generation.subscribe(lambda _: cache.clear())
+
+    client.get(f"/v{API_VERSION}/items/1")
+    assert generation.update("token-1", last_modified=1700000000.0)
+    assert not generation.update("token-1")
+    assert generation.last_modified == 1700000000.0
+    assert len(cache) == 0
+
+    client.get(f"/v{API_VERSION}/items/1")
+    assert calls["count"] == 2
+
+
+def test_data_generation_failing_callback():
+    """Test a failing callback does not stop the remaining callbacks."""
+    generation = DataGeneration()
+    generations = []
+
+    def _fail(_: str) -> None:
+        raise RuntimeError
+
+    generation.subscribe(_fail)
+    generation.subscribe(generations.append)
+
+    assert generation.update("token-1")
+    assert generations == [generation.generation]
+    assert generation.last_modified is None
+
+
+def test_generation_store(monkeypatch: pytest.MonkeyPatch):
+    """Test GenerationStore keeps only values for the current generation."""
+
+    class _Store(GenerationStore):
+        async def load(self, generation: str) -> str:
+            if generation == "broken":
+                raise Error("unavailable")
+
+            return f"value-{generation}"
+
+    generation = DataGeneration()
+    monkeypatch.setattr(generation_module, "data_generation", generation)
+    store = _Store("test value")
+    generation.subscribe(store.invalidate)
+
+    async def _update(token: str) -> None:
+        generation.update(token)
+        await store.wait()
+
+    asyncio.run(_update("token-1"))
+    assert store.current == f"value-{generation.generation}"
+
+    asyncio.run(store.reload("stale"))
+    assert store.current == f"value-{generation.generation}"
+
+    asyncio.run(store.reload("broken"))
+    assert store.current == f"value-{generation.generation}"
+
+    store.preload = False
+    asyncio.run(_update("token-2"))
+    assert store.current is None
+
+    asyncio.run(store.ensure_loaded())
+    assert store.current == f"value-{generation.generation}"
+
+
+def test_response_cache_middleware_etag(monkeypatch: pytest.MonkeyPatch):
+    """Test ResponseCacheMiddleware returns 304 for matching validators."""
+    monkeypatch.setattr(data_generation, "last_modified", 1700000000.0)
+    cache = ResponseCache(max_bytes=1024 * 1024)
+    _app, calls = _create_app(cache)
+    client = TestClient(_app)
+
+    response = client.get(f"/v{API_VERSION}/items/1")
+    etag = response.headers["etag"]
+    assert etag.startswith('"')
+    assert response.headers["last-modified"] == "Tue, 14 Nov 2023 22:13:20 GMT"
+
+    response = client.get(f"/v{API_VERSION}/items/1", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.headers["etag"] == etag
+    assert not response.content
+    assert calls["count"] == 1
+
+    response = client.get(
+        f"/v{API_VERSION}/items/1", headers={"If-None-Match": '"stale"'}
+    )
+    assert response.status_code == 200
+
+    response = client.get(
+        f"/v{API_VERSION}/items/1",
+        headers={"If-Modified-Since": response.headers["last-modified"]},
+    )
+    assert response.status_code == 304
+
+
+def test_response_cache_middleware_etag_uncached():
+    """Test ResponseCacheMiddleware adds an ETag to uncached routes."""
+    cache = ResponseCache(max_bytes=1024 * 1024)
+    _app, calls = _create_app(cache)
+    client = TestClient(_app)
+
+    response = client.get(f"/v{API_VERSION}/items/random")
+    assert "x-cache" not in response.headers
+
+    response = client.get(
+        f"/v{API_VERSION}/items/random",
+        headers={"If-None-Match": response.headers["etag"]},
+    )
+    assert response.status_code == 200
+    assert calls["count"] == 2
+
+
+def test_response_cache_middleware_coalesce():
+    """Test ResponseCacheMiddleware coalesces identical concurrent misses."""
+    cache = ResponseCache(max_bytes=1024 * 1024)
+    calls = {"count": 0}
+    _app = FastAPI()
+    _app.add_middleware(ResponseCacheMiddleware, cache=cache)
+
+    @_app.get(f"/v{API_VERSION}/slow")
+    async def get_slow():
+        calls["count"] += 1
+        await asyncio.sleep(0.1)
+        return {"count": calls["count"]}
+
+    async def _request_all() -> list[httpx.Response]:
+        transport = httpx.ASGITransport(app=_app)
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://testserver"
+        ) as async_client:
+            return await asyncio.gather(
+                *(async_client.get(f"/v{API_VERSION}/slow") for _ in range(5))
+            )
+
+    responses = asyncio.run(_request_all())
+    assert calls["count"] == 1
+    assert all(response.json() == {"count": 1} for response in responses)
+    assert sorted(response.headers["x-cache"] for response in responses) == [
+        "COALESCED",
+        "COALESCED",
+        "COALESCED",
+        "COALESCED",
+        "MISS",
+    ]
+
+
+def test_response_cache_middleware_streaming():
+    """Test ResponseCacheMiddleware passes streaming responses through."""
+    cache = ResponseCache(max_bytes=1024 * 1024)
+    calls = {"count": 0}
+    _app = FastAPI()
+    _app.add_middleware(ResponseCacheMiddleware, cache=cache)
+
+    @_app.get(f"/v{API_VERSION}/stream")
+    async def get_stream():
+        calls["count"] += 1
+        return StreamingResponse(
+            iter([b'{"items":[', b"1,2", b"]}"]), media_type="application/json"
+        )
+
+    client = TestClient(_app)
+    first = client.get(f"/v{API_VERSION}/stream")
+    second = client.get(f"/v{API_VERSION}/stream")
+
+    assert first.headers["x-cache"] == second.headers["x-cache"] == "MISS"
+    assert "etag" not in first.headers
+    assert "etag" not in second.headers
+    assert first.json() == second.json() == {"items": [1, 2]}
+    assert calls["count"] == 2
+    assert cache.size == 0
+
+
+def test_response_cache_middleware_not_found():
+    """Test ResponseCacheMiddleware caches 404 responses."""
+    cache = ResponseCache(max_bytes=1024 * 1024)
+    calls = {"count": 0}
+    _app = FastAPI()
+    _app.add_middleware(ResponseCacheMiddleware, cache=cache)
+
+    @_app.get(f"/v{API_VERSION}/missing/{{item_id}}")
+    async def get_missing(item_id: int):
+        calls["count"] += 1
+        return JSONResponse(status_code=404, content={"detail": "Not found"})
+
+    client = TestClient(_app)
+    first = client.get(f"/v{API_VERSION}/missing/1")
+    second = client.get(f"/v{API_VERSION}/missing/1", headers={"If-None-Match": "*"})
+
+    assert first.status_code == second.status_code == 404
+    assert second.headers["x-cache"] == "HIT"
+    assert second.json() == {"detail": "Not found"}
+    assert calls["count"] == 1
+
+
+def test_route_ttl_seeded():
+    """Test seeded requests for random routes are cached."""
+    assert route_ttl(f"/v{API_VERSION}/shows/random") == 0
+    assert route_ttl(f"/v{API_VERSION}/shows/random", seeded=True) > 0
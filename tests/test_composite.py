@@ -0,0 +1,69 @@
+# Copyright (c) 2018-2026 Linh Pham
+# api.wwdt.me is released under the terms of the Apache License 2.0
+# SPDX-License-Identifier: Apache-2.0
+#
+# vim: set noai syntax=python ts=4 sw=4:
+"""Testing /v2.0/batch route."""
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.composite import MAX_COMPOSITE_REQUESTS, valid_path
+from app.config import API_VERSION
+from app.main import app
+
+client = TestClient(app)
+
+
+@pytest.mark.parametrize(
+    "path, expected",
+    [
+        (f"/v{API_VERSION}/shows/recent", True),
+        (f"/v{API_VERSION}/guests/batch?ids=54,1", True),
+        (f"/v{API_VERSION}/batch", False),
+        (f"https://example.org/v{API_VERSION}/version", False),
+        ("/robots.txt", False),
+    ],
+)
+def test_valid_path(path: str, expected: bool):
+    """Test paths that can be requested in a composite request."""
+    assert valid_path(path) is expected
+
+
+def test_post_batch():
+    """Test /v2.0/batch route returns a status code for each path."""
+    paths = [
+        f"/v{API_VERSION}/guests/id/abc",
+        f"/v{API_VERSION}/guests/batch",
+        f"/v{API_VERSION}/unknown",
+        f"/v{API_VERSION}/batch",
+    ]
+    response = client.post(f"/v{API_VERSION}/batch", json={"paths": paths})
+    responses = response.json()["responses"]
+
+    assert response.status_code == 200
+    assert list(responses) == paths
+    assert [responses[path]["status"] for path in paths] == [422, 400, 404, 400]
+    assert "detail" in responses[paths[1]]["body"]
+
+
+def test_post_batch_version():
+    """Test /v2.0/batch route with the version route."""
+    response = client.post(
+        f"/v{API_VERSION}/batch", json={"paths": [f"/v{API_VERSION}/version"]}
+    )
+    version = response.json()["responses"][f"/v{API_VERSION}/version"]
+
+    assert response.status_code == 200
+    assert version["status"] == 200
+    assert "api" in version["body"]
+
+
+@pytest.mark.parametrize("count", [0, MAX_COMPOSITE_REQUESTS + 1])
+def test_post_batch_size(count: int):
+    """Test /v2.0/batch route rejects empty and oversized requests."""
+    paths = [f"/v{API_VERSION}/shows/id/{index}" for index in range(count)]
+    response = client.post(f"/v{API_VERSION}/batch", json={"paths": paths})
+
+    assert response.status_code == 400
+    assert "detail" in response.json()
@@ -0,0 +1,274 @@
+# Copyright (c) 2018-2026 Linh Pham
+# api.wwdt.me is released under the terms of the Apache License 2.0
+# SPDX-License-Identifier: Apache-2.0
+#
+# vim: set noai syntax=python ts=4 sw=4:
+"""Testing Response Compression."""
+
+import asyncio
+import gzip
+
+import brotli
+import pytest
+import zstandard
+from fastapi import FastAPI
+from fastapi.responses import Response, StreamingResponse
+from fastapi.testclient import TestClient
+
+from app import compression
+from app.cache import ResponseCache, ResponseCacheMiddleware
+from app.compression import (
+    ENCODINGS,
+    CompressionMiddleware,
+    CompressionSettings,
+    StreamCompressor,
+    compress,
+    compress_body,
+    encoded_headers,
+    route_settings,
+    select_encoding,
+    variant_etag,
+)
+from app.config import API_VERSION
+
+_BODY = b'{"shows":[]}' * 200
+_DECOMPRESS = {
+    "br": brotli.decompress,
+    "gzip": gzip.decompress,
+    "zstd": lambda data: zstandard.ZstdDecompressor().decompressobj().decompress(data),
+}
+
+
+def _create_app(cache: ResponseCache | None = None) -> FastAPI:
+    """Create an application with small, large and streamed responses."""
+    _app = FastAPI()
+    if cache is not None:
+        _app.add_middleware(ResponseCacheMiddleware, cache=cache)
+
+    _app.add_middleware(CompressionMiddleware)
+
+    @_app.get(f"/v{API_VERSION}/items/small")
+    async def get_small():
+        return {"id": 1}
+
+    @_app.get(f"/v{API_VERSION}/items/large")
+    async def get_large():
+        return Response(content=_BODY, media_type="application/json")
+
+    @_app.get(f"/v{API_VERSION}/items/stream")
+    async def get_stream():
+        async def _chunks():
+            for _ in range(4):
+                yield _BODY
+
+        return StreamingResponse(_chunks(), media_type="application/json")
+
+    @_app.get(f"/v{API_VERSION}/items/encoded")
+    async def get_encoded():
+        return Response(
+            content=compress(_BODY, "gzip", 9),
+            media_type="application/json",
+            headers={"content-encoding": "gzip"},
+        )
+
+    return _app
+
+
+@pytest.mark.parametrize(
+    "accept_encoding, expected",
+    [
+        (None, "identity"),
+        ("", "identity"),
+        ("gzip", "gzip"),
+        ("gzip, deflate, br", "br"),
+        ("br;q=0.5, gzip", "gzip"),
+        ("br;q=0, gzip;q=0", "identity"),
+        ("*", "br"),
+        ("*;q=0.1, br;q=0", "zstd"),
+        ("*;q=0.1, br;q=0, zstd;q=0", "gzip"),
+        ("zstd, gzip", "zstd"),
+        ("deflate", "identity"),
+        ("GZIP;Q=0.8", "gzip"),
+    ],
+)
+def test_select_encoding(accept_encoding: str | None, expected: str):
+    """Test select_encoding honors Accept-Encoding quality values."""
+    assert select_encoding(accept_encoding, ENCODINGS) == expected
+
+
+def test_select_encoding_unavailable():
+    """Test select_encoding only returns available content codings."""
+    assert select_encoding("br", ("gzip",)) == "identity"
+
+
+def test_compress():
+    """Test compressed bodies decompress to the original body."""
+    body = b'{"shows":[]}' * 100
+    assert gzip.decompress(compress(body, "gzip", 6)) == body
+    assert brotli.decompress(compress(body, "br", 5)) == body
+    with pytest.raises(ValueError):
+        compress(body, "deflate", 6)
+
+
+@pytest.mark.parametrize("encoding", ENCODINGS)
+def test_compress_round_trip(encoding: str):
+    """Test each content coding decompresses to the original body."""
+    assert _DECOMPRESS[encoding](compress(_BODY, encoding, 3)) == _BODY
+
+
+@pytest.mark.parametrize("encoding", ENCODINGS)
+def test_stream_compressor(encoding: str):
+    """Test streamed chunks decompress to the original body."""
+    compressor = StreamCompressor(encoding, 3)
+    data = b"".join(compressor.compress(_BODY) for _ in range(3))
+    data += compressor.compress(b"", final=True)
+    assert _DECOMPRESS[encoding](data) == _BODY * 3
+
+
+@pytest.mark.parametrize("encoding", ENCODINGS)
+def test_stream_compressor_offloaded(monkeypatch, encoding: str):
+    """Test streamed chunks are compressed using the query thread pools."""
+    keys = []
+
+    async def _run_blocking(func, *args, key=None, details=False):
+        keys.append(key)
+        return func(*args)
+
+    async def _compress() -> bytes:
+        compressor = StreamCompressor(encoding, 3)
+        data = b""
+        for _ in range(3):
+            data += await compressor.compress_chunk(_BODY)
+
+        return data + await compressor.compress_chunk(b"", final=True)
+
+    monkeypatch.setattr(compression, "run_blocking", _run_blocking)
+    assert _DECOMPRESS[encoding](asyncio.run(_compress())) == _BODY * 3
+    assert keys == ["compress"] * 4
+
+
+def test_variant_etag():
+    """Test ETags of compressed copies are distinct and not repeated."""
+    assert variant_etag('"abc"', "br") == '"abc-br"'
+    assert variant_etag('"abc-br"', "br") == '"abc-br"'
+    assert variant_etag('"abc"', "identity") == '"abc"'
+    headers = encoded_headers(
+        [(b"etag", b'"abc"'), (b"content-length", b"100")], "gzip", 40
+    )
+    assert headers == [
+        (b"etag", b'"abc-gzip"'),
+        (b"content-encoding", b"gzip"),
+        (b"content-length", b"40"),
+        (b"vary", b"Accept-Encoding"),
+    ]
+
+
+def test_route_settings(monkeypatch):
+    """Test per-route compression settings match route path templates."""
+    disabled = CompressionSettings(enabled=False)
+    monkeypatch.setattr(
+        compression,
+        "_ROUTE_SETTINGS",
+        [(compression._route_pattern("/v2.0/shows/id/{show_id}"), disabled)],
+    )
+    assert route_settings("/v2.0/shows/id/1083") is disabled
+    assert route_settings("/v2.0/shows/id/1083/extra") is not disabled
+    assert route_settings("/v2.0/shows") is not disabled
+
+
+@pytest.mark.parametrize("encoding", ENCODINGS)
+def test_compression_middleware(encoding: str):
+    """Test responses are compressed using the accepted content coding."""
+    client = TestClient(_create_app())
+    response = client.get(
+        f"/v{API_VERSION}/items/large", headers={"accept-encoding": encoding}
+    )
+    assert response.headers["content-encoding"] == encoding
+    assert response.headers["vary"] == "Accept-Encoding"
+    assert response.content == _BODY
+
+    response = client.get(
+        f"/v{API_VERSION}/items/stream", headers={"accept-encoding": encoding}
+    )
+    assert response.headers["content-encoding"] == encoding
+    assert "content-length" not in response.headers
+    assert response.content == _BODY * 4
+
+
+def test_compression_middleware_skipped():
+    """Test small and already encoded responses are not compressed."""
+    client = TestClient(_create_app())
+    response = client.get(
+        f"/v{API_VERSION}/items/small", headers={"accept-encoding": "br"}
+    )
+    assert "content-encoding" not in response.headers
+    assert response.headers["vary"] == "Accept-Encoding"
+
+    response = client.get(
+        f"/v{API_VERSION}/items/large", headers={"accept-encoding": "identity"}
+    )
+    assert "content-encoding" not in response.headers
+    assert response.content == _BODY
+
+    response = client.get(
+        f"/v{API_VERSION}/items/encoded", headers={"accept-encoding": "br, gzip"}
+    )
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.content == _BODY
+
+
+def test_compression_cached_variants():
+    """Test compressed copies of cached responses are stored and reused."""
+    cache = ResponseCache()
+    client = TestClient(_create_app(cache))
+    url = f"/v{API_VERSION}/items/large"
+
+    first = client.get(url, headers={"accept-encoding": "br"})
+    assert first.headers["x-cache"] == "MISS"
+    assert first.headers["content-encoding"] == "br"
+    assert first.headers["etag"].endswith('-br"')
+    size = cache.size
+
+    second = client.get(url, headers={"accept-encoding": "br"})
+    assert second.headers["x-cache"] == "HIT"
+    assert second.headers["etag"] == first.headers["etag"]
+    assert second.content == _BODY
+    assert cache.size == size
+
+    third = client.get(url, headers={"accept-encoding": "gzip"})
+    assert third.headers["content-encoding"] == "gzip"
+    assert third.content == _BODY
+    assert cache.size > size
+
+    response = client.get(
+        url,
+        headers={"accept-encoding": "br", "if-none-match": first.headers["etag"]},
+    )
+    assert response.status_code == 304
+    assert response.headers["etag"] == first.headers["etag"]
+
+
+def test_compression_not_modified_uncompressed():
+    """Test 304 responses use the ETag of the copy the client received."""
+    client = TestClient(_create_app(ResponseCache()))
+    url = f"/v{API_VERSION}/items/small"
+
+    first = client.get(url, headers={"accept-encoding": "br"})
+    assert "content-encoding" not in first.headers
+    assert not first.headers["etag"].endswith('-br"')
+
+    response = client.get(
+        url,
+        headers={"accept-encoding": "br", "if-none-match": first.headers["etag"]},
+    )
+    assert response.status_code == 304
+    assert response.headers["etag"] == first.headers["etag"]
+    assert response.headers["vary"] == "Accept-Encoding"
+
+
+@pytest.mark.parametrize("offload_size", [0, len(_BODY) + 1])
+def test_compress_body(monkeypatch, offload_size: int):
+    """Test large bodies are compressed using a thread pool."""
+    monkeypatch.setattr(compression, "COMPRESSION_OFFLOAD_SIZE", offload_size)
+    body = asyncio.run(compress_body(_BODY, "gzip", 6))
+    assert gzip.decompress(body) == _BODY
@@ -0,0 +1,86 @@
+# Copyright (c) 2018-2026 Linh Pham
+# api.wwdt.me is released under the terms of the Apache License 2.0
+# SPDX-License-Identifier: Apache-2.0
+#
+# vim: set noai syntax=python ts=4 sw=4:
+"""Testing Application-wide Connection Pool."""
+
+import json
+
+import pytest
+from mysql.connector.errors import PoolError
+
+from app.config import load_config
+from app.database import ConnectionPool
+
+
+class _Connection:
+    """Minimal stand-in for a MySQL connection."""
+
+    def __init__(self):
+        self.closed = False
+
+    def is_connected(self) -> bool:
+        return not self.closed
+
+    def reconnect(self) -> None:
+        self.closed = False
+
+    def close(self) -> None:
+        self.closed = True
+
+
+class _Pool(ConnectionPool):
+    """Connection pool that does not connect to a database."""
+
+    def _connect(self) -> _Connection:
+        return _Connection()
+
+
+def test_connection_pool_reuses_connections():
+    """Test ConnectionPool returns released connections for reuse."""
+    pool = _Pool(database_config={}, pool_size=1, pool_timeout=0)
+    with pool.connection() as first:
+        pass
+
+    with pool.connection() as second:
+        assert second is first
+
+
+def test_connection_pool_timeout():
+    """Test ConnectionPool raises PoolError once exhausted."""
+    pool = _Pool(database_config={}, pool_size=1, pool_timeout=0)
+    with pool.connection(), pytest.raises(PoolError):
+        pool.get_connection()
+
+
+def test_connection_pool_overflow():
+    """Test ConnectionPool overflow connections are closed on release."""
+    pool = _Pool(database_config={}, pool_size=1, pool_timeout=0, max_overflow=1)
+    with pool.connection() as pooled:
+        overflow = pool.get_connection()
+        assert overflow is not pooled
+
+        with pytest.raises(PoolError):
+            pool.get_connection()
+
+        pool.release(overflow)
+        assert overflow.closed
+
+    assert not pooled.closed
+
+
+@pytest.mark.parametrize(
+    "database, settings, size",
+    [
+        ({"use_pool": False}, {}, 10),
+        ({"use_pool": False}, {"query_workers": 16}, 18),
+        ({"use_pool": True, "pool_size": 12}, {}, 12),
+        ({"use_pool": True, "pool_size": 12}, {"query_workers": 16}, 18),
+    ],
+)
+def test_load_config_pool_size(tmp_path, database, settings, size):
+    """Test the pool has at least one connection per query thread."""
+    config_file = tmp_path / "config.json"
+    config_file.write_text(json.dumps({"database": database, "settings": settings}))
+    assert load_config(str(config_file))["pool"]["size"] == size
@@ -0,0 +1,46 @@
+# Copyright (c) 2018-2026 Linh Pham
+# api.wwdt.me is released under the terms of the Apache License 2.0
+# SPDX-License-Identifier: Apache-2.0
+#
+# vim: set noai syntax=python ts=4 sw=4:
+"""Testing Query Dispatch Thread Pools."""
+
+import asyncio
+import threading
+import time
+
+from app.dispatch import run_blocking
+
+
+def test_run_blocking_off_event_loop():
+    """Test dispatch.run_blocking runs the function on a worker thread."""
+
+    async def _run() -> tuple[int, int]:
+        return threading.get_ident(), await run_blocking(threading.get_ident)
+
+    loop_thread, worker_thread = asyncio.run(_run())
+    assert loop_thread != worker_thread
+
+
+def test_run_blocking_concurrency_cap():
+    """Test dispatch.run_blocking limits details queries per key."""
+    active = 0
+    peak = 0
+    lock = threading.Lock()
+
+    def _work() -> None:
+        nonlocal active, peak
+        with lock:
+            active += 1
+            peak = max(peak, active)
+        time.sleep(0.02)
+        with lock:
+            active -= 1
+
+    async def _run() -> None:
+        await asyncio.gather(
+            *(run_blocking(_work, key="test", details=True) for _ in range(4))
+        )
+
+    asyncio.run(_run())
+    assert peak == 1
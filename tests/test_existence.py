@@ -0,0 +1,251 @@
+# Copyright (c) 2018-2026 Linh Pham
+# api.wwdt.me is released under the terms of the Apache License 2.0
+# SPDX-License-Identifier: Apache-2.0
+#
+# vim: set noai syntax=python ts=4 sw=4:
+"""Testing Existence Index."""
+
+import asyncio
+import datetime
+import json
+from zoneinfo import ZoneInfo
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from wwdtm.guest import Guest
+from wwdtm.show import Show
+
+from app import dispatch, existence
+from app.cache import ResponseCache, ResponseCacheMiddleware
+from app.config import API_VERSION
+from app.dispatch import UNRESOLVED, run_query
+from app.existence import (
+    ExistenceIndex,
+    ExistenceSets,
+    SlugRouteMiddleware,
+    random_sample_response,
+    sample,
+)
+from app.main import app
+from app.models.guests import Guests as GuestsModel
+from app.models.shows import Shows as ShowsModel
+
+
+@pytest.fixture
+def index() -> ExistenceIndex:
+    """Existence index holding a small data set."""
+    index = ExistenceIndex()
+    index.current = ExistenceSets(
+        "test",
+        ids={"Guest": frozenset({1, 2, 3}), "Show": frozenset({10, 12, 13})},
+        slugs={"Guest": {"alpha-guest": 1, "beta-guest": 2, "none": 3}},
+        dates=frozenset({"2018-10-27", "2018-11-03", "2999-01-02"}),
+        random_ids={"Guest": (1, 2)},
+        slugs_by_id={"Guest": {1: "alpha-guest", 2: "beta-guest", 3: "none"}},
+        show_ids=(10, 12, 13),
+        show_dates=("2018-10-27", "2018-11-03", "2999-01-02"),
+        show_years={2018: (0, 2), 2999: (2, 3)},
+    )
+    return index
+
+
+@pytest.mark.parametrize(
+    "key, args, expected",
+    [
+        ("Guest.retrieve_by_id", (2,), UNRESOLVED),
+        ("Guest.retrieve_details_by_id", (99,), {}),
+        ("Guest.retrieve_by_slug", (" Alpha-Guest ",), UNRESOLVED),
+        ("Guest.retrieve_details_by_slug", ("gamma-guest",), {}),
+        ("Guest.retrieve_random", (), UNRESOLVED),
+        ("Host.retrieve_by_id", (1,), UNRESOLVED),
+        ("Show.retrieve_by_id", (11,), {}),
+        ("Show.retrieve_by_date", (2018, 10, 27), UNRESOLVED),
+        ("Show.retrieve_details_by_date", (2018, 2, 30), {}),
+        ("Show.retrieve_by_date_string", ("2018-10-27",), UNRESOLVED),
+        ("Show.retrieve_details_by_date_string", ("2018-10-28",), {}),
+        ("Show.retrieve_by_year", (2018,), UNRESOLVED),
+    ],
+)
+def test_existence_index_resolve(index: ExistenceIndex, key, args, expected):
+    """Test only lookups for values that do not exist are answered."""
+    assert index.resolve(key, args, {}) == expected
+
+
+def test_existence_index_not_loaded():
+    """Test lookups are not answered before the index is loaded."""
+    assert ExistenceIndex().resolve("Guest.retrieve_by_id", (99,), {}) is UNRESOLVED
+
+
+def test_run_query_rejects_unknown_values(index: ExistenceIndex, monkeypatch):
+    """Test run_query answers lookups for unknown values without the database."""
+    monkeypatch.setattr(dispatch, "_resolvers", [index.resolve])
+
+    assert asyncio.run(run_query(Guest, "retrieve_by_slug", "unknown")) == {}
+
+
+@pytest.mark.parametrize(
+    "path, expected",
+    [
+        (f"/v{API_VERSION}/guests/slug/Beta-Guest", f"/v{API_VERSION}/guests/id/2"),
+        (
+            f"/v{API_VERSION}/guests/details/slug/alpha-guest",
+            f"/v{API_VERSION}/guests/details/id/1",
+        ),
+        (f"/v{API_VERSION}/guests/slug/gamma-guest", None),
+        (f"/v{API_VERSION}/guests/random/slug", None),
+        (f"/v{API_VERSION}/hosts/slug/alpha-guest", None),
+        (f"/v{API_VERSION}/shows/slug/alpha-guest", None),
+    ],
+)
+def test_existence_index_id_path(index: ExistenceIndex, path, expected):
+    """Test slug string route paths map to the corresponding ID route."""
+    assert index.id_path(path) == expected
+
+
+def test_slug_route_middleware(index: ExistenceIndex):
+    """Test slug string requests share the cached ID route response."""
+    cache = ResponseCache()
+    calls = {"id": 0, "slug": 0}
+    _app = FastAPI()
+    _app.add_middleware(ResponseCacheMiddleware, cache=cache)
+    _app.add_middleware(SlugRouteMiddleware, index=index)
+
+    @_app.get(f"/v{API_VERSION}/guests/id/{{guest_id}}")
+    async def get_guest_by_id(guest_id: int):
+        calls["id"] += 1
+        return {"id": guest_id}
+
+    @_app.get(f"/v{API_VERSION}/guests/slug/{{guest_slug}}")
+    async def get_guest_by_slug(guest_slug: str):
+        calls["slug"] += 1
+        return {"slug": guest_slug}
+
+    client = TestClient(_app)
+    assert client.get(f"/v{API_VERSION}/guests/id/2").json() == {"id": 2}
+    response = client.get(f"/v{API_VERSION}/guests/slug/BETA-GUEST")
+    assert response.json() == {"id": 2}
+    assert response.headers["x-cache"] == "HIT"
+    assert client.get(f"/v{API_VERSION}/guests/slug/unknown").json() == {
+        "slug": "unknown"
+    }
+    assert calls == {"id": 1, "slug": 1}
+    assert len(cache) == 2
+
+
+def test_existence_index_random(index: ExistenceIndex):
+    """Test random queries are answered from the index."""
+    assert index.resolve("Guest.retrieve_random_id", (), {}) in (1, 2)
+    assert index.resolve("Guest.retrieve_random_slug", (), {}) in (
+        "alpha-guest",
+        "beta-guest",
+    )
+    assert index.resolve("Show.retrieve_random_id", (), {}) in (10, 12)
+    assert index.resolve("Show.retrieve_random_date_by_year", (), {"year": 2018}) in (
+        "2018-10-27",
+        "2018-11-03",
+    )
+    assert index.resolve("Show.retrieve_random_by_year", (), {"year": 2999}) is None
+    assert index.resolve("Host.retrieve_random_id", (), {}) is UNRESOLVED
+    assert ExistenceIndex().resolve("Guest.retrieve_random", (), {}) is UNRESOLVED
+
+
+def test_existence_index_random_pool_time_zone(monkeypatch):
+    """Test unaired shows are excluded using the date in the show time zone."""
+    time_zone = ZoneInfo("Pacific/Kiritimati")
+    today = datetime.datetime.now(time_zone).date()
+    dates = tuple(
+        (today + datetime.timedelta(days=offset)).isoformat() for offset in (0, 1)
+    )
+    index = ExistenceIndex()
+    index.current = ExistenceSets(
+        "test",
+        ids={"Show": frozenset({10, 11})},
+        dates=frozenset(dates),
+        show_ids=(10, 11),
+        show_dates=dates,
+        show_years={today.year: (0, 2)},
+    )
+
+    monkeypatch.setattr(existence, "SHOW_TIME_ZONE", time_zone)
+    assert index.random_pool("Show") == (10,)
+
+
+def test_existence_index_random_info(index: ExistenceIndex, monkeypatch):
+    """Test random entity information is retrieved from the next resolver."""
+    monkeypatch.setattr(
+        dispatch,
+        "_resolvers",
+        [
+            index.resolve,
+            lambda key, args, kwargs: {"key": key, "id": args[0], **kwargs},
+        ],
+    )
+
+    info = asyncio.run(run_query(Guest, "retrieve_random_details"))
+    assert info["key"] == "Guest.retrieve_details_by_id"
+    assert info["id"] in (1, 2)
+
+
+def test_sample():
+    """Test samples are distinct and seeded samples are reproducible."""
+    pool = tuple(range(100))
+    assert len(set(sample(pool, 10))) == 10
+    assert sorted(sample(pool[:5], 10)) == list(pool[:5])
+    assert sample(pool, 10, seed="quiz") == sample(pool, 10, seed="quiz")
+    assert sample(pool, 10, seed="quiz") != sample(pool, 10, seed="round")
+    assert len(set(sample(pool, 10, seed="quiz"))) == 10
+
+
+def test_random_sample_response(index: ExistenceIndex, monkeypatch):
+    """Test random entities are returned as a list in a single response."""
+    monkeypatch.setattr(existence, "existence_index", index)
+    monkeypatch.setattr(
+        dispatch,
+        "_resolvers",
+        [lambda key, args, kwargs: {"id": args[0], "name": "Guest", "slug": "guest"}],
+    )
+
+    response = asyncio.run(
+        random_sample_response(
+            GuestsModel, "guests", Guest, "retrieve_by_id", 5, "quiz"
+        )
+    )
+    guests = json.loads(response.body)["guests"]
+    assert sorted(guest["id"] for guest in guests) == [1, 2]
+
+    guest = asyncio.run(
+        random_sample_response(
+            GuestsModel, "guests", Guest, "retrieve_by_id", None, "quiz"
+        )
+    )
+    assert guest["id"] in (1, 2)
+
+    response = asyncio.run(
+        random_sample_response(
+            ShowsModel, "shows", Show, "retrieve_by_id", 2, None, year=2999
+        )
+    )
+    assert response is None
+
+
+def test_existence_index_invalidate_disabled(index: ExistenceIndex):
+    """Test a disabled index is dropped on data changes and loaded lazily."""
+    index.preload = False
+
+    async def _invalidate():
+        index.invalidate("next")
+
+    asyncio.run(_invalidate())
+    assert index.current is None
+    assert index._task is None
+
+
+def test_random_route_schema():
+    """Test random routes document single and list responses."""
+    schema = app.openapi()["paths"][f"/v{API_VERSION}/guests/random"]["get"]
+    response_schema = schema["responses"]["200"]["content"]["application/json"]
+    assert response_schema["schema"]["anyOf"] == [
+        {"$ref": "#/components/schemas/Guest"},
+        {"$ref": "#/components/schemas/Guests"},
+    ]
@@ -174,3 +174,36 @@ def test_get_randon_guest_slug():
     assert response.status_code == 200
     assert "slug" in _slug
     assert isinstance(_slug["slug"], str)
+
+
+def test_get_guests_batch():
+    """Test /v2.0/guests/batch route."""
+    response = client.get(
+        f"/v{API_VERSION}/guests/batch", params={"ids": "54,0", "slugs": "-abcdef"}
+    )
+    guests = response.json()
+
+    assert response.status_code == 200
+    assert [guest["id"] for guest in guests["guests"]] == [54]
+    assert guests["not_found"] == {"ids": [0], "slugs": ["-abcdef"]}
+
+
+def test_post_guests_details_batch():
+    """Test POST /v2.0/guests/details/batch route."""
+    response = client.post(
+        f"/v{API_VERSION}/guests/details/batch",
+        json={"ids": [54], "slugs": ["tom-hanks"]},
+    )
+    guests = response.json()
+
+    assert response.status_code == 200
+    assert "appearances" in guests["guests"][0]
+    assert guests["not_found"]["ids"] == []
+
+
+def test_get_guests_batch_empty():
+    """Test /v2.0/guests/batch route without IDs or slug strings."""
+    response = client.get(f"/v{API_VERSION}/guests/batch")
+
+    assert response.status_code == 400
+    assert "detail" in response.json()
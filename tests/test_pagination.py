@@ -0,0 +1,124 @@
+# Copyright (c) 2018-2026 Linh Pham
+# api.wwdt.me is released under the terms of the Apache License 2.0
+# SPDX-License-Identifier: Apache-2.0
+#
+# vim: set noai syntax=python ts=4 sw=4:
+"""Testing Keyset Pagination."""
+
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+from pydantic import BaseModel
+from starlette.requests import Request
+
+from app import pagination
+from app.pagination import (
+    CollectionIndex,
+    decode_cursor,
+    encode_cursor,
+    page_response,
+)
+
+_rows = [
+    {"id": 3, "date": "2018-01-06"},
+    {"id": 1, "date": "2018-01-13"},
+    {"id": 7, "date": "2018-01-20"},
+    {"id": 2, "date": "2018-01-27"},
+    {"id": 5, "date": "2018-02-03"},
+]
+
+
+@pytest.fixture
+def index(monkeypatch) -> CollectionIndex:
+    """Collection index that does not query the database."""
+
+    async def _run_query(library_class, method_name, **kwargs):
+        return list(_rows)
+
+    monkeypatch.setattr(pagination, "run_query", _run_query)
+    return CollectionIndex(object, sort_fields=("date",))
+
+
+def test_cursor_round_trip():
+    """Test decode_cursor returns the values passed to encode_cursor."""
+    cursor = encode_cursor(1083, ["2018-10-27"])
+    assert decode_cursor(cursor) == (1083, ("2018-10-27",))
+
+
+def test_decode_cursor_invalid():
+    """Test decode_cursor raises an HTTP 400 error for invalid cursors."""
+    with pytest.raises(HTTPException) as error:
+        decode_cursor("not-a-cursor")
+
+    assert error.value.status_code == 400
+
+
+def test_collection_index_pages(index: CollectionIndex):
+    """Test CollectionIndex returns every row once, in order."""
+    ids = []
+    cursor = None
+    while True:
+        page = asyncio.run(index.page(cursor, 2))
+        ids.extend(page.ids)
+        cursor = page.next_cursor
+        if not cursor:
+            break
+
+    assert ids == [row["id"] for row in _rows]
+
+
+def test_collection_index_missing_row(index: CollectionIndex):
+    """Test CollectionIndex resumes using the sort key of a removed row."""
+    cursor = encode_cursor(99, ["2018-01-15"])
+    page = asyncio.run(index.page(cursor, 2))
+    assert page.ids == [7, 2]
+
+
+def test_collection_index_iter_details(monkeypatch, index: CollectionIndex):
+    """Test CollectionIndex retrieves details in batches, in order."""
+    calls = []
+
+    async def _run_query_each(library_class, method_name, values, **kwargs):
+        calls.append((method_name, list(values), kwargs))
+        return [{"id": value} if value != 7 else None for value in values]
+
+    async def _collect():
+        return [batch async for batch in index.iter_details(extra=True)]
+
+    monkeypatch.setattr(pagination, "run_query_each", _run_query_each)
+    monkeypatch.setattr(pagination, "MAX_PAGE_SIZE", 2)
+    batches = asyncio.run(_collect())
+
+    assert batches == [[{"id": 3}, {"id": 1}], [{"id": 2}], [{"id": 5}]]
+    assert calls[0] == (
+        "retrieve_details_by_id",
+        [3, 1],
+        {"details": True, "extra": True},
+    )
+    assert len(calls) == 3
+
+
+def test_page_response_relative_link():
+    """Test the next page link does not include the request host."""
+
+    class Items(BaseModel):
+        items: list[int]
+
+    request = Request(
+        {
+            "type": "http",
+            "method": "GET",
+            "scheme": "http",
+            "server": ("internal", 8000),
+            "path": "/v2.0/guests",
+            "query_string": b"page_size=2",
+            "headers": [(b"host", b"internal:8000")],
+        }
+    )
+    response = page_response(request, Items, "items", [1, 2], "abc")
+
+    assert response.headers["x-next-cursor"] == "abc"
+    assert (
+        response.headers["link"] == '</v2.0/guests?page_size=2&cursor=abc>; rel="next"'
+    )
@@ -0,0 +1,152 @@
+# Copyright (c) 2018-2026 Linh Pham
+# api.wwdt.me is released under the terms of the Apache License 2.0
+# SPDX-License-Identifier: Apache-2.0
+#
+# vim: set noai syntax=python ts=4 sw=4:
+"""Testing Panelist Statistics Calculated Using Columnar Arrays."""
+
+import secrets
+import statistics
+from decimal import Decimal
+from typing import Any
+
+import numpy
+import pytest
+from wwdtm.panelist import PanelistStatistics
+
+from app.config import load_config
+from app.database import close_pool, database_connection, open_pool
+from app.panelist import RANKS, Panelist, ScoreColumns, scoring_statistics
+
+
+def _expected_statistics(
+    rows: list[dict[str, Any]], number_decimal_places: int
+) -> dict[str, Any]:
+    """Calculates statistics for a panelist's rows the way wwdtm does."""
+    score_data = [row["score"] for row in rows if row["score"]]
+    score_data_decimal = [row["score_decimal"] for row in rows if row["score_decimal"]]
+    if not score_data or not score_data_decimal:
+        return {}
+
+    ranks = {
+        name: sum(1 for row in rows if row["pnl_rank"] == rank)
+        for rank, name in RANKS.items()
+    }
+    return {
+        "scoring": {
+            "minimum": int(numpy.amin(score_data)),
+            "maximum": int(numpy.amax(score_data)),
+            "mean": round(numpy.mean(score_data), number_decimal_places),
+            "median": int(numpy.median(score_data)),
+            "mode": statistics.mode(sorted(score_data)),
+            "mode_multiple": sorted(statistics.multimode(sorted(score_data))),
+            "standard_deviation": round(numpy.std(score_data), number_decimal_places),
+            "variance": round(numpy.var(score_data), number_decimal_places),
+            "total": int(numpy.sum(score_data)),
+        },
+        "scoring_decimal": {
+            "minimum": Decimal(numpy.amin(score_data_decimal)),
+            "maximum": Decimal(numpy.amax(score_data_decimal)),
+            "mean": round(
+                Decimal(numpy.mean(score_data_decimal)), number_decimal_places
+            ),
+            "median": Decimal(numpy.median(score_data_decimal)),
+            "mode": statistics.mode(sorted(score_data_decimal)),
+            "mode_multiple": sorted(statistics.multimode(sorted(score_data_decimal))),
+            "standard_deviation": round(
+                Decimal(numpy.std(score_data_decimal)), number_decimal_places
+            ),
+            "variance": round(
+                Decimal(numpy.var(score_data_decimal)), number_decimal_places
+            ),
+            "total": Decimal(numpy.sum(score_data_decimal)),
+        },
+        "ranking": {
+            "rank": ranks,
+            "percentage": {
+                name: round(100 * (count / len(score_data)), number_decimal_places)
+                for name, count in ranks.items()
+            },
+        },
+    }
+
+
+def _random_rows(panelist_ids: list[int]) -> list[dict[str, Any]]:
+    """Returns random appearance rows ordered by panelist ID."""
+    rows = []
+    for panelist_id in panelist_ids:
+        for _ in range(1 + secrets.randbelow(150)):
+            score = secrets.randbelow(21)
+            rows.append(
+                {
+                    "id": panelist_id,
+                    "score": score if secrets.randbelow(10) else None,
+                    "score_decimal": Decimal(score * 10 + secrets.randbelow(2) * 5)
+                    / 10,
+                    "pnl_rank": secrets.choice([*RANKS, None]),
+                }
+            )
+
+    return rows
+
+
+@pytest.mark.parametrize("number_decimal_places", [0, 2, 5, 20])
+def test_scoring_statistics_match_wwdtm(number_decimal_places: int):
+    """Test statistics match statistics calculated for each panelist."""
+    rows = _random_rows([1, 2, 5, 8, 13])
+    rows.extend(
+        {"id": 21, "score": 0, "score_decimal": Decimal(0), "pnl_rank": "3"}
+        for _ in range(3)
+    )
+
+    calculated = scoring_statistics(
+        ScoreColumns.from_rows(rows), number_decimal_places=number_decimal_places
+    )
+
+    for panelist_id in (1, 2, 5, 8, 13, 21):
+        expected = _expected_statistics(
+            [row for row in rows if row["id"] == panelist_id], number_decimal_places
+        )
+        assert calculated.get(panelist_id, {}) == expected
+
+
+def test_scoring_statistics_without_rows():
+    """Test statistics for no appearances."""
+    assert scoring_statistics(ScoreColumns.from_rows([])) == {}
+
+
+def test_score_columns_from_rows():
+    """Test columnar arrays created from appearance rows."""
+    columns = ScoreColumns.from_rows(
+        [
+            {"id": 3, "score": None, "score_decimal": None, "pnl_rank": "1t"},
+            {"id": 3, "score": 7, "score_decimal": Decimal("7.5"), "pnl_rank": None},
+        ]
+    )
+
+    assert columns.ids.tolist() == [3, 3]
+    assert columns.scores.tolist() == [0, 7]
+    assert columns.scores_decimal.tolist() == [Decimal(0), Decimal("7.5")]
+    assert columns.ranks.tolist() == [1, -1]
+
+
+def test_retrieve_all_details_matches_per_panelist():
+    """Test statistics for all panelists match per-panelist statistics."""
+    open_pool(load_config())
+    try:
+        with database_connection() as connection:
+            panelists = Panelist(database_connection=connection).retrieve_all_details(
+                number_decimal_places=5
+            )
+            panelist_statistics = PanelistStatistics(database_connection=connection)
+            expected = [
+                panelist_statistics.retrieve_statistics_by_id(
+                    panelist["id"], number_decimal_places=5
+                )
+                for panelist in panelists
+            ]
+    finally:
+        close_pool()
+
+    assert panelists
+    assert [panelist["statistics"] for panelist in panelists] == expected
@@ -104,6 +104,33 @@ def test_get_panelist_details_by_id(panelist_id: int):
     assert "appearances" in panelist
 
 
+@pytest.mark.parametrize("panelist_id, include", [(30, "appearances")])
+def test_get_panelist_details_by_id_include(panelist_id: int, include: str):
+    """Test /v2.0/panelists/details/id/{panelist_id} route with include."""
+    response = client.get(
+        f"/v{API_VERSION}/panelists/details/id/{panelist_id}",
+        params={"include": include},
+    )
+    panelist = response.json()
+
+    assert response.status_code == 200
+    assert panelist["id"] == panelist_id
+    assert panelist["appearances"]
+    assert panelist["statistics"] is None
+    assert panelist["bluffs"] is None
+
+
+@pytest.mark.parametrize("panelist_id, include", [(30, "scores")])
+def test_get_panelist_details_by_id_include_invalid(panelist_id: int, include: str):
+    """Test /v2.0/panelists/details/id/{panelist_id} route with include."""
+    response = client.get(
+        f"/v{API_VERSION}/panelists/details/id/{panelist_id}",
+        params={"include": include},
+    )
+
+    assert response.status_code == 422
+
+
 @pytest.mark.parametrize("panelist_id", [0])
 def test_get_panelist_details_by_id_not_found(panelist_id: int):
     """Test /v2.0/panelists/details/id/{panelist_id} route."""
@@ -300,6 +327,16 @@ def test_get_random_panelist():
     assert "slug" in panelist
 
 
+def test_get_random_panelist_count():
+    """Test /v2.0/panelists/random route with the count parameter."""
+    response = client.get(f"/v{API_VERSION}/panelists/random", params={"count": 3})
+    panelists = response.json()
+
+    assert response.status_code == 200
+    assert "panelists" in panelists
+    assert len({panelist["id"] for panelist in panelists["panelists"]}) == 3
+
+
 def test_get_random_panelist_id():
     """Test /v2.0/panelists/random/id route."""
     response = client.get(f"/v{API_VERSION}/panelists/random/id")
@@ -0,0 +1,74 @@
+# Copyright (c) 2018-2026 Linh Pham
+# api.wwdt.me is released under the terms of the Apache License 2.0
+# SPDX-License-Identifier: Apache-2.0
+#
+# vim: set noai syntax=python ts=4 sw=4:
+"""Testing Pre-rendered Responses."""
+
+import asyncio
+import gzip
+
+import brotli
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+from wwdtm.guest import Guest
+
+from app import prerender
+from app.generation import data_generation
+from app.models.guests import GuestsDetails
+from app.prerender import PrerenderedResponse
+
+_guests = [
+    {"id": 1, "name": "A", "slug": "a", "appearances": {"count": 0}},
+    {"id": 2, "name": "B", "slug": "b", "appearances": {"count": 0}},
+]
+
+
+def test_prerendered_response(monkeypatch):
+    """Test rendered variants are negotiated using Accept-Encoding."""
+
+    async def _run_query(library_class, method_name, details=False, **kwargs):
+        return _guests
+
+    monkeypatch.setattr(prerender, "run_query", _run_query)
+    monkeypatch.setattr(data_generation, "generation", "prerender-test")
+    prerendered = PrerenderedResponse(GuestsDetails, "guests", Guest)
+    expected = GuestsDetails.model_validate({"guests": _guests}).model_dump_json()
+
+    _app = FastAPI()
+
+    @_app.get("/guests/details")
+    async def get_guests_details(request: Request):
+        if not prerendered._task:
+            prerendered.invalidate(data_generation.generation)
+            assert await prerendered.response(request) is None
+            await asyncio.wait({prerendered._task})
+
+        return await prerendered.response(request)
+
+    client = TestClient(_app)
+    response = client.get("/guests/details", headers={"accept-encoding": "br"})
+    assert response.headers["content-encoding"] == "br"
+    assert response.headers["vary"] == "Accept-Encoding"
+    assert response.content == expected.encode()
+    assert "etag" in response.headers
+
+    response = client.get("/guests/details", headers={"accept-encoding": "identity"})
+    assert "content-encoding" not in response.headers
+    assert response.content == expected.encode()
+
+    body, _ = prerendered.current.variants["gzip"]
+    assert gzip.decompress(body) == expected.encode()
+    body, _ = prerendered.current.variants["br"]
+    assert brotli.decompress(body) == expected.encode()
+
+    prerendered.invalidate("next")
+    assert prerendered.current is None
+    asyncio.run(prerendered.close())
+    assert prerendered._task is None
+
+
+def test_prerendered_response_not_rendered():
+    """Test no response is returned before the response is rendered."""
+    prerendered = PrerenderedResponse(GuestsDetails, "guests", Guest)
+    assert asyncio.run(prerendered.response(None)) is None
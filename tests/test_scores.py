@@ -0,0 +1,343 @@
+# Copyright (c) 2018-2026 Linh Pham
+# api.wwdt.me is released under the terms of the Apache License 2.0
+# SPDX-License-Identifier: Apache-2.0
+#
+# vim: set noai syntax=python ts=4 sw=4:
+"""Testing Panelist Decimal Score Columns."""
+
+import datetime
+from decimal import Decimal
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app import scores
+from app.config import API_VERSION
+from app.dispatch import UNRESOLVED
+from app.main import app
+from app.scores import DecimalScoreColumns, ScoreColumnStore, score_bins
+
+_rows = [
+    {
+        "id": 2,
+        "show_id": 12,
+        "date": datetime.date(2018, 10, 27),
+        "score": Decimal("4.5"),
+        "pnl_rank": "1",
+    },
+    {
+        "id": 2,
+        "show_id": 11,
+        "date": datetime.date(2018, 11, 3),
+        "score": Decimal("10.0"),
+        "pnl_rank": "1",
+    },
+    {
+        "id": 2,
+        "show_id": 14,
+        "date": datetime.date(2019, 1, 5),
+        "score": Decimal("4.5"),
+        "pnl_rank": "1t",
+    },
+    {
+        "id": 5,
+        "show_id": 12,
+        "date": datetime.date(2018, 10, 27),
+        "score": Decimal("2.3"),
+        "pnl_rank": "2",
+    },
+    {
+        "id": 5,
+        "show_id": 11,
+        "date": datetime.date(2018, 11, 3),
+        "score": Decimal("0.0"),
+        "pnl_rank": "3",
+    },
+]
+
+
+@pytest.fixture
+def store() -> ScoreColumnStore:
+    """Score column store holding a small data set."""
+    store = ScoreColumnStore()
+    store.current = DecimalScoreColumns.from_rows(
+        "test",
+        _rows,
+        minimum=Decimal("0.0"),
+        maximum=Decimal("2.0"),
+        slugs={"Alpha-Panelist": 2, "beta-panelist": 5, "gamma-panelist": 8},
+    )
+    return store
+
+
+def test_score_bins():
+    """Test half-point score labels for a score range."""
+    assert score_bins(Decimal("-1.0"), Decimal("1.5")) == [
+        "-1",
+        "-0.5",
+        "0",
+        "0.5",
+        "1",
+        "1.5",
+    ]
+    assert score_bins(None, None) == []
+
+
+def test_projections(store: ScoreColumnStore):
+    """Test scores projected from the score columns."""
+    columns = store.current
+
+    assert columns.scores_list(2) == {
+        "shows": ["2018-10-27", "2018-11-03", "2019-01-05"],
+        "scores": [Decimal("4.5"), Decimal("10.0"), Decimal("4.5")],
+    }
+    assert columns.scores_ordered_pair(5) == [
+        ("2018-10-27", Decimal("2.3")),
+        ("2018-11-03", Decimal("0.0")),
+    ]
+    assert columns.scores_grouped_ordered_pair(2) == [
+        ("0", 0),
+        ("0.5", 0),
+        ("1", 0),
+        ("1.5", 0),
+        ("2", 0),
+        ("2.5", 0),
+        ("4.5", 2),
+        ("10", 1),
+    ]
+    assert columns.scores_grouped_list(5) == {
+        "score": ["0", "0.5", "1", "1.5", "2", "2.5", "2.3"],
+        "count": [1, 0, 0, 0, 0, 0, 1],
+    }
+    assert columns.scores_list(8) == {}
+    assert columns.scores_ordered_pair(8) == []
+    assert columns.scores_grouped_ordered_pair(8) == []
+    assert columns.scores_grouped_list(8) == {}
+
+
+@pytest.mark.parametrize(
+    "key, args, expected",
+    [
+        (
+            "PanelistDecimalScores.retrieve_scores_list_by_slug",
+            (" alpha-panelist ",),
+            {
+                "shows": ["2018-10-27", "2018-11-03", "2019-01-05"],
+                "scores": [Decimal("4.5"), Decimal("10.0"), Decimal("4.5")],
+            },
+        ),
+        (
+            "PanelistDecimalScores.retrieve_scores_ordered_pair_by_id",
+            (5,),
+            [("2018-10-27", Decimal("2.3")), ("2018-11-03", Decimal("0.0"))],
+        ),
+        ("PanelistDecimalScores.retrieve_scores_list_by_id", (99,), {}),
+        ("PanelistDecimalScores.retrieve_scores_list_by_slug", ("delta",), {}),
+        (
+            "PanelistDecimalScores.retrieve_scores_grouped_ordered_pair_by_slug",
+            ("gamma-panelist",),
+            [],
+        ),
+        ("PanelistDecimalScores.retrieve_scores_by_id", (2,), UNRESOLVED),
+        ("PanelistScores.retrieve_scores_list_by_id", (2,), UNRESOLVED),
+    ],
+)
+def test_resolve(store: ScoreColumnStore, key: str, args: tuple, expected):
+    """Test panelist decimal scores queries answered from the columns."""
+    assert store.resolve(key, args, {}) == expected
+
+
+def test_resolve_not_loaded():
+    """Test queries are left to the database until the columns load."""
+    store = ScoreColumnStore()
+
+    assert (
+        store.resolve("PanelistDecimalScores.retrieve_scores_list_by_id", (2,), {})
+        is UNRESOLVED
+    )
+
+
+def test_from_rows_without_rows():
+    """Test score columns created without any appearances."""
+    columns = DecimalScoreColumns.from_rows("test", [])
+
+    assert columns.segments == {}
+    assert columns.scores_list(1) == {}
+
+
+def test_scores_matrix(store: ScoreColumnStore):
+    """Test dense and compact matrices of shows and panelists."""
+    columns = store.current
+
+    assert columns.scores_matrix() == {
+        "encoding": "dense",
+        "shows": {
+            "ids": [12, 11, 14],
+            "dates": ["2018-10-27", "2018-11-03", "2019-01-05"],
+        },
+        "panelists": [
+            {
+                "id": 2,
+                "slug": "Alpha-Panelist",
+                "scores": [Decimal("4.5"), Decimal("10.0"), Decimal("4.5")],
+            },
+            {
+                "id": 5,
+                "slug": "beta-panelist",
+                "scores": [Decimal("2.3"), Decimal("0.0"), None],
+            },
+        ],
+    }
+    assert columns.scores_matrix([5, 2], end_year=2018, compact=True) == {
+        "encoding": "compact",
+        "shows": {"ids": [12, 11], "dates": ["2018-10-27", "2018-11-03"]},
+        "panelists": [
+            {
+                "id": 5,
+                "slug": "beta-panelist",
+                "rows": [0, 1],
+                "scores": [Decimal("2.3"), Decimal("0.0")],
+            },
+            {
+                "id": 2,
+                "slug": "Alpha-Panelist",
+                "rows": [0, 1],
+                "scores": [Decimal("4.5"), Decimal("10.0")],
+            },
+        ],
+    }
+    assert columns.scores_matrix([5], start_year=2019) == {
+        "encoding": "dense",
+        "shows": {"ids": [], "dates": []},
+        "panelists": [{"id": 5, "slug": "beta-panelist", "scores": []}],
+    }
+
+
+def test_get_panelists_scores_matrix(
+    store: ScoreColumnStore, monkeypatch: pytest.MonkeyPatch
+):
+    """Test /v2.0/panelists/scores/matrix route."""
+    monkeypatch.setattr(scores, "score_column_store", store)
+    client = TestClient(app)
+
+    response = client.get(
+        f"/v{API_VERSION}/panelists/scores/matrix",
+        params={"ids": "2", "start_year": 2019, "encoding": "compact"},
+    )
+    assert response.status_code == 200
+    assert response.json()["shows"]["ids"] == [14]
+    assert response.json()["panelists"][0]["rows"] == [0]
+
+    response = client.get(f"/v{API_VERSION}/panelists/scores/matrix")
+    assert response.status_code == 200
+    assert response.json()["panelists"][0] == {
+        "id": 2,
+        "slug": "Alpha-Panelist",
+        "scores": ["4.5", "10.0", "4.5"],
+    }
+
+    response = client.get(
+        f"/v{API_VERSION}/panelists/scores/matrix", params={"ids": "2,8"}
+    )
+    assert response.status_code == 404
+
+    response = client.get(
+        f"/v{API_VERSION}/panelists/scores/matrix", params={"encoding": "sparse"}
+    )
+    assert response.status_code == 422
+
+
+def test_compare(store: ScoreColumnStore):
+    """Test head-to-head comparison of panelists."""
+    comparison = store.current.compare([5, 2], number_decimal_places=2)
+
+    assert comparison["shows"] == {
+        "ids": [12, 11],
+        "dates": ["2018-10-27", "2018-11-03"],
+    }
+    assert comparison["panelists"] == [
+        {
+            "id": 5,
+            "slug": "beta-panelist",
+            "scores": [Decimal("2.3"), Decimal("0.0")],
+        },
+        {
+            "id": 2,
+            "slug": "Alpha-Panelist",
+            "scores": [Decimal("4.5"), Decimal("10.0")],
+        },
+    ]
+    assert comparison["matchups"] == [
+        {
+            "panelist_id": 5,
+            "opponent_id": 2,
+            "shared_appearances": 2,
+            "wins": 0,
+            "losses": 2,
+            "ties": 0,
+            "score_differential": {
+                "total": Decimal("-12.2"),
+                "mean": Decimal("-6.10"),
+                "minimum": Decimal("-10.0"),
+                "maximum": Decimal("-2.2"),
+            },
+            "ranks": {
+                "panelist": {
+                    "first": 0,
+                    "first_tied": 0,
+                    "second": 1,
+                    "second_tied": 0,
+                    "third": 1,
+                },
+                "opponent": {
+                    "first": 2,
+                    "first_tied": 0,
+                    "second": 0,
+                    "second_tied": 0,
+                    "third": 0,
+                },
+            },
+        }
+    ]
+
+
+def test_compare_without_shared_shows(store: ScoreColumnStore):
+    """Test comparison of panelists who never appeared together."""
+    comparison = store.current.compare([2, 8])
+
+    assert store.current.co_appearances.keys() == {(2, 5)}
+    assert comparison["shows"] == {"ids": [], "dates": []}
+    assert comparison["panelists"][1] == {
+        "id": 8,
+        "slug": "gamma-panelist",
+        "scores": [],
+    }
+    assert comparison["matchups"][0]["shared_appearances"] == 0
+    assert comparison["matchups"][0]["score_differential"] == {
+        "total": Decimal(0),
+        "mean": None,
+        "minimum": None,
+        "maximum": None,
+    }
+
+
+def test_get_panelists_comparison(
+    store: ScoreColumnStore, monkeypatch: pytest.MonkeyPatch
+):
+    """Test /v2.0/panelists/compare route."""
+    monkeypatch.setattr(scores, "score_column_store", store)
+    client = TestClient(app)
+
+    response = client.get(f"/v{API_VERSION}/panelists/compare", params={"ids": "2,5"})
+    assert response.status_code == 200
+    assert response.json()["shows"]["ids"] == [12, 11]
+    assert response.json()["matchups"][0]["wins"] == 2
+
+    response = client.get(f"/v{API_VERSION}/panelists/compare", params={"ids": "2,2"})
+    assert response.status_code == 400
+
+    response = client.get(f"/v{API_VERSION}/panelists/compare", params={"ids": "2,9"})
+    assert response.status_code == 404
+
+    response = client.get(f"/v{API_VERSION}/panelists/compare", params={"ids": "a"})
+    assert response.status_code == 422
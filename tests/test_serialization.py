@@ -0,0 +1,181 @@
+# Copyright (c) 2018-2026 Linh Pham
+# api.wwdt.me is released under the terms of the Apache License 2.0
+# SPDX-License-Identifier: Apache-2.0
+#
+# vim: set noai syntax=python ts=4 sw=4:
+"""Testing Fast JSON Serialization."""
+
+import asyncio
+from decimal import Decimal
+
+import pytest
+from fastapi import APIRouter, FastAPI
+from fastapi.testclient import TestClient
+
+from app import serialization
+from app.models.guests import Guest, Guests, GuestsDetails
+from app.models.panelists import (
+    PanelistScoresGroupedOrderedPair,
+    PanelistScoresMatrix,
+    ScoringStatistics,
+)
+from app.models.shows import ShowsDetails
+
+_show_details = {
+    "shows": [
+        {
+            "id": 1083,
+            "date": "2018-10-27",
+            "best_of": False,
+            "repeat_show": False,
+            "show_url": None,
+            "original_show_id": None,
+            "original_show_date": None,
+            "location": {
+                "id": 2,
+                "slug": "chase-bank-auditorium-chicago-il",
+                "city": "Chicago",
+                "state": "IL",
+                "venue": "Chase Bank Auditorium",
+                "coordinates": {"latitude": Decimal("41.88"), "longitude": None},
+                "unused": True,
+            },
+            "description": "Ünïcode description",
+            "host": {"id": 1, "name": "Peter Sagal", "slug": "peter", "guest": False},
+            "panelists": [
+                {
+                    "id": 14,
+                    "name": "Paula Poundstone",
+                    "slug": "paula-poundstone",
+                    "lightning_round_start": 2,
+                    "lightning_round_start_decimal": Decimal("2.0"),
+                    "lightning_round_correct": 3,
+                    "lightning_round_correct_decimal": 3.5,
+                    "score": 8,
+                    "score_decimal": Decimal("8.50"),
+                    "score_exception": False,
+                    "rank": "1",
+                }
+            ],
+            "bluffs": [],
+            "guests": [
+                {"id": 9, "name": "Guest", "slug": "guest", "score": 2},
+            ],
+        }
+    ]
+}
+
+
+@pytest.mark.parametrize(
+    "model, content",
+    [
+        (ShowsDetails, _show_details),
+        (
+            GuestsDetails,
+            {
+                "guests": [
+                    {"id": 1, "name": "A", "slug": "a", "appearances": {"count": 0}},
+                    {
+                        "id": 2,
+                        "name": "B",
+                        "slug": None,
+                        "appearances": {
+                            "count": {"regular_shows": 1, "all_shows": 2},
+                            "shows": [],
+                        },
+                    },
+                ]
+            },
+        ),
+        (
+            ScoringStatistics,
+            {
+                "minimum": 0,
+                "maximum": 20,
+                "mean": 8,
+                "median": 7.5,
+                "mode": 7,
+                "mode_multiple": [7],
+                "standard_deviation": 0.1 + 0.2,
+                "variance": 1e-05,
+                "total": 120,
+            },
+        ),
+        (
+            PanelistScoresGroupedOrderedPair,
+            {"scores": [(Decimal("0.5"), 1), (2, 4)]},
+        ),
+        (
+            PanelistScoresMatrix,
+            {
+                "encoding": "dense",
+                "shows": {"ids": [1, 2], "dates": ["2018-10-27", "2018-11-03"]},
+                "panelists": [
+                    {"id": 14, "slug": "a", "scores": [Decimal("8.5"), None]},
+                    {"id": 15, "slug": None, "rows": [1], "scores": [Decimal(2)]},
+                ],
+            },
+        ),
+        (Guest | Guests, {"id": 1, "name": "A", "slug": "a"}),
+        (Guest | Guests, {"guests": [{"id": 1, "name": "A", "slug": "a"}]}),
+    ],
+)
+def test_serialize_matches_models(model, content):
+    """Test serialize output matches the response model output."""
+    body = serialization.serialize(model, content)
+    serialization.validate(model, content, body)
+
+
+def test_fast_json_route(monkeypatch):
+    """Test FastJSONRoute responses match regular route responses."""
+    responses = {}
+    for enabled in (False, True):
+        monkeypatch.setattr(serialization, "FAST_SERIALIZER", enabled)
+        monkeypatch.setattr(serialization, "FAST_SERIALIZER_VALIDATE", enabled)
+        router = APIRouter(route_class=serialization.FastJSONRoute)
+
+        @router.get("/shows/details", response_model=ShowsDetails)
+        async def get_shows_details():
+            return _show_details
+
+        _app = FastAPI()
+        _app.include_router(router)
+        response = TestClient(_app).get("/shows/details")
+        assert response.status_code == 200
+        responses[enabled] = response
+
+    assert responses[True].content == responses[False].content
+    assert responses[True].headers["content-type"] == "application/json"
+
+
+async def _batches(items: list, size: int):
+    for start in range(0, len(items), size):
+        yield items[start : start + size]
+
+
+async def _collect(chunks) -> list[bytes]:
+    return [chunk async for chunk in chunks]
+
+
+@pytest.mark.parametrize("enabled", [False, True])
+def test_iter_model_json(monkeypatch, enabled):
+    """Test iter_model_json output matches the response model output."""
+    monkeypatch.setattr(serialization, "FAST_SERIALIZER", enabled)
+    monkeypatch.setattr(serialization, "STREAM_CHUNK_SIZE", 256)
+    content = {"shows": _show_details["shows"] * 5}
+
+    chunks = asyncio.run(
+        _collect(
+            serialization.iter_model_json(
+                ShowsDetails, "shows", _batches(content["shows"], 2)
+            )
+        )
+    )
+    assert len(chunks) > 1
+    expected = ShowsDetails.model_validate(content).model_dump_json().encode()
+    assert b"".join(chunks) == expected
+
+    chunks = asyncio.run(
+        _collect(serialization.iter_model_json(ShowsDetails, "shows", _batches([], 2)))
+    )
+    assert b"".join(chunks) == b'{"shows":[]}'
@@ -0,0 +1,141 @@
+# Copyright (c) 2018-2026 Linh Pham
+# api.wwdt.me is released under the terms of the Apache License 2.0
+# SPDX-License-Identifier: Apache-2.0
+#
+# vim: set noai syntax=python ts=4 sw=4:
+"""Testing Set-Based Show Details Retrieval."""
+
+import datetime
+from decimal import Decimal
+
+import pytest
+from wwdtm.show import Show as WWDTMShow
+
+from app.config import load_config
+from app.database import close_pool, database_connection, open_pool
+from app.show import Show, bluff_info, core_info, group_rows, panelist_info
+
+_core_row = {
+    "show_id": 11,
+    "date": datetime.date(2017, 12, 30),
+    "best_of": 1,
+    "repeat_show_id": 10,
+    "original_show_date": datetime.date(2017, 10, 28),
+    "show_url": None,
+    "location_id": 3,
+    "city": "Chicago",
+    "state": "IL",
+    "state_name": "Illinois",
+    "latitude": None,
+    "longitude": None,
+    "venue": "Studio",
+    "location_slug": None,
+    "host_id": 1,
+    "host": "Alpha Host",
+    "host_slug": "alpha-host",
+    "host_guest": 0,
+    "scorekeeper_id": 2,
+    "scorekeeper": "Beta Scorekeeper",
+    "scorekeeper_slug": None,
+    "scorekeeper_guest": 1,
+    "scorekeeper_description": "",
+    "show_description": " Description ",
+    "show_notes": None,
+}
+
+
+def test_core_info():
+    """Test core show information built from a show row."""
+    info = core_info(_core_row, lambda **kwargs: "studio-chicago-il")
+
+    assert list(info) == [
+        "id",
+        "date",
+        "best_of",
+        "repeat_show",
+        "original_show_id",
+        "original_show_date",
+        "show_url",
+        "description",
+        "notes",
+        "location",
+        "host",
+        "scorekeeper",
+    ]
+    assert info["original_show_date"] == "2017-10-28"
+    assert info["description"] == "Description"
+    assert info["location"]["slug"] == "studio-chicago-il"
+    assert info["location"]["coordinates"] is None
+    assert info["scorekeeper"]["slug"] == "beta-scorekeeper"
+    assert info["scorekeeper"]["description"] is None
+
+    info = core_info({**_core_row, "repeat_show_id": None}, lambda **kwargs: "")
+    assert "original_show_id" not in info
+    assert "original_show_date" not in info
+
+
+def test_panelist_and_bluff_info():
+    """Test panelist and Bluff the Listener information built from rows."""
+    panelist = panelist_info(
+        {
+            "id": 5,
+            "name": "Gamma Panelist",
+            "slug": None,
+            "start": 2,
+            "start_decimal": Decimal("2.5"),
+            "correct": 3,
+            "correct_decimal": Decimal("3.0"),
+            "score": 8,
+            "score_decimal": Decimal("8.0"),
+            "pnl_rank": None,
+        }
+    )
+    assert panelist["slug"] == "gamma-panelist"
+    assert panelist["score_exception"] is True
+    assert panelist["rank"] is None
+
+    bluff = bluff_info(
+        {
+            "segment": 1,
+            "chosen_id": 5,
+            "chosen_name": "Gamma Panelist",
+            "chosen_slug": "gamma-panelist",
+            "correct_id": None,
+            "correct_name": None,
+            "correct_slug": None,
+        }
+    )
+    assert bluff == {
+        "segment": 1,
+        "chosen_panelist": {
+            "id": 5,
+            "name": "Gamma Panelist",
+            "slug": "gamma-panelist",
+        },
+        "correct_panelist": None,
+    }
+
+
+def test_group_rows():
+    """Test rows are grouped by show ID in their original order."""
+    rows = [{"show_id": 2, "n": 1}, {"show_id": 1, "n": 2}, {"show_id": 2, "n": 3}]
+
+    assert group_rows(rows, lambda row: row["n"]) == {2: [1, 3], 1: [2]}
+
+
+@pytest.mark.parametrize("year, month", [(2018, 10)])
+def test_retrieve_details_matches_per_show(year: int, month: int):
+    """Test set-based details match the details retrieved for each show."""
+    open_pool(load_config())
+    try:
+        with database_connection() as connection:
+            shows = Show(database_connection=connection).retrieve_details_by_year_month(
+                year, month
+            )
+            wwdtm_show = WWDTMShow(database_connection=connection)
+            expected = [wwdtm_show.retrieve_details_by_id(show["id"]) for show in shows]
+    finally:
+        close_pool()
+
+    assert shows
+    assert shows == expected
@@ -385,6 +385,22 @@ def test_get_show_details_by_id(show_id: int):
     assert "guests" in show
 
 
+@pytest.mark.parametrize("show_id, include", [(1083, "panelists,guests")])
+def test_get_show_details_by_id_include(show_id: int, include: str):
+    """Test /v2.0/shows/details/id/{show_id} route with include."""
+    response = client.get(
+        f"/v{API_VERSION}/shows/details/id/{show_id}", params={"include": include}
+    )
+    show = response.json()
+
+    assert response.status_code == 200
+    assert show["id"] == show_id
+    assert show["panelists"]
+    assert show["guests"]
+    assert show["location"] is None
+    assert show["bluffs"] is None
+
+
 @pytest.mark.parametrize("show_id", [0])
 def test_get_show_details_by_id_not_found(show_id: int):
     """Test /v2.0/shows/details/id/{show_id} route."""
@@ -817,6 +833,33 @@ def test_get_random_show():
     assert "original_show_date" in show
 
 
+@pytest.mark.parametrize("count", [1, 5])
+def test_get_random_show_count(count: int):
+    """Test /v2.0/shows/random route with the count parameter."""
+    response = client.get(f"/v{API_VERSION}/shows/random", params={"count": count})
+    shows = response.json()
+
+    assert response.status_code == 200
+    assert "shows" in shows
+    assert len(shows["shows"]) == count
+    assert len({show["id"] for show in shows["shows"]}) == count
+
+
+def test_get_random_show_seed():
+    """Test /v2.0/shows/random route with the seed parameter."""
+    params = {"count": 5, "seed": "quiz"}
+    first = client.get(f"/v{API_VERSION}/shows/random", params=params)
+    second = client.get(f"/v{API_VERSION}/shows/random", params=params)
+
+    assert first.status_code == 200
+    assert first.json() == second.json()
+
+    response = client.get(f"/v{API_VERSION}/shows/random", params={"seed": "quiz"})
+    assert response.status_code == 200
+    assert "id" in response.json()
+    assert "shows" not in response.json()
+
+
 def test_get_random_show_date():
     """Test /v2.0/shows/random/date route."""
     response = client.get(f"/v{API_VERSION}/shows/random/date")
@@ -920,3 +963,39 @@ def test_get_shows_repeats(inclusive: bool):
     assert isinstance(shows["shows"][0]["original_show_id"], int)
     assert "original_show_date" in shows["shows"][0]
     assert isinstance(shows["shows"][0]["original_show_date"], str)
+
+
+def test_post_shows_batch():
+    """Test POST /v2.0/shows/batch route."""
+    response = client.post(
+        f"/v{API_VERSION}/shows/batch",
+        json={"ids": [1083, 0], "dates": ["2018-10-27", "1900-01-01"]},
+    )
+    shows = response.json()
+
+    assert response.status_code == 200
+    assert "shows" in shows
+    assert shows["not_found"] == {"ids": [0], "dates": ["1900-01-01"]}
+
+
+def test_post_shows_batch_invalid_date():
+    """Test POST /v2.0/shows/batch route with an invalid date."""
+    response = client.post(
+        f"/v{API_VERSION}/shows/batch", json={"dates": ["2018-02-30"]}
+    )
+
+    assert response.status_code == 422
+
+
+def test_get_shows_details_batch():
+    """Test /v2.0/shows/details/batch route."""
+    response = client.get(
+        f"/v{API_VERSION}/shows/details/batch",
+        params={"ids": "1083,0", "dates": "2018-10-27"},
+    )
+    shows = response.json()
+
+    assert response.status_code == 200
+    assert shows["shows"][0]["id"] == 1083
+    assert "panelists" in shows["shows"][0]
+    assert shows["not_found"] == {"ids": [0], "dates": []}
@@ -0,0 +1,214 @@
+# Copyright (c) 2018-2026 Linh Pham
+# api.wwdt.me is released under the terms of the Apache License 2.0
+# SPDX-License-Identifier: Apache-2.0
+#
+# vim: set noai syntax=python ts=4 sw=4:
+"""Testing In-Memory Data Snapshot."""
+
+import asyncio
+from decimal import Decimal
+
+import pytest
+from wwdtm.guest import Guest
+from wwdtm.show import Show
+
+from app import dispatch, export_snapshot, snapshot
+from app.dispatch import UNRESOLVED, run_query
+from app.generation import DataGeneration
+from app.snapshot import (
+    EntityIndex,
+    ShowIndex,
+    Snapshot,
+    SnapshotStore,
+    read_snapshot,
+    write_snapshot,
+)
+
+_guests = [
+    {"id": 1, "name": "Alpha Guest", "slug": "alpha-guest"},
+    {"id": 2, "name": "Beta Guest", "slug": "beta-guest"},
+]
+_guest_details = [
+    {**_guests[0], "appearances": {"count": 0, "shows": []}},
+    {**_guests[1], "appearances": {"count": 0, "shows": []}},
+]
+_shows = [
+    {"id": 10, "date": "2017-10-28", "best_of": False, "repeat_show": False},
+    {
+        "id": 11,
+        "date": "2017-12-30",
+        "best_of": True,
+        "repeat_show": True,
+        "original_show_id": 10,
+        "original_show_date": "2017-10-28",
+    },
+    {"id": 12, "date": "2018-10-27", "best_of": True, "repeat_show": False},
+    {"id": 13, "date": "2018-11-03", "best_of": False, "repeat_show": False},
+]
+_show_details = [{**show, "panelists": [], "guests": []} for show in _shows]
+
+
+@pytest.fixture
+def store() -> SnapshotStore:
+    """Snapshot store holding a small data set."""
+    store = SnapshotStore()
+    store.current = Snapshot(
+        "test",
+        {
+            "Guest": EntityIndex(_guests, _guest_details),
+            "Panelist": EntityIndex(
+                [], [], details_kwargs={"number_decimal_places": 2}
+            ),
+            "Show": ShowIndex(_shows, _show_details),
+        },
+        {"Location.retrieve_postal_abbreviations": {"IL": {"name": "Illinois"}}},
+    )
+    return store
+
+
+@pytest.mark.parametrize(
+    "key, args, kwargs, expected",
+    [
+        ("Guest.retrieve_all", (), {}, _guests),
+        ("Guest.retrieve_by_id", (2,), {}, _guests[1]),
+        ("Guest.retrieve_by_id", (99,), {}, {}),
+        ("Guest.retrieve_by_slug", (" Alpha-Guest ",), {}, _guests[0]),
+        ("Guest.retrieve_details_by_slug", ("beta-guest",), {}, _guest_details[1]),
+        ("Guest.retrieve_details_by_slug", ("gamma",), {}, {}),
+        ("Guest.retrieve_random", (), {}, UNRESOLVED),
+        ("Panelist.retrieve_details_by_id", (1,), {}, UNRESOLVED),
+        (
+            "Location.retrieve_postal_abbreviations",
+            (),
+            {},
+            {"IL": {"name": "Illinois"}},
+        ),
+        ("Show.retrieve_by_date", (2018, 10, 27), {}, _shows[2]),
+        ("Show.retrieve_by_date", (2018, 2, 30), {}, {}),
+        ("Show.retrieve_details_by_date_string", ("2017-10-28",), {}, _show_details[0]),
+        ("Show.retrieve_by_year", (2018,), {}, _shows[2:]),
+        ("Show.retrieve_by_year_month", (2017, 12), {}, [_shows[1]]),
+        ("Show.retrieve_details_by_month_day", (10, 27), {}, [_show_details[2]]),
+        ("Show.retrieve_all_best_ofs", (), {}, [_shows[1], _shows[2]]),
+        ("Show.retrieve_all_best_ofs", (), {"inclusive": False}, [_shows[2]]),
+        ("Show.retrieve_all_repeats", (), {"inclusive": False}, []),
+        ("Show.retrieve_all_repeat_best_ofs_details", (), {}, [_show_details[1]]),
+        ("Show.retrieve_repeats_by_year", (), {"year": 2018}, None),
+        ("Show.retrieve_repeats_details_by_year", (), {"year": 2018}, []),
+        ("Show.retrieve_best_ofs_by_year", (), {"year": 0}, []),
+        ("Show.retrieve_all_dates", (), {}, [show["date"] for show in _shows]),
+        ("Guest.retrieve_by_id", (1, 2), {}, UNRESOLVED),
+        ("Show.retrieve_by_year", (2018,), {"month": 10}, UNRESOLVED),
+    ],
+)
+def test_snapshot_resolve(store: SnapshotStore, key, args, kwargs, expected):
+    """Test snapshot results match the results of the wwdtm methods."""
+    assert store.resolve(key, args, kwargs) == expected
+
+
+def test_snapshot_resolve_errors(store: SnapshotStore, monkeypatch):
+    """Test errors raised by snapshot methods are not hidden."""
+
+    def _retrieve_by_id(snapshot, id_):
+        raise TypeError("unexpected")
+
+    monkeypatch.setitem(snapshot._METHODS, "Guest.retrieve_by_id", _retrieve_by_id)
+    with pytest.raises(TypeError):
+        store.resolve("Guest.retrieve_by_id", (1,), {})
+
+
+def test_snapshot_resolve_without_snapshot():
+    """Test queries are not answered before a snapshot is loaded."""
+    assert SnapshotStore().resolve("Guest.retrieve_all", (), {}) is UNRESOLVED
+
+
+def test_run_query_uses_resolver(store: SnapshotStore, monkeypatch):
+    """Test run_query answers from a resolver without the database."""
+    monkeypatch.setattr(dispatch, "_resolvers", [store.resolve])
+
+    assert asyncio.run(run_query(Guest, "retrieve_by_id", 1)) == _guests[0]
+    assert asyncio.run(
+        dispatch.run_query_each(Show, "retrieve_details_by_id", [12, 10])
+    ) == [_show_details[2], _show_details[0]]
+
+
+def test_snapshot_file_round_trip(store: SnapshotStore, tmp_path):
+    """Test a snapshot read from a snapshot file matches the original."""
+    path = tmp_path / "snapshot.bin"
+    write_snapshot(store.current, path)
+    mapped = SnapshotStore()
+    mapped.current = read_snapshot(path)
+
+    assert mapped.current.generation == "test"
+    assert mapped.resolve("Guest.retrieve_all", (), {}) is UNRESOLVED
+    assert mapped.current.requested == {("Guest", "rows")}
+    assert not isinstance(mapped.current.entities["Guest"].rows, list)
+    for entity, field in [("Guest", "rows"), ("Show", "rows"), ("Show", "details")]:
+        mapped.current.decode(entity, field)
+
+    for key, args in [
+        ("Guest.retrieve_all", ()),
+        ("Guest.retrieve_details_by_id", (2,)),
+        ("Guest.retrieve_by_slug", ("ALPHA-GUEST",)),
+        ("Guest.retrieve_by_slug", ("unknown",)),
+        ("Show.retrieve_details_by_year", (2018,)),
+        ("Show.retrieve_all_best_ofs", ()),
+        ("Location.retrieve_postal_abbreviations", ()),
+    ]:
+        assert mapped.resolve(key, args, {}) == store.resolve(key, args, {})
+
+
+def test_snapshot_file_decimal(tmp_path):
+    """Test Decimal values are preserved in snapshot files."""
+    rows = [{"id": 4, "slug": "a", "coordinates": {"latitude": Decimal("41.880")}}]
+    path = tmp_path / "snapshot.bin"
+    write_snapshot(Snapshot("test", {"Location": EntityIndex(rows)}), path)
+
+    row = read_snapshot(path).entities["Location"].by_id[4]
+    assert row == rows[0]
+    assert str(row["coordinates"]["latitude"]) == "41.880"
+
+
+def test_snapshot_file_invalid(tmp_path):
+    """Test opening a file that is not a snapshot file raises an error."""
+    path = tmp_path / "snapshot.bin"
+    path.write_bytes(b"not a snapshot file")
+    with pytest.raises(ValueError):
+        read_snapshot(path)
+
+
+def test_export_snapshot(store: SnapshotStore, monkeypatch, tmp_path):
+    """Test export_snapshot writes the snapshot for the current data."""
+    monkeypatch.setattr(
+        export_snapshot,
+        "retrieve_change_token",
+        lambda: ("export-token", (4, 8, 0), 1700000000.0),
+    )
+    monkeypatch.setattr(
+        export_snapshot,
+        "load_snapshot",
+        lambda generation: Snapshot(generation, store.current.entities),
+    )
+    generation = DataGeneration()
+    monkeypatch.setattr(export_snapshot, "data_generation", generation)
+    path = tmp_path / "snapshot.bin"
+
+    assert export_snapshot.export_snapshot(str(path)) == generation.generation
+    assert read_snapshot(path).generation == generation.generation
+    assert generation.last_modified == 1700000000.0
+
+
+def test_snapshot_store_decodes_requested_records(store: SnapshotStore, tmp_path):
+    """Test full-table queries decode snapshot file records once."""
+    path = tmp_path / "snapshot.bin"
+    write_snapshot(store.current, path)
+    mapped = SnapshotStore()
+    mapped.current = read_snapshot(path)
+
+    async def _resolve():
+        assert mapped.resolve("Show.retrieve_all_dates", (), {}) is UNRESOLVED
+        await asyncio.gather(*mapped._decoding)
+        return mapped.resolve("Show.retrieve_all_dates", (), {})
+
+    assert asyncio.run(_resolve()) == [show["date"] for show in _shows]
+    assert mapped.current.scheduled == {("Show", "rows")}